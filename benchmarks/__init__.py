@@ -0,0 +1,14 @@
+"""Micro- and macro-benchmarks of the hot paths of rllib.
+
+Run the benchmarks and write the results of the current commit to
+`benchmarks/results/<commit>.json' with::
+
+    python -m benchmarks.run [--filter PATTERN] [--group micro|macro] [--quick]
+
+Compare the results of two commits, flagging the regressions, with::
+
+    python -m benchmarks.compare benchmarks/results/<base>.json \
+        benchmarks/results/<new>.json [--threshold 0.1]
+
+All the benchmarks run offline on cpu.
+"""
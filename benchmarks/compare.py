@@ -0,0 +1,95 @@
+"""Compare the benchmark results of two commits and flag the regressions."""
+import argparse
+import sys
+
+from .harness import load_results
+from .run import format_time
+
+
+def compare(base, new, threshold=0.1):
+    """Compare the median times of the benchmarks of two runs.
+
+    A benchmark regresses when its median time grows by more than `threshold' and
+    even its fastest new repetition is slower than the base median, so that noise
+    in a single repetition does not flag it. Improvements are flagged symmetrically.
+    A benchmark that fails in the new run is flagged as an error.
+
+    Parameters
+    ----------
+    base: dict.
+        Results of the base run, as written by `benchmarks.run'.
+    new: dict.
+        Results of the new run.
+    threshold: float, optional (default=0.1).
+        Relative change of the median time that is flagged.
+
+    Returns
+    -------
+    comparison: list.
+        Name, base median, new median, ratio and status of each benchmark. The
+        status is one of `regression', `improvement', `ok', `error', `added' or
+        `removed'.
+    """
+    base, new = base["benchmarks"], new["benchmarks"]
+    comparison = []
+    for name in list(base) + [name for name in new if name not in base]:
+        if "error" in new.get(name, {}):
+            median = base[name].get("median") if name in base else None
+            comparison.append((name, median, None, None, "error"))
+            continue
+        if name not in new:
+            comparison.append((name, base[name]["median"], None, None, "removed"))
+            continue
+        if name not in base or "error" in base[name]:
+            comparison.append((name, None, new[name]["median"], None, "added"))
+            continue
+        base_median, new_median = base[name]["median"], new[name]["median"]
+        ratio = new_median / base_median
+        if ratio > 1 + threshold and new[name]["min"] > base_median:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold) and new[name]["max"] < base_median:
+            status = "improvement"
+        else:
+            status = "ok"
+        comparison.append((name, base_median, new_median, ratio, status))
+    return comparison
+
+
+def format_comparison(comparison):
+    """Format a comparison as a table."""
+    lines = [
+        "benchmark".ljust(48)
+        + "base".rjust(12)
+        + "new".rjust(12)
+        + "ratio".rjust(9)
+        + "  status"
+    ]
+    for name, base_median, new_median, ratio, status in comparison:
+        lines.append(
+            name.ljust(48)
+            + (format_time(base_median) if base_median is not None else "-").rjust(12)
+            + (format_time(new_median) if new_median is not None else "-").rjust(12)
+            + (f"{ratio:.2f}" if ratio is not None else "-").rjust(9)
+            + f"  {status}"
+        )
+    return "\n".join(lines)
+
+
+def main(args):
+    """Compare two result files and exit with an error if a benchmark regressed."""
+    base, new = load_results(args.base), load_results(args.new)
+    print(f"base: {base['metadata']['commit']}, new: {new['metadata']['commit']}")
+    comparison = compare(base, new, args.threshold)
+    print(format_comparison(comparison))
+    regressions = [row[0] for row in comparison if row[-1] in ("regression", "error")]
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("base", help="Results of the base commit.")
+    parser.add_argument("new", help="Results of the new commit.")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    main(parser.parse_args())
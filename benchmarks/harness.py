@@ -0,0 +1,209 @@
+"""Registry, timer and result files of the benchmarks."""
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+import numpy as np
+import torch
+
+BENCHMARKS = {}
+
+
+class Benchmark(object):
+    """Benchmark of a function.
+
+    Parameters
+    ----------
+    name: str.
+        Name of the benchmark.
+    setup: callable.
+        Function that prepares the benchmark and returns the function to time.
+        Besides its time, the result reports the number of tensors that a call
+        allocates, see `count_allocations'.
+    group: str.
+        Group of the benchmark, `micro' or `macro'.
+    number: int, optional.
+        Number of calls per repetition. By default, it is calibrated so that each
+        repetition takes at least the minimum time of the run.
+    repeats: int, optional.
+        Number of repetitions. By default, the number of repetitions of the run.
+    fresh: bool, optional (default=False).
+        Flag that indicates whether to call `setup' before each repetition, for
+        functions that change their state, e.g., that grow a dataset.
+    """
+
+    def __init__(self, name, setup, group, number=None, repeats=None, fresh=False):
+        self.name = name
+        self.setup = setup
+        self.group = group
+        self.number = number
+        self.repeats = repeats
+        self.fresh = fresh
+
+    def __call__(self, min_time=0.2, repeats=5, seed=0):
+        """Time the benchmark.
+
+        Parameters
+        ----------
+        min_time: float, optional (default=0.2).
+            Minimum time in seconds of a repetition, used to calibrate the number of
+            calls per repetition.
+        repeats: int, optional (default=5).
+            Number of repetitions, unless the benchmark fixes it.
+        seed: int, optional (default=0).
+            Seed set before each setup.
+
+        Returns
+        -------
+        result: dict.
+            Statistics of the time per call in seconds over the repetitions, and the
+            number of tensors allocated per call.
+        """
+        repeats = self.repeats or repeats
+        function = self._setup(seed)
+        function()  # warm up.
+        number = self.number or calibrate(function, min_time)
+
+        times = []
+        for repeat in range(repeats):
+            if self.fresh and repeat > 0:
+                function = self._setup(seed)
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            times.append((time.perf_counter() - start) / number)
+
+        return {
+            "group": self.group,
+            "median": statistics.median(times),
+            "mean": statistics.mean(times),
+            "stdev": statistics.stdev(times) if repeats > 1 else 0.0,
+            "min": min(times),
+            "max": max(times),
+            "number": number,
+            "repeats": repeats,
+            "allocations": count_allocations(function),
+        }
+
+    def _setup(self, seed):
+        torch.manual_seed(seed)
+        np.random.seed(seed)
+        return self.setup()
+
+
+def benchmark(name, group="micro", number=None, repeats=None, fresh=False):
+    """Register a benchmark.
+
+    The decorated function prepares the benchmark and returns the function to time.
+    See `Benchmark' for the parameters.
+    """
+
+    def decorator(setup):
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark {name} is already registered.")
+        BENCHMARKS[name] = Benchmark(name, setup, group, number, repeats, fresh)
+        return setup
+
+    return decorator
+
+
+class _AllocationCounter(getattr(torch.overrides, "TorchFunctionMode", object)):
+    """Count the torch functions that return a tensor that is not an input."""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def __torch_function__(self, func, types, args=(), kwargs=None):
+        output = func(*args, **(kwargs or {}))
+        if isinstance(output, torch.Tensor) and all(output is not x for x in args):
+            self.count += 1
+        return output
+
+
+def count_allocations(function):
+    """Count the tensors that a call to a function allocates.
+
+    It counts the tensors returned by torch functions and tensor methods called from
+    python, so it misses the intermediate tensors of a single operation. It returns
+    None if the version of torch does not support torch function modes.
+    """
+    if not hasattr(torch.overrides, "TorchFunctionMode"):
+        return None
+    with _AllocationCounter() as counter:
+        function()
+    return counter.count
+
+
+def calibrate(function, min_time):
+    """Get the number of calls of a function that take at least `min_time' seconds."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed_time = time.perf_counter() - start
+        if elapsed_time >= min_time:
+            return number
+        number *= 2 if elapsed_time == 0 else max(2, int(min_time / elapsed_time))
+
+
+def select(pattern="*", group=None):
+    """Select the registered benchmarks whose name matches a glob pattern."""
+    return [
+        bench
+        for name, bench in BENCHMARKS.items()
+        if fnmatch.fnmatch(name, pattern) and (group is None or bench.group == group)
+    ]
+
+
+def git_commit():
+    """Get the current commit and whether the working tree has changes."""
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+        )
+        status = subprocess.check_output(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            stderr=subprocess.DEVNULL,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit.decode().strip(), len(status) > 0
+
+
+def get_metadata():
+    """Get the commit, the date and the software and hardware of a run."""
+    commit, dirty = git_commit()
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "num_threads": torch.get_num_threads(),
+    }
+
+
+def save_results(filename, results, metadata):
+    """Write the results of a run to a json file."""
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(filename, "w") as file:
+        json.dump({"metadata": metadata, "benchmarks": results}, file, indent=2)
+
+
+def load_results(filename):
+    """Read the results of a run from a json file."""
+    with open(filename, "r") as file:
+        return json.load(file)
@@ -0,0 +1,118 @@
+"""Measure the import time of the top-level packages with `python -X importtime'.
+
+Each package is imported in a fresh interpreter, whose import-time report gives the
+cumulative time of each imported module. The script prints the total import time of
+each package and its slowest imports, which are the candidates to import lazily.
+
+The `import[...]' macro-benchmarks of `benchmarks.run' time the same imports, from
+the start to the exit of the interpreter. Run the script with::
+
+    python -m benchmarks.importtime [PACKAGE ...] [--repeats 3]
+"""
+import argparse
+import subprocess
+import sys
+
+PACKAGES = [
+    "torch",
+    "rllib",
+    "rllib.agent",
+    "rllib.algorithms",
+    "rllib.dataset",
+    "rllib.environment",
+    "rllib.model",
+    "rllib.policy",
+    "rllib.value_function",
+]
+
+
+def parse_importtime(report):
+    """Parse an import-time report.
+
+    Returns
+    -------
+    times: Dict[str, Tuple[float, Optional[str]]].
+        Cumulative time in seconds of each imported module and the module that
+        imported it, which is None for the modules of the statement.
+    """
+    times, parents = {}, []
+    # A module is reported after the modules that it imports.
+    for line in reversed(report.splitlines()):
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        parents[level:] = [name.strip()]
+        times[name.strip()] = int(cumulative) / 1e6, (
+            parents[level - 1] if level > 0 else None
+        )
+    return times
+
+
+def import_report(statement):
+    """Run a statement in a fresh interpreter and return its import-time report."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        universal_newlines=True,
+        check=True,
+    )
+    return process.stderr
+
+
+def measure_import_time(module, repeats=3):
+    """Measure the import time of a module.
+
+    The modules that the interpreter imports at start-up are not counted.
+
+    Returns
+    -------
+    total: float.
+        Median over the repetitions of the import time in seconds.
+    times: Dict[str, Tuple[float, Optional[str]]].
+        Cumulative time and importer of each imported module, from the run with the
+        median time, see `parse_importtime'.
+    """
+    startup = parse_importtime(import_report("pass"))
+    runs = []
+    for _ in range(repeats):
+        report = parse_importtime(import_report(f"import {module}"))
+        times = {name: value for name, value in report.items() if name not in startup}
+        total = sum(time for time, parent in times.values() if parent is None)
+        runs.append((total, times))
+    runs.sort(key=lambda run: run[0])
+    return runs[len(runs) // 2]
+
+
+def slowest_imports(times, package, num_imports=5, exclude=("torch",)):
+    """Get the slowest external modules that the modules of a package import."""
+    root = package.split(".")[0]
+    candidates = sorted(
+        (
+            (time, name)
+            for name, (time, parent) in times.items()
+            if parent is not None
+            and parent.split(".")[0] == root
+            and name.split(".")[0] not in (root,) + tuple(exclude)
+        ),
+        reverse=True,
+    )
+    return [(name, time) for time, name in candidates[:num_imports]]
+
+
+def main(args):
+    """Print the import time of each package and its slowest imports."""
+    for package in args.packages:
+        total, times = measure_import_time(package, args.repeats)
+        print(package.ljust(48) + f"{1e3 * total:.1f}ms".rjust(12))
+        for name, time in slowest_imports(times, package, args.num_imports):
+            print(f"    {name}".ljust(48) + f"{1e3 * time:.1f}ms".rjust(12))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("packages", nargs="*", default=PACKAGES)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--num-imports", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,75 @@
+"""Measure the latency percentiles of `AbstractAgent.act' with and without fast path.
+
+Unlike the benchmarks of `benchmarks.run', which report the median time of many
+calls, this script times every call, as the tail latency bounds the frequency of a
+control loop.
+"""
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from rllib.agent import PPOAgent, SACAgent
+from rllib.environment import GymEnvironment
+from rllib.policy import InferencePolicy
+
+from .run import format_time
+
+AGENTS = {
+    "SAC-VPendulum": (SACAgent, "VPendulum-v0"),
+    "PPO-CartPole": (PPOAgent, "CartPole-v0"),
+}
+
+
+def measure_latency(function, num_calls=1000, num_warmup=100):
+    """Time each call to a function and return the percentiles of the latency."""
+    for _ in range(num_warmup):
+        function()
+    times = np.empty(num_calls)
+    for i in range(num_calls):
+        start = time.perf_counter()
+        function()
+        times[i] = time.perf_counter() - start
+    p50, p90, p99 = np.percentile(times, [50, 90, 99])
+    return {"p50": p50, "p90": p90, "p99": p99, "max": times.max()}
+
+
+def get_act_functions(name):
+    """Get the functions that compute an action of an agent at a fixed state."""
+    agent_class, environment_name = AGENTS[name]
+    environment = GymEnvironment(environment_name, seed=0)
+    state = environment.reset()
+    functions = {}
+    for fast_inference in [False, True]:
+        agent = agent_class.default(
+            environment, fast_inference=fast_inference, checkpoint_frequency=0
+        )
+        agent.logger.delete_directory()
+        key = "act[fast]" if fast_inference else "act"
+        functions[key] = lambda agent=agent: agent.act(state)
+    traced_policy = InferencePolicy(agent.policy, trace=True)
+    functions["inference_policy[traced]"] = lambda: traced_policy(state)
+    return functions
+
+
+def main(args):
+    """Print the latency percentiles of each agent."""
+    torch.set_num_threads(args.num_threads)
+    torch.manual_seed(args.seed)
+    print("".ljust(48) + "".join(key.rjust(12) for key in ["p50", "p90", "p99", "max"]))
+    for name in AGENTS:
+        for key, function in get_act_functions(name).items():
+            latency = measure_latency(function, args.num_calls)
+            print(
+                f"{name}.{key}".ljust(48)
+                + "".join(format_time(value).rjust(12) for value in latency.values())
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-calls", type=int, default=10000)
+    parser.add_argument("--num-threads", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
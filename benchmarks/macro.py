@@ -0,0 +1,115 @@
+"""Macro-benchmarks of agents interacting with environments.
+
+Each benchmark times one episode of `rollout_agent', including the learning of the
+agent. The warm-up episode fills the memory of the agent and ends the exploration
+episodes, so the timed episodes learn and plan from the start.
+"""
+import copy
+
+from rllib.agent import MPCAgent, PPOAgent, QLearningAgent, SACAgent, SARSAAgent
+from rllib.algorithms.mpc import CEMShooting
+from rllib.environment import GymEnvironment
+from rllib.environment.mdps import DoubleChainProblem, EasyGridWorld
+from rllib.model.environment_model import EnvironmentModel
+from rllib.util.rollout import rollout_agent
+
+from .harness import benchmark
+from .importtime import PACKAGES, import_report
+
+PENDULUM_STEPS = 100
+TABULAR_STEPS = 100
+
+
+def get_pendulum():
+    """Get the vectorized pendulum environment."""
+    return GymEnvironment("VPendulum-v0", seed=0)
+
+
+def rollout(environment, agent, max_steps):
+    """Get a function that rolls out the agent for one episode."""
+    return lambda: rollout_agent(environment, agent, max_steps=max_steps)
+
+
+def get_sac_pendulum(**kwargs):
+    """Get a function that rolls out SAC learning at every step."""
+    environment = get_pendulum()
+    agent = SACAgent.default(
+        environment,
+        train_frequency=1,
+        num_iter=1,
+        batch_size=32,
+        checkpoint_frequency=0,
+        **kwargs,
+    )
+    return rollout(environment, agent, PENDULUM_STEPS)
+
+
+@benchmark("rollout_agent[SAC-VPendulum]", group="macro", number=1, repeats=3)
+def sac_pendulum():
+    """Time an episode of SAC learning at every step."""
+    return get_sac_pendulum()
+
+
+@benchmark(
+    "rollout_agent[SAC-VPendulum-background]", group="macro", number=1, repeats=3
+)
+def sac_pendulum_background():
+    """Time an episode of SAC learning at every step in a background thread."""
+    return get_sac_pendulum(background_learning=True)
+
+
+@benchmark("rollout_agent[PPO-VPendulum]", group="macro", number=1, repeats=3)
+def ppo_pendulum():
+    """Time an episode of PPO learning at the end of the episode."""
+    environment = get_pendulum()
+    agent = PPOAgent.default(
+        environment, num_rollouts=1, num_iter=4, checkpoint_frequency=0
+    )
+    return rollout(environment, agent, PENDULUM_STEPS)
+
+
+@benchmark("rollout_agent[MPC-VPendulum]", group="macro", number=1, repeats=3)
+def mpc_pendulum():
+    """Time an episode of CEM planning with the true model."""
+    environment = get_pendulum()
+    model_environment = copy.deepcopy(environment)
+    model_environment.reset()
+    solver = CEMShooting(
+        dynamical_model=EnvironmentModel(model_environment, model_kind="dynamics"),
+        reward_model=EnvironmentModel(model_environment, model_kind="rewards"),
+        num_model_steps=10,
+        num_iter=2,
+        num_particles=100,
+        action_scale=environment.action_scale,
+    )
+    agent = MPCAgent(mpc_solver=solver, checkpoint_frequency=0)
+    return rollout(environment, agent, PENDULUM_STEPS // 4)
+
+
+@benchmark("rollout_agent[QLearning-EasyGridWorld]", group="macro", number=1)
+def q_learning_grid_world():
+    """Time an episode of tabular Q-Learning."""
+    environment = EasyGridWorld()
+    agent = QLearningAgent.default(environment, checkpoint_frequency=0)
+    return rollout(environment, agent, TABULAR_STEPS)
+
+
+@benchmark("rollout_agent[SARSA-DoubleChain]", group="macro", number=1)
+def sarsa_double_chain():
+    """Time an episode of tabular SARSA."""
+    environment = DoubleChainProblem()
+    agent = SARSAAgent.default(environment, checkpoint_frequency=0)
+    return rollout(environment, agent, TABULAR_STEPS)
+
+
+def register_import_benchmark(package):
+    """Register the benchmark of the import of a package in a fresh interpreter."""
+
+    @benchmark(f"import[{package}]", group="macro", number=1, repeats=3)
+    def import_package():
+        """Time a fresh interpreter that imports the package."""
+        return lambda: import_report(f"import {package}")
+
+
+for package_name in PACKAGES:
+    register_import_benchmark(package_name)
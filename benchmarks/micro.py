@@ -0,0 +1,450 @@
+"""Micro-benchmarks of the data structures, utilities, models and solvers."""
+import tempfile
+
+import numpy as np
+import torch
+
+from rllib.algorithms.mpc import (
+    CEMShooting,
+    GradientBasedSolver,
+    ILQRSolver,
+    MPPIShooting,
+    RandomShooting,
+)
+from rllib.algorithms.mpc.policy_shooting import PolicyShooting
+from rllib.algorithms.policy_evaluation.gae import GAE
+from rllib.algorithms.tabular_planning import value_iteration
+from rllib.dataset import ShardedOfflineDataset, TrajectoryDataset, write_shards
+from rllib.dataset.datatypes import Observation
+from rllib.dataset.experience_replay import (
+    ExperienceReplay,
+    PrioritizedExperienceReplay,
+)
+from rllib.dataset.offline_dataset import OfflineDataset
+from rllib.dataset.transforms import (
+    ActionNormalizer,
+    RewardNormalizer,
+    StateNormalizer,
+)
+from rllib.dataset.utilities import stack_list_of_tuples
+from rllib.environment.mdps import EasyGridWorld
+from rllib.model import EnsembleModel, ExactGPModel, NNModel
+from rllib.policy import NNPolicy
+from rllib.reward.quadratic_reward import QuadraticReward
+from rllib.util.neural_networks.utilities import TileCode, update_parameters
+from rllib.util.rollout import step_env
+from rllib.util.training.model_learning import train_ensemble_step
+from rllib.util.utilities import fill_behavior_statistics, tensor_to_distribution
+from rllib.util.value_estimation import discount_cumsum
+from rllib.value_function import (
+    NNQFunction,
+    NNValueFunction,
+    TileCodingValueFunction,
+)
+
+from .harness import benchmark
+
+DIM_STATE, DIM_ACTION = 4, 2
+MEMORY_SIZE = 10000
+BATCH_SIZE = 256
+HORIZON = 200
+
+MEMORIES = {
+    "plain": lambda: ExperienceReplay(max_len=MEMORY_SIZE),
+    "n_step": lambda: ExperienceReplay(max_len=MEMORY_SIZE, num_memory_steps=4),
+    "prioritized": lambda: PrioritizedExperienceReplay(max_len=MEMORY_SIZE),
+    "normalized": lambda: ExperienceReplay(
+        max_len=MEMORY_SIZE,
+        transformations=[
+            StateNormalizer(dim=(DIM_STATE,)),
+            ActionNormalizer(dim=(DIM_ACTION,)),
+            RewardNormalizer(),
+        ],
+    ),
+}
+
+
+def get_observations(num_observations):
+    """Get random observations."""
+    return [
+        Observation.random_example(dim_state=(DIM_STATE,), dim_action=(DIM_ACTION,))
+        for _ in range(num_observations)
+    ]
+
+
+def get_memory(kind, num_observations=MEMORY_SIZE):
+    """Get a memory of a given kind filled with random observations."""
+    memory = MEMORIES[kind]()
+    for observation in get_observations(num_observations):
+        memory.append(observation)
+    return memory
+
+
+def register_memory_benchmarks(kind):
+    """Register the append and sample benchmarks of a memory."""
+
+    @benchmark(f"experience_replay.append[{kind}]")
+    def append():
+        """Time appending 100 observations to the memory."""
+        memory = get_memory(kind, num_observations=BATCH_SIZE)
+        observations = get_observations(100)
+
+        def function():
+            for observation in observations:
+                memory.append(observation)
+
+        return function
+
+    @benchmark(f"experience_replay.sample_batch[{kind}]")
+    def sample_batch():
+        """Time sampling a batch from a full memory."""
+        memory = get_memory(kind)
+        return lambda: memory.sample_batch(BATCH_SIZE)
+
+
+for memory_kind in MEMORIES:
+    register_memory_benchmarks(memory_kind)
+
+
+@benchmark("experience_replay.all_data[normalized]")
+def experience_replay_all_data():
+    """Time getting all the transformed data of a memory."""
+    memory = get_memory("normalized")
+    return lambda: memory.all_data
+
+
+def get_trajectory_dataset(num_trajectories=50):
+    """Get a dataset of random trajectories with random lengths."""
+    dataset = TrajectoryDataset(sequence_length=16)
+    for length in np.random.randint(HORIZON // 2, 2 * HORIZON, num_trajectories):
+        dataset.append(get_observations(length))
+    return dataset
+
+
+@benchmark("trajectory_dataset.sample_batch")
+def trajectory_dataset_sample_batch():
+    """Time sampling a batch of sub-trajectories."""
+    dataset = get_trajectory_dataset()
+    return lambda: dataset.sample_batch(BATCH_SIZE)
+
+
+@benchmark("trajectory_dataset.all_data")
+def trajectory_dataset_all_data():
+    """Time getting all the data of the dataset."""
+    dataset = get_trajectory_dataset()
+    return lambda: dataset.all_data
+
+
+NUM_OFFLINE_TRANSITIONS = 100000
+SHARD_DIRECTORIES = {}
+
+
+def get_offline_observation():
+    """Get the raw observation of an offline dataset of random transitions."""
+    num_transitions = NUM_OFFLINE_TRANSITIONS
+    return Observation(
+        state=torch.randn(num_transitions, DIM_STATE),
+        action=torch.randn(num_transitions, DIM_ACTION),
+        reward=torch.randn(num_transitions, 1),
+        next_state=torch.randn(num_transitions, DIM_STATE),
+        done=torch.zeros(num_transitions),
+        log_prob_action=torch.zeros(num_transitions),
+    )
+
+
+def get_shard_directory():
+    """Get a directory with ten shards of random transitions, written once."""
+    if "shards" not in SHARD_DIRECTORIES:
+        directory = tempfile.TemporaryDirectory()
+        write_shards(
+            get_offline_observation(),
+            directory.name,
+            shard_size=NUM_OFFLINE_TRANSITIONS // 10,
+        )
+        SHARD_DIRECTORIES["shards"] = directory
+    return SHARD_DIRECTORIES["shards"].name
+
+
+@benchmark("offline_dataset.sample_batch")
+def offline_dataset_sample_batch():
+    """Time sampling a batch from an in-memory offline dataset."""
+    observation = get_offline_observation()
+    dataset = OfflineDataset(
+        Observation(*(x.unsqueeze(1) if x.ndim else x for x in observation)),
+        transformations=[StateNormalizer(dim=(DIM_STATE,))],
+    )
+    return lambda: dataset.sample_batch(BATCH_SIZE)
+
+
+@benchmark("sharded_offline_dataset.sample_batch")
+def sharded_offline_dataset_sample_batch():
+    """Time sampling a batch from the window of a sharded dataset."""
+    dataset = ShardedOfflineDataset(
+        get_shard_directory(),
+        transformations=[StateNormalizer(dim=(DIM_STATE,))],
+        shuffle_window=NUM_OFFLINE_TRANSITIONS // 5,
+    )
+    return lambda: dataset.sample_batch(BATCH_SIZE)
+
+
+@benchmark("sharded_offline_dataset.epoch", number=1, repeats=3)
+def sharded_offline_dataset_epoch():
+    """Time an epoch through a sharded dataset, in batches."""
+    dataset = ShardedOfflineDataset(
+        get_shard_directory(),
+        transformations=[StateNormalizer(dim=(DIM_STATE,))],
+        shuffle_window=NUM_OFFLINE_TRANSITIONS // 5,
+    )
+
+    def function():
+        for _ in dataset.batches(BATCH_SIZE):
+            pass
+
+    return function
+
+
+class ConstantEnvironment(object):
+    """Environment whose steps return fixed arrays, to time the overhead of a step."""
+
+    def __init__(self):
+        self.next_state = np.random.randn(DIM_STATE).astype(np.float32)
+        self.reward = np.random.randn(1).astype(np.float32)
+
+    def step(self, action):
+        """Return the next state, the reward, the done flag and the info."""
+        return self.next_state, self.reward, False, {}
+
+
+@benchmark("observation.step")
+def observation_step():
+    """Time building the observation of an environment step and storing it."""
+    environment, memory = ConstantEnvironment(), ExperienceReplay(max_len=MEMORY_SIZE)
+    state = np.random.randn(DIM_STATE).astype(np.float32)
+    action = np.random.randn(DIM_ACTION).astype(np.float32)
+
+    def function():
+        observation, *_ = step_env(environment, state, action, action_scale=1.0)
+        memory.append(observation)
+        return observation.shape
+
+    return function
+
+
+def register_step_statistics_benchmark(defer_statistics):
+    """Register the benchmark of a step with the statistics of the policy."""
+    name = "deferred" if defer_statistics else "per_step"
+
+    @benchmark(f"step_env.statistics[{name}]")
+    def step_statistics():
+        """Time an environment step with the action distribution of a policy."""
+        environment = ConstantEnvironment()
+        policy = NNPolicy(dim_state=(DIM_STATE,), dim_action=(DIM_ACTION,))
+        state = np.random.randn(DIM_STATE).astype(np.float32)
+        pi = tensor_to_distribution(policy(torch.tensor(state)), **policy.dist_params)
+        action = pi.sample().numpy()
+
+        return lambda: step_env(
+            environment, state, action, 1.0, pi=pi, defer_statistics=defer_statistics
+        )
+
+
+for defer in [False, True]:
+    register_step_statistics_benchmark(defer)
+
+
+@benchmark("fill_behavior_statistics")
+def fill_statistics():
+    """Time computing the deferred statistics of a trajectory."""
+    environment = ConstantEnvironment()
+    policy = NNPolicy(dim_state=(DIM_STATE,), dim_action=(DIM_ACTION,))
+    state = np.random.randn(DIM_STATE).astype(np.float32)
+    trajectory = []
+    for _ in range(HORIZON):
+        pi = tensor_to_distribution(policy(torch.tensor(state)), **policy.dist_params)
+        trajectory.append(
+            step_env(
+                environment, state, pi.sample().numpy(), 1.0, pi, defer_statistics=True
+            )[0]
+        )
+    trajectory = stack_list_of_tuples(trajectory)
+    return lambda: fill_behavior_statistics(trajectory, policy)
+
+
+@benchmark("stack_list_of_tuples")
+def stack_observations():
+    """Time stacking the observations of a trajectory."""
+    observations = get_observations(HORIZON)
+    return lambda: stack_list_of_tuples(observations)
+
+
+@benchmark("discount_cumsum")
+def discounted_cumulative_sum():
+    """Time the discounted cumulative sum of the rewards of a trajectory."""
+    rewards = torch.randn(HORIZON, 1)
+    return lambda: discount_cumsum(rewards, gamma=0.99)
+
+
+@benchmark("gae")
+def generalized_advantage_estimation():
+    """Time the generalized advantage estimation of a trajectory."""
+    gae = GAE(
+        td_lambda=0.95,
+        gamma=0.99,
+        value_function=NNValueFunction(dim_state=(DIM_STATE,)),
+    )
+    trajectory = stack_list_of_tuples(get_observations(HORIZON))
+
+    def function():
+        with torch.no_grad():
+            return gae(trajectory)
+
+    return function
+
+
+@benchmark("update_parameters")
+def soft_update():
+    """Time the soft update of the parameters of a q function."""
+    kwargs = dict(dim_state=(DIM_STATE,), dim_action=(DIM_ACTION,), layers=[256, 256])
+    target, new = NNQFunction(**kwargs), NNQFunction(**kwargs)
+    return lambda: update_parameters(target, new, tau=0.005)
+
+
+def get_ensemble():
+    """Get an ensemble model and a batch of transitions."""
+    model = EnsembleModel(
+        num_heads=5, dim_state=(DIM_STATE,), dim_action=(DIM_ACTION,), layers=[200, 200]
+    )
+    observation = stack_list_of_tuples(get_observations(BATCH_SIZE))
+    return model, observation
+
+
+@benchmark("ensemble_model.forward")
+def ensemble_forward():
+    """Time the prediction of an ensemble on a batch."""
+    model, observation = get_ensemble()
+
+    def function():
+        with torch.no_grad():
+            return model(observation.state, observation.action)
+
+    return function
+
+
+@benchmark("ensemble_model.train")
+def ensemble_train():
+    """Time a training step of an ensemble on a batch."""
+    model, observation = get_ensemble()
+    optimizer = torch.optim.Adam(model.parameters(), lr=1e-3)
+    mask = torch.ones(BATCH_SIZE, model.num_heads)
+    return lambda: train_ensemble_step(model, observation, optimizer, mask)
+
+
+def get_gp_data(num_data):
+    """Get synthetic transitions for a gp model."""
+    state = torch.randn(num_data, DIM_STATE)
+    action = torch.randn(num_data, DIM_ACTION)
+    next_state = torch.sin(state) + action.sum(-1, keepdim=True)
+    return state, action, next_state
+
+
+@benchmark("gp_model.add_data", fresh=True)
+def gp_add_data():
+    """Time adding 10 transitions to a gp model with 500 transitions."""
+    model = ExactGPModel(*get_gp_data(500))
+    new_data = get_gp_data(10)
+    return lambda: model.add_data(*new_data)
+
+
+@benchmark("gp_model.predict")
+def gp_predict():
+    """Time the prediction of a gp model with 500 transitions on a batch."""
+    model = ExactGPModel(*get_gp_data(500))
+    model.eval()
+    state, action, _ = get_gp_data(BATCH_SIZE)
+
+    def function():
+        with torch.no_grad():
+            return model(state, action)
+
+    return function
+
+
+SOLVERS = {
+    "random_shooting": lambda **kwargs: RandomShooting(**kwargs),
+    "cem_shooting": lambda **kwargs: CEMShooting(num_iter=5, **kwargs),
+    "mppi_shooting": lambda **kwargs: MPPIShooting(num_iter=5, **kwargs),
+    "gradient_based": lambda **kwargs: GradientBasedSolver(num_iter=5, **kwargs),
+    "ilqr": lambda **kwargs: ILQRSolver(num_iter=5, **kwargs),
+    "policy_shooting": lambda **kwargs: PolicyShooting(
+        policy=NNPolicy(dim_state=(DIM_STATE,), dim_action=(DIM_ACTION,)), **kwargs
+    ),
+}
+
+
+def register_solver_benchmark(name):
+    """Register the benchmark of an MPC solver on a neural network model."""
+
+    @benchmark(f"mpc.{name}")
+    def solve():
+        """Time solving the MPC problem from a state."""
+        solver = SOLVERS[name](
+            dynamical_model=NNModel(
+                dim_state=(DIM_STATE,),
+                dim_action=(DIM_ACTION,),
+                layers=[64, 64],
+                deterministic=True,
+            ),
+            reward_model=QuadraticReward(
+                torch.eye(DIM_STATE), 0.1 * torch.eye(DIM_ACTION)
+            ),
+            num_model_steps=15,
+            num_particles=200,
+        )
+        state = torch.randn(DIM_STATE)
+
+        def function():
+            solver.reset()
+            return solver(state)
+
+        return function
+
+
+for solver_name in SOLVERS:
+    register_solver_benchmark(solver_name)
+
+
+@benchmark("tile_coding.forward[dense]")
+def dense_tile_coding_forward():
+    """Time a linear value of the one-hot tile code of a batch of 4-d states."""
+    tile_code = TileCode([-1.0] * 4, [1.0] * 4, bins=10)
+    linear = torch.nn.Linear(tile_code.num_outputs, 1, bias=False)
+    state = 2 * torch.rand(BATCH_SIZE, 4) - 1
+    return lambda: linear(tile_code(state))
+
+
+def register_tile_coding_benchmark(name, dim_state, table_size):
+    """Register the benchmark of a sparse tile-coding value function."""
+
+    @benchmark(f"tile_coding.forward[{name}]")
+    def sparse_tile_coding_forward():
+        """Time a tile-coding value function with 8 tilings on a batch."""
+        value_function = TileCodingValueFunction(
+            [-1.0] * dim_state,
+            [1.0] * dim_state,
+            bins=10,
+            dim_state=(dim_state,),
+            table_size=table_size,
+        )
+        state = 2 * torch.rand(BATCH_SIZE, dim_state) - 1
+        return lambda: value_function(state)
+
+
+register_tile_coding_benchmark("sparse", 4, None)
+register_tile_coding_benchmark("hashed-8d", 8, 2 ** 16)
+
+
+@benchmark("value_iteration", repeats=3)
+def tabular_value_iteration():
+    """Time value iteration on a grid world."""
+    environment = EasyGridWorld()
+    return lambda: value_iteration(environment, gamma=0.9)
@@ -0,0 +1,102 @@
+"""Run the benchmarks and write the results to a json file."""
+import argparse
+import os
+import tempfile
+
+import torch
+
+from . import macro, micro  # noqa: F401, register the benchmarks.
+from .harness import get_metadata, save_results, select
+
+
+def run(benchmarks, min_time=0.2, repeats=5, seed=0, verbose=True):
+    """Run benchmarks in a temporary working directory and return their results.
+
+    The temporary directory collects the logs and checkpoints that the agents write.
+    A benchmark that raises an exception is recorded with the error and the run
+    continues.
+    """
+    results = {}
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for bench in benchmarks:
+                try:
+                    results[bench.name] = bench(min_time, repeats, seed)
+                except Exception as exception:
+                    results[bench.name] = {
+                        "group": bench.group,
+                        "error": repr(exception),
+                    }
+                if verbose:
+                    print(format_result(bench.name, results[bench.name]), flush=True)
+        finally:
+            os.chdir(working_directory)
+    return results
+
+
+def format_result(name, result):
+    """Format the result of a benchmark as a line of a table."""
+    if "error" in result:
+        return name.ljust(48) + f"  {result['error']}"
+    return (
+        name.ljust(48)
+        + format_time(result["median"]).rjust(12)
+        + f"+-{format_time(result['stdev'])}".rjust(14)
+        + f"x{result['number']}".rjust(9)
+        + str(result.get("allocations", "")).rjust(9)
+    )
+
+
+def format_time(seconds):
+    """Format a time with an adequate unit."""
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def main(args):
+    """Run the selected benchmarks."""
+    torch.set_num_threads(args.num_threads)
+    benchmarks = select(args.filter, args.group)
+    if not benchmarks:
+        raise ValueError(f"No benchmark matches {args.filter}.")
+    if args.quick:
+        args.min_time, args.repeats = 0.05, 2
+
+    metadata = get_metadata()
+    print(
+        "benchmark".ljust(48)
+        + "median".rjust(12)
+        + "stdev".rjust(14)
+        + "calls".rjust(9)
+        + "tensors".rjust(9)
+    )
+    results = run(benchmarks, args.min_time, args.repeats, args.seed)
+
+    output = args.output
+    if output is None:
+        name = metadata["commit"] or "results"
+        name += "-dirty" if metadata["dirty"] else ""
+        output = os.path.join(os.path.dirname(__file__), "results", f"{name}.json")
+    save_results(output, results, metadata)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--filter", default="*", help="Glob pattern of the benchmark names."
+    )
+    parser.add_argument("--group", choices=["micro", "macro"], default=None)
+    parser.add_argument("--output", default=None, help="Name of the json file.")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--num-threads", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--quick", action="store_true", help="Use short repetitions, for smoke tests."
+    )
+    main(parser.parse_args())
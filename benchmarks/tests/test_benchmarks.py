@@ -0,0 +1,132 @@
+import os
+
+import pytest
+import torch
+
+from benchmarks.compare import compare, format_comparison
+from benchmarks.harness import (
+    BENCHMARKS,
+    Benchmark,
+    count_allocations,
+    load_results,
+    save_results,
+    select,
+)
+from benchmarks.importtime import (
+    measure_import_time,
+    parse_importtime,
+    slowest_imports,
+)
+from benchmarks.latency import measure_latency
+from benchmarks.run import format_result, run
+
+
+def get_result(median, spread=0.0):
+    return {"median": median, "min": median - spread, "max": median + spread}
+
+
+def test_benchmark():
+    calls = []
+    bench = Benchmark("append", lambda: lambda: calls.append(1), group="micro")
+    result = bench(min_time=0.01, repeats=3)
+    assert result["repeats"] == 3
+    assert result["number"] > 1
+    assert len(calls) >= 1 + 3 * result["number"]
+    assert result["min"] <= result["median"] <= result["max"]
+    assert result["allocations"] == 0
+
+    setups = []
+    fresh = Benchmark("fresh", lambda: setups.append(1) or int, "micro", 2, 3, True)
+    assert fresh()["number"] == 2
+    assert len(setups) == 3
+
+
+def test_count_allocations():
+    tensor = torch.zeros(3)
+    assert count_allocations(lambda: tensor.to("cpu")) == 0
+    assert count_allocations(lambda: torch.zeros(3).add_(1.0) + 1.0) == 2
+
+
+def test_registry():
+    assert {"micro", "macro"} == {bench.group for bench in BENCHMARKS.values()}
+    names = [bench.name for bench in select("experience_replay.*")]
+    assert "experience_replay.sample_batch[prioritized]" in names
+    assert all(bench.group == "macro" for bench in select(group="macro"))
+
+
+def test_run_and_compare(tmp_path):
+    benchmarks = select("discount_cumsum") + [
+        Benchmark("failing", lambda: 1 / 0, group="micro")
+    ]
+    results = run(benchmarks, min_time=0.01, repeats=2, verbose=False)
+    assert results["discount_cumsum"]["median"] > 0
+    assert "ZeroDivisionError" in results["failing"]["error"]
+    assert "ZeroDivisionError" in format_result("failing", results["failing"])
+
+    filename = os.path.join(tmp_path, "results.json")
+    save_results(filename, results, {"commit": None})
+    loaded = load_results(filename)
+    assert loaded["benchmarks"] == results
+    statuses = [row[-1] for row in compare(loaded, loaded)]
+    assert statuses == ["ok", "error"]
+
+
+def test_compare():
+    base = {
+        "benchmarks": {
+            "slower": get_result(1.0, 0.01),
+            "noisy": get_result(1.0, 0.01),
+            "faster": get_result(1.0, 0.01),
+            "same": get_result(1.0, 0.01),
+            "removed": get_result(1.0),
+        }
+    }
+    new = {
+        "benchmarks": {
+            "slower": get_result(1.5, 0.1),
+            "noisy": get_result(1.5, 0.6),
+            "faster": get_result(0.5, 0.1),
+            "same": get_result(1.05, 0.01),
+            "added": get_result(1.0),
+        }
+    }
+    comparison = compare(base, new, threshold=0.1)
+    assert {row[0]: row[-1] for row in comparison} == {
+        "slower": "regression",
+        "noisy": "ok",
+        "faster": "improvement",
+        "same": "ok",
+        "removed": "removed",
+        "added": "added",
+    }
+    assert comparison[0][3] == pytest.approx(1.5)
+    assert "regression" in format_comparison(comparison)
+
+
+def test_measure_latency():
+    calls = []
+    latency = measure_latency(lambda: calls.append(1), num_calls=50, num_warmup=5)
+    assert len(calls) == 55
+    assert 0 < latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+
+
+def test_parse_importtime():
+    report = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |     numpy.core",
+            "import time:       200 |        300 |   numpy",
+            "import time:        50 |        350 | rllib",
+            "import time:        10 |         10 | rllib.agent",
+        ]
+    )
+    times = parse_importtime(report)
+    assert times["rllib"] == (350e-6, None)
+    assert times["numpy"] == (300e-6, "rllib")
+    assert times["numpy.core"] == (100e-6, "numpy")
+    assert slowest_imports(times, "rllib.agent") == [("numpy", 300e-6)]
+
+
+def test_measure_import_time():
+    total, times = measure_import_time("json", repeats=1)
+    assert total == times["json"][0] > 0
@@ -0,0 +1,89 @@
+"""Compare sequential and actor-learner training of off-policy agents.
+
+The sequential baseline alternates environment steps and gradient steps in one
+process, as `rollout_agent' does with `train_frequency=1'. The actor-learner runtime
+steps the environment in separate actor processes while the calling process learns.
+For each agent, the script reports the environment steps and gradient steps per
+second of both runtimes.
+"""
+import argparse
+import time
+
+from rllib.agent import DPGAgent, DQNAgent, MPOAgent, SACAgent, TD3Agent
+from rllib.environment import GymEnvironment
+from rllib.util.rollout import rollout_agent
+from rllib.util.training.actor_learner import train_agent_actor_learner
+
+AGENTS = {
+    "SAC": SACAgent,
+    "TD3": TD3Agent,
+    "DPG": DPGAgent,
+    "DQN": DQNAgent,
+    "MPO": MPOAgent,
+}
+
+
+def get_agent(args, agent_name):
+    """Get an agent and its environment."""
+    if agent_name == "DQN":
+        environment = GymEnvironment("CartPole-v0", args.seed)
+    else:
+        environment = GymEnvironment("VContinuous-CartPole-v0", args.seed)
+    agent = AGENTS[agent_name].default(
+        environment, num_iter=1, batch_size=args.batch_size
+    )
+    return agent, environment
+
+
+def main(args):
+    """Run the actor-learner benchmark."""
+    print(
+        "agent".ljust(8)
+        + "runtime".ljust(16)
+        + "env steps/s".ljust(14)
+        + "updates/s"
+    )
+    for agent_name in args.agents:
+        agent, environment = get_agent(args, agent_name)
+        agent.train()
+        start = time.time()
+        while agent.total_steps < args.num_env_steps:
+            rollout_agent(environment, agent, max_steps=args.max_steps)
+        elapsed_time = time.time() - start
+        print(
+            agent_name.ljust(8)
+            + "sequential".ljust(16)
+            + f"{agent.total_steps / elapsed_time:.0f}".ljust(14)
+            + f"{agent.train_steps / elapsed_time:.0f}"
+        )
+
+        agent, environment = get_agent(args, agent_name)
+        start = time.time()
+        train_agent_actor_learner(
+            agent,
+            environment,
+            num_env_steps=args.num_env_steps,
+            num_actors=args.num_actors,
+            max_policy_lag=args.max_policy_lag,
+            max_steps=args.max_steps,
+            seed=args.seed,
+        )
+        elapsed_time = time.time() - start
+        print(
+            agent_name.ljust(8)
+            + f"{args.num_actors} actors".ljust(16)
+            + f"{agent.total_steps / elapsed_time:.0f}".ljust(14)
+            + f"{agent.train_steps / elapsed_time:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--agents", nargs="+", default=list(AGENTS))
+    parser.add_argument("--num-env-steps", type=int, default=2000)
+    parser.add_argument("--num-actors", type=int, default=2)
+    parser.add_argument("--max-policy-lag", type=int, default=0)
+    parser.add_argument("--max-steps", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
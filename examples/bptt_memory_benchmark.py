@@ -0,0 +1,86 @@
+"""Compare memory and throughput of model rollouts for pathwise policy gradients.
+
+The dynamical model is a randomly initialized neural network. For each horizon, the
+script computes the pathwise gradient of the model-based value of a policy, as in
+BPTT, storing all activations, checkpointing segments of the simulation, and
+checkpointing with a truncated gradient window. It reports the simulated
+transitions per second of the forward pass, the time of the gradient computation,
+and the memory of the activations kept for the backward pass.
+"""
+import argparse
+import time
+
+import torch
+
+from rllib.model import NNModel
+from rllib.policy import NNPolicy
+from rllib.reward.quadratic_reward import QuadraticReward
+from rllib.value_function import NNValueFunction
+from rllib.value_function.model_based_q_function import ModelBasedQFunction
+
+
+def get_q_function(args, num_model_steps, **kwargs):
+    """Get a model-based q function with a neural network dynamical model."""
+    torch.manual_seed(args.seed)
+    dim_state, dim_action = (args.dim_state,), (args.dim_action,)
+    return ModelBasedQFunction(
+        dynamical_model=NNModel(
+            dim_state=dim_state,
+            dim_action=dim_action,
+            layers=[args.hidden_size, args.hidden_size],
+        ),
+        reward_model=QuadraticReward(
+            torch.eye(args.dim_state), 0.1 * torch.eye(args.dim_action)
+        ),
+        num_model_steps=num_model_steps,
+        num_particles=args.num_particles,
+        policy=NNPolicy(dim_state=dim_state, dim_action=dim_action),
+        value_function=NNValueFunction(dim_state=dim_state),
+        gamma=0.99,
+        **kwargs,
+    )
+
+
+def main(args):
+    """Run the BPTT memory benchmark."""
+    state = torch.randn(args.batch_size, 1, args.dim_state)
+    action = torch.randn(args.batch_size, 1, args.dim_action)
+    print(
+        "horizon".ljust(10)
+        + "mode".ljust(14)
+        + "transitions/s".ljust(16)
+        + "time [s]".ljust(10)
+        + "saved activations [MB]"
+    )
+    for num_model_steps in args.horizon:
+        segment = int(num_model_steps ** 0.5)
+        modes = {
+            "full": {},
+            "checkpoint": dict(checkpoint_steps=segment),
+            "truncated": dict(checkpoint_steps=segment, truncation_steps=segment * 2),
+        }
+        for mode, kwargs in modes.items():
+            q_function = get_q_function(args, num_model_steps, **kwargs)
+            start = time.time()
+            q_function(state, action).mean().backward()
+            gradient_time = time.time() - start
+            info = q_function.simulator.info
+            print(
+                f"{num_model_steps}".ljust(10)
+                + mode.ljust(14)
+                + f"{info['sim_throughput']:.0f}".ljust(16)
+                + f"{gradient_time:.2f}".ljust(10)
+                + f"{info['sim_saved_memory']:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--horizon", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--dim-state", type=int, default=16)
+    parser.add_argument("--dim-action", type=int, default=4)
+    parser.add_argument("--hidden-size", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--num-particles", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
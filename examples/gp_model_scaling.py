@@ -0,0 +1,111 @@
+"""Compare the scaling of exact and variational GP dynamical models with data size.
+
+For each training set size the script times one type-II MLL step of `ExactGPModel'
+against one minibatch ELBO step of `VariationalGPModel' and the prediction on a batch
+of test points. It also reports the size of the largest kernel matrix each model
+builds, O(N^2) for the exact GP and O(batch m + m^2) for the variational GP.
+"""
+import argparse
+import time
+
+import torch
+
+from rllib.dataset.datatypes import Observation
+from rllib.model import ExactGPModel, VariationalGPModel
+from rllib.util.training.model_learning import (
+    train_exact_gp_type2mll_step,
+    train_variational_gp_step,
+)
+
+
+def get_data(num_data, dim_state, dim_action):
+    """Get synthetic transitions."""
+    state = torch.randn(num_data, dim_state)
+    action = torch.randn(num_data, dim_action)
+    next_state = torch.sin(state) + action.sum(-1, keepdim=True)
+    return state, action, next_state
+
+
+def timeit(function, repetitions):
+    """Get average wall time of a function in seconds."""
+    start = time.time()
+    for _ in range(repetitions):
+        function()
+    return (time.time() - start) / repetitions
+
+
+def main(args):
+    """Run the scaling benchmark."""
+    torch.manual_seed(args.seed)
+    test_state, test_action, _ = get_data(
+        args.test_size, args.dim_state, args.dim_action
+    )
+    print(
+        "num_data".ljust(10)
+        + "model".ljust(8)
+        + "train [s]".ljust(12)
+        + "predict [s]".ljust(14)
+        + "kernel [MB]"
+    )
+    for num_data in args.num_data:
+        state, action, next_state = get_data(num_data, args.dim_state, args.dim_action)
+        exact = ExactGPModel(state, action, next_state)
+        svgp = VariationalGPModel(
+            num_inducing_points=args.num_inducing_points,
+            dim_state=(args.dim_state,),
+            dim_action=(args.dim_action,),
+            num_data=num_data,
+        )
+        for model in [exact, svgp]:
+            optimizer = torch.optim.Adam(model.parameters(), lr=0.01)
+            if model is exact:
+                observation = Observation(
+                    state=state.unsqueeze(1),
+                    action=action.unsqueeze(1),
+                    next_state=next_state.unsqueeze(1),
+                )
+                kernel_size = num_data ** 2
+
+                def train():
+                    model.train()
+                    train_exact_gp_type2mll_step(model, observation, optimizer)
+
+            else:
+                idx = torch.randint(num_data, (args.batch_size,))
+                observation = Observation(
+                    state=state[idx], action=action[idx], next_state=next_state[idx]
+                )
+                kernel_size = args.batch_size * args.num_inducing_points
+                kernel_size += args.num_inducing_points ** 2
+
+                def train():
+                    model.train()
+                    train_variational_gp_step(model, observation, optimizer)
+
+            def predict():
+                model.eval()
+                with torch.no_grad():
+                    model(test_state, test_action)
+
+            train_time = timeit(train, args.repetitions)
+            predict_time = timeit(predict, args.repetitions)
+            print(
+                f"{num_data}".ljust(10)
+                + ("Exact" if model is exact else "SVGP").ljust(8)
+                + f"{train_time:.4f}".ljust(12)
+                + f"{predict_time:.4f}".ljust(14)
+                + f"{4 * kernel_size / 2 ** 20:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--num-data", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--num-inducing-points", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--test-size", type=int, default=256)
+    parser.add_argument("--dim-state", type=int, default=3)
+    parser.add_argument("--dim-action", type=int, default=1)
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,93 @@
+"""Compare memory and time of the gradient based MPC solver against horizon length.
+
+The dynamical model is a randomly initialized neural network. For each horizon, the
+script solves the MPC problem with and without checkpointing of the horizon
+segments and reports the solve time and the memory of the activations that the
+forward pass keeps for the backward pass of one gradient step. With checkpointing,
+the backward pass recomputes the activations of a single segment at a time.
+"""
+import argparse
+import time
+
+import torch
+
+from rllib.algorithms.mpc import GradientBasedSolver
+from rllib.model import NNModel
+from rllib.reward.quadratic_reward import QuadraticReward
+from rllib.util.neural_networks.utilities import DisableGradient
+
+
+def get_solver(args, num_model_steps, checkpoint):
+    """Get a gradient based solver with a neural network dynamical model."""
+    torch.manual_seed(args.seed)
+    dynamical_model = NNModel(
+        dim_state=(args.dim_state,),
+        dim_action=(args.dim_action,),
+        layers=[args.hidden_size, args.hidden_size],
+        deterministic=True,
+    )
+    return GradientBasedSolver(
+        dynamical_model=dynamical_model,
+        reward_model=QuadraticReward(
+            torch.eye(args.dim_state), 0.1 * torch.eye(args.dim_action)
+        ),
+        num_model_steps=num_model_steps,
+        num_iter=args.num_iter,
+        num_restarts=args.num_restarts,
+        checkpoint=checkpoint,
+    )
+
+
+def saved_memory(solver, state):
+    """Get the bytes of the tensors saved for the backward pass of the returns."""
+    solver.initialize_actions(state.shape[:-1])
+    actions = solver.get_candidate_action_sequence()
+    saved_bytes = [0]
+
+    def pack(tensor):
+        saved_bytes[0] += tensor.numel() * tensor.element_size()
+        return tensor
+
+    models = (solver.dynamical_model, solver.reward_model)
+    with DisableGradient(*models):
+        with torch.autograd.graph.saved_tensors_hooks(pack, lambda tensor: tensor):
+            returns = solver.evaluate_restarts(state, actions)
+        returns.sum().backward()
+    return saved_bytes[0]
+
+
+def main(args):
+    """Run the gradient based solver benchmark."""
+    state = torch.randn(args.dim_state)
+    get_solver(args, 1, False)(state)  # Warm up with a one step horizon.
+    print(
+        "horizon".ljust(10)
+        + "checkpoint".ljust(12)
+        + "time [s]".ljust(10)
+        + "saved activations [MB]"
+    )
+    for num_model_steps in args.horizon:
+        for checkpoint in [False, True]:
+            solver = get_solver(args, num_model_steps, checkpoint)
+            start = time.time()
+            solver(state)
+            solve_time = time.time() - start
+            memory = saved_memory(solver, state)
+            print(
+                f"{num_model_steps}".ljust(10)
+                + f"{checkpoint}".ljust(12)
+                + f"{solve_time:.2f}".ljust(10)
+                + f"{memory / 2 ** 20:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--horizon", type=int, nargs="+", default=[25, 50, 100, 200])
+    parser.add_argument("--dim-state", type=int, default=16)
+    parser.add_argument("--dim-action", type=int, default=4)
+    parser.add_argument("--hidden-size", type=int, default=256)
+    parser.add_argument("--num-restarts", type=int, default=256)
+    parser.add_argument("--num-iter", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,111 @@
+"""Compare the iLQR solver against CEM on smooth MPC problems.
+
+For a random linear system and for the cart-pole environment model, both with a
+quadratic reward, the script solves the MPC problem from several initial states and
+reports, averaged over the solves, the number of transitions evaluated by the
+dynamical model, the wall time, and the return of the planned action sequence.
+"""
+import argparse
+import copy
+import time
+
+import torch
+
+from rllib.algorithms.mpc import CEMShooting, ILQRSolver
+from rllib.environment import GymEnvironment
+from rllib.model import AbstractModel, LinearModel
+from rllib.model.environment_model import EnvironmentModel
+from rllib.reward.quadratic_reward import QuadraticReward
+
+
+class CountingModel(AbstractModel):
+    """Model wrapper that counts the transitions evaluated by the base model."""
+
+    def __init__(self, base_model):
+        super().__init__(
+            dim_state=base_model.dim_state,
+            dim_action=base_model.dim_action,
+            model_kind=base_model.model_kind,
+        )
+        self.base_model = base_model
+        self.num_evaluations = 0
+
+    def forward(self, state, action, next_state=None):
+        """Evaluate the base model and count the transitions."""
+        self.num_evaluations += state.shape[:-1].numel()
+        return self.base_model(state, action)
+
+
+def get_problems():
+    """Get the dynamical and reward models of each problem."""
+    a = torch.eye(4) + 0.1 * torch.randn(4, 4)
+    b = torch.randn(4, 2)
+    environment = GymEnvironment("VContinuous-CartPole-v0", 0)
+    environment.reset()
+    return {
+        "Linear": (
+            LinearModel(a, b),
+            QuadraticReward(torch.eye(4), 0.1 * torch.eye(2)),
+            0.1 * torch.randn(4),
+        ),
+        "CartPole": (
+            EnvironmentModel(copy.deepcopy(environment)),
+            QuadraticReward(torch.eye(4), 0.1 * torch.eye(1)),
+            torch.tensor([0.0, 0.0, 0.2, 0.0]),
+        ),
+    }
+
+
+def main(args):
+    """Run the iLQR benchmark."""
+    torch.manual_seed(args.seed)
+    solvers = {
+        "iLQR": lambda **kwargs: ILQRSolver(num_iter=args.ilqr_iter, **kwargs),
+        "CEM": lambda **kwargs: CEMShooting(
+            num_iter=args.cem_iter, num_particles=args.num_particles, **kwargs
+        ),
+    }
+    print(
+        "problem".ljust(12)
+        + "solver".ljust(8)
+        + "evaluations".ljust(14)
+        + "time [ms]".ljust(12)
+        + "return"
+    )
+    for problem, (dynamical_model, reward_model, state) in get_problems().items():
+        states = state + 0.05 * torch.randn(args.num_solves, state.shape[-1])
+        for solver_name, solver_fn in solvers.items():
+            model = CountingModel(dynamical_model)
+            solver = solver_fn(
+                dynamical_model=model,
+                reward_model=reward_model,
+                num_model_steps=args.horizon,
+            )
+            solve_time, returns = 0.0, 0.0
+            for state in states:
+                solver.reset()  # Solve from scratch.
+                start = time.time()
+                action_sequence = solver(state)
+                solve_time += time.time() - start
+                returns += solver.evaluate_action_sequence(
+                    action_sequence.unsqueeze(-2), state.unsqueeze(-2)
+                ).item()
+            num_evaluations = model.num_evaluations - args.horizon * args.num_solves
+            print(
+                problem.ljust(12)
+                + solver_name.ljust(8)
+                + f"{num_evaluations / args.num_solves:.0f}".ljust(14)
+                + f"{1000 * solve_time / args.num_solves:.1f}".ljust(12)
+                + f"{returns / args.num_solves:.4f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--horizon", type=int, default=20)
+    parser.add_argument("--num-solves", type=int, default=10)
+    parser.add_argument("--ilqr-iter", type=int, default=10)
+    parser.add_argument("--cem-iter", type=int, default=5)
+    parser.add_argument("--num-particles", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
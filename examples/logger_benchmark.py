@@ -0,0 +1,83 @@
+"""Compare the cost of logging with and without buffering.
+
+The script logs a few tensor and float values per step, as the agents do during
+training, and reports the time per update with tensorboard enabled for an
+unbuffered synchronous logger and for the default buffered asynchronous logger. It
+then reports the time to export and load the statistics as json and as columns.
+"""
+import argparse
+import os
+import time
+
+import torch
+
+from rllib.util.logger import Logger
+
+
+def log(logger, args):
+    """Log `num_steps' updates and return the time per update in microseconds."""
+    values = torch.randn(args.num_steps, 4)
+    start = time.time()
+    for step in range(args.num_steps):
+        logger.update(
+            critic_loss=values[step, 0],
+            policy_loss=values[step, 1],
+            td_error=values[step, 2:],
+            reward=1.0,
+        )
+        if step % args.episode_length == args.episode_length - 1:
+            logger.end_episode()
+    logger.wait()
+    return 1e6 * (time.time() - start) / args.num_steps
+
+
+def file_size(logger, filenames):
+    """Get the total size of the files in megabytes."""
+    return sum(os.path.getsize(f"{logger.log_dir}/{f}") for f in filenames) / 2 ** 20
+
+
+def main(args):
+    """Run the logger benchmark."""
+    unbuffered = Logger(
+        "logger_benchmark",
+        comment="unbuffered",
+        tensorboard=True,
+        flush_frequency=1,
+        asynchronous=False,
+    )
+    buffered = Logger("logger_benchmark", comment="buffered", tensorboard=True)
+    print(f"unbuffered update [us]: {log(unbuffered, args):.1f}")
+    print(f"buffered update [us]:   {log(buffered, args):.1f}")
+
+    exports = {
+        "json": (
+            buffered.export_to_json,
+            buffered.load_from_json,
+            ["statistics.json", "all.json"],
+        ),
+        "columnar": (
+            lambda: (buffered.export(), buffered.wait()),
+            buffered.load,
+            ["statistics.npz", "all.npz"],
+        ),
+    }
+    for name, (export, load, filenames) in exports.items():
+        start = time.time()
+        export()
+        export_time = time.time() - start
+        start = time.time()
+        load()
+        load_time = time.time() - start
+        print(
+            f"{name} export [s]: {export_time:.2f}, load [s]: {load_time:.2f}, "
+            f"size [MB]: {file_size(buffered, filenames):.1f}"
+        )
+    unbuffered.delete_directory()
+    buffered.delete_directory()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--num-steps", type=int, default=100000)
+    parser.add_argument("--episode-length", type=int, default=1000)
+    main(parser.parse_args())
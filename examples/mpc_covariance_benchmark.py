@@ -0,0 +1,110 @@
+"""Compare the covariance types of the shooting MPC solvers against action dimension.
+
+For each action dimension the script builds a random linear system with a quadratic
+reward and reports, for each covariance type, the time to sample the candidate
+action sequences and fit the elites, the time of a full solver call, the memory of
+the action distribution, and the return of the planned action sequence.
+"""
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from rllib.algorithms.mpc import CEMShooting, MPPIShooting, RandomShooting
+from rllib.model import LinearModel
+from rllib.reward.quadratic_reward import QuadraticReward
+
+SOLVERS = {
+    "CEM": CEMShooting,
+    "MPPI": MPPIShooting,
+    "RandomShooting": RandomShooting,
+}
+
+
+def get_solver(solver_cls, dim_action, covariance_type, args):
+    """Get a solver for a random stable linear system."""
+    dim_state = dim_action
+    a = torch.eye(dim_state) + 0.1 * torch.randn(dim_state, dim_state)
+    a = 0.99 * a / torch.linalg.eigvals(a).abs().max()
+    b = torch.randn(dim_state, dim_action) / np.sqrt(dim_action)
+    return solver_cls(
+        dynamical_model=LinearModel(a, b),
+        reward_model=QuadraticReward(torch.eye(dim_state), 0.1 * torch.eye(dim_action)),
+        num_model_steps=args.horizon,
+        num_particles=args.num_particles,
+        covariance_type=covariance_type,
+        rank=args.rank,
+    )
+
+
+def distribution_memory(solver):
+    """Get the number of bytes that the action distribution uses."""
+    tensors = [solver.mean, solver.covariance, solver.variance, solver.cov_factor]
+    return sum(t.element_size() * t.numel() for t in tensors if t is not None)
+
+
+def time_sample_and_fit(solver, num_repeats):
+    """Time sampling candidates and fitting the elites on the current distribution."""
+    num_elites = max(1, solver.num_particles // 10)
+    start = time.time()
+    for _ in range(num_repeats):
+        noise = solver.sample_noise(solver.num_particles)
+        elites = (solver.mean + noise[:num_elites]).permute(1, 0, 2)
+        solver.fit_elites(elites)
+    return (time.time() - start) / num_repeats
+
+
+def main(args):
+    """Run the covariance benchmark."""
+    print(
+        "solver".ljust(16)
+        + "dim".ljust(6)
+        + "covariance".ljust(12)
+        + "fit [ms]".ljust(10)
+        + "solve [ms]".ljust(12)
+        + "memory [kB]".ljust(13)
+        + "return"
+    )
+    for solver_name, solver_cls in SOLVERS.items():
+        for dim_action in args.dim_action:
+            for covariance_type in ["full", "diagonal", "lowrank"]:
+                torch.manual_seed(args.seed)  # Same system for every covariance.
+                solver = get_solver(solver_cls, dim_action, covariance_type, args)
+                state = torch.randn(dim_action)
+                row = solver_name.ljust(16) + f"{dim_action}".ljust(6)
+                row += covariance_type.ljust(12)
+                try:
+                    solver.initialize_actions(state.shape[:-1])
+                    fit_time = time_sample_and_fit(solver, args.num_repeats)
+                    solver.reset()
+
+                    start = time.time()
+                    with torch.no_grad():
+                        for _ in range(args.num_repeats):
+                            action_sequence = solver(state)
+                    solve_time = (time.time() - start) / args.num_repeats
+                except ValueError:  # Elite covariance is singular.
+                    print(row + "failed: singular covariance")
+                    continue
+                returns = solver.evaluate_action_sequence(
+                    action_sequence.unsqueeze(-2), state.unsqueeze(-2)
+                )
+                print(
+                    row
+                    + f"{1000 * fit_time:.2f}".ljust(10)
+                    + f"{1000 * solve_time:.2f}".ljust(12)
+                    + f"{distribution_memory(solver) / 1024:.1f}".ljust(13)
+                    + f"{returns.mean().item():.2f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--dim-action", type=int, nargs="+", default=[2, 8, 32, 128])
+    parser.add_argument("--horizon", type=int, default=10)
+    parser.add_argument("--num-particles", type=int, default=400)
+    parser.add_argument("--rank", type=int, default=2)
+    parser.add_argument("--num-repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
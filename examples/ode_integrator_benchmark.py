@@ -0,0 +1,97 @@
+"""Compare fixed-step integrators against scipy's RK45 on the ODE systems.
+
+For each system the script simulates a batch of random initial states under random
+constant actions. RK45 integrates the states one at a time with numpy, while the
+fixed-step integrators integrate the whole batch at once with torch. The script
+reports the simulated transitions per second and the maximum deviation from RK45.
+"""
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from rllib.environment.systems import CartPole, InvertedPendulum
+from rllib.environment.systems.cart1d import Cart1d
+from rllib.environment.systems.integrators import RK4, Euler, SemiImplicitEuler
+
+SYSTEMS = {
+    "InvertedPendulum": (lambda **kw: InvertedPendulum(1.0, 1.0, 0.1, **kw), [0]),
+    "CartPole": (lambda **kw: CartPole(1.0, 1.0, 1.0, **kw), [0, 1]),
+    "Cart1d": (lambda **kw: Cart1d(**kw), [0]),
+}
+
+
+def simulate_rk45(system, state, action, num_steps):
+    """Simulate each initial state sequentially with RK45."""
+    final_state = np.zeros_like(state)
+    for i in range(state.shape[0]):
+        system.reset(state[i])
+        for _ in range(num_steps):
+            system.step(action[i])
+        final_state[i] = system.state
+    return final_state
+
+
+def simulate_batch(system, state, action, num_steps):
+    """Simulate all initial states at once with a fixed-step integrator."""
+    system.reset(torch.tensor(state))
+    action = torch.tensor(action)
+    with torch.no_grad():
+        for _ in range(num_steps):
+            system.step(action)
+    return system.state.numpy()
+
+
+def main(args):
+    """Run the integrator benchmark."""
+    torch.set_default_dtype(torch.float64)
+    rng = np.random.RandomState(args.seed)
+    print(
+        "system".ljust(20) + "integrator".ljust(20) + "steps/s".ljust(14) + "max error"
+    )
+    for name, (system_fn, position_idx) in SYSTEMS.items():
+        system = system_fn(step_size=args.step_size)
+        state = 0.1 * rng.randn(args.batch_size, system.dim_state[0])
+        action = 0.1 * rng.randn(args.batch_size, system.dim_action[0])
+        num_transitions = args.batch_size * args.num_steps
+
+        start = time.time()
+        reference = simulate_rk45(system, state, action, args.num_steps)
+        rk45_time = time.time() - start
+        print(
+            name.ljust(20)
+            + "RK45".ljust(20)
+            + f"{num_transitions / rk45_time:.0f}".ljust(14)
+            + "-"
+        )
+
+        integrators = {
+            "Euler": Euler(num_substeps=args.num_substeps),
+            "SemiImplicitEuler": SemiImplicitEuler(
+                position_idx, num_substeps=args.num_substeps
+            ),
+            "RK4": RK4(num_substeps=args.num_substeps),
+        }
+        for integrator_name, integrator in integrators.items():
+            system = system_fn(step_size=args.step_size, integrator=integrator)
+            start = time.time()
+            final_state = simulate_batch(system, state, action, args.num_steps)
+            batch_time = time.time() - start
+            error = np.abs(final_state - reference).max()
+            print(
+                name.ljust(20)
+                + integrator_name.ljust(20)
+                + f"{num_transitions / batch_time:.0f}".ljust(14)
+                + f"{error:.2e}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--num-steps", type=int, default=100)
+    parser.add_argument("--num-substeps", type=int, default=1)
+    parser.add_argument("--step-size", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
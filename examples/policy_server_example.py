@@ -0,0 +1,100 @@
+"""Serve a policy to many concurrent environments with and without micro-batching.
+
+Each client interacts with its own copy of the environment and requests the actions
+to a policy server, either from a thread or from a process through a local socket.
+The script reports the environment steps per second, the distribution of the batch
+sizes and the time that the requests waited in the queue, first without batching
+(`max_batch_size=1') and then with micro-batches.
+"""
+import argparse
+import multiprocessing
+import threading
+import time
+
+import torch
+
+from rllib.environment import GymEnvironment
+from rllib.policy import NNPolicy
+from rllib.util.policy_server import PolicyClient, PolicyServer
+
+
+def run_client(act, environment_name, num_steps, seed):
+    """Interact with an environment, requesting the actions to the server."""
+    environment = GymEnvironment(environment_name, seed=seed)
+    state = environment.reset()
+    for _ in range(num_steps):
+        state, _, done, _ = environment.step(act(state))
+        if done:
+            state = environment.reset()
+
+
+def run_process_client(address, environment_name, num_steps, seed):
+    """Interact with an environment, requesting the actions through a socket."""
+    with PolicyClient(address) as client:
+        run_client(client.act, environment_name, num_steps, seed)
+
+
+def serve(policy, args, max_batch_size):
+    """Serve the policy to the clients and return the server and the elapsed time."""
+    server = PolicyServer(
+        policy, max_batch_size=max_batch_size, max_wait_time=args.max_wait_time
+    )
+    with server:
+        if args.processes:
+            address = server.serve()
+            context = multiprocessing.get_context("fork")
+            clients = [
+                context.Process(
+                    target=run_process_client,
+                    args=(address, args.environment, args.num_steps, seed),
+                )
+                for seed in range(args.num_clients)
+            ]
+        else:
+            clients = [
+                threading.Thread(
+                    target=run_client,
+                    args=(server.act, args.environment, args.num_steps, seed),
+                )
+                for seed in range(args.num_clients)
+            ]
+        start = time.time()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        elapsed = time.time() - start
+    return server, elapsed
+
+
+def main(args):
+    """Compare serving the policy without and with micro-batching."""
+    torch.set_num_threads(args.num_threads)
+    environment = GymEnvironment(args.environment)
+    policy = NNPolicy.default(environment, layers=[256, 256])
+    for max_batch_size in [1, args.max_batch_size]:
+        server, elapsed = serve(policy, args, max_batch_size)
+        statistics = server.statistics()
+        print(f"max_batch_size={max_batch_size}")
+        print(f"  env steps / s: {statistics['num_requests'] / elapsed:.0f}")
+        print(f"  mean batch size: {statistics['mean_batch_size']:.2f}")
+        print(f"  batch sizes: {statistics['batch_sizes']}")
+        print(
+            f"  queue time: p50 {1e3 * statistics['queue_time_p50']:.2f}ms, "
+            f"p99 {1e3 * statistics['queue_time_p99']:.2f}ms"
+        )
+        print(f"  forward time: {1e3 * statistics['forward_time']:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--environment", default="VContinuous-CartPole-v0")
+    parser.add_argument("--num-clients", type=int, default=16)
+    parser.add_argument("--num-steps", type=int, default=200)
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-time", type=float, default=1e-3)
+    parser.add_argument("--num-threads", type=int, default=1)
+    parser.add_argument(
+        "--processes", action="store_true", help="Run the clients in processes."
+    )
+    main(parser.parse_args())
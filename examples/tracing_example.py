@@ -0,0 +1,75 @@
+"""Trace where time goes while training an agent.
+
+The script first reports the overhead per call of a traced function, with the tracer
+disabled and enabled, against the undecorated function. It then trains an agent with
+the tracer disabled and enabled, reports both training times, prints the statistics
+of the spans and writes the Chrome trace to the log directory of the agent. Open it
+in `chrome://tracing' or https://ui.perfetto.dev.
+"""
+import argparse
+import time
+
+from rllib.agent import DPGAgent, DQNAgent, SACAgent
+from rllib.environment import GymEnvironment
+from rllib.util.rollout import rollout_agent
+from rllib.util.tracing import TRACER, traced
+
+AGENTS = {"SAC": SACAgent, "DPG": DPGAgent, "DQN": DQNAgent}
+
+
+def function(x):
+    """Do nothing."""
+    return x
+
+
+def call_overhead(num_calls):
+    """Get the overhead in nanoseconds per call of a traced function."""
+    traced_function = traced("function")(function)
+    times = {}
+    for name, f in [("undecorated", function), ("traced", traced_function)]:
+        start = time.perf_counter_ns()
+        for i in range(num_calls):
+            f(i)
+        times[name] = (time.perf_counter_ns() - start) / num_calls
+    return times["traced"] - times["undecorated"]
+
+
+def train(args):
+    """Train an agent and return it with the training time."""
+    if args.agent == "DQN":
+        environment = GymEnvironment("CartPole-v0", args.seed)
+    else:
+        environment = GymEnvironment("VContinuous-CartPole-v0", args.seed)
+    agent = AGENTS[args.agent].default(environment, num_iter=1, batch_size=32)
+    start = time.time()
+    rollout_agent(environment, agent, num_episodes=args.num_episodes, max_steps=200)
+    return agent, time.time() - start
+
+
+def main(args):
+    """Run the tracing example."""
+    print(f"disabled overhead [ns/call]: {call_overhead(args.num_calls):.0f}")
+    TRACER.enable()
+    print(f"enabled overhead [ns/call]:  {call_overhead(args.num_calls):.0f}")
+    TRACER.disable()
+    TRACER.reset()
+
+    agent, disabled_time = train(args)
+    agent.logger.delete_directory()
+    TRACER.enable(record_events=True)
+    agent, enabled_time = train(args)
+    TRACER.disable()
+    print(
+        f"training time [s]: {disabled_time:.2f} disabled, {enabled_time:.2f} enabled"
+    )
+    print(TRACER.summary())
+    print(f"Chrome trace written to {agent.logger.log_dir}/trace.json")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--agent", default="SAC", choices=list(AGENTS))
+    parser.add_argument("--num-episodes", type=int, default=5)
+    parser.add_argument("--num-calls", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
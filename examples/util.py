@@ -3,23 +3,12 @@ import importlib
 import os
 
 import yaml
-from gym.envs import registry
 
 from examples.experiment_parser import Experiment
 from rllib.environment import GymEnvironment
 from rllib.util.training.agent_training import evaluate_agent, train_agent
 from rllib.util.utilities import load_random_state, set_random_seed
 
-try:
-    from dm_control.suite import BENCHMARKING
-
-    from rllib.environment.dm_environment import DMSuiteEnvironment
-except Exception:  # dm_control not installed.
-    BENCHMARKING = []
-
-gym_envs = list(registry.env_specs.keys())
-dm_envs = [f"{env}/{task}" for (env, task) in BENCHMARKING]
-
 
 def parse_config_file(file_dir=None):
     """Parse configuration file."""
@@ -39,11 +28,14 @@ class EnvironmentBuilder:
 
     def create_environment(self):
         """Create environment."""
-        if self.name in gym_envs:
-            environment = GymEnvironment(self.name, seed=self.args.seed)
-        else:
+        if "/" in self.name:  # A DM-Suite environment, e.g., `cartpole/swingup'.
+            # dm_control is slow to import, hence it is imported only if needed.
+            from rllib.environment.dm_environment import DMSuiteEnvironment
+
             env_name, env_task = self.name.split("/")
             environment = DMSuiteEnvironment(env_name, env_task, seed=self.args.seed)
+        else:
+            environment = GymEnvironment(self.name, seed=self.args.seed)
         return environment
 
 
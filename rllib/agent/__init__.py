@@ -1,46 +1,49 @@
-from .abstract_agent import AbstractAgent
-from .bandit import GPUCBAgent
-from .fixed_policy_agent import FixedPolicyAgent
-from .model_based import (
-    BPTTAgent,
-    DataAugmentationAgent,
-    DerivedMBAgent,
-    DynaAgent,
-    FakeModelFreeAgent,
-    MBMPOAgent,
-    ModelBasedAgent,
-    MPCAgent,
-    MVEAgent,
-    STEVEAgent,
-    SVGAgent,
-)
-from .off_policy import (
-    DDQNAgent,
-    DPGAgent,
-    DQNAgent,
-    FittedValueEvaluationAgent,
-    ISERAgent,
-    MPOAgent,
-    QLearningAgent,
-    REPSAgent,
-    SACAgent,
-    SoftQLearningAgent,
-    SVG0Agent,
-    TD3Agent,
-    VMPOAgent,
-)
-from .on_policy import (
-    A2CAgent,
-    ActorCriticAgent,
-    ExpectedActorCriticAgent,
-    ExpectedSARSAAgent,
-    GAACAgent,
-    PPOAgent,
-    REINFORCEAgent,
-    SARSAAgent,
-    TRPOAgent,
-)
-from .random_agent import RandomAgent
+"""Agents that interact with environments and learn from their observations.
+
+The agents are imported on first use, see `rllib.util.lazy_import'.
+"""
+from rllib.util.lazy_import import lazy_attributes
+
+_AGENT_MODULES = {
+    "AbstractAgent": ".abstract_agent",
+    "GPUCBAgent": ".bandit",
+    "FixedPolicyAgent": ".fixed_policy_agent",
+    "BPTTAgent": ".model_based",
+    "DataAugmentationAgent": ".model_based",
+    "DerivedMBAgent": ".model_based",
+    "DynaAgent": ".model_based",
+    "FakeModelFreeAgent": ".model_based",
+    "MBMPOAgent": ".model_based",
+    "ModelBasedAgent": ".model_based",
+    "MPCAgent": ".model_based",
+    "MVEAgent": ".model_based",
+    "STEVEAgent": ".model_based",
+    "SVGAgent": ".model_based",
+    "DDQNAgent": ".off_policy",
+    "DPGAgent": ".off_policy",
+    "DQNAgent": ".off_policy",
+    "FittedValueEvaluationAgent": ".off_policy",
+    "ISERAgent": ".off_policy",
+    "MPOAgent": ".off_policy",
+    "QLearningAgent": ".off_policy",
+    "REPSAgent": ".off_policy",
+    "SACAgent": ".off_policy",
+    "SoftQLearningAgent": ".off_policy",
+    "SVG0Agent": ".off_policy",
+    "TD3Agent": ".off_policy",
+    "VMPOAgent": ".off_policy",
+    "A2CAgent": ".on_policy",
+    "ActorCriticAgent": ".on_policy",
+    "ExpectedActorCriticAgent": ".on_policy",
+    "ExpectedSARSAAgent": ".on_policy",
+    "GAACAgent": ".on_policy",
+    "PPOAgent": ".on_policy",
+    "REINFORCEAgent": ".on_policy",
+    "SARSAAgent": ".on_policy",
+    "TRPOAgent": ".on_policy",
+    "RandomAgent": ".random_agent",
+}
+__getattr__, __dir__ = lazy_attributes(__name__, _AGENT_MODULES)
 
 MODEL_FREE = [
     "A2C",
@@ -81,3 +84,5 @@ MODEL_BASED = [
 ]
 
 AGENTS = MODEL_FREE + MODEL_BASED
+
+__all__ = [*_AGENT_MODULES, "AGENTS", "MODEL_BASED", "MODEL_FREE"]
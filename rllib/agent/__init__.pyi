@@ -0,0 +1,49 @@
+from typing import List
+
+from .abstract_agent import AbstractAgent
+from .bandit import GPUCBAgent
+from .fixed_policy_agent import FixedPolicyAgent
+from .model_based import (
+    BPTTAgent,
+    DataAugmentationAgent,
+    DerivedMBAgent,
+    DynaAgent,
+    FakeModelFreeAgent,
+    MBMPOAgent,
+    ModelBasedAgent,
+    MPCAgent,
+    MVEAgent,
+    STEVEAgent,
+    SVGAgent,
+)
+from .off_policy import (
+    DDQNAgent,
+    DPGAgent,
+    DQNAgent,
+    FittedValueEvaluationAgent,
+    ISERAgent,
+    MPOAgent,
+    QLearningAgent,
+    REPSAgent,
+    SACAgent,
+    SoftQLearningAgent,
+    SVG0Agent,
+    TD3Agent,
+    VMPOAgent,
+)
+from .on_policy import (
+    A2CAgent,
+    ActorCriticAgent,
+    ExpectedActorCriticAgent,
+    ExpectedSARSAAgent,
+    GAACAgent,
+    PPOAgent,
+    REINFORCEAgent,
+    SARSAAgent,
+    TRPOAgent,
+)
+from .random_agent import RandomAgent
+
+MODEL_FREE: List[str]
+MODEL_BASED: List[str]
+AGENTS: List[str]
@@ -9,14 +9,20 @@ from torch.optim.optimizer import Optimizer
 from tqdm import tqdm
 
 from rllib.dataset.datatypes import Loss
-from rllib.dataset.utilities import average_dataclass
+from rllib.dataset.utilities import average_dataclass, stack_list_of_tuples
+from rllib.policy.inference_policy import InferencePolicy
 from rllib.policy.nn_policy import NNPolicy
+from rllib.util.checkpoint import Checkpointer, load_checkpoint
 from rllib.util.early_stopping import EarlyStopping
 from rllib.util.logger import Logger
 from rllib.util.neural_networks.utilities import DisableGradient
-from rllib.util.utilities import save_random_state, tensor_to_distribution
+from rllib.util.tracing import TRACER, count, span, traced
+from rllib.util.training.background_learner import BackgroundLearner
+from rllib.util.utilities import fill_behavior_statistics, tensor_to_distribution
 from rllib.value_function import NNQFunction
 
+NOT_SAVED = ("_pi", "background_learner", "inference_policies")
+
 
 class AbstractAgent(object, metaclass=ABCMeta):
     """Interface for agents that interact with an environment.
@@ -29,6 +35,28 @@ class AbstractAgent(object, metaclass=ABCMeta):
         initial exploratory steps.
     exploration_episodes: int, optional (default=0)
         initial exploratory episodes
+    checkpoint_frequency: int, optional (default=1)
+        Number of episodes between checkpoints. If zero, never checkpoint.
+    asynchronous_checkpoint: bool, optional (default=True)
+        Flag that indicates whether to write the checkpoints in a background thread.
+    background_learning: bool, optional (default=False)
+        Flag that indicates whether to learn in a background thread while the agent
+        interacts with the environment. Only the agents that submit their updates to
+        `_in_learner', such as the off-policy and model-based agents, learn in it.
+    deterministic_learning: bool, optional (default=False)
+        Flag that indicates whether the background learning waits for each update,
+        which makes the results equal to sequential learning.
+    max_pending_updates: int, optional (default=1)
+        Maximum number of updates that the background learner lags behind.
+    fast_inference: bool, optional (default=False)
+        Flag that indicates whether to act with the fast path of `InferencePolicy',
+        when the policy is a neural network policy. The action distribution `pi' is
+        then only built when it is read.
+    defer_statistics: bool, optional (default=False)
+        Flag that indicates whether the rollouts store the parameters of the action
+        distribution instead of evaluating its entropy and the log-probability of the
+        action at each step. The algorithms evaluate them for each batch, see
+        `fill_behavior_statistics'.
 
     Methods
     -------
@@ -64,6 +92,13 @@ class AbstractAgent(object, metaclass=ABCMeta):
         device="cpu",
         log_dir=None,
         name=None,
+        checkpoint_frequency=1,
+        asynchronous_checkpoint=True,
+        background_learning=False,
+        deterministic_learning=False,
+        max_pending_updates=1,
+        fast_inference=False,
+        defer_statistics=False,
         *args,
         **kwargs,
     ):
@@ -73,6 +108,11 @@ class AbstractAgent(object, metaclass=ABCMeta):
             tensorboard=tensorboard,
             comment=comment,
         )
+        self.checkpointer = Checkpointer(
+            self.logger.log_dir,
+            frequency=checkpoint_frequency,
+            asynchronous=asynchronous_checkpoint,
+        )
         self.early_stopping_algorithm = EarlyStopping(epsilon=early_stopping_epsilon)
 
         self.counters = {
@@ -104,6 +144,16 @@ class AbstractAgent(object, metaclass=ABCMeta):
         self.params = {}
         self.device = device
 
+        self.background_learning = background_learning
+        self.deterministic_learning = deterministic_learning
+        self.max_pending_updates = max_pending_updates
+        self.background_learner = None
+
+        self.fast_inference = fast_inference
+        self.inference_policies = {}
+        self._pi = None
+        self.defer_statistics = defer_statistics
+
     def set_policy(self, new_policy):
         """Set policy."""
         self.policy = new_policy
@@ -148,35 +198,65 @@ class AbstractAgent(object, metaclass=ABCMeta):
         )
         return str_
 
+    @traced("act")
     def act(self, state):
         """Ask the agent for an action to interact with the environment."""
-        if self.total_steps < self.exploration_steps or (
-            self.total_episodes < self.exploration_episodes
-        ):
-            policy = self.policy.random()
-        else:
-            if not isinstance(state, torch.Tensor):
-                state = torch.tensor(
-                    state, dtype=torch.get_default_dtype(), device=self.device
-                )
-            policy = self.policy(state)
-
-        self.pi = tensor_to_distribution(policy, **self.policy.dist_params)
-        if self.training:
-            action = self.pi.sample()
-        elif self.pi.has_enumerate_support:
-            action = torch.argmax(self.pi.probs)
-        else:
-            try:
-                action = self.pi.mean
-            except NotImplementedError:
-                action = self.pi.sample((100,)).mean(dim=0)
-
-        if not self.policy.discrete_action:
-            action = action.clamp(-1.0, 1.0)
-            action = self.policy.action_scale * action
+        with self._acting_policy() as acting_policy:
+            inference_policy = self._inference_policy(acting_policy)
+            if self.total_steps < self.exploration_steps or (
+                self.total_episodes < self.exploration_episodes
+            ):
+                policy = acting_policy.random()
+            elif inference_policy is not None:
+                self.pi = inference_policy  # the distribution is built when read.
+                return inference_policy(state, sample=self.training)
+            else:
+                if not isinstance(state, torch.Tensor):
+                    state = torch.tensor(
+                        state, dtype=torch.get_default_dtype(), device=self.device
+                    )
+                policy = acting_policy(state)
+
+            self.pi = tensor_to_distribution(policy, **acting_policy.dist_params)
+            if self.training:
+                action = self.pi.sample()
+            elif self.pi.has_enumerate_support:
+                action = torch.argmax(self.pi.probs)
+            else:
+                try:
+                    action = self.pi.mean
+                except NotImplementedError:
+                    action = self.pi.sample((100,)).mean(dim=0)
+
+            if not acting_policy.discrete_action:
+                action = action.clamp(-1.0, 1.0)
+                action = acting_policy.action_scale * action
         return action.detach().to("cpu").numpy()
 
+    @property
+    def pi(self):
+        """Return the action distribution of the last call to `act'."""
+        if isinstance(self._pi, InferencePolicy):
+            self._pi = self._pi.distribution()
+        return self._pi
+
+    @pi.setter
+    def pi(self, pi):
+        """Set the action distribution, or the inference policy that computes it."""
+        self._pi = pi
+
+    def _inference_policy(self, policy):
+        """Return the inference fast path of a policy, or None if it has none."""
+        if not self.fast_inference:
+            return None
+        if policy not in self.inference_policies:
+            if isinstance(policy, NNPolicy):
+                self.inference_policies[policy] = InferencePolicy(policy)
+            else:
+                self.inference_policies[policy] = None
+        return self.inference_policies[policy]
+
+    @traced("observe")
     def observe(self, observation):
         """Observe transition from the environment.
 
@@ -186,26 +266,31 @@ class AbstractAgent(object, metaclass=ABCMeta):
 
         """
         if self.training:
-            self.policy.update()  # update policy parameters (eps-greedy.)
+            for policy in self._policies():
+                policy.update()  # update policy parameters (eps-greedy.)
             self.counters["total_steps"] += 1
             self.episode_steps[-1] += 1
-        for i, reward in enumerate(observation.reward):
-            self.logger.update(**{f"reward-{i}": reward.item()})
-        self.logger.update(entropy=observation.entropy.item())
+        rewards = observation.reward.reshape(-1).tolist()
+        self.logger.update(
+            **{f"reward-{i}": reward for i, reward in enumerate(rewards)}
+        )
+        if not self.defer_statistics:  # Else, log it at the end of the episode.
+            self.logger.update(entropy=observation.entropy.item())
 
         self.last_trajectory.append(observation)
-        observation.to(self.device)
 
     def start_episode(self):
         """Start a new episode."""
-        self.policy.reset()
+        for policy in self._policies():
+            policy.reset()
         self.last_trajectory = []
 
         self.episode_steps.append(0)
 
     def set_goal(self, goal):
         """Set goal."""
-        self.policy.set_goal(goal)
+        for policy in self._policies():
+            policy.set_goal(goal)
 
     def end_episode(self):
         """End an episode."""
@@ -215,10 +300,16 @@ class AbstractAgent(object, metaclass=ABCMeta):
         else:
             self.counters["eval_episodes"] += 1
 
+        if self.defer_statistics and len(self.last_trajectory):
+            trajectory = fill_behavior_statistics(
+                stack_list_of_tuples(self.last_trajectory), self.policy
+            )
+            self.logger.update(entropy=trajectory.entropy)
+
         best_return = -float("inf")
         end_episode_dict = {}
         for key in filter(
-            lambda x: x.startswith("reward") and "-" in x, self.logger.current.keys()
+            lambda x: x.startswith("reward") and "-" in x, list(self.logger.current)
         ):
             index = key.split("-")[1]
             rewards = self.logger.current[key]
@@ -234,19 +325,43 @@ class AbstractAgent(object, metaclass=ABCMeta):
         for index, reward in enumerate(torch.max(rewards, dim=0)[0]):
             end_episode_dict.update(**{f"max_reward-{index}": reward.detach().item()})
 
+        if TRACER.enabled:
+            end_episode_dict.update(TRACER.breakdown())
         self.logger.end_episode(**end_episode_dict)
 
-        # save checkpoint at every episode.
-        self.save_checkpoint()
-
-        if best_return >= max(
+        save_last = self.checkpointer.should_save(self.total_episodes)
+        save_best = best_return >= max(
             self.logger.get("train_return-0") + self.logger.get("eval_return-0")
-        ):  # logger.get() returns a list!
-            self.save("best.pkl")
+        )  # logger.get() returns a list!
+        self._in_learner(self._save_checkpoints, save_last, save_best)
+
+    def _save_checkpoints(self, save_last, save_best):
+        """Save the last and the best checkpoints."""
+        save_time = 0
+        if save_last:
+            self.save_checkpoint()
+            save_time += self.checkpointer.save_time
+
+        if save_best:
+            self.checkpointer.save("best.pkl", self._get_params())
+            save_time += self.checkpointer.save_time
+
+        # Checkpoint times are reported with the statistics of the next episode.
+        self.logger.update(
+            checkpoint_time=save_time,
+            checkpoint_write_time=self.checkpointer.write_time,
+        )
 
     def end_interaction(self):
         """End the interaction with the environment."""
-        pass
+        if self.background_learner is not None:  # finish pending learning.
+            self.background_learner.close()
+            self.background_learner = None
+            self.inference_policies = {}
+        self.checkpointer.wait()  # write pending checkpoints.
+        self.logger.wait()  # write pending statistics.
+        if TRACER.record_events:
+            TRACER.export_chrome_trace(f"{self.logger.log_dir}/trace.json")
 
     def learn(self, *args, **kwargs):
         """Train the agent."""
@@ -261,12 +376,55 @@ class AbstractAgent(object, metaclass=ABCMeta):
 
     def train(self, val=True):
         """Set the agent in training mode."""
+        if not val and self.background_learner is not None:
+            self.background_learner.wait()  # evaluate the latest policy.
         self.training = val
 
     def eval(self, val=True):
         """Set the agent in evaluation mode."""
         self.train(not val)
 
+    def _policies(self):
+        """Return the learned policy and the copies with which the agent acts."""
+        if self.background_learner is None:
+            return [self.policy]
+        return [self.policy] + self.background_learner.policies
+
+    def _update_dist_params(self, **kwargs):
+        """Update the distribution parameters of the policy and its acting copies.
+
+        The learned policy is updated first, so that the copies that the background
+        learner publishes meanwhile also have the new parameters.
+        """
+        for policy in self._policies():
+            policy.dist_params.update(**kwargs)
+
+    def _acting_policy(self):
+        """Return a context manager that yields the policy with which to act."""
+        if self.background_learner is None:
+            return contextlib.nullcontext(self.policy)
+        return self.background_learner.acting_policy()
+
+    def _in_learner(self, function, *args, update=False):
+        """Call a function in the background learner, if any.
+
+        Functions that change the policy must set `update', so that the background
+        learner publishes the new parameters to the acting policy. The background
+        learner starts with the first update.
+        """
+        if self.background_learning and update and self.background_learner is None:
+            self.background_learner = BackgroundLearner(
+                self.policy,
+                max_pending_updates=self.max_pending_updates,
+                deterministic=self.deterministic_learning,
+            )
+        if self.background_learner is None:
+            function(*args)
+        elif update:
+            self.background_learner.update(function, *args)
+        else:
+            self.background_learner.run(function, *args)
+
     def _learn_steps(self, closure):
         """Apply `num_iter' learn steps to closure function."""
         for _ in tqdm(range(self.num_iter), disable=not self._training_verbose):
@@ -275,17 +433,19 @@ class AbstractAgent(object, metaclass=ABCMeta):
             else:
                 cm = DisableGradient(self.policy)
 
-            with cm:
+            with cm, span("learn"):
                 losses = self.optimizer.step(closure=closure)  # type: Loss
 
             self.logger.update(**asdict(average_dataclass(losses)))
             self.logger.update(**self.algorithm.info())
 
             self.counters["train_steps"] += 1
+            count("gradient_steps")
             if self.train_steps % self.target_update_frequency == 0:
-                self.algorithm.update()
-                for param in self.params.values():
-                    param.update()
+                with span("target_update"):
+                    self.algorithm.update()
+                    for param in self.params.values():
+                        param.update()
 
             if self.early_stop(losses, **self.algorithm.info()):
                 break
@@ -345,10 +505,13 @@ class AbstractAgent(object, metaclass=ABCMeta):
         return self.__class__.__name__ if self._name is None else self._name
 
     def save_checkpoint(self):
-        """Save a checkpoint of the agent at the end of each episode."""
-        self.logger.export_to_json()
-        self.save("last.pkl")
-        save_random_state(self.logger.log_dir)
+        """Save a checkpoint of the agent and the random state.
+
+        The checkpoint is written incrementally by `self.checkpointer' to `last.pkl',
+        in the background if the checkpointer is asynchronous.
+        """
+        self.logger.export()
+        self.checkpointer.save("last.pkl", self._get_params(), random_state=True)
 
     def save(self, filename, directory=None):
         """Save agent.
@@ -365,16 +528,26 @@ class AbstractAgent(object, metaclass=ABCMeta):
         path: str.
             Path where agent is saved.
         """
+        if self.background_learner is not None:
+            self.background_learner.wait()
         if directory is None:
             directory = self.logger.log_dir
         path = f"{directory}/{filename}"
 
+        params = self._get_params()
+        for key, value in params.items():
+            if isinstance(value, nn.Module) or isinstance(value, Optimizer):
+                params[key] = value.state_dict()
+
+        torch.save(params, path)
+        return path
+
+    def _get_params(self):
+        """Get the agent attributes to save."""
         params = {}
         for key, value in self.__dict__.items():
-            if isinstance(value, Logger) or key == "pi":
+            if isinstance(value, (Logger, Checkpointer)) or key in NOT_SAVED:
                 continue
-            elif isinstance(value, nn.Module) or isinstance(value, Optimizer):
-                params[key] = value.state_dict()
             elif isinstance(value, AbstractAgent):
                 # abstract agents can't be pickled.
                 # if an agent has a sub-agent, then it should implement the saving.
@@ -383,9 +556,7 @@ class AbstractAgent(object, metaclass=ABCMeta):
                 continue
             else:
                 params[key] = value
-
-        torch.save(params, path)
-        return path
+        return params
 
     def load(self, path):
         """Load agent.
@@ -393,12 +564,16 @@ class AbstractAgent(object, metaclass=ABCMeta):
         Parameters
         ----------
         path: str.
-            Full path to agent.
+            Full path to agent, either saved with `save' or as a checkpoint.
         """
-        agent_dict = torch.load(path)
+        agent_dict = load_checkpoint(path)
+        if self.background_learner is not None:  # the acting copies are stale.
+            self.background_learner.close()
+            self.background_learner = None
+            self.inference_policies = {}
 
         for key, value in self.__dict__.items():
-            if isinstance(value, Logger) or key == "pi":
+            if isinstance(value, (Logger, Checkpointer)) or key in NOT_SAVED:
                 continue
             elif isinstance(value, AbstractAgent):
                 # abstract agents can't be saved as a dict.
@@ -1,5 +1,15 @@
 from abc import ABCMeta
-from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from torch import Tensor
 from torch.distributions import Distribution
@@ -8,11 +18,13 @@ from torch.optim.optimizer import Optimizer
 from rllib.algorithms.abstract_algorithm import AbstractAlgorithm
 from rllib.dataset.datatypes import Action, Loss, Observation, State
 from rllib.environment import AbstractEnvironment
-from rllib.policy import AbstractPolicy
+from rllib.policy import AbstractPolicy, InferencePolicy
 from rllib.value_function.abstract_value_function import AbstractQFunction
+from rllib.util.checkpoint import Checkpointer
 from rllib.util.early_stopping import EarlyStopping
 from rllib.util.logger import Logger
 from rllib.util.parameter_decay import ParameterDecay
+from rllib.util.training.background_learner import BackgroundLearner
 
 T = TypeVar("T", bound="AbstractAgent")
 
@@ -20,10 +32,14 @@ class AbstractAgent(object, metaclass=ABCMeta):
     policy: AbstractPolicy
     algorithm: AbstractAlgorithm
     optimizer: Optimizer
-    pi: Distribution
+    _pi: Optional[Union[Distribution, InferencePolicy]]
+    fast_inference: bool
+    defer_statistics: bool
+    inference_policies: Dict[AbstractPolicy, Optional[InferencePolicy]]
     counters: Dict[str, int]
     episode_steps: List[int]
     logger: Logger
+    checkpointer: Checkpointer
     early_stopping_algorithm: EarlyStopping
     gamma: float
     exploration_steps: int
@@ -36,6 +52,10 @@ class AbstractAgent(object, metaclass=ABCMeta):
     target_update_frequency: int
     clip_gradient_val: float
     device: str
+    background_learning: bool
+    deterministic_learning: bool
+    max_pending_updates: int
+    background_learner: Optional[BackgroundLearner]
 
     training: bool
     _training_verbose: bool
@@ -62,6 +82,13 @@ class AbstractAgent(object, metaclass=ABCMeta):
         device: str = ...,
         log_dir: Optional[str] = ...,
         name: Optional[str] = ...,
+        checkpoint_frequency: int = ...,
+        asynchronous_checkpoint: bool = ...,
+        background_learning: bool = ...,
+        deterministic_learning: bool = ...,
+        max_pending_updates: int = ...,
+        fast_inference: bool = ...,
+        defer_statistics: bool = ...,
         *args: Any,
         **kwargs: Any,
     ) -> None: ...
@@ -70,9 +97,17 @@ class AbstractAgent(object, metaclass=ABCMeta):
         cls: Type[T], environment: AbstractEnvironment, *args: Any, **kwargs: Any
     ) -> T: ...
     def act(self, state: State) -> Action: ...
+    @property
+    def pi(self) -> Distribution: ...
+    @pi.setter
+    def pi(self, pi: Union[Distribution, InferencePolicy]) -> None: ...
+    def _inference_policy(
+        self, policy: AbstractPolicy
+    ) -> Optional[InferencePolicy]: ...
     def observe(self, observation: Observation) -> None: ...
     def start_episode(self) -> None: ...
     def end_episode(self) -> None: ...
+    def _save_checkpoints(self, save_last: bool, save_best: bool) -> None: ...
     def end_interaction(self) -> None: ...
     def set_goal(self, goal: Optional[Tensor]) -> None: ...
     def set_policy(self, new_policy: AbstractPolicy) -> None: ...
@@ -80,6 +115,12 @@ class AbstractAgent(object, metaclass=ABCMeta):
     def early_stop(self, losses: Loss, **kwargs: Any) -> bool: ...
     def train(self, val: bool = True) -> None: ...
     def eval(self, val: bool = True) -> None: ...
+    def _policies(self) -> List[AbstractPolicy]: ...
+    def _update_dist_params(self, **kwargs: Any) -> None: ...
+    def _acting_policy(self) -> ContextManager[AbstractPolicy]: ...
+    def _in_learner(
+        self, function: Callable, *args: Any, update: bool = ...
+    ) -> None: ...
     def _learn_steps(self, closure: Callable) -> Loss: ...
     @property
     def train_episodes(self) -> int: ...
@@ -99,6 +140,7 @@ class AbstractAgent(object, metaclass=ABCMeta):
     def name(self) -> str: ...
     def save_checkpoint(self) -> None: ...
     def save(self, filename: str, directory: Optional[str] = ...) -> str: ...
+    def _get_params(self) -> Dict[str, Any]: ...
     def load(self, path: str) -> None: ...
     @staticmethod
     def default_policy(environment) -> AbstractPolicy: ...
@@ -1,6 +1,7 @@
 """Python Script Template."""
 from importlib import import_module
 
+from rllib.dataset.experience_replay.utilities import MakeRaw
 from rllib.environment.fake_environment import FakeEnvironment
 from rllib.util.neural_networks.utilities import DisableGradient
 from rllib.util.training.agent_training import train_agent
@@ -49,9 +50,8 @@ class FakeModelFreeAgent(ModelBasedAgent):
         def sample_initial_states():
             """Get initial states to sample from."""
             # Samples from experience replay empirical distribution.
-            obs, *_ = self.memory.sample_batch(1)
-            for transform in self.memory.transformations:
-                obs = transform.inverse(obs)
+            with MakeRaw(self.memory):
+                obs, *_ = self.memory.sample_batch(1)
             initial_states = obs.state[:, 0, :]  # obs is an n-step return.
             return initial_states.squeeze(0)
 
@@ -14,11 +14,13 @@ from torch.optim import Adam
 from rllib.agent.abstract_agent import AbstractAgent
 from rllib.algorithms.model_learning_algorithm import ModelLearningAlgorithm
 from rllib.dataset.experience_replay import ExperienceReplay, StateExperienceReplay
+from rllib.dataset.experience_replay.utilities import MakeRaw
 from rllib.environment.fake_environment import FakeEnvironment
 from rllib.model import TransformedModel
 from rllib.policy.random_policy import RandomPolicy
 from rllib.util.neural_networks.utilities import DisableGradient
 from rllib.util.rollout import rollout_policy
+from rllib.util.tracing import span
 
 
 class ModelBasedAgent(AbstractAgent):
@@ -136,14 +138,17 @@ class ModelBasedAgent(AbstractAgent):
         """
         super().observe(observation)
         if self.training:
-            self.memory.append(observation)
-        if self.learn_model_at_observe:
+            self._in_learner(self.memory.append, observation)
+        learn_model = self.learn_model_at_observe
+        train = self.train_at_observe and self.algorithm is not None
+        if learn_model or train:
+            self._in_learner(self._learn_at_observe, learn_model, train, update=True)
+
+    def _learn_at_observe(self, learn_model, train):
+        """Learn the model and the policy after an observation."""
+        if learn_model:
             self.model_learning_algorithm.learn(self.logger)
-        if (
-            self.train_at_observe
-            and len(self.memory) > self.batch_size
-            and self.algorithm is not None
-        ):
+        if train and len(self.memory) > self.batch_size:
             self.learn()
 
     def start_episode(self):
@@ -151,7 +156,7 @@ class ModelBasedAgent(AbstractAgent):
         super().start_episode()
 
         if self.thompson_sampling:
-            self.dynamical_model.sample_posterior()
+            self._in_learner(self.dynamical_model.sample_posterior)
 
     def end_episode(self):
         """See `AbstractAgent.end_episode'.
@@ -161,20 +166,38 @@ class ModelBasedAgent(AbstractAgent):
 
         Then train the agent.
         """
-        self.initial_states_dataset.append(self.last_trajectory[0].state.unsqueeze(0))
-        if self.model_learning_algorithm is not None and self.training:
-            self.model_learning_algorithm.add_last_trajectory(self.last_trajectory)
-        if self.pretrain_model:
+        flags = (
+            self.pretrain_model,
+            self.learn_model_at_end_episode,
+            self.train_at_end_episode,
+            self.simulate,
+        )
+        self._in_learner(
+            self._learn_at_end_episode,
+            self.last_trajectory,
+            self.training,
+            *flags,
+            update=any(flags),
+        )
+        super().end_episode()
+
+    def _learn_at_end_episode(
+        self, trajectory, training, pretrain_model, learn_model, train, simulate
+    ):
+        """Add the trajectory to the datasets and learn the model and the policy."""
+        self.initial_states_dataset.append(trajectory[0].state.unsqueeze(0))
+        if self.model_learning_algorithm is not None and training:
+            self.model_learning_algorithm.add_last_trajectory(trajectory)
+        if pretrain_model:
             self.model_learning_algorithm.learn(
                 self.logger, max_iter=self.pre_train_iterations
             )
-        if self.learn_model_at_end_episode:
+        if learn_model:
             self.model_learning_algorithm.learn(self.logger)
-        if self.train_at_end_episode:
+        if train:
             self.learn()
-        if self.simulate:
+        if simulate:
             self.simulate_policy_on_model()
-        super().end_episode()
 
     def learn(self, memory=None):
         """Learn a policy with the model."""
@@ -188,11 +211,12 @@ class ModelBasedAgent(AbstractAgent):
                 observation, *_ = memory.sample_batch(self.batch_size)
             self.optimizer.zero_grad()
             losses = self.algorithm(observation.clone())
-            losses.combined_loss.mean().backward()
+            with span("backward"):
+                losses.combined_loss.mean().backward()
 
-            torch.nn.utils.clip_grad_norm_(
-                self.algorithm.parameters(), self.clip_gradient_val
-            )
+                torch.nn.utils.clip_grad_norm_(
+                    self.algorithm.parameters(), self.clip_gradient_val
+                )
             return losses
 
         with DisableGradient(
@@ -204,9 +228,8 @@ class ModelBasedAgent(AbstractAgent):
         """Get initial states to sample from."""
         # Samples from experience replay empirical distribution.
         if self.num_memory_samples > 0:
-            obs, *_ = self.memory.sample_batch(self.num_memory_samples)
-            for transform in self.memory.transformations:
-                obs = transform.inverse(obs)
+            with MakeRaw(self.memory):
+                obs, *_ = self.memory.sample_batch(self.num_memory_samples)
             initial_states = obs.state[:, 0, :]  # obs is an n-step return.
             return initial_states.squeeze(0)
         # Samples from empirical initial state distribution.
@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 import torch
 from torch.distributions import Distribution
@@ -6,6 +6,7 @@ from torch.distributions import Distribution
 from rllib.agent.abstract_agent import AbstractAgent
 from rllib.algorithms.abstract_algorithm import AbstractAlgorithm
 from rllib.algorithms.model_learning_algorithm import ModelLearningAlgorithm
+from rllib.dataset.datatypes import Observation
 from rllib.dataset.experience_replay import ExperienceReplay, StateExperienceReplay
 from rllib.model import AbstractModel
 from rllib.policy import AbstractPolicy
@@ -63,6 +64,16 @@ class ModelBasedAgent(AbstractAgent):
     def learn_model_at_end_episode(self) -> bool: ...
     @property
     def pretrain_model(self) -> bool: ...
+    def _learn_at_observe(self, learn_model: bool, train: bool) -> None: ...
+    def _learn_at_end_episode(
+        self,
+        trajectory: List[Observation],
+        training: bool,
+        pretrain_model: bool,
+        learn_model: bool,
+        train: bool,
+        simulate: bool,
+    ) -> None: ...
     def simulate_policy_on_model(self) -> None: ...
     def _sample_initial_states(self) -> torch.Tensor: ...
     @property
@@ -7,10 +7,29 @@ from .model_based_agent import ModelBasedAgent
 
 
 class MPCAgent(ModelBasedAgent):
-    """Implementation of an agent that runs an MPC policy."""
+    """Implementation of an agent that runs an MPC policy.
 
-    def __init__(self, mpc_solver, solver_frequency=1, *args, **kwargs):
-        policy = MPCPolicy(mpc_solver, solver_frequency=solver_frequency)
+    With `asynchronous=True' the policy plans in a background thread and acts within
+    `deadline' seconds, see `MPCPolicy'. The plan age, the solver iterations per step,
+    and the deadline misses are then logged at every step. The planner is parked at
+    the end of each episode and paused while the models are learned.
+    """
+
+    def __init__(
+        self,
+        mpc_solver,
+        solver_frequency=1,
+        asynchronous=False,
+        deadline=None,
+        *args,
+        **kwargs,
+    ):
+        policy = MPCPolicy(
+            mpc_solver,
+            solver_frequency=solver_frequency,
+            asynchronous=asynchronous,
+            deadline=deadline,
+        )
         super().__init__(
             policy=policy,
             simulation_frequency=0,
@@ -24,6 +43,33 @@ class MPCAgent(ModelBasedAgent):
             **kwargs,
         )
 
+    def act(self, state):
+        """See `AbstractAgent.act'."""
+        action = super().act(state)
+        if self.policy.asynchronous:
+            self.logger.update(**self.policy.info())
+        return action
+
+    def end_episode(self):
+        """See `AbstractAgent.end_episode'."""
+        self.policy.park()  # Do not plan for the last state of the episode.
+        super().end_episode()
+
+    def _learn_at_observe(self, *args):
+        """See `ModelBasedAgent._learn_at_observe'."""
+        with self.policy.paused():
+            super()._learn_at_observe(*args)
+
+    def _learn_at_end_episode(self, *args):
+        """See `ModelBasedAgent._learn_at_end_episode'."""
+        with self.policy.paused():
+            super()._learn_at_end_episode(*args)
+
+    def end_interaction(self):
+        """See `AbstractAgent.end_interaction'."""
+        self.policy.stop()
+        super().end_interaction()
+
     @classmethod
     def default(
         cls,
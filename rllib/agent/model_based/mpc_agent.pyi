@@ -1,10 +1,24 @@
-from typing import Any
+from typing import Any, Optional
 
 from rllib.algorithms.mpc.abstract_solver import MPCSolver
+from rllib.dataset.datatypes import Action, State
 
 from .model_based_agent import ModelBasedAgent
 
 class MPCAgent(ModelBasedAgent):
     """Implementation of an agent that runs an MPC policy."""
 
-    def __init__(self, mpc_solver: MPCSolver, *args: Any, **kwargs: Any) -> None: ...
+    def __init__(
+        self,
+        mpc_solver: MPCSolver,
+        solver_frequency: int = ...,
+        asynchronous: bool = ...,
+        deadline: Optional[float] = ...,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None: ...
+    def act(self, state: State) -> Action: ...
+    def end_episode(self) -> None: ...
+    def _learn_at_observe(self, *args: Any) -> None: ...
+    def _learn_at_end_episode(self, *args: Any) -> None: ...
+    def end_interaction(self) -> None: ...
@@ -70,14 +70,14 @@ class DPGAgent(OffPolicyAgent):
     def train(self, val=True):
         """Set the agent in training mode."""
         super().train(val)
-        self.policy.dist_params.update(add_noise=True)
+        self._update_dist_params(add_noise=True)
 
     def eval(self, val=True):
         """Set the agent in evaluation mode."""
         super().eval(val)
         # Set add_noise to false because tensor_to_distribution in the `act' method
         # will perturb the mean of the action distribution.
-        self.policy.dist_params.update(add_noise=False)
+        self._update_dist_params(add_noise=False)
 
     @classmethod
     def default(
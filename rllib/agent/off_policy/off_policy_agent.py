@@ -4,6 +4,7 @@ import torch
 
 from rllib.agent.abstract_agent import AbstractAgent
 from rllib.dataset.experience_replay import ExperienceReplay
+from rllib.util.tracing import span
 
 
 class OffPolicyAgent(AbstractAgent):
@@ -43,20 +44,30 @@ class OffPolicyAgent(AbstractAgent):
         """See `AbstractAgent.observe'."""
         super().observe(observation)  # this update total steps.
         if self.training:
-            self.memory.append(observation)
-        if self.train_at_observe and len(self.memory) >= self.batch_size:
-            self.learn()
+            self._in_learner(self.memory.append, observation)
+        if self.train_at_observe:
+            self._in_learner(self._learn_if_ready, update=True)
 
     def end_episode(self):
         """See `AbstractAgent.end_episode'."""
-        if self.train_at_end_episode and len(self.memory) >= self.batch_size:
-            self.learn()
+        if self.train_at_end_episode:
+            self._in_learner(self._learn_if_ready, update=True)
 
-        if len(self.memory) > 0 and self.training:  # Maybe learn() resets the memory.
-            self.memory.end_episode()
+        if self.training:
+            self._in_learner(self._end_memory_episode)
 
         super().end_episode()  # this update total episodes.
 
+    def _learn_if_ready(self):
+        """Learn if the memory has enough observations."""
+        if len(self.memory) >= self.batch_size:
+            self.learn()
+
+    def _end_memory_episode(self):
+        """End the episode of the memory."""
+        if len(self.memory) > 0:  # Maybe learn() resets the memory.
+            self.memory.end_episode()
+
     def learn(self):
         """Train the off-policy agent."""
         #
@@ -68,10 +79,11 @@ class OffPolicyAgent(AbstractAgent):
             self.optimizer.zero_grad()
             losses_ = self.algorithm(observation.clone())
             loss = (losses_.combined_loss * weight.detach()).mean()
-            loss.backward()
-            torch.nn.utils.clip_grad_norm_(
-                self.algorithm.parameters(), self.clip_gradient_val
-            )
+            with span("backward"):
+                loss.backward()
+                torch.nn.utils.clip_grad_norm_(
+                    self.algorithm.parameters(), self.clip_gradient_val
+                )
 
             # Update memory
             self.memory.update(idx, losses_.td_error.abs().detach())
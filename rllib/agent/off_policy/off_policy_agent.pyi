@@ -19,3 +19,5 @@ class OffPolicyAgent(AbstractAgent):
         *args: Any,
         **kwargs: Any,
     ) -> None: ...
+    def _learn_if_ready(self) -> None: ...
+    def _end_memory_episode(self) -> None: ...
@@ -3,6 +3,7 @@ import torch
 
 from rllib.agent.abstract_agent import AbstractAgent
 from rllib.dataset.utilities import stack_list_of_tuples
+from rllib.util.tracing import span
 
 
 class OnPolicyAgent(AbstractAgent):
@@ -44,11 +45,12 @@ class OnPolicyAgent(AbstractAgent):
             """Gradient calculation."""
             self.optimizer.zero_grad()
             losses = self.algorithm(trajectories)
-            losses.combined_loss.backward()
+            with span("backward"):
+                losses.combined_loss.backward()
 
-            torch.nn.utils.clip_grad_norm_(
-                self.algorithm.parameters(), self.clip_gradient_val
-            )
+                torch.nn.utils.clip_grad_norm_(
+                    self.algorithm.parameters(), self.clip_gradient_val
+                )
 
             return losses
 
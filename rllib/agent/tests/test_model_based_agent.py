@@ -1,13 +1,15 @@
 import copy
+import time
 
 import numpy as np
 import pytest
 import torch
 
 from rllib.agent import BPTTAgent, DynaAgent, MPCAgent, MVEAgent, STEVEAgent, SVGAgent
-from rllib.algorithms.mpc import CEMShooting, MPPIShooting, RandomShooting
+from rllib.algorithms.mpc import CEMShooting, ILQRSolver, MPPIShooting, RandomShooting
 from rllib.environment import GymEnvironment
 from rllib.model.environment_model import EnvironmentModel
+from rllib.policy import MPCPolicy
 from rllib.util.training.agent_training import evaluate_agent, train_agent
 
 MAX_STEPS = 25
@@ -134,7 +136,13 @@ class TestMPCAgent(object):
     def default_action(self, request):
         return request.param
 
-    def get_solver(self, solver_, warm_start_, num_cpu_, default_action_):
+    @pytest.fixture(params=["full", "diagonal", "lowrank"], scope="class")
+    def covariance_type(self, request):
+        return request.param
+
+    def get_solver(
+        self, solver_, warm_start_, num_cpu_, default_action_, covariance_type_="full"
+    ):
         if solver_ == "random_shooting":
             mpc_solver = RandomShooting(
                 dynamical_model=self.dynamical_model,
@@ -148,6 +156,7 @@ class TestMPCAgent(object):
                 warm_start=warm_start_,
                 default_action=default_action_,
                 num_cpu=num_cpu_,
+                covariance_type=covariance_type_,
             )
         elif solver_ == "cem_shooting":
             mpc_solver = CEMShooting(
@@ -163,6 +172,7 @@ class TestMPCAgent(object):
                 warm_start=warm_start_,
                 default_action=default_action_,
                 num_cpu=num_cpu_,
+                covariance_type=covariance_type_,
             )
         elif solver_ == "mppi_shooting":
             mpc_solver = MPPIShooting(
@@ -179,6 +189,7 @@ class TestMPCAgent(object):
                 warm_start=warm_start_,
                 default_action=default_action_,
                 num_cpu=num_cpu_,
+                covariance_type=covariance_type_,
             )
         else:
             raise NotImplementedError
@@ -211,3 +222,111 @@ class TestMPCAgent(object):
         self.init()
         mpc_solver = self.get_solver(solver, True, 1, default_action)
         self.run_agent(mpc_solver)
+
+    def test_mpc_covariance_type(self, solver, covariance_type):
+        self.init()
+        mpc_solver = self.get_solver(solver, True, 1, "mean", covariance_type)
+        self.run_agent(mpc_solver)
+
+    def test_mpc_fit_elites(self, covariance_type):
+        self.init()
+        mpc_solver = self.get_solver("cem_shooting", True, 1, "mean", covariance_type)
+        mpc_solver.dim_action, mpc_solver.rank = 3, 1
+        mpc_solver.initialize_actions(torch.Size([2]))
+
+        factor = torch.tensor([[2.0], [1.0], [0.0]])
+        covariance = factor @ factor.T + 0.1 * torch.eye(3)
+        mean = torch.tensor([0.5, -0.5, 0.0])
+        elites = mean + torch.randn(self.NUM_MODEL_STEPS, 2, 20000, 3) @ (
+            torch.linalg.cholesky(covariance).T
+        )
+        mpc_solver.fit_elites(elites)
+        torch.testing.assert_close(
+            mpc_solver.mean, mean.expand_as(mpc_solver.mean), atol=0.1, rtol=0
+        )
+
+        noise = mpc_solver.sample_noise(20000)
+        assert noise.shape == (20000, self.NUM_MODEL_STEPS, 2, 3)
+        noise_cov = torch.einsum("p...i,p...j->...ij", noise, noise) / 20000
+        if covariance_type == "diagonal":
+            covariance = torch.diag_embed(covariance.diagonal())
+        torch.testing.assert_close(
+            noise_cov, covariance.expand_as(noise_cov), atol=0.3, rtol=0
+        )
+
+    def test_mpc_ilqr(self, warm_start):
+        self.init()
+        mpc_solver = ILQRSolver(
+            dynamical_model=self.dynamical_model,
+            reward_model=self.reward_model,
+            num_model_steps=self.NUM_MODEL_STEPS,
+            num_iter=self.NUM_ITER,
+            warm_start=warm_start,
+        )
+        self.run_agent(mpc_solver)
+
+    def test_mpc_asynchronous(self, solver):
+        self.init()
+        mpc_solver = self.get_solver(solver, True, 1, "mean")
+        agent = MPCAgent(
+            mpc_solver=mpc_solver,
+            exploration_steps=0,
+            exploration_episodes=0,
+            asynchronous=True,
+        )
+        evaluate_agent(
+            agent,
+            environment=self.env,
+            num_episodes=1,
+            max_steps=self.MAX_ITER,
+            render=False,
+        )
+        assert agent.policy._planner is None  # Stopped by end_interaction.
+        assert agent.logger.get("plan_age") == [0]
+        assert agent.logger.get("deadline_miss") == [0]
+        assert agent.logger.get("plan_iterations")[0] >= mpc_solver.num_iter
+        agent.logger.delete_directory()  # Cleanup directory.
+
+    def test_mpc_deadline(self):
+        self.init()
+        mpc_solver = self.get_solver("cem_shooting", True, 1, "mean")
+        policy = MPCPolicy(mpc_solver, asynchronous=True, deadline=0.0)
+        state = torch.tensor(self.env.reset(), dtype=torch.get_default_dtype())
+
+        action, _ = policy(state)  # No plan is available yet.
+        assert policy.deadline_miss
+        assert policy.plan_age == self.NUM_MODEL_STEPS
+        torch.testing.assert_close(action, torch.zeros(1))
+
+        time.sleep(0.5)  # The planner refines the plan of the previous state.
+        policy.deadline = None
+        action, _ = policy(state)
+        assert not policy.deadline_miss
+        assert policy.plan_age == 0
+        assert action.shape == (1,)
+        policy.stop()
+
+    def test_mpc_park_and_pause(self):
+        self.init()
+        mpc_solver = self.get_solver("cem_shooting", True, 1, "mean")
+        policy = MPCPolicy(mpc_solver, asynchronous=True)
+        state = torch.tensor(self.env.reset(), dtype=torch.get_default_dtype())
+        policy(state)
+
+        # The planner keeps the model in eval mode.
+        self.dynamical_model.train()
+        time.sleep(0.1)
+        assert not self.dynamical_model.training
+
+        with policy.paused():
+            num_iterations = policy._num_iterations
+            time.sleep(0.1)
+            assert policy._num_iterations == num_iterations
+        policy(state)
+
+        policy.park()
+        num_iterations = policy._num_iterations
+        time.sleep(0.1)
+        assert policy._target is None
+        assert policy._num_iterations == num_iterations
+        policy.stop()
@@ -17,8 +17,10 @@ from rllib.util.neural_networks.utilities import (
     deep_copy_module,
     update_parameters,
 )
+from rllib.util.tracing import span, traced
 from rllib.util.utilities import (
     RewardTransformer,
+    fill_behavior_statistics,
     get_entropy_and_log_p,
     off_policy_weight,
     separated_kl,
@@ -362,6 +364,7 @@ class AbstractAlgorithm(nn.Module, metaclass=ABCMeta):
         )
         return entropy_loss + kl_loss
 
+    @traced("forward")
     def forward(self, observation):
         """Compute the losses.
 
@@ -385,9 +388,14 @@ class AbstractAlgorithm(nn.Module, metaclass=ABCMeta):
 
         loss = Loss()
         for trajectory in trajectories:
-            loss += self.actor_loss(trajectory)
-            loss += self.critic_loss(trajectory)
-            loss += self.regularization_loss(trajectory, len(trajectories))
+            if self.policy is not None:
+                trajectory = fill_behavior_statistics(trajectory, self.policy)
+            with span("actor_loss"):
+                loss += self.actor_loss(trajectory)
+            with span("critic_loss"):
+                loss += self.critic_loss(trajectory)
+            with span("regularization_loss"):
+                loss += self.regularization_loss(trajectory, len(trajectories))
 
         return loss / len(trajectories)
 
@@ -16,9 +16,17 @@ class BPTT(AbstractMBAlgorithm):
 
     Clavera, I., Fu, V., & Abbeel, P. (2020).
     Model-Augmented Actor-Critic: Backpropagating through Paths. ICLR.
+
+    Parameters
+    ----------
+    checkpoint_steps: int, optional.
+        Number of steps of the simulation segments that are recomputed in the
+        backward pass instead of stored. It bounds the memory of long simulations.
+    truncation_steps: int, optional.
+        Number of steps of the windows through which gradients are propagated.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, checkpoint_steps=None, truncation_steps=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         if self.num_model_steps > 0:
@@ -34,11 +42,16 @@ class BPTT(AbstractMBAlgorithm):
                 td_lambda=self.td_lambda,
                 reward_transformer=self.reward_transformer,
                 entropy_regularization=self.entropy_loss.eta.item(),
+                checkpoint_steps=checkpoint_steps,
+                truncation_steps=truncation_steps,
             )
 
     def actor_loss(self, observation):
         """Use the model to compute the gradient loss."""
-        return self.pathwise_loss(observation).reduce(self.criterion.reduction)
+        loss = self.pathwise_loss(observation).reduce(self.criterion.reduction)
+        if self.num_model_steps > 0:
+            self._info.update(**self.pathwise_loss.critic.simulator.info)
+        return loss
 
     def update(self):
         """Update algorithm parameters."""
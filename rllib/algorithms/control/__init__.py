@@ -1,2 +1,3 @@
 """Algorithms from Control."""
+from .gain_schedule import GainSchedule
 from .lqr import *
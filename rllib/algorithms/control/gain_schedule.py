@@ -0,0 +1,100 @@
+"""Gain-scheduled LQR controllers."""
+import torch
+import torch.nn as nn
+
+from .lqr import batch_dlqr
+
+
+class GainSchedule(nn.Module):
+    r"""Cache of LQR gains keyed by operating point.
+
+    The system is linearized at a batch of operating points (x_i, u_i) and the
+    resulting Riccati equations are solved in a single batched call. At a state x the
+    controller interpolates the affine control laws of the closest operating points,
+    ..math:: u(x) = \sum_i w_i(x) [u_i + K_i (x - x_i)],
+    with inverse-distance weights w_i over the `num_neighbors' closest states.
+
+    Parameters
+    ----------
+    system: ODESystem.
+        System with a `linearize_batch' method.
+    q: Tensor.
+        State cost matrix (semi-positive definite).
+    r: Tensor.
+        Input cost matrix (positive definite).
+    gamma: float, optional.
+        Discount factor.
+    num_neighbors: int, optional (default=1).
+        Number of operating points to interpolate.
+    """
+
+    def __init__(self, system, q, r, gamma=None, num_neighbors=1):
+        super().__init__()
+        self.system = system
+        self.gamma = gamma
+        self.num_neighbors = num_neighbors
+        dim_state, dim_action = q.shape[-1], r.shape[-1]
+
+        self.register_buffer("q", q)
+        self.register_buffer("r", r)
+        self.register_buffer("states", torch.zeros(0, dim_state))
+        self.register_buffer("actions", torch.zeros(0, dim_action))
+        self.register_buffer("gains", torch.zeros(0, dim_action, dim_state))
+
+    def __len__(self):
+        """Return the number of operating points in the cache."""
+        return self.states.shape[0]
+
+    def add_operating_points(self, state, action):
+        """Linearize and solve the LQR problem at the new operating points.
+
+        Operating points that are already in the cache are skipped.
+
+        Parameters
+        ----------
+        state: Tensor.
+            Tensor of dimension [B x dim_state].
+        action: Tensor.
+            Tensor of dimension [B x dim_action].
+        """
+        state_action = torch.cat((state, action), dim=-1)
+        cached = torch.cat((self.states, self.actions), dim=-1)
+        is_new = ~(state_action.unsqueeze(-2) == cached).all(-1).any(-1)
+        state, action = state[is_new], action[is_new]
+        if state.shape[0] == 0:
+            return
+
+        a, b = self.system.linearize_batch(state, action)
+        gain, _ = batch_dlqr(
+            a, b, self.q.to(a.dtype), self.r.to(a.dtype), gamma=self.gamma
+        )
+        self.states = torch.cat((self.states, state.to(self.states.dtype)))
+        self.actions = torch.cat((self.actions, action.to(self.actions.dtype)))
+        self.gains = torch.cat((self.gains, gain.to(self.gains.dtype)))
+
+    def _neighbors(self, state):
+        """Get the indexes and the normalized weights of the closest points."""
+        if len(self) == 0:
+            raise RuntimeError(
+                "The gain schedule has no operating points, call "
+                "`add_operating_points' first."
+            )
+        distance = torch.cdist(state.reshape(-1, state.shape[-1]), self.states)
+        distance = distance.reshape(*state.shape[:-1], -1)
+        num_neighbors = min(self.num_neighbors, len(self))
+        distance, idx = distance.topk(num_neighbors, dim=-1, largest=False)
+
+        weight = 1.0 / (distance + 1e-8)
+        return idx, weight / weight.sum(-1, keepdim=True)
+
+    def gain(self, state):
+        """Get the interpolated gain at a state."""
+        idx, weight = self._neighbors(state)
+        return (weight.unsqueeze(-1).unsqueeze(-1) * self.gains[idx]).sum(-3)
+
+    def forward(self, state):
+        """Get the gain-scheduled action at a state."""
+        idx, weight = self._neighbors(state)
+        deviation = (state.unsqueeze(-2) - self.states[idx]).unsqueeze(-1)
+        action = self.actions[idx] + (self.gains[idx] @ deviation).squeeze(-1)
+        return (weight.unsqueeze(-1) * action).sum(-2)
@@ -1,6 +1,7 @@
 """LQR algorithms."""
 import numpy as np
 import scipy
+import torch
 
 
 def dlqr(a, b, q, r, gamma=None):
@@ -37,3 +38,62 @@ def dlqr(a, b, q, r, gamma=None):
     gain = np.linalg.solve(b.T @ cost @ b + r, b.T @ cost @ a)
 
     return -gain, cost
+
+
+def batch_dlqr(a, b, q, r, gamma=None, max_iter=100, tol=1e-8):
+    """Solve a batch of discrete time lqr controllers in torch.
+
+    The discrete algebraic Riccati equations are solved with the structured doubling
+    algorithm (SDA), which converges quadratically and only uses batched solves and
+    matrix products.
+
+    Parameters
+    ----------
+    a: state transition matrices, Tensor of dimension [B x n x n].
+    b: input matrices, Tensor of dimension [B x n x m].
+    q: state cost matrices, Tensor of dimension [(B) x n x n].
+    r: input cost matrices, Tensor of dimension [(B) x m x m].
+    gamma: discount factor, optional.
+    max_iter: maximum number of doubling iterations.
+    tol: relative tolerance on the change of the cost term.
+
+    Returns
+    -------
+    K: Tensor
+        The controller gains so that u[k] = K @ x[k], of dimension [B x m x n].
+    P: Tensor
+        The cost terms of the quadratic value functions, of dimension [B x n x n].
+
+    References
+    ----------
+    Chu, E. W., Fan, H. Y., & Lin, W. W. (2005).
+    A structure-preserving doubling algorithm for continuous-time algebraic Riccati
+    equations. Linear algebra and its applications.
+    """
+    if gamma is not None:
+        a = a * np.sqrt(gamma)
+        r = r * (1 / gamma)
+    q, r = q.expand(*a.shape), r.expand(*a.shape[:-2], *r.shape[-2:])
+
+    eye = torch.eye(a.shape[-1], dtype=a.dtype, device=a.device).expand(*a.shape)
+    a_k = a
+    g_k = b @ torch.linalg.solve(r, b.transpose(-2, -1))
+    cost = q
+    for _ in range(max_iter):
+        w = eye + g_k @ cost
+        w_inv_a = torch.linalg.solve(w, a_k)
+        w_inv_g = torch.linalg.solve(w, g_k)
+
+        new_cost = cost + a_k.transpose(-2, -1) @ cost @ w_inv_a
+        g_k = g_k + a_k @ w_inv_g @ a_k.transpose(-2, -1)
+        a_k = a_k @ w_inv_a
+
+        delta = torch.linalg.norm(new_cost - cost, dim=(-2, -1))
+        cost = new_cost
+        if torch.all(delta <= tol * torch.linalg.norm(cost, dim=(-2, -1))):
+            break
+
+    cost = 0.5 * (cost + cost.transpose(-2, -1))
+    bt_cost = b.transpose(-2, -1) @ cost
+    gain = torch.linalg.solve(bt_cost @ b + r, bt_cost @ a)
+    return -gain, cost
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import torch
+import torch.testing
+
+from rllib.algorithms.control import GainSchedule, batch_dlqr, dlqr
+from rllib.environment.systems import CartPole, InvertedPendulum
+
+
+@pytest.fixture(params=[None, 0.9])
+def gamma(request):
+    return request.param
+
+
+@pytest.fixture(params=[InvertedPendulum(1, 1, 0.1), CartPole(1, 1, 0.5)])
+def system(request):
+    return request.param
+
+
+def test_linearize_batch(system):
+    torch.manual_seed(0)
+    state = 0.1 * torch.randn(4, system.dim_state[0])
+    action = 0.1 * torch.randn(4, system.dim_action[0])
+    a, b = system.linearize_batch(state, action)
+    assert a.shape == (4, system.dim_state[0], system.dim_state[0])
+    assert b.shape == (4, system.dim_state[0], system.dim_action[0])
+
+    for i in range(4):
+        linear_system = system.linearize(state[i].numpy(), action[i].numpy())
+        np.testing.assert_allclose(linear_system.a, a[i].numpy(), rtol=1e-5)
+        np.testing.assert_allclose(linear_system.b, b[i].numpy(), rtol=1e-5)
+
+
+def test_batch_dlqr(system, gamma):
+    torch.manual_seed(0)
+    state = 0.1 * torch.randn(8, system.dim_state[0], dtype=torch.float64)
+    action = torch.zeros(8, system.dim_action[0], dtype=torch.float64)
+    a, b = system.linearize_batch(state, action)
+    q = torch.eye(system.dim_state[0], dtype=torch.float64)
+    r = torch.eye(system.dim_action[0], dtype=torch.float64)
+
+    gain, cost = batch_dlqr(a, b, q, r, gamma=gamma)
+    for i in range(8):
+        gain_, cost_ = dlqr(a[i].numpy(), b[i].numpy(), q.numpy(), r.numpy(), gamma)
+        np.testing.assert_allclose(gain[i].numpy(), gain_, rtol=1e-4, atol=1e-6)
+        np.testing.assert_allclose(cost[i].numpy(), cost_, rtol=1e-4, atol=1e-6)
+
+
+def test_gain_schedule(system):
+    torch.manual_seed(0)
+    dim_state, dim_action = system.dim_state[0], system.dim_action[0]
+    state = 0.1 * torch.randn(16, dim_state)
+    action = torch.zeros(16, dim_action)
+    schedule = GainSchedule(
+        system, torch.eye(dim_state), torch.eye(dim_action), num_neighbors=2
+    )
+    schedule.add_operating_points(state, action)
+    schedule.add_operating_points(state[:4], action[:4])
+    assert len(schedule) == 16
+
+    # At the operating points, the schedule recovers the nominal action and gain.
+    torch.testing.assert_allclose(schedule(state), action, atol=1e-4, rtol=1e-4)
+    torch.testing.assert_allclose(
+        schedule.gain(state), schedule.gains, atol=1e-4, rtol=1e-4
+    )
+    assert schedule(torch.randn(3, 5, dim_state)).shape == (3, 5, dim_action)
+
+
+def test_empty_gain_schedule():
+    schedule = GainSchedule(InvertedPendulum(1, 1, 0.1), torch.eye(2), torch.eye(1))
+    with pytest.raises(RuntimeError):
+        schedule(torch.randn(2))
+    with pytest.raises(RuntimeError):
+        schedule.gain(torch.randn(2))
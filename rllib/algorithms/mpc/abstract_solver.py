@@ -4,11 +4,14 @@ from abc import ABCMeta, abstractmethod
 import numpy as np
 import torch
 import torch.nn as nn
+from torch.distributions import MultivariateNormal
 
 from rllib.dataset.utilities import stack_list_of_tuples
 from rllib.util.multi_objective_reduction import MeanMultiObjectiveReduction
 from rllib.util.neural_networks.utilities import repeat_along_dimension, to_torch
 from rllib.util.rollout import rollout_actions
+from rllib.util.tracing import traced
+from rllib.util.utilities import sample_mean_and_cov
 from rllib.util.value_estimation import discount_sum
 
 
@@ -42,6 +45,12 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
          Default action behavior.
     num_cpu: int, optional.
         Number of CPUs to run the solver.
+    covariance_type: str, optional (default="full").
+        Covariance of the action distribution at each time step. One of "full",
+        "diagonal", or "lowrank" (a rank `rank' matrix plus a diagonal). The last two
+        sample and fit the distribution without O(dim_action^3) factorizations.
+    rank: int, optional (default=1).
+        Rank of the "lowrank" covariance.
     """
 
     def __init__(
@@ -61,6 +70,8 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
         action_scale=1.0,
         num_cpu=1,
         multi_objective_reduction=MeanMultiObjectiveReduction(dim=-1),
+        covariance_type="full",
+        rank=1,
         *args,
         **kwargs,
     ):
@@ -85,11 +96,15 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
         self.dim_action = self.dynamical_model.dim_action[0]
         self.dim_reward = self.reward_model.dim_reward[0]
 
+        if covariance_type not in ["full", "diagonal", "lowrank"]:
+            raise NotImplementedError(f"{covariance_type} covariance not implemented.")
+        self.covariance_type = covariance_type
+        self.rank = rank
+
         self.mean = None
         self._scale = scale
-        self.covariance = (scale ** 2) * torch.eye(self.dim_action).repeat(
-            self.num_model_steps, 1, 1
-        )
+        self.covariance, self.variance, self.cov_factor = None, None, None
+        self.initialize_covariance(torch.Size())
         if isinstance(action_scale, np.ndarray):
             action_scale = to_torch(action_scale)
         elif not isinstance(action_scale, torch.Tensor):
@@ -103,6 +118,7 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
         self.num_cpu = num_cpu
         self.multi_objective_reduction = multi_objective_reduction
 
+    @traced("evaluate_action_sequence")
     def evaluate_action_sequence(self, action_sequence, state):
         """Evaluate action sequence by performing a rollout."""
         trajectory = stack_list_of_tuples(
@@ -123,6 +139,15 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
             returns = returns + self.gamma ** self.num_model_steps * terminal_reward
         return returns
 
+    def terminal_value(self, state):
+        """Get the discounted and reduced terminal reward of the final states."""
+        if not self.terminal_reward:
+            return torch.zeros(state.shape[:-1])
+        value = self.terminal_reward(state)
+        if value.dim() == state.dim():
+            value = self.multi_objective_reduction(value)
+        return self.gamma ** self.num_model_steps * value
+
     @abstractmethod
     def get_candidate_action_sequence(self):
         """Get candidate actions."""
@@ -153,10 +178,74 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
             self.mean = torch.cat((next_mean, final_action), dim=0)
         else:
             self.mean = torch.zeros(self.num_model_steps, *batch_shape, self.dim_action)
-        self.covariance = (self._scale ** 2) * torch.eye(self.dim_action).repeat(
-            self.num_model_steps, *batch_shape, 1, 1
-        )
+        self.initialize_covariance(batch_shape)
+
+    def initialize_covariance(self, batch_shape):
+        """Initialize the covariance of the action distribution to scale^2 I."""
+        shape = (self.num_model_steps, *batch_shape, self.dim_action)
+        variance = torch.full(shape, self._scale ** 2)
+        if self.covariance_type == "full":
+            self.covariance = torch.diag_embed(variance)
+        else:
+            self.variance = variance
+        if self.covariance_type == "lowrank":
+            self.cov_factor = torch.zeros(*shape, self.rank)
+
+    def sample_noise(self, num_samples):
+        """Sample zero-mean noise with the covariance of the action distribution.
+
+        Returns
+        -------
+        noise: Tensor.
+            Tensor of dimension [num_samples x H x *batch x dim_action].
+        """
+        if self.covariance_type == "full":
+            distribution = MultivariateNormal(
+                torch.zeros_like(self.mean), self.covariance
+            )
+            return distribution.sample((num_samples,))
+
+        noise = torch.randn(num_samples, *self.variance.shape) * self.variance.sqrt()
+        if self.covariance_type == "lowrank":
+            eps = torch.randn(num_samples, *self.variance.shape[:-1], self.rank, 1)
+            noise += (self.cov_factor @ eps).squeeze(-1)
+        return noise
 
+    def fit_elites(self, elite_actions, alpha=0.0):
+        """Fit the action distribution to the elite action sequences in-place.
+
+        The mean and covariance are low-pass filtered with coefficient alpha. For the
+        "lowrank" covariance, alpha filters the mean and the diagonal, and the low
+        rank factor is replaced by the principal directions of the elite actions.
+
+        Parameters
+        ----------
+        elite_actions: Tensor.
+            Tensor of dimension [H x *batch x num_elites x dim_action].
+        alpha: float, optional (default=0.).
+            Low pass filter coefficient.
+        """
+        if self.covariance_type == "full":
+            new_mean, new_cov = sample_mean_and_cov(elite_actions.transpose(-1, -2))
+            self.covariance.mul_(alpha).add_(new_cov, alpha=1 - alpha)
+        else:
+            new_mean = elite_actions.mean(-2)
+            deviation = elite_actions - new_mean.unsqueeze(-2)
+            new_variance = deviation.pow(2).mean(-2) + 1e-6  # Add some jitter.
+            if self.covariance_type == "lowrank":
+                num_elites = elite_actions.shape[-2]
+                _, sigma, vh = torch.linalg.svd(
+                    deviation / np.sqrt(num_elites), full_matrices=False
+                )
+                rank = min(self.rank, sigma.shape[-1])
+                factor = vh[..., :rank, :].transpose(-2, -1) * sigma[..., None, :rank]
+                self.cov_factor.zero_()
+                self.cov_factor[..., :rank] = factor
+                new_variance = (new_variance - factor.pow(2).sum(-1)).clamp_min(1e-6)
+            self.variance.mul_(alpha).add_(new_variance, alpha=1 - alpha)
+        self.mean.mul_(alpha).add_(new_mean, alpha=1 - alpha)
+
+    @traced("mpc_solve")
     def forward(self, state):
         """Return action that solves the MPC problem."""
         self.dynamical_model.eval()
@@ -165,15 +254,30 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
         state = repeat_along_dimension(state, number=self.num_particles, dim=-2)
 
         for _ in range(self.num_iter):
-            action_sequence = self.get_candidate_action_sequence()
-            returns = self.evaluate_action_sequence(action_sequence, state)
-            elite_actions = self.get_best_action(action_sequence, returns)
-            self.update_sequence_generation(elite_actions)
+            self.iterate(state)
 
+        return self.action_sequence
+
+    def iterate(self, state):
+        """Do one iteration of the solver.
+
+        Parameters
+        ----------
+        state: Tensor.
+            Initial state repeated along the particles, of dimension
+            [*batch x num_particles x dim_state].
+        """
+        action_sequence = self.get_candidate_action_sequence()
+        returns = self.evaluate_action_sequence(action_sequence, state)
+        elite_actions = self.get_best_action(action_sequence, returns)
+        self.update_sequence_generation(elite_actions)
+
+    @property
+    def action_sequence(self):
+        """Return the current solution of the MPC problem."""
         if self.clamp:
             return self.mean.clamp(-1.0, 1.0)
-
-        return self.mean
+        return self.mean.clone()  # The mean is updated in-place.
 
     def reset(self, warm_action=None):
         """Reset warm action."""
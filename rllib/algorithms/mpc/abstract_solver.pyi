@@ -25,7 +25,11 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
 
     mean: Optional[Tensor]
     _scale: float
-    covariance: Tensor
+    covariance: Optional[Tensor]
+    variance: Optional[Tensor]
+    cov_factor: Optional[Tensor]
+    covariance_type: str
+    rank: int
     multi_objective_reduction: AbstractMultiObjectiveReduction
     def __init__(
         self,
@@ -44,12 +48,15 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
         clamp: bool = ...,
         num_cpu: int = ...,
         multi_objective_reduction: AbstractMultiObjectiveReduction = ...,
+        covariance_type: str = ...,
+        rank: int = ...,
         *args: Any,
         **kwargs: Any,
     ) -> None: ...
     def evaluate_action_sequence(
         self, action_sequence: Tensor, state: Tensor
     ) -> Tensor: ...
+    def terminal_value(self, state: Tensor) -> Tensor: ...
     @abstractmethod
     def get_candidate_action_sequence(self) -> Tensor: ...
     @abstractmethod
@@ -57,5 +64,11 @@ class MPCSolver(nn.Module, metaclass=ABCMeta):
     @abstractmethod
     def update_sequence_generation(self, elite_actions: Tensor) -> None: ...
     def initialize_actions(self, batch_shape: torch.Size) -> None: ...
+    def initialize_covariance(self, batch_shape: torch.Size) -> None: ...
+    def sample_noise(self, num_samples: int) -> Tensor: ...
+    def fit_elites(self, elite_actions: Tensor, alpha: float = ...) -> None: ...
     def forward(self, *args: Tensor, **kwargs: Any) -> Tensor: ...
+    def iterate(self, state: Tensor) -> None: ...
+    @property
+    def action_sequence(self) -> Tensor: ...
     def reset(self, warm_action: Optional[Tensor] = ...) -> None: ...
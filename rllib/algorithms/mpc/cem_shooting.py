@@ -1,9 +1,6 @@
 """MPC Algorithms."""
 
 import torch
-from torch.distributions import MultivariateNormal
-
-from rllib.util.utilities import sample_mean_and_cov
 
 from .abstract_solver import MPCSolver
 
@@ -57,8 +54,7 @@ class CEMShooting(MPCSolver):
 
     def get_candidate_action_sequence(self):
         """Get candidate actions by sampling from a multivariate normal."""
-        action_distribution = MultivariateNormal(self.mean, self.covariance)
-        action_sequence = action_distribution.sample((self.num_particles,))
+        action_sequence = self.mean + self.sample_noise(self.num_particles)
         action_sequence = action_sequence.permute(
             tuple(torch.arange(1, action_sequence.dim() - 1)) + (0, -1)
         )
@@ -78,6 +74,4 @@ class CEMShooting(MPCSolver):
 
     def update_sequence_generation(self, elite_actions):
         """Update distribution by the empirical mean and covariance of best actions."""
-        new_mean, new_cov = sample_mean_and_cov(elite_actions.transpose(-1, -2))
-        self.mean = self.alpha * self.mean + (1 - self.alpha) * new_mean
-        self.covariance = self.alpha * self.covariance + (1 - self.alpha) * new_cov
+        self.fit_elites(elite_actions, alpha=self.alpha)
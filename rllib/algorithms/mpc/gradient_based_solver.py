@@ -1,35 +1,112 @@
 """A gradient based solver runs SGD on the action sequence."""
+import numpy as np
+import torch
 from torch.optim import Adam
+from torch.utils.checkpoint import checkpoint
 
-from rllib.dataset.utilities import stack_list_of_tuples
 from rllib.util.neural_networks.utilities import DisableGradient
-from rllib.util.rollout import rollout_actions
-from rllib.util.value_estimation import discount_sum
+from rllib.util.tracing import traced
+from rllib.util.utilities import sample_model
 
 from .abstract_solver import MPCSolver
 
 
 class GradientBasedSolver(MPCSolver):
-    """Gradient based MPC solver."""
+    """Gradient based MPC solver.
 
-    def __init__(self, num_iter=5, lr=1e-2, *args, **kwargs):
+    The solver optimizes `num_restarts' action sequences in parallel as a single
+    batched tensor with Adam. The first restart starts from the (warm-started) mean
+    and the others from the mean perturbed with Gaussian noise of standard deviation
+    `scale'. It returns, for each initial state, the best action sequence found.
+
+    With `checkpoint', the horizon is split into segments of ceil(sqrt(H)) steps and
+    only the states at the segment boundaries are kept for the backward pass, which
+    recomputes the activations of one segment at a time. Memory then grows as
+    O(sqrt(H)) instead of O(H), at the cost of an extra forward pass.
+
+    Parameters
+    ----------
+    num_iter: int, optional (default=5).
+        Number of gradient steps.
+    lr: float, optional (default=1e-2).
+        Learning rate of Adam.
+    num_restarts: int, optional (default=1).
+        Number of action sequences optimized in parallel.
+    checkpoint: bool, optional (default=False).
+        Flag that indicates whether to checkpoint the horizon segments.
+    """
+
+    def __init__(
+        self, num_iter=5, lr=1e-2, num_restarts=1, checkpoint=False, *args, **kwargs
+    ):
         super().__init__(num_iter=num_iter, *args, **kwargs)
         self.lr = lr
+        self.num_restarts = num_restarts
+        self.checkpoint = checkpoint
+        if checkpoint:
+            self.segment_length = int(np.ceil(np.sqrt(self.num_model_steps)))
+        else:
+            self.segment_length = self.num_model_steps
 
     def get_candidate_action_sequence(self):
-        """Get candidate action sequence."""
-        actions = self.mean.detach().clone()
-        actions.requires_grad = True
-        return actions
+        """Get the initial action sequence of each restart."""
+        mean = self.mean.unsqueeze(1)
+        noise = torch.randn(
+            self.num_model_steps, self.num_restarts - 1, *self.mean.shape[1:]
+        )
+        actions = torch.cat((mean, mean + self._scale * noise), dim=1)
+        return actions.detach().requires_grad_()
 
     def get_best_action(self, action_sequence, returns):
-        """Return action_sequence. Not implemented."""
-        return action_sequence
+        """Get the action sequence of the best restart.
+
+        Parameters
+        ----------
+        action_sequence: Tensor.
+            Tensor of dimension [H x num_restarts x *batch x dim_action].
+        returns: Tensor.
+            Tensor of dimension [num_restarts x *batch].
+        """
+        idx = returns.argmax(0)
+        idx = idx.reshape(1, 1, *idx.shape, 1).expand(
+            self.num_model_steps, 1, *action_sequence.shape[2:]
+        )
+        return action_sequence.gather(1, idx).squeeze(1)
+
+    def update_sequence_generation(self, elite_actions):
+        """Update the mean with the best action sequence."""
+        self.mean = elite_actions.detach()
 
-    def update_sequence_generation(self, elite_actions) -> None:
-        """Do Nothing. Not implemented."""
-        pass
+    def rollout_segment(self, state, actions, time_step):
+        """Get the final state and the discounted returns of a horizon segment."""
+        returns = 0.0
+        for action in actions:
+            action = self.action_scale * action
+            next_state = sample_model(self.dynamical_model, state, action)
+            reward = sample_model(self.reward_model, state, action, next_state)
+            reward = self.multi_objective_reduction(reward)
+            returns = returns + self.gamma ** time_step * reward
+            state, time_step = next_state, time_step + 1
+        return state, returns
 
+    def evaluate_restarts(self, state, actions):
+        """Evaluate action sequences of dimension [H x num_restarts x *batch x d]."""
+        if self.clamp:
+            actions = actions.clamp(-1.0, 1.0)
+        state = state.expand(self.num_restarts, *state.shape)
+        returns = 0.0
+        for start in range(0, self.num_model_steps, self.segment_length):
+            segment = actions[start : start + self.segment_length]
+            if self.checkpoint and torch.is_grad_enabled():
+                state, segment_returns = checkpoint(
+                    self.rollout_segment, state, segment, start, use_reentrant=False
+                )
+            else:
+                state, segment_returns = self.rollout_segment(state, segment, start)
+            returns = returns + segment_returns
+        return returns + self.terminal_value(state)
+
+    @traced("mpc_solve")
     def forward(self, state):
         """Compute SGD on actions estimation."""
         batch_shape = state.shape[:-1]
@@ -37,19 +114,25 @@ class GradientBasedSolver(MPCSolver):
 
         actions = self.get_candidate_action_sequence()
         optimizer = Adam([actions], lr=self.lr)
+        best_actions, best_returns = self.mean, torch.full(batch_shape, -np.inf)
+        models = (self.dynamical_model, self.reward_model, self.terminal_reward)
 
-        for i in range(self.num_iter):
-            optimizer.zero_grad()
-            with DisableGradient(self.dynamical_model, self.reward_model):
-                trajectory = rollout_actions(
-                    self.dynamical_model, self.reward_model, actions, state
-                )
+        # Models stay frozen in the backward pass, where checkpoints are recomputed.
+        with DisableGradient(*models):
+            for i in range(self.num_iter + 1):
+                with torch.set_grad_enabled(i < self.num_iter):
+                    returns = self.evaluate_restarts(state, actions)
+
+                candidate_returns = returns.detach().max(0)[0]
+                candidate = self.get_best_action(actions.detach(), returns.detach())
+                improved = (candidate_returns > best_returns).unsqueeze(-1)
+                best_actions = torch.where(improved, candidate, best_actions)
+                best_returns = torch.max(candidate_returns, best_returns)
 
-            returns = discount_sum(
-                stack_list_of_tuples(trajectory, dim=-2).reward, gamma=self.gamma
-            )
-            (-returns).sum().backward()
-            optimizer.step()
+                if i < self.num_iter:
+                    optimizer.zero_grad()
+                    (-returns).sum().backward()
+                    optimizer.step()
 
-        self.mean = actions.detach().clone()
-        return actions
+        self.update_sequence_generation(best_actions)
+        return self.action_sequence
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Tuple
 
 from torch import Tensor
 
@@ -8,7 +8,23 @@ class GradientBasedSolver(MPCSolver):
     """Gradient based MPC solver."""
 
     lr: float
-    def __init__(self, lr: float = ..., *args: Any, **kwargs: Any) -> None: ...
+    num_restarts: int
+    checkpoint: bool
+    segment_length: int
+    def __init__(
+        self,
+        num_iter: int = ...,
+        lr: float = ...,
+        num_restarts: int = ...,
+        checkpoint: bool = ...,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None: ...
     def get_candidate_action_sequence(self) -> Tensor: ...
     def get_best_action(self, action_sequence: Tensor, returns: Tensor) -> Tensor: ...
     def update_sequence_generation(self, elite_actions: Tensor) -> None: ...
+    def rollout_segment(
+        self, state: Tensor, actions: Tensor, time_step: int
+    ) -> Tuple[Tensor, Tensor]: ...
+    def evaluate_restarts(self, state: Tensor, actions: Tensor) -> Tensor: ...
+    def forward(self, state: Tensor) -> Tensor: ...
@@ -0,0 +1,330 @@
+"""Iterative LQR solver for MPC."""
+import warnings
+
+import torch
+
+from rllib.util.tracing import traced
+
+from .abstract_solver import MPCSolver
+
+
+def _jacobian(output, inputs, create_graph=False):
+    """Compute the Jacobian of output w.r.t. inputs for independent batch elements.
+
+    Parameters
+    ----------
+    output: Tensor.
+        Tensor of dimension [*batch x k] computed from inputs.
+    inputs: Tensor.
+        Tensor of dimension [*batch x d] that requires grad.
+    create_graph: bool, optional (default=False).
+        Flag that indicates whether to differentiate through the Jacobian.
+
+    Returns
+    -------
+    jacobian: Tensor.
+        Tensor of dimension [*batch x k x d].
+    """
+    rows = []
+    for i in range(output.shape[-1]):
+        grad = None
+        if output.requires_grad:
+            (grad,) = torch.autograd.grad(
+                output[..., i].sum(),
+                inputs,
+                retain_graph=True,
+                create_graph=create_graph,
+                allow_unused=True,
+            )
+        rows.append(torch.zeros_like(inputs) if grad is None else grad)
+    return torch.stack(rows, dim=-2)
+
+
+def _select(trajectory, index):
+    """Select the line search trajectory of each batch element.
+
+    Parameters
+    ----------
+    trajectory: Tensor.
+        Tensor of dimension [T x num_step_sizes x *batch x dim].
+    index: Tensor.
+        Long tensor of dimension [*batch].
+    """
+    index = index.reshape(1, 1, *index.shape, 1).expand(
+        trajectory.shape[0], 1, *trajectory.shape[2:]
+    )
+    return trajectory.gather(1, index).squeeze(1)
+
+
+class ILQRSolver(MPCSolver):
+    r"""Iterative LQR solver.
+
+    At each iteration, the solver linearizes the dynamical model and computes a
+    quadratic expansion of the reward model around the nominal trajectory, with one
+    batched evaluation of each model for the whole horizon. A backward Riccati pass
+    computes the affine control law
+        ..math :: u_t = \bar{u}_t + \alpha k_t + K_t (x_t - \bar{x}_t),
+    and a line search rolls out all step sizes alpha in parallel and keeps, for each
+    initial state, the one with the largest return.
+
+    Second order derivatives of the dynamics are neglected (as in iLQR, unlike DDP).
+    When `clamp' is set, the actions are clamped during the forward pass. The
+    termination model is ignored.
+
+    Parameters
+    ----------
+    num_iter: int, optional (default=10).
+        Maximum number of iterations.
+    regularization: float, optional (default=1e-6).
+        Minimum Levenberg-Marquardt regularization of the action Hessian, which must
+        be positive. It is increased for the initial states whose Hessian is not
+        positive definite or whose line search fails.
+    max_regularization: float, optional (default=1e10).
+        Maximum regularization. The initial states whose Hessian is not positive
+        definite with the maximum regularization, e.g., because the derivatives of
+        the models are not finite, keep their nominal action sequence.
+    step_sizes: tuple of float, optional.
+        Step sizes of the line search.
+    tolerance: float, optional (default=1e-6).
+        Relative improvement of the returns below which the solver stops.
+
+    References
+    ----------
+    Li, W., & Todorov, E. (2004).
+    Iterative linear quadratic regulator design for nonlinear biological movement
+    systems. ICINCO.
+
+    Tassa, Y., Erez, T., & Todorov, E. (2012).
+    Synthesis and stabilization of complex behaviors through online trajectory
+    optimization. IROS.
+    """
+
+    def __init__(
+        self,
+        num_iter=10,
+        regularization=1e-6,
+        max_regularization=1e10,
+        step_sizes=(1.0, 0.5, 0.25, 0.125, 0.0625),
+        tolerance=1e-6,
+        *args,
+        **kwargs,
+    ):
+        super().__init__(num_iter=num_iter, *args, **kwargs)
+        if not 0 < regularization <= max_regularization:
+            raise ValueError(
+                f"regularization must be in (0, {max_regularization}], "
+                f"got {regularization}."
+            )
+        self.regularization = regularization
+        self.max_regularization = max_regularization
+        self.step_sizes = torch.tensor((0.0,) + tuple(step_sizes))
+        self.tolerance = tolerance
+
+    def get_candidate_action_sequence(self):
+        """Get candidate action sequence."""
+        return self.mean
+
+    def get_best_action(self, action_sequence, returns):
+        """Return action_sequence."""
+        return action_sequence
+
+    def update_sequence_generation(self, elite_actions):
+        """Update the nominal action sequence."""
+        self.mean = elite_actions
+
+    def step(self, state, action):
+        """Get the next state and the reward of a transition."""
+        action = self.action_scale * action
+        next_state = self.dynamical_model(state, action)[0]
+        reward = self.reward_model(state, action, next_state)[0]
+        return next_state, self.multi_objective_reduction(reward)
+
+    def rollout(self, state, actions, nominal_states=None, k=None, gain=None):
+        """Roll out the (affine) control law from an initial state.
+
+        Parameters
+        ----------
+        state: Tensor.
+            Initial state of dimension [*batch x dim_state].
+        actions: Tensor.
+            Nominal actions of dimension [H x *batch x dim_action].
+        nominal_states: Tensor, optional.
+            Nominal states of dimension [H + 1 x *batch x dim_state].
+        k: Tensor, optional.
+            Scaled feed-forward terms of dimension [H x *batch x dim_action].
+        gain: Tensor, optional.
+            Feedback gains of dimension [H x *batch x dim_action x dim_state].
+
+        Returns
+        -------
+        states: Tensor.
+            States of dimension [H + 1 x *batch x dim_state].
+        actions: Tensor.
+            Actions of dimension [H x *batch x dim_action].
+        returns: Tensor.
+            Returns of dimension [*batch].
+        """
+        states, new_actions, returns = [state], [], 0.0
+        for t in range(self.num_model_steps):
+            action = actions[t]
+            if gain is not None:
+                deviation = (state - nominal_states[t]).unsqueeze(-1)
+                action = action + k[t] + (gain[t] @ deviation).squeeze(-1)
+            if self.clamp:
+                action = action.clamp(-1.0, 1.0)
+            state, reward = self.step(state, action)
+            returns = returns + self.gamma ** t * reward
+            states.append(state)
+            new_actions.append(action)
+        returns = returns + self.terminal_value(state)
+        return torch.stack(states), torch.stack(new_actions), returns
+
+    def quadratize(self, states, actions):
+        """Expand the dynamics to first order and the cost to second order.
+
+        The cost is the negative discounted reward. The expansion of all time steps
+        is computed with a single batched call to each model.
+
+        Returns
+        -------
+        f_z: Tensor.
+            Jacobians of the dynamics [H x *batch x dim_state x (dim_state + dim_a)].
+        l_z: Tensor.
+            Gradients of the cost [H x *batch x (dim_state + dim_a)].
+        l_zz: Tensor.
+            Hessians of the cost [H x *batch x (dim_state + dim_a) x (...)].
+        v_x: Tensor.
+            Gradient of the terminal cost [*batch x dim_state].
+        v_xx: Tensor.
+            Hessian of the terminal cost [*batch x dim_state x dim_state].
+        """
+        dim_state = states.shape[-1]
+        discount = self.gamma ** torch.arange(self.num_model_steps)
+        discount = discount.reshape(-1, *([1] * (actions.dim() - 1)))
+        with torch.enable_grad():
+            z = torch.cat((states[:-1], actions), dim=-1).detach().requires_grad_()
+            next_state, reward = self.step(z[..., :dim_state], z[..., dim_state:])
+            f_z = _jacobian(next_state, z)
+            l_z = -_jacobian(reward.unsqueeze(-1), z, create_graph=True)[..., 0, :]
+            l_zz = _jacobian(l_z, z)
+
+            x = states[-1].detach().requires_grad_()
+            value = self.terminal_value(x).unsqueeze(-1)
+            v_x = -_jacobian(value, x, create_graph=True)[..., 0, :]
+            v_xx = _jacobian(v_x, x)
+        return (
+            f_z.detach(),
+            discount * l_z.detach(),
+            discount.unsqueeze(-1) * l_zz,
+            v_x.detach(),
+            v_xx,
+        )
+
+    def backward_pass(self, f_z, l_z, l_zz, v_x, v_xx, mu):
+        """Compute the control law with a backward Riccati recursion.
+
+        The Hessian of the cost w.r.t. the action is regularized with mu, which is
+        increased where it is not positive definite and the recursion restarts. The
+        batch elements that fail with the maximum regularization get zero feed-forward
+        terms and gains, i.e., they keep the nominal actions.
+
+        Returns
+        -------
+        k: Tensor.
+            Feed-forward terms of dimension [H x *batch x dim_action].
+        gain: Tensor.
+            Feedback gains of dimension [H x *batch x dim_action x dim_state].
+        mu: Tensor.
+            Regularization of dimension [*batch] used in the recursion.
+        """
+        dim_state = v_x.shape[-1]
+        eye = torch.eye(self.dim_action)
+        terminal_v_x, terminal_v_xx = v_x, v_xx
+        given_up = torch.zeros(mu.shape, dtype=torch.bool)
+        while True:
+            v_x, v_xx, ks, gains = terminal_v_x, terminal_v_xx, [], []
+            failed = torch.zeros(mu.shape, dtype=torch.bool)
+            for t in reversed(range(self.num_model_steps)):
+                f_zt = f_z[t]
+                q_z = l_z[t] + (f_zt.transpose(-2, -1) @ v_x.unsqueeze(-1)).squeeze(-1)
+                q_zz = l_zz[t] + f_zt.transpose(-2, -1) @ v_xx @ f_zt
+                q_x, q_u = q_z[..., :dim_state], q_z[..., dim_state:]
+                q_xx = q_zz[..., :dim_state, :dim_state]
+                q_ux = q_zz[..., dim_state:, :dim_state]
+                q_uu = q_zz[..., dim_state:, dim_state:]
+
+                chol, info = torch.linalg.cholesky_ex(q_uu + mu[..., None, None] * eye)
+                k_gain = -torch.cholesky_solve(
+                    torch.cat((q_u[..., None], q_ux), -1), chol
+                )
+                finite = torch.isfinite(k_gain).flatten(-2).all(-1)
+                failed |= ((info > 0) | ~finite) & ~given_up
+                if failed.any():
+                    break
+                k_gain = torch.where(given_up[..., None, None], 0.0, k_gain)
+                k, gain = k_gain[..., 0], k_gain[..., 1:]
+
+                gain_t = gain.transpose(-2, -1)
+                q_ux_t = q_ux.transpose(-2, -1)
+                v_x = q_x + (gain_t @ (q_uu @ k[..., None] + q_u[..., None]))[..., 0]
+                v_x = v_x + (q_ux_t @ k[..., None])[..., 0]
+                v_xx = q_xx + gain_t @ q_uu @ gain + gain_t @ q_ux + q_ux_t @ gain
+                v_xx = 0.5 * (v_xx + v_xx.transpose(-2, -1))
+                ks.append(k)
+                gains.append(gain)
+
+            if not failed.any():
+                return torch.stack(ks[::-1]), torch.stack(gains[::-1]), mu
+            stop = failed & (mu >= self.max_regularization)
+            if stop.any():
+                warnings.warn(
+                    f"The action Hessian of {stop.sum()} initial states is not "
+                    f"positive definite with regularization {self.max_regularization}, "
+                    "they keep their nominal actions.",
+                    RuntimeWarning,
+                )
+                given_up |= stop
+            mu = torch.where(failed & ~stop, 10 * mu, mu)
+            mu = mu.clamp(self.regularization, self.max_regularization)
+
+    @traced("mpc_solve")
+    def forward(self, state):
+        """Return the action sequence that solves the MPC problem."""
+        self.dynamical_model.eval()
+        batch_shape = state.shape[:-1]
+        self.initialize_actions(batch_shape)
+        step_sizes = self.step_sizes.reshape(-1, *([1] * len(batch_shape)))
+
+        with torch.no_grad():
+            states, actions, returns = self.rollout(state, self.mean)
+        mu = torch.full(batch_shape, self.regularization)
+        for _ in range(self.num_iter):
+            f_z, l_z, l_zz, v_x, v_xx = self.quadratize(states, actions)
+            k, gain, mu = self.backward_pass(f_z, l_z, l_zz, v_x, v_xx, mu)
+
+            # Line search over all the step sizes at once.
+            with torch.no_grad():
+                new_states, new_actions, new_returns = self.rollout(
+                    state.expand(len(step_sizes), *state.shape),
+                    actions,
+                    states,
+                    step_sizes.unsqueeze(-1) * k.unsqueeze(1),
+                    gain.unsqueeze(1),
+                )
+            new_returns, best = new_returns.max(0)
+            improvement = new_returns - returns
+            states = _select(new_states, best)
+            # Keep the nominal actions where the rollouts are not finite.
+            new_actions = _select(new_actions, best)
+            finite = torch.isfinite(new_actions).all(-1).all(0)
+            actions = torch.where(finite.unsqueeze(-1), new_actions, actions)
+            returns = new_returns
+
+            success = improvement > 0
+            mu = torch.where(success, mu / 10, 10 * mu)
+            mu = mu.clamp(self.regularization, self.max_regularization)
+            if (improvement <= self.tolerance * (1 + returns.abs())).all():
+                break
+
+        self.update_sequence_generation(actions)
+        return self.action_sequence
@@ -0,0 +1,46 @@
+from typing import Any, Optional, Sequence, Tuple
+
+from torch import Tensor
+
+from .abstract_solver import MPCSolver
+
+class ILQRSolver(MPCSolver):
+    regularization: float
+    max_regularization: float
+    step_sizes: Tensor
+    tolerance: float
+    def __init__(
+        self,
+        num_iter: int = ...,
+        regularization: float = ...,
+        max_regularization: float = ...,
+        step_sizes: Sequence[float] = ...,
+        tolerance: float = ...,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None: ...
+    def get_candidate_action_sequence(self) -> Tensor: ...
+    def get_best_action(self, action_sequence: Tensor, returns: Tensor) -> Tensor: ...
+    def update_sequence_generation(self, elite_actions: Tensor) -> None: ...
+    def step(self, state: Tensor, action: Tensor) -> Tuple[Tensor, Tensor]: ...
+    def rollout(
+        self,
+        state: Tensor,
+        actions: Tensor,
+        nominal_states: Optional[Tensor] = ...,
+        k: Optional[Tensor] = ...,
+        gain: Optional[Tensor] = ...,
+    ) -> Tuple[Tensor, Tensor, Tensor]: ...
+    def quadratize(
+        self, states: Tensor, actions: Tensor
+    ) -> Tuple[Tensor, Tensor, Tensor, Tensor, Tensor]: ...
+    def backward_pass(
+        self,
+        f_z: Tensor,
+        l_z: Tensor,
+        l_zz: Tensor,
+        v_x: Tensor,
+        v_xx: Tensor,
+        mu: Tensor,
+    ) -> Tuple[Tensor, Tensor, Tensor]: ...
+    def forward(self, state: Tensor) -> Tensor: ...
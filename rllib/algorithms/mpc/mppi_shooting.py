@@ -1,6 +1,5 @@
 """MPC Algorithms."""
 import torch
-from torch.distributions import MultivariateNormal
 
 from rllib.util.parameter_decay import Constant, ParameterDecay
 
@@ -35,8 +34,7 @@ class MPPIShooting(MPCSolver):
 
     def get_candidate_action_sequence(self):
         """Get candidate actions by sampling from a multivariate normal."""
-        noise_dist = MultivariateNormal(torch.zeros_like(self.mean), self.covariance)
-        noise = noise_dist.sample((self.num_particles,))
+        noise = self.sample_noise(self.num_particles)
 
         lag = len(self.filter_coefficients)
         for i in range(self.num_model_steps):
@@ -2,6 +2,7 @@
 
 import torch
 
+from rllib.util.tracing import traced
 from rllib.util.value_estimation import mb_return
 
 from .random_shooting import RandomShooting
@@ -28,6 +29,7 @@ class PolicyShooting(RandomShooting):
         super().__init__(*args, **kwargs)
         self.policy = policy
 
+    @traced("mpc_solve")
     def forward(self, state, **kwargs):
         """Get best action."""
         self.dynamical_model.eval()
@@ -47,5 +49,5 @@ class PolicyShooting(RandomShooting):
         value = self.multi_objective_reduction(value)
         idx = torch.topk(value, k=self.num_elites, largest=True)[1]
 
-        # Return first action and the mean over the elite samples.
-        return actions[0, idx].mean(0)
+        # Return the mean action sequence over the elite samples, of shape [H x d].
+        return actions[idx].mean(0)
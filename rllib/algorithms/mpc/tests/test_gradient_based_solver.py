@@ -0,0 +1,56 @@
+import pytest
+import torch
+import torch.testing
+
+from rllib.algorithms.mpc import GradientBasedSolver
+from rllib.model import LinearModel
+from rllib.reward.quadratic_reward import QuadraticReward
+
+NUM_MODEL_STEPS = 10
+
+
+@pytest.fixture(params=[1, 4])
+def num_restarts(request):
+    return request.param
+
+
+def get_solver(**kwargs):
+    torch.manual_seed(0)
+    a = torch.eye(3) + 0.1 * torch.randn(3, 3)
+    b = torch.randn(3, 2)
+    return GradientBasedSolver(
+        dynamical_model=LinearModel(a, b),
+        reward_model=QuadraticReward(torch.eye(3), 0.1 * torch.eye(2)),
+        num_model_steps=NUM_MODEL_STEPS,
+        lr=0.05,
+        **kwargs,
+    )
+
+
+def test_shape(num_restarts):
+    solver = get_solver(num_restarts=num_restarts)
+    state = torch.randn(5, 3)
+    action_sequence = solver(state)
+    assert action_sequence.shape == (NUM_MODEL_STEPS, 5, 2)
+    assert action_sequence.abs().max() <= 1.0
+
+
+def test_checkpoint(num_restarts):
+    state = torch.randn(5, 3)
+    action_sequences = []
+    for checkpoint in [False, True]:
+        solver = get_solver(num_restarts=num_restarts, checkpoint=checkpoint)
+        action_sequences.append(solver(state))
+    assert solver.segment_length == 4
+    torch.testing.assert_close(action_sequences[0], action_sequences[1])
+
+
+def test_restarts_improve_returns():
+    state = 3 * torch.randn(5, 3)
+    returns = []
+    for num_restarts in [1, 8]:
+        solver = get_solver(num_restarts=num_restarts, num_iter=20)
+        action_sequence = solver(state)
+        actions = action_sequence.unsqueeze(1).expand(-1, num_restarts, -1, -1)
+        returns.append(solver.evaluate_restarts(state, actions)[0])
+    assert (returns[1] >= returns[0] - 1e-4 * returns[0].abs()).all()
@@ -0,0 +1,125 @@
+import copy
+
+import pytest
+import torch
+import torch.testing
+
+from rllib.algorithms.mpc import CEMShooting, ILQRSolver
+from rllib.environment import GymEnvironment
+from rllib.model import LinearModel
+from rllib.model.environment_model import EnvironmentModel
+from rllib.reward.quadratic_reward import QuadraticReward
+
+NUM_MODEL_STEPS = 10
+
+
+@pytest.fixture(params=[1.0, 0.9])
+def gamma(request):
+    return request.param
+
+
+def get_linear_problem(dim_state=3, dim_action=2):
+    torch.manual_seed(0)
+    a = torch.eye(dim_state) + 0.1 * torch.randn(dim_state, dim_state)
+    b = torch.randn(dim_state, dim_action)
+    q, r = torch.eye(dim_state), 0.1 * torch.eye(dim_action)
+    return a, b, q, r
+
+
+def finite_horizon_lqr(a, b, q, r, gamma):
+    """Get the gain of the first step with dynamic programming."""
+    cost = torch.zeros_like(q)
+    for _ in range(NUM_MODEL_STEPS):
+        gain = -torch.linalg.solve(r + gamma * b.T @ cost @ b, gamma * b.T @ cost @ a)
+        cost = q + gamma * a.T @ cost @ (a + b @ gain)
+    return gain
+
+
+def test_linear_quadratic(gamma):
+    a, b, q, r = get_linear_problem()
+    solver = ILQRSolver(
+        dynamical_model=LinearModel(a, b),
+        reward_model=QuadraticReward(q, r),
+        num_model_steps=NUM_MODEL_STEPS,
+        gamma=gamma,
+        clamp=False,
+    )
+    state = torch.randn(4, 3)
+    action_sequence = solver(state)
+    assert action_sequence.shape == (NUM_MODEL_STEPS, 4, 2)
+
+    gain = finite_horizon_lqr(a, b, q, r, gamma)
+    torch.testing.assert_close(action_sequence[0], state @ gain.T, atol=1e-4, rtol=0)
+
+
+def test_clamp_and_warm_start():
+    a, b, q, r = get_linear_problem()
+    solver = ILQRSolver(
+        dynamical_model=LinearModel(a, b),
+        reward_model=QuadraticReward(q, r),
+        num_model_steps=NUM_MODEL_STEPS,
+        action_scale=0.5,
+    )
+    state = 10 * torch.randn(3)
+    action_sequence = solver(state)
+    assert action_sequence.abs().max() <= 1.0
+
+    old_mean = solver.mean.clone()
+    solver.initialize_actions(state.shape[:-1])
+    torch.testing.assert_close(solver.mean[:-1], old_mean[1:])
+
+
+def test_nonlinear_better_than_cem():
+    environment = GymEnvironment("VContinuous-CartPole-v0", 0)
+    environment.reset()
+    dynamical_model = EnvironmentModel(copy.deepcopy(environment))
+    reward_model = QuadraticReward(torch.eye(4), 0.1 * torch.eye(1))
+    state = torch.tensor([0.0, 0.0, 0.2, 0.0])
+
+    returns = {}
+    for solver_cls in [ILQRSolver, CEMShooting]:
+        torch.manual_seed(0)
+        solver = solver_cls(
+            dynamical_model=dynamical_model,
+            reward_model=reward_model,
+            num_model_steps=NUM_MODEL_STEPS,
+            num_iter=5,
+            num_particles=50,
+        )
+        action_sequence = solver(state)
+        returns[solver_cls] = solver.evaluate_action_sequence(
+            action_sequence.unsqueeze(-2), state.unsqueeze(-2)
+        ).item()
+    assert returns[ILQRSolver] >= returns[CEMShooting]
+
+
+def test_regularization():
+    a, b, q, r = get_linear_problem()
+    with pytest.raises(ValueError):
+        ILQRSolver(
+            dynamical_model=LinearModel(a, b),
+            reward_model=QuadraticReward(q, r),
+            num_model_steps=NUM_MODEL_STEPS,
+            regularization=0.0,
+        )
+
+    # The regularization makes the Hessian of an indefinite cost positive definite.
+    solver = ILQRSolver(
+        dynamical_model=LinearModel(a, b),
+        reward_model=QuadraticReward(q, -r),
+        num_model_steps=NUM_MODEL_STEPS,
+    )
+    assert torch.isfinite(solver(torch.randn(4, 3))).all()
+
+
+def test_non_finite_model():
+    a, b, q, r = get_linear_problem()
+    b[0, 0] = float("inf")
+    solver = ILQRSolver(
+        dynamical_model=LinearModel(a, b),
+        reward_model=QuadraticReward(q, r),
+        num_model_steps=NUM_MODEL_STEPS,
+    )
+    with pytest.warns(RuntimeWarning):
+        action_sequence = solver(torch.randn(4, 3))
+    torch.testing.assert_close(action_sequence, torch.zeros(NUM_MODEL_STEPS, 4, 2))
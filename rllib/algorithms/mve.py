@@ -4,6 +4,7 @@ import torch
 from rllib.dataset.datatypes import Loss
 from rllib.dataset.utilities import stack_list_of_tuples
 from rllib.util.neural_networks.utilities import broadcast_to_tensor
+from rllib.util.utilities import fill_behavior_statistics
 from rllib.util.value_estimation import discount_cumsum, mc_return
 from rllib.value_function import NNEnsembleQFunction
 
@@ -27,6 +28,7 @@ class MVE(Dyna):
     def forward(self, observation):
         """Rollout model and call base algorithm with transitions."""
         self.base_algorithm.reset_info()
+        observation = fill_behavior_statistics(observation, self.policy)
         loss = Loss()
         loss += self.base_algorithm.actor_loss(observation).reduce("mean")
         loss += self.model_augmented_critic_loss(observation).reduce("mean")
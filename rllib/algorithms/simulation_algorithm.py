@@ -1,7 +1,16 @@
 """Simulation algorithm."""
+import time
 
-from rllib.util.neural_networks.utilities import repeat_along_dimension
+import torch
+from torch.utils.checkpoint import checkpoint
+
+from rllib.util.neural_networks.utilities import (
+    DisableGradient,
+    broadcast_to_tensor,
+    repeat_along_dimension,
+)
 from rllib.util.rollout import rollout_model
+from rllib.util.tracing import traced
 
 
 class SimulationAlgorithm(object):
@@ -19,6 +28,12 @@ class SimulationAlgorithm(object):
         Number of particles to simulate from initial state.
     num_model_steps: int.
         Number of steps to simulate the particles. .
+    checkpoint_steps: int, optional.
+        Number of steps of the segments whose activations are recomputed in the
+        backward pass instead of stored. By default, all activations are stored.
+    truncation_steps: int, optional.
+        Number of steps of the windows through which gradients are propagated. By
+        default, gradients are propagated through the full simulation.
 
     Methods
     -------
@@ -39,6 +54,8 @@ class SimulationAlgorithm(object):
         termination_model=None,
         num_particles=1,
         num_model_steps=1,
+        checkpoint_steps=None,
+        truncation_steps=None,
     ):
         super().__init__()
         self.dynamical_model = dynamical_model
@@ -46,7 +63,78 @@ class SimulationAlgorithm(object):
         self.termination_model = termination_model
         self.num_particles = num_particles
         self.num_model_steps = num_model_steps
+        self.checkpoint_steps = checkpoint_steps
+        self.truncation_steps = truncation_steps
+        self.info = {}
+
+    def get_segments(self):
+        """Get the start and the end of the segments that are simulated at once.
+
+        The segments end at the checkpoint and at the truncation boundaries.
+        """
+        boundaries = {self.num_model_steps}
+        for steps in [self.checkpoint_steps, self.truncation_steps]:
+            if steps is not None:
+                boundaries.update(range(steps, self.num_model_steps, steps))
+        boundaries = sorted(boundaries)
+        return list(zip([0] + boundaries[:-1], boundaries))
+
+    def simulate_segment(self, initial_state, policy, initial_action, max_steps):
+        """Simulate a segment with frozen models.
+
+        The models are frozen inside the segment so that the checkpointed
+        recomputation in the backward pass builds the same graph as the forward pass.
+        """
+        with DisableGradient(
+            self.dynamical_model, self.reward_model, self.termination_model
+        ):
+            return rollout_model(
+                dynamical_model=self.dynamical_model,
+                reward_model=self.reward_model,
+                policy=policy,
+                initial_state=initial_state,
+                initial_action=initial_action,
+                max_steps=max_steps,
+                termination_model=self.termination_model,
+            )
+
+    def simulate_segments(self, initial_state, policy, initial_action=None):
+        """Simulate the segments, checkpointing and truncating at their boundaries."""
+        trajectory = []
+        state, done = initial_state, None
+        checkpoint_segments = self.checkpoint_steps is not None
+        for start, end in self.get_segments():
+            if (
+                start > 0
+                and self.truncation_steps is not None
+                and start % self.truncation_steps == 0
+            ):
+                state = state.detach()
+            action = initial_action if start == 0 else None
+            if checkpoint_segments and torch.is_grad_enabled():
+                segment = checkpoint(
+                    self.simulate_segment,
+                    state,
+                    policy,
+                    action,
+                    end - start,
+                    use_reentrant=False,
+                )
+            else:
+                segment = self.simulate_segment(state, policy, action, end - start)
 
+            if done is not None:  # Carry the termination of previous segments.
+                for observation in segment:
+                    not_done = 1.0 - broadcast_to_tensor(done, observation.reward)
+                    observation.reward = observation.reward * not_done
+                    observation.done = torch.max(observation.done, done)
+            trajectory += segment
+            state, done = segment[-1].next_state, segment[-1].done
+            if torch.all(done.bool()):
+                break
+        return trajectory
+
+    @traced("simulate")
     def simulate(self, initial_state, policy, initial_action=None, memory=None):
         """Simulate a set of particles starting from `state' and following `policy'."""
         if self.num_particles > 0:
@@ -60,14 +148,42 @@ class SimulationAlgorithm(object):
                 )
                 initial_action = initial_action.reshape(*initial_state.shape[:-1], -1)
 
-        trajectory = rollout_model(
-            dynamical_model=self.dynamical_model,
-            reward_model=self.reward_model,
-            policy=policy,
-            initial_state=initial_state,
-            initial_action=initial_action,
-            max_steps=self.num_model_steps,
-            termination_model=self.termination_model,
-            memory=memory,
+        saved_bytes = [0]
+
+        def pack(tensor):
+            saved_bytes[0] += tensor.numel() * tensor.element_size()
+            return tensor
+
+        start = time.time()
+        with torch.autograd.graph.saved_tensors_hooks(pack, lambda tensor: tensor):
+            if self.checkpoint_steps is None and self.truncation_steps is None:
+                trajectory = rollout_model(
+                    dynamical_model=self.dynamical_model,
+                    reward_model=self.reward_model,
+                    policy=policy,
+                    initial_state=initial_state,
+                    initial_action=initial_action,
+                    max_steps=self.num_model_steps,
+                    termination_model=self.termination_model,
+                    memory=memory,
+                )
+            else:
+                trajectory = self.simulate_segments(
+                    initial_state, policy, initial_action
+                )
+                if memory is not None:
+                    for observation in trajectory:
+                        memory.append(observation)
+        if torch.is_grad_enabled() and self.checkpoint_steps is not None:
+            # The checkpoints keep the initial state of each segment.
+            saved_bytes[0] += sum(
+                trajectory[start].state.numel() * initial_state.element_size()
+                for start, _ in self.get_segments()
+                if start < len(trajectory)
+            )
+        num_transitions = len(trajectory) * initial_state.shape[:-1].numel()
+        self.info.update(
+            sim_throughput=num_transitions / max(time.time() - start, 1e-9),
+            sim_saved_memory=saved_bytes[0] / 2 ** 20,
         )
         return trajectory
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from torch import Tensor
 
@@ -13,6 +13,9 @@ class SimulationAlgorithm(object):
     termination_model: Optional[AbstractModel]
     num_particles: int
     num_model_steps: int
+    checkpoint_steps: Optional[int]
+    truncation_steps: Optional[int]
+    info: Dict[str, Any]
     def __init__(
         self,
         dynamical_model: AbstractModel,
@@ -20,7 +23,23 @@ class SimulationAlgorithm(object):
         termination_model: Optional[AbstractModel] = ...,
         num_particles: int = ...,
         num_model_steps: int = ...,
+        checkpoint_steps: Optional[int] = ...,
+        truncation_steps: Optional[int] = ...,
     ) -> None: ...
+    def get_segments(self) -> List[Tuple[int, int]]: ...
+    def simulate_segment(
+        self,
+        initial_state: Tensor,
+        policy: AbstractPolicy,
+        initial_action: Optional[Tensor],
+        max_steps: int,
+    ) -> Trajectory: ...
+    def simulate_segments(
+        self,
+        initial_state: Tensor,
+        policy: AbstractPolicy,
+        initial_action: Optional[Tensor] = ...,
+    ) -> Trajectory: ...
     def simulate(
         self,
         state: Tensor,
@@ -1,3 +1,4 @@
 from .dataset import TrajectoryDataset
 from .experience_replay import *
+from .sharded_offline_dataset import ShardedOfflineDataset, write_shards
 from .utilities import *
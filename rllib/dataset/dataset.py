@@ -1,13 +1,56 @@
 """Implementation of a Trajectory Dataset."""
-from dataclasses import asdict
-
 import numpy as np
 import torch
 from torch.utils import data
 
 from rllib.dataset.datatypes import Observation
+from rllib.dataset.transforms import ComposedTransform
+
+from .utilities import map_observation, stack_list_of_tuples
+
+
+def _window_starts(offsets, sequence_length, drop_last=False):
+    """Get the starts of the sub-trajectories of packed trajectories.
+
+    Each trajectory is split into consecutive windows of `sequence_length' points. If
+    `drop_last' is False, a last window that ends at the end of the trajectory
+    includes the remaining points. Trajectories shorter than `sequence_length' have no
+    windows.
+
+    Parameters
+    ----------
+    offsets: torch.Tensor
+        Start of each trajectory, followed by the end of the last one.
+    sequence_length: int
+        Length of the sub-trajectories.
+    drop_last: bool, optional (default=False).
+        Whether to drop the remaining points of each trajectory.
+
+    Returns
+    -------
+    starts: torch.Tensor
+        Start of each sub-trajectory in the packed trajectories.
+    """
+    lengths = offsets[1:] - offsets[:-1]
+    if drop_last:
+        num_windows = lengths // sequence_length
+    else:
+        num_windows = (lengths + sequence_length - 1) // sequence_length
+    num_windows[lengths < sequence_length] = 0
 
-from .utilities import map_and_cast, stack_list_of_tuples
+    trajectory = torch.repeat_interleave(num_windows)
+    first_window = torch.cumsum(num_windows, dim=0) - num_windows
+    window = torch.arange(len(trajectory)) - first_window[trajectory]
+    start = torch.min(window * sequence_length, lengths[trajectory] - sequence_length)
+    return offsets[trajectory] + start
+
+
+def _expand_rows(value, num_rows):
+    """Convert a field to a tensor, expanding a scalar field to num_rows rows."""
+    value = torch.as_tensor(value)
+    if value.dim() == 0:
+        return value.expand(num_rows)
+    return value
 
 
 class TrajectoryDataset(data.Dataset):
@@ -15,6 +58,12 @@ class TrajectoryDataset(data.Dataset):
 
     The dataset splits the dataset into subsequences of fixed length.
 
+    The trajectories are packed into a contiguous tensor per field and an `offsets'
+    tensor with the start of each trajectory, so that the sub-trajectories and
+    `all_data' are views of the packed tensors and `sample_batch' gathers a batch of
+    sub-trajectories with a single index per field. The transformed packed tensors
+    are cached until a trajectory is appended or the transformations change.
+
     Properties
     ----------
     sequence_length: int, optional(default: 1)
@@ -31,19 +80,39 @@ class TrajectoryDataset(data.Dataset):
         return list of initial states of all the trajectories.
     append(trajectory):
         append a trajectory to the dataset.
+    sample_batch(batch_size, sequence_length):
+        sample a batch of sub-trajectories.
     shuffle():
         shuffle the dataset.
     sequence_length: int
         length of the sub-trajectories.
 
+    Examples
+    --------
+    >>> dataset = TrajectoryDataset(sequence_length=4)
+    >>> for length in [10, 7]:
+    ...     dataset.append(Observation(
+    ...         state=torch.randn(length, 3), action=torch.randn(length, 2),
+    ...         reward=torch.randn(length), next_state=torch.randn(length, 3),
+    ...         done=torch.zeros(length)
+    ...     ))
+    >>> len(dataset)
+    5
+    >>> dataset.sample_batch(32).state.shape
+    torch.Size([32, 4, 3])
+    >>> dataset.sequence_length = 8
+    >>> len(dataset)
+    2
     """
 
     def __init__(self, sequence_length=None, transformations=None):
         super().__init__()
         self._sequence_length = sequence_length
-        self._trajectories = []
-        self._sub_trajectory_indexes = []
+        self._data = None  # Packed fields, with spare capacity.
+        self._offsets = torch.zeros(1, dtype=torch.long)
+        self._index = torch.zeros(0, dtype=torch.long)
         self._num_points = 0
+        self._transformed = None  # Transformed data and the state it was computed at.
         self.transformations = transformations if transformations else []
 
     def __getitem__(self, idx):
@@ -58,21 +127,19 @@ class TrajectoryDataset(data.Dataset):
         sub-trajectory: Observation
         """
         if self.sequence_length is None:  # get trajectory
-            observation = self._trajectories[idx]
+            trajectory_idx = self._index[idx]
+            start, end = self._offsets[trajectory_idx : trajectory_idx + 2].tolist()
         else:  # Get sub-trajectory.
-            trajectory_idx, start = self._sub_trajectory_indexes[idx]
+            start = self._index[idx].item()
             end = start + self._sequence_length
 
-            trajectory = self._trajectories[trajectory_idx]
-
-            observation = Observation(
-                **{key: val[start:end] for key, val in asdict(trajectory).items()}
-            )
-
-        for transform in self.transformations:
-            observation = transform(observation)
+        return self._slice(start, end, self._transformed_data())
 
-        return observation
+    def __getstate__(self):
+        """Get the state to pickle or copy, without the cached transformed data."""
+        state = self.__dict__.copy()
+        state["_transformed"] = None
+        return state
 
     def __len__(self):
         """Return the size in the dataset.
@@ -85,10 +152,37 @@ class TrajectoryDataset(data.Dataset):
         length: int
 
         """
-        if self._sequence_length is None:
-            return len(self._trajectories)
-        else:
-            return len(self._sub_trajectory_indexes)
+        return len(self._index)
+
+    def _slice(self, start, end, data=None):
+        """Get a view of the packed observations between start and end."""
+        data = self._data if data is None else data
+        return map_observation(lambda x: x[start:end], data)
+
+    def _transformed_data(self):
+        """Get the transformed packed observations, which are cached."""
+        version = self._transform.version
+        if version is None:  # The transformations can't be cached.
+            return self._transform(self._slice(0, self._num_points))
+        key = (self._num_points, version)
+        if self._transformed is None or self._transformed[0] != key:
+            data = self._transform(self._slice(0, self._num_points))
+            self._transformed = key, data
+        return self._transformed[1]
+
+    def _reserve(self, trajectory, num_points):
+        """Grow the packed tensors geometrically to fit num_points observations."""
+        capacity = 0 if self._data is None else len(self._data.state)
+        if num_points <= capacity:
+            return
+        capacity = max(num_points, 2 * capacity)
+        packed = map_observation(
+            lambda x: x.new_empty((capacity,) + x.shape[1:]), trajectory
+        )
+        if self._data is not None:
+            for new, old in zip(packed, self._data):
+                new[: self._num_points] = old[: self._num_points]
+        self._data = packed
 
     def append(self, trajectory):
         """Append new trajectories to the dataset.
@@ -102,17 +196,23 @@ class TrajectoryDataset(data.Dataset):
         ValueError
             If the new trajectory is shorter than the sequence length.
         """
-        trajectory_index = len(self._trajectories)
+        trajectory_index = len(self._offsets) - 1
 
         if isinstance(trajectory, Observation):
             try:
                 num_observations = len(trajectory.reward)
             except TypeError:
                 num_observations = 1
+                trajectory = map_observation(
+                    lambda x: torch.as_tensor(x).unsqueeze(0), trajectory
+                )
         else:
             # Stack the tuples to one trajectory
             num_observations = len(trajectory)
             trajectory = stack_list_of_tuples(trajectory)
+        trajectory = map_observation(
+            lambda x: _expand_rows(x, num_observations), trajectory
+        )
 
         if (
             self._sequence_length is not None
@@ -121,38 +221,87 @@ class TrajectoryDataset(data.Dataset):
             raise ValueError("The sequence is shorter than the sequence length")
 
         # Add trajectory to dataset
-        self._trajectories.append(trajectory)
+        start, end = self._num_points, self._num_points + num_observations
+        self._reserve(trajectory, end)
+        for packed, value in zip(self._data, trajectory):
+            packed[start:end] = value
+        self._num_points = end
+        self._offsets = torch.cat((self._offsets, torch.tensor([end])))
 
         # Update the transformers but do not apply transforms.
-        for transformation in self.transformations:
-            transformation.update(trajectory)
+        self._transform.update(self._slice(start, end))
 
         # Add sub-trajectory indexes
-        if self._sequence_length is not None:
-            sub_indexes = self._get_subindexes(num_observations, self._sequence_length)
-            sub_indexes = [(trajectory_index, sub_index) for sub_index in sub_indexes]
+        if self._sequence_length is None:
+            index = torch.tensor([trajectory_index])
+        else:
+            index = _window_starts(self._offsets[-2:], self._sequence_length)
+        self._index = torch.cat((self._index, index))
 
-            self._sub_trajectory_indexes += sub_indexes
+    def sample_batch(self, batch_size, sequence_length=None):
+        """Sample a batch of sub-trajectories.
+
+        Parameters
+        ----------
+        batch_size: int
+            Number of sub-trajectories.
+        sequence_length: int, optional.
+            Length of the sub-trajectories. By default, the sequence length of the
+            dataset.
+
+        Returns
+        -------
+        observation: Observation
+            Observation with fields of shape [batch_size, sequence_length, ...].
+
+        Raises
+        ------
+        ValueError
+            If neither the dataset nor the call have a sequence length.
+        """
+        if sequence_length is None:
+            sequence_length = self._sequence_length
+        if sequence_length is None:
+            raise ValueError("Sampling a batch requires a sequence length.")
+
+        if sequence_length == self._sequence_length:
+            starts = self._index
+        else:
+            starts = _window_starts(self._offsets, sequence_length)
+        starts = starts[torch.as_tensor(np.random.choice(len(starts), batch_size))]
+        index = starts.unsqueeze(-1) + torch.arange(sequence_length)
+
+        # index_select of the flat index is faster than advanced indexing.
+        return map_observation(
+            lambda x: x.index_select(0, index.reshape(-1)).reshape(
+                index.shape + x.shape[1:]
+            ),
+            self._transformed_data(),
+        )
 
     def shuffle(self):
         """Shuffle the dataset."""
-        if self._sequence_length is not None:
-            np.random.shuffle(self._trajectories)
-        else:
-            np.random.shuffle(self._sub_trajectory_indexes)
+        self._index = self._index[torch.as_tensor(np.random.permutation(len(self)))]
 
     @property
     def all_data(self):
         """Get all the data."""
-        data = map_and_cast(torch.cat, self._trajectories)
-        for transformation in self.transformations:
-            data = transformation(data)
-        return data
+        return Observation(*self._transformed_data())
 
     @property
     def initial_states(self):
         """Return a list with initial states."""
-        return np.stack([trajectory.state[0] for trajectory in self._trajectories])
+        return self._data.state[self._offsets[:-1]].numpy()
+
+    @property
+    def transformations(self):
+        """Return the list of transformations."""
+        return self._transform.transformations
+
+    @transformations.setter
+    def transformations(self, value):
+        """Set the transformations."""
+        self._transform = ComposedTransform(value)
 
     @property
     def sequence_length(self):
@@ -161,17 +310,15 @@ class TrajectoryDataset(data.Dataset):
 
     @sequence_length.setter
     def sequence_length(self, value):
-        """Set the sequence length and update the sub-trajectory indexes."""
+        """Set the sequence length and update the sub-trajectory indexes.
+
+        The trajectories that are shorter than the sequence length are skipped.
+        """
         self._sequence_length = value
-        self._sub_trajectory_indexes = []
-        if value is not None:
-            for trajectory_index, trajectory in enumerate(self._trajectories):
-                num_observations = len(trajectory.state)
-                sub_indexes = self._get_subindexes(num_observations, value)
-                sub_indexes = [
-                    (trajectory_index, sub_index) for sub_index in sub_indexes
-                ]
-                self._sub_trajectory_indexes += sub_indexes
+        if value is None:
+            self._index = torch.arange(len(self._offsets) - 1)
+        else:
+            self._index = _window_starts(self._offsets, value)
 
     @staticmethod
     def _get_subindexes(num_observations, sequence_length, drop_last=False):
@@ -201,12 +348,5 @@ class TrajectoryDataset(data.Dataset):
         >>> TrajectoryDataset._get_subindexes(9, 3)
         [0, 3, 6]
         """
-        # Add sub-trajectory indexes
-        num_sub_trajectories = num_observations // sequence_length
-        sub_indexes = [i * sequence_length for i in range(num_sub_trajectories)]
-
-        # In this case the last transitions are not included in the loop above.
-        if not drop_last and num_observations % sequence_length > 0:
-            # Append a subsequence that includes the last data point
-            sub_indexes.append(num_observations - sequence_length)
-        return sub_indexes
+        offsets = torch.tensor([0, num_observations])
+        return _window_starts(offsets, sequence_length, drop_last).tolist()
@@ -1,33 +1,58 @@
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from numpy import ndarray
+import torch.nn as nn
+from torch import Tensor
 from torch.utils import data
 
 from .datatypes import Observation
-from .transforms import AbstractTransform
+from .transforms import AbstractTransform, ComposedTransform
+
+def _window_starts(
+    offsets: Tensor, sequence_length: int, drop_last: bool = ...
+) -> Tensor: ...
+def _expand_rows(value: Any, num_rows: int) -> Tensor: ...
 
 class TrajectoryDataset(data.Dataset):
-    _sequence_length: int
-    _trajectories: List[Observation]
-    _sub_trajectory_indexes: List[int]
-    transformations: List[AbstractTransform]
+    _sequence_length: Optional[int]
+    _data: Optional[Observation]
+    _offsets: Tensor
+    _index: Tensor
+    _num_points: int
+    _transformed: Optional[Tuple[Tuple[int, int], Observation]]
+    _transform: ComposedTransform
     def __init__(
         self,
         sequence_length: Optional[int] = ...,
         transformations: Optional[List[AbstractTransform]] = ...,
     ) -> None: ...
     def __getitem__(self, idx: int) -> Observation: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
     def __len__(self) -> int: ...
+    def _slice(
+        self, start: int, end: int, data: Optional[Observation] = ...
+    ) -> Observation: ...
+    def _transformed_data(self) -> Observation: ...
+    def _reserve(self, trajectory: Observation, num_points: int) -> None: ...
     def append(self, trajectory: Union[Observation, List[Observation]]) -> None: ...
+    def sample_batch(
+        self, batch_size: int, sequence_length: Optional[int] = ...
+    ) -> Observation: ...
     def shuffle(self) -> None: ...
     @property
     def all_data(self) -> Observation: ...
     @property
     def initial_states(self) -> ndarray: ...
     @property
-    def sequence_length(self) -> int: ...
+    def transformations(self) -> nn.ModuleList: ...
+    @transformations.setter
+    def transformations(
+        self, value: Union[List[AbstractTransform], nn.ModuleList]
+    ) -> None: ...
+    @property
+    def sequence_length(self) -> Optional[int]: ...
     @sequence_length.setter
-    def sequence_length(self, value: int) -> None: ...
+    def sequence_length(self, value: Optional[int]) -> None: ...
     @staticmethod
     def _get_subindexes(
         num_observations: int, sequence_length: int, drop_last: bool = ...
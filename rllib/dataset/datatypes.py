@@ -1,5 +1,5 @@
 """Project Data-types."""
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Tuple, Type, TypeVar, Union
 
 import numpy as np
@@ -24,7 +24,15 @@ T = TypeVar("T", bound="Observation")
 
 @dataclass
 class Observation:
-    """Observation datatype."""
+    """Observation datatype.
+
+    The fields that are not given share a default NaN tensor, which is not copied by
+    `clone', `to' or `to_torch'. Hence, do not modify the default fields in place.
+
+    When a rollout defers the statistics of the behavior policy, `behavior_params'
+    holds the packed parameters of its distribution, and `entropy' and
+    `log_prob_action' are NaN until `fill_behavior_statistics' computes them.
+    """
 
     state: State
     action: Action = torch.tensor(NaN)
@@ -37,6 +45,7 @@ class Observation:
     state_scale_tril: Tensor = torch.tensor(NaN)
     next_state_scale_tril: Tensor = torch.tensor(NaN)
     reward_scale_tril: Tensor = torch.tensor(NaN)
+    behavior_params: Tensor = torch.tensor(NaN)  # Deferred statistics.
 
     def __iter__(self):
         """Iterate the properties of the observation."""
@@ -45,11 +54,15 @@ class Observation:
     @property
     def shape(self):
         """Get the shape of the observation."""
-        with torch.no_grad():
-            if np.isnan(np.array(self.reward)).any():
-                return self.state.shape[:-1]
-            else:
-                return self.reward.shape[:-1]
+        reward = self.reward
+        if isinstance(reward, torch.Tensor):
+            is_nan = torch.isnan(reward).any()
+        else:
+            is_nan = np.isnan(np.array(reward)).any()
+        if is_nan:
+            return self.state.shape[:-1]
+        else:
+            return reward.shape[:-1]
 
     @staticmethod
     def _is_equal_nan(x, y):
@@ -135,6 +148,7 @@ class Observation:
             state_scale_tril=torch.tensor(NaN),
             next_state_scale_tril=torch.tensor(NaN),
             reward_scale_tril=torch.tensor(NaN),
+            behavior_params=torch.tensor(NaN),
         )
 
     @classmethod
@@ -213,15 +227,39 @@ class Observation:
 
     def clone(self):
         """Get a cloned copy of the current observation."""
-        return Observation(*tuple(x.clone() for x in self.to_torch()))
+        return Observation(
+            *(
+                x if x is default else to_torch(x).clone()
+                for x, default in zip(self, _DEFAULTS)
+            )
+        )
 
     def to(self, *args, **kwargs):
-        """Perform dtypes and device conversions. See torch.to()."""
-        return Observation(*tuple(x.to(*args, **kwargs) for x in self.to_torch()))
+        """Perform dtypes and device conversions. See torch.to().
+
+        If no field changes, return the observation itself, as torch.Tensor.to().
+        """
+        observation = self.to_torch()
+        values = tuple(x.to(*args, **kwargs) for x in observation)
+        if all(new is old for new, old in zip(values, observation)):
+            return observation
+        return Observation(*values)
 
     def to_torch(self):
-        """Transform to torch."""
-        return Observation(*map(lambda x: to_torch(x), self))
+        """Transform to torch.
+
+        If all the fields are tensors, return the observation itself.
+        """
+        if all(isinstance(x, torch.Tensor) for x in self):
+            return self
+        return Observation(*map(to_torch, self))
+
+
+# Default tensors of the fields of an observation, shared by all observations.
+_DEFAULTS = tuple(
+    field_.default if isinstance(field_.default, Tensor) else object()
+    for field_ in fields(Observation)
+)
 
 
 @dataclass
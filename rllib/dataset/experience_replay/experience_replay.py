@@ -9,7 +9,9 @@ from torch.utils import data
 from torch.utils.data._utils.collate import default_collate
 
 from rllib.dataset.datatypes import Observation
+from rllib.dataset.transforms import ComposedTransform
 from rllib.dataset.utilities import stack_list_of_tuples
+from rllib.util.tracing import traced
 
 
 class ExperienceReplay(data.Dataset):
@@ -26,7 +28,7 @@ class ExperienceReplay(data.Dataset):
         A sequence of transformations to apply to the dataset, each of which is a
         callable that takes an observation as input and returns a modified observation.
         If they have an `update` method it will be called whenever a new trajectory
-        is added to the dataset.
+        is added to the dataset. They are applied as a single `ComposedTransform'.
 
     Methods
     -------
@@ -64,6 +66,7 @@ class ExperienceReplay(data.Dataset):
         self.data_count = 0
 
         self.transformations = transformations or list()
+        self._all_data = None  # Transformed data and the state it was computed at.
         self._num_memory_steps = num_memory_steps
         self.zero_observation = None
 
@@ -124,6 +127,12 @@ class ExperienceReplay(data.Dataset):
 
         return train, test
 
+    def __getstate__(self):
+        """Get the state to pickle or copy, without the cached transformed data."""
+        state = self.__dict__.copy()
+        state["_all_data"] = None
+        return state
+
     def __len__(self):
         """Return the current size of the buffer."""
         if self.is_full:
@@ -167,11 +176,13 @@ class ExperienceReplay(data.Dataset):
             num_states=num_states,
             num_actions=num_actions,
         )
+        # The padding has no deferred statistics, but it stacks with observations.
+        self.zero_observation.behavior_params = torch.full_like(
+            observation.behavior_params, float("nan")
+        )
 
     def _get_consecutive_observations(self, start_idx, num_memory_steps):
-        if num_memory_steps == 0 and not (
-            isinstance(start_idx, int) or isinstance(start_idx, int)
-        ):
+        if num_memory_steps == 0 and not isinstance(start_idx, (int, np.integer)):
             observation = stack_list_of_tuples(self.memory[start_idx])
             return Observation(*map(lambda x: x.unsqueeze(1), observation))
         num_memory_steps = max(1, num_memory_steps)
@@ -200,9 +211,7 @@ class ExperienceReplay(data.Dataset):
         observation = self._get_consecutive_observations(idx, self.num_memory_steps)
         if self.raw:
             return observation
-        for transform in self.transformations:
-            observation = transform(observation)
-        return observation
+        return self._transform(observation)
 
     def reset(self):
         """Reset memory to empty."""
@@ -210,6 +219,7 @@ class ExperienceReplay(data.Dataset):
         self.valid = torch.zeros(self.max_len)
         self.data_count = 0
         self.zero_observation = None
+        self._all_data = None
 
     def end_episode(self):
         """Terminate an episode.
@@ -256,10 +266,9 @@ class ExperienceReplay(data.Dataset):
             self.valid[(self.ptr + i + 1) % self.max_len] = 0
         self.data_count += 1
 
-        for transformation in self.transformations:
-            transformation.update(observation)
-            observation = transformation(observation)
+        self._transform.update(observation)
 
+    @traced("sample_batch")
     def sample_batch(self, batch_size):
         """Sample a batch of observations."""
         indices = np.random.choice(self.valid_indexes, batch_size)
@@ -280,14 +289,31 @@ class ExperienceReplay(data.Dataset):
         """
         return self.data_count >= self.max_len
 
+    @property
+    def transformations(self):
+        """Return the list of transformations."""
+        return self._transform.transformations
+
+    @transformations.setter
+    def transformations(self, value):
+        """Set the transformations."""
+        self._transform = ComposedTransform(value)
+
     @property
     def all_data(self):
-        """Get all the data."""
-        all_obs = self.all_raw
+        """Get all the data.
 
-        for transformation in self.transformations:
-            all_obs = transformation(all_obs)
-        return all_obs
+        The transformed data is cached until an observation is appended or the
+        transformations change. It is not cached if the transformations have no
+        version, see `ComposedTransform.version'.
+        """
+        version = self._transform.version
+        if version is None:
+            return self._transform(self.all_raw)
+        key = (id(self.memory), self.data_count, version)
+        if self._all_data is None or self._all_data[0] != key:
+            self._all_data = key, self._transform(self.all_raw)
+        return Observation(*self._all_data[1])
 
     @property
     def all_raw(self):
@@ -6,7 +6,7 @@ from torch import Tensor
 from torch.utils import data
 
 from rllib.dataset.datatypes import Observation
-from rllib.dataset.transforms import AbstractTransform
+from rllib.dataset.transforms import AbstractTransform, ComposedTransform
 
 T = TypeVar("T", bound="ExperienceReplay")
 
@@ -15,7 +15,8 @@ class ExperienceReplay(data.Dataset):
     memory: ndarray
     valid: Tensor
     weights: Tensor
-    transformations: List[AbstractTransform]
+    _transform: ComposedTransform
+    _all_data: Optional[Tuple[Tuple[int, int, int], Observation]]
     data_count: int
     _num_memory_steps: int
     zero_observation: Optional[Observation]
@@ -31,6 +32,7 @@ class ExperienceReplay(data.Dataset):
         cls: Type[T], other: T, num_memory_steps: Optional[int] = ...
     ) -> T: ...
     def split(self, ratio: float = ..., *args: Any, **kwargs: Any) -> Tuple[T, T]: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
     def __len__(self) -> int: ...
     def __getitem__(self, item: int) -> Tuple[Dict[str, Tensor], int, Tensor]: ...
     def _init_observation(self, observation: Observation) -> None: ...
@@ -45,6 +47,12 @@ class ExperienceReplay(data.Dataset):
     def sample_batch(self, batch_size: int) -> Tuple[Observation, Tensor, Tensor]: ...
     def update(self, indexes: Tensor, td_error: Tensor) -> None: ...
     @property
+    def transformations(self) -> nn.ModuleList: ...
+    @transformations.setter
+    def transformations(
+        self, value: Union[List[AbstractTransform], nn.ModuleList]
+    ) -> None: ...
+    @property
     def all_data(self) -> Observation: ...
     @property
     def all_raw(self) -> Observation: ...
@@ -6,6 +6,7 @@ from torch.utils.data._utils.collate import default_collate
 
 from rllib.dataset.datatypes import Observation
 from rllib.util.parameter_decay import Constant, ParameterDecay
+from rllib.util.tracing import traced
 
 from .experience_replay import ExperienceReplay
 
@@ -107,6 +108,7 @@ class PrioritizedExperienceReplay(ExperienceReplay):
         num = len(self)
         return self._priorities[:num] / torch.sum(self._priorities[:num])
 
+    @traced("sample_batch")
     def sample_batch(self, batch_size):
         """Get a batch of data."""
         probs = self.probabilities.numpy()
@@ -1,5 +1,9 @@
+import copy
+import pickle
+
 import numpy as np
 import pytest
+import torch
 
 from rllib.dataset import ExperienceReplay
 from rllib.dataset.datatypes import Observation
@@ -337,3 +341,54 @@ class TestExperienceReplay(object):
             assert weight == 1.0
             for attribute in Observation(**observation):
                 assert attribute.shape[0] == max(1, num_memory_steps)
+
+
+def test_all_data_cache():
+    memory = ExperienceReplay(max_len=100, transformations=[StateNormalizer((4,))])
+    for _ in range(10):
+        observation = Observation.random_example(dim_state=(4,))
+        state = observation.state.clone()
+        memory.append(observation)
+        np.testing.assert_allclose(observation.state, state)  # Not transformed.
+
+    all_data = memory.all_data
+    assert memory.all_data.state is all_data.state
+    assert all_data.state.shape == (10, 4)
+
+    memory.append(Observation.random_example(dim_state=(4,)))
+    assert memory.all_data.state.shape == (11, 4)
+    np.testing.assert_allclose(memory.all_data.state.mean(0), np.zeros(4), atol=1e-5)
+
+
+def test_all_data_cache_not_copied():
+    memory = ExperienceReplay(max_len=100, transformations=[StateNormalizer((4,))])
+    for _ in range(10):
+        memory.append(Observation.random_example(dim_state=(4,)))
+    memory.all_data
+    assert memory._all_data is not None
+    assert copy.deepcopy(memory)._all_data is None
+    assert pickle.loads(pickle.dumps(memory))._all_data is None
+
+
+class LinearMean(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.linear = torch.nn.Linear(4, 4)
+
+    def forward(self, state, action):
+        return self.linear(state)
+
+
+def test_all_data_trainable_transformation():
+    mean_function = LinearMean()
+    memory = ExperienceReplay(
+        max_len=100, transformations=[MeanFunction(mean_function)]
+    )
+    for _ in range(10):
+        memory.append(Observation.random_example(dim_state=(4,)))
+    next_state = memory.all_data.next_state
+
+    # The parameters change without an update of the transformation.
+    with torch.no_grad():
+        mean_function.linear.bias.add_(1.0)
+    torch.testing.assert_close(memory.all_data.next_state, next_state - 1.0)
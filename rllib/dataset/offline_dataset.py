@@ -8,11 +8,16 @@ from torch.distributions import Poisson
 from torch.utils.data.dataset import Dataset
 
 from .datatypes import Observation
+from .transforms import ComposedTransform
 from .utilities import flatten_observation
 
 
 class OfflineDataset(Dataset):
-    """Offline dataset that handles the get item."""
+    """Offline dataset that handles the get item.
+
+    The transformed dataset is cached until the transformations change, and the
+    observations are gathered from it.
+    """
 
     def __init__(
         self,
@@ -30,6 +35,7 @@ class OfflineDataset(Dataset):
         self.dataset = dataset
 
         self.transformations = transformations
+        self._transformed = None  # Transformed data and the version it was computed at.
         self.bootstrap = bootstrap
         if self.bootstrap:
             self.weights = Poisson(torch.ones(num_bootstraps)).sample((len(self),))
@@ -58,6 +64,12 @@ class OfflineDataset(Dataset):
         for idx in range(len(self)):
             yield self._get_observation(idx)
 
+    def __getstate__(self):
+        """Get the state to pickle or copy, without the cached transformed data."""
+        state = self.__dict__.copy()
+        state["_transformed"] = None
+        return state
+
     def __len__(self):
         """Length of data set."""
         return len(self.indexes)
@@ -66,19 +78,32 @@ class OfflineDataset(Dataset):
         """Get item of dataset."""
         return asdict(self._get_observation(idx)), idx, self.weights[idx]
 
+    @property
+    def transformations(self):
+        """Return the list of transformations."""
+        return self._transform.transformations
+
+    @transformations.setter
+    def transformations(self, value):
+        """Set the transformations."""
+        self._transform = ComposedTransform(value)
+
     def init_transformations(self):
         """Initialize transformations."""
-        observation = self.dataset.clone()
-        observation = flatten_observation(observation)
-        for transformation in self.transformations:
-            transformation.update(observation)
-            observation = transformation(observation.clone())
+        self._transform.update(flatten_observation(self.dataset))
 
     def apply_transformations(self, observation):
         """Apply transformations to observation."""
-        for transform in self.transformations:
-            observation = transform(observation)
-        return observation
+        return self._transform(observation)
+
+    def _transformed_data(self):
+        """Get the transformed dataset, which is cached."""
+        version = self._transform.version
+        if version is None:  # The transformations can't be cached.
+            return self.apply_transformations(self.dataset)
+        if self._transformed is None or self._transformed[0] != version:
+            self._transformed = version, self.apply_transformations(self.dataset)
+        return self._transformed[1]
 
     def get_random_split(self, ratio):
         """Get a random split of the dataset."""
@@ -116,15 +141,7 @@ class OfflineDataset(Dataset):
         -------
         observation: Observation
         """
-        observation = Observation(
-            state=self.dataset.state[idx],
-            action=self.dataset.action[idx],
-            reward=self.dataset.reward[idx],
-            next_state=self.dataset.next_state[idx],
-            done=self.dataset.done[idx],
-            log_prob_action=self.dataset.log_prob_action[idx],
-        ).clone()
-        return observation
+        return self._index_observation(self.dataset, idx).clone()
 
     def _get_observation(self, idx):
         """Return any desired observation.
@@ -137,7 +154,19 @@ class OfflineDataset(Dataset):
         -------
         observation: Observation
         """
-        return self.apply_transformations(self._get_raw_observation(idx))
+        return self._index_observation(self._transformed_data(), idx)
+
+    @staticmethod
+    def _index_observation(observation, idx):
+        """Index the fields of an observation that the dataset stores."""
+        return Observation(
+            state=observation.state[idx],
+            action=observation.action[idx],
+            reward=observation.reward[idx],
+            next_state=observation.next_state[idx],
+            done=observation.done[idx],
+            log_prob_action=observation.log_prob_action[idx],
+        )
 
     def sample_batch(self, batch_size):
         """Sample a batch of data with a given size."""
@@ -147,7 +176,7 @@ class OfflineDataset(Dataset):
     @property
     def all_data(self):
         """Get all the transformed data."""
-        return self.apply_transformations(self.all_raw)
+        return Observation(*self._transformed_data())
 
     @property
     def all_raw(self):
@@ -1,6 +1,6 @@
 """An Offline dataset is intended for an offline rl algorithm to use."""
 
-from typing import Dict, Iterator, List, Optional, Tuple, Type, TypeVar, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, TypeVar, Union
 
 import numpy as np
 import torch
@@ -8,7 +8,7 @@ import torch.nn as nn
 from torch.utils.data.dataset import Dataset
 
 from .datatypes import Array, Index, Observation
-from .transforms import AbstractTransform
+from .transforms import AbstractTransform, ComposedTransform
 
 T = TypeVar("T", bound="OfflineDataset")
 
@@ -18,7 +18,8 @@ class OfflineDataset(Dataset):
     num_memory_steps: int
     indexes: torch.Tensor
     dataset: Observation
-    transformations: List[AbstractTransform]
+    _transform: ComposedTransform
+    _transformed: Optional[Tuple[int, Observation]]
     bootstrap: bool
     max_len: int
     def __init__(
@@ -34,15 +35,25 @@ class OfflineDataset(Dataset):
     @num_bootstraps.setter
     def num_bootstraps(self, num_bootstraps: int) -> None: ...
     def __iter__(self) -> Iterator[Observation]: ...
+    def __getstate__(self) -> Dict[str, Any]: ...
     def __len__(self) -> int: ...
     def __getitem__(
         self, idx: Index
     ) -> Tuple[Dict[str, torch.Tensor], int, torch.Tensor]: ...
+    @property
+    def transformations(self) -> nn.ModuleList: ...
+    @transformations.setter
+    def transformations(
+        self, value: Union[List[AbstractTransform], nn.ModuleList]
+    ) -> None: ...
     def init_transformations(self) -> None: ...
     def apply_transformations(self, observation: Observation) -> Observation: ...
     def get_random_split(self, ratio: float) -> Tuple[Type[T], Type[T]]: ...
     def _get_raw_observation(self, idx: Index) -> Observation: ...
     def _get_observation(self, idx: Index) -> Observation: ...
+    def _transformed_data(self) -> Observation: ...
+    @staticmethod
+    def _index_observation(observation: Observation, idx: Index) -> Observation: ...
     def sample_batch(
         self, batch_size: int
     ) -> Tuple[Observation, Index, torch.Tensor]: ...
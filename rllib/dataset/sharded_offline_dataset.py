@@ -0,0 +1,547 @@
+"""An offline dataset that streams shards of transitions from the disk."""
+
+import os
+import queue
+import threading
+import zipfile
+from collections import deque
+from dataclasses import fields
+from functools import partial
+from glob import glob
+
+import numpy as np
+import torch
+from torch.utils.data import IterableDataset, get_worker_info
+
+from .datatypes import Observation
+from .transforms import ComposedTransform
+from .utilities import flatten_observation
+
+FIELDS = [field_.name for field_ in fields(Observation)]
+_DEFAULTS = Observation(state=None)
+
+
+def write_shards(observation, path, shard_size=100000, compress=False):
+    """Write the transitions of an observation as `.npz' shards of a directory.
+
+    Parameters
+    ----------
+    observation: Observation
+        Observation whose fields have the transitions in the leading dimension, e.g.,
+        `OfflineDataset.dataset' or `ExperienceReplay.all_raw'. The default fields are
+        not written.
+    path: str
+        Directory of the shards.
+    shard_size: int, optional (default=100000).
+        Number of transitions of each shard.
+    compress: bool, optional (default=False).
+        Flag that indicates whether to compress the shards.
+
+    Returns
+    -------
+    shards: List[str]
+        Paths of the written shards.
+    """
+    os.makedirs(path, exist_ok=True)
+    arrays = {
+        name: torch.as_tensor(value).numpy()
+        for name, value, default in zip(FIELDS, observation, _DEFAULTS)
+        if value is not default
+    }
+    save = np.savez_compressed if compress else np.savez
+    num_transitions = arrays["state"].shape[0]
+    shards = []
+    for i, start in enumerate(range(0, num_transitions, shard_size)):
+        shard = os.path.join(path, f"shard_{i:06d}.npz")
+        save(shard, **{k: v[start : start + shard_size] for k, v in arrays.items()})
+        shards.append(shard)
+    return shards
+
+
+def load_shard(path, rows=None):
+    """Load the transitions of a shard.
+
+    A shard is either a `.npz' file or a directory of `.npy' files, with one array
+    per field of the observation. The `.npy' files are memory mapped, hence only the
+    selected rows are read.
+
+    Parameters
+    ----------
+    path: str
+        Path of the shard.
+    rows: np.ndarray, optional.
+        Indexes of the transitions to load. By default, load all the transitions.
+
+    Returns
+    -------
+    observation: Observation
+    """
+    if os.path.isdir(path):
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in FIELDS
+            if os.path.exists(os.path.join(path, f"{name}.npy"))
+        }
+    else:
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files if name in FIELDS}
+    if rows is not None:
+        arrays = {name: array[rows] for name, array in arrays.items()}
+    return Observation(
+        **{
+            name: torch.as_tensor(np.ascontiguousarray(array))
+            for name, array in arrays.items()
+        }
+    )
+
+
+def shard_shape(path):
+    """Get the shape of the states of a shard without loading it."""
+    if os.path.isdir(path):
+        return np.load(os.path.join(path, "state.npy"), mmap_mode="r").shape
+    with zipfile.ZipFile(path) as archive, archive.open("state.npy") as file:
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, _, _ = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, _, _ = np.lib.format.read_array_header_2_0(file)
+    return shape
+
+
+def concatenate_observations(observations):
+    """Concatenate the transitions of observations along the leading dimension."""
+    return Observation(
+        *(
+            default if values[0] is default else torch.cat(values)
+            for values, default in zip(zip(*observations), _DEFAULTS)
+        )
+    )
+
+
+def _index_observation(observation, idx):
+    """Index the transitions of an observation, keeping the default fields."""
+    return Observation(
+        *(
+            value if value is default else value[idx]
+            for value, default in zip(observation, _DEFAULTS)
+        )
+    )
+
+
+def _load_rows(shards, rows, offsets, index):
+    """Load the transitions of a shard and their indexes in the dataset."""
+    observation = load_shard(shards[index], rows=rows[index])
+    return observation, np.arange(offsets[index], offsets[index + 1])
+
+
+class _Prefetcher(object):
+    """Iterator that loads shards in a background thread, ahead of their use.
+
+    Parameters
+    ----------
+    load: Callable[[int], Any].
+        Function that loads a shard.
+    order: Iterable[int].
+        Indexes of the shards to load, possibly infinite.
+    num_prefetch: int.
+        Maximum number of loaded shards that wait to be used.
+    """
+
+    def __init__(self, load, order, num_prefetch):
+        self._queue = queue.Queue(maxsize=num_prefetch)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(load, order))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _put(self, item):
+        """Put an item in the queue, unless the prefetcher is closed."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, load, order):
+        """Load the shards and put them in the queue."""
+        try:
+            for index in order:
+                if not self._put((index, load(index))):
+                    return
+        except Exception as exception:
+            self._put(exception)
+            return
+        self._put(None)
+
+    def __iter__(self):
+        """Return the iterator."""
+        return self
+
+    def __next__(self):
+        """Return the index and the data of the next shard."""
+        item = self._queue.get()
+        if item is None:
+            raise StopIteration
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def close(self):
+        """Stop the loading thread."""
+        self._stop.set()
+        self._thread.join()
+
+
+class ShardedOfflineDataset(IterableDataset):
+    """Offline dataset that streams shards of transitions from the disk.
+
+    The dataset holds a window of shards in memory, whose size is at least
+    `shuffle_window' transitions, while a background thread prefetches the next
+    shards. `sample_batch' samples from the window and replaces its oldest shard
+    after drawing as many transitions as the window has, and `batches' iterates an
+    epoch, shuffling the transitions across the window. The transformations are
+    applied to each batch.
+
+    The bootstrap weights of a shard are sampled when the shard is loaded, from a
+    generator seeded with the shard index. Hence, the weights of a transition do not
+    change between epochs and changing `num_bootstraps' does not sample the weights
+    of the whole dataset.
+
+    Parameters
+    ----------
+    path: str or List[str].
+        Directory of the shards, or list of the paths of the shards. A shard is either
+        a `.npz' file or a directory of `.npy' files, see `load_shard'.
+    transformations: list of transforms.AbstractTransform, optional.
+        Transformations of the batches.
+    num_bootstraps: int, optional (default=1).
+        Number of bootstrap weights of each transition.
+    bootstrap: bool, optional (default=True).
+        Flag that indicates whether to sample Poisson(1) bootstrap weights.
+    shuffle_window: int, optional (default=100000).
+        Minimum number of transitions in memory that are shuffled together.
+    num_prefetch: int, optional (default=2).
+        Number of shards that are loaded ahead of their use. With zero, the shards are
+        loaded when they are needed, without a background thread.
+    seed: int, optional (default=0).
+        Seed of the bootstrap weights.
+    init_transformations: bool, optional (default=True).
+        Flag that indicates whether to update the transformations with a pass through
+        the dataset.
+    splits: Tuple[Tuple[int, float, bool]], optional.
+        Random splits of the transitions, as (seed, ratio, train) tuples, see
+        `get_random_split'.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from rllib.dataset.utilities import stack_list_of_tuples
+    >>> observation = stack_list_of_tuples(
+    ...     [Observation.random_example(dim_state=(3,)) for _ in range(100)]
+    ... )
+    >>> directory = tempfile.mkdtemp()
+    >>> shards = write_shards(observation, directory, shard_size=30)
+    >>> dataset = ShardedOfflineDataset(directory, shuffle_window=50)
+    >>> len(dataset), len(dataset.shards)
+    (100, 4)
+    >>> batch, idx, weights = dataset.sample_batch(32)
+    >>> batch.state.shape, weights.shape
+    (torch.Size([32, 3]), torch.Size([32, 1]))
+    >>> sum(len(idx) for _, idx, _ in dataset.batches(batch_size=32))
+    100
+    >>> dataset.close()
+    """
+
+    def __init__(
+        self,
+        path,
+        transformations=(),
+        num_bootstraps=1,
+        bootstrap=True,
+        shuffle_window=100000,
+        num_prefetch=2,
+        seed=0,
+        init_transformations=True,
+        splits=(),
+    ):
+        super().__init__()
+        if isinstance(path, str):
+            shards = glob(os.path.join(path, "*.npz"))
+            shards += [p for p in glob(os.path.join(path, "*")) if os.path.isdir(p)]
+            path = sorted(shards)
+        self.shards = list(path)
+        if not self.shards:
+            raise ValueError("There are no shards in the dataset.")
+
+        self.splits = tuple(splits)
+        self.seed = seed
+        self.bootstrap = bootstrap
+        self._num_bootstraps = num_bootstraps
+        self.shuffle_window = shuffle_window
+        self.num_prefetch = num_prefetch
+        self.transformations = transformations
+
+        self._rows = [self._get_rows(i) for i in range(len(self.shards))]
+        lengths = [
+            shard_shape(shard)[0] if rows is None else len(rows)
+            for shard, rows in zip(self.shards, self._rows)
+        ]
+        self.offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+
+        self._stream = None  # Loaded shards that `sample_batch' uses.
+        self._window = deque()
+        self._window_length = 0
+        self._window_data = None
+        self._num_samples = 0
+
+        if init_transformations:
+            self.init_transformations()
+
+    def __len__(self):
+        """Get the number of transitions."""
+        return int(self.offsets[-1])
+
+    def __iter__(self):
+        """Iterate through the transformed transitions, in shuffled order."""
+        for observation, _, _ in self.batches(batch_size=1024):
+            for i in range(len(observation.state)):
+                yield _index_observation(observation, i)
+
+    def __del__(self):
+        """Stop prefetching the shards."""
+        self.close()
+
+    @property
+    def num_bootstraps(self):
+        """Get the number of bootstraps."""
+        return self._num_bootstraps
+
+    @num_bootstraps.setter
+    def num_bootstraps(self, num_bootstraps):
+        """Set the number of bootstraps, sampling the weights lazily."""
+        self._num_bootstraps = num_bootstraps
+        self._window_data = None
+
+    @property
+    def transformations(self):
+        """Return the list of transformations."""
+        return self._transform.transformations
+
+    @transformations.setter
+    def transformations(self, value):
+        """Set the transformations."""
+        self._transform = ComposedTransform(value)
+
+    def init_transformations(self):
+        """Update the transformations with a pass through the shards."""
+        if not len(self.transformations):
+            return
+        for _, observation, _ in self._load_shards(range(len(self.shards))):
+            self._transform.update(flatten_observation(observation))
+
+    def apply_transformations(self, observation):
+        """Apply transformations to observation."""
+        return self._transform(observation)
+
+    def get_random_split(self, ratio):
+        """Get a random split of the dataset.
+
+        Each transition belongs to the training set with probability `ratio', hence
+        the sizes of the splits are random. The splits do not read the shards.
+        """
+        seed = np.random.randint(2 ** 31)
+        train_set, validation_set = [
+            ShardedOfflineDataset(
+                self.shards,
+                transformations=self.transformations,
+                num_bootstraps=self.num_bootstraps,
+                bootstrap=self.bootstrap,
+                shuffle_window=self.shuffle_window,
+                num_prefetch=self.num_prefetch,
+                seed=self.seed,
+                init_transformations=False,
+                splits=self.splits + ((seed, ratio, train),),
+            )
+            for train in (True, False)
+        ]
+        return train_set, validation_set
+
+    def sample_batch(self, batch_size):
+        """Sample a batch of transitions from the window of shards.
+
+        Returns
+        -------
+        observation: Observation
+            Transformed transitions.
+        idx: np.ndarray
+            Indexes of the transitions in the dataset.
+        weights: torch.Tensor
+            Bootstrap weights of the transitions.
+        """
+        if self._stream is None:
+            self._stream = self._load_shards(self._shard_order())
+            self._fill_window()
+        elif self._num_samples >= self._window_length:
+            if len(self._window) < len(self.shards):
+                self._window_length -= len(self._window.popleft()[2])
+                self._fill_window()
+            self._num_samples = 0
+        if self._window_data is None:
+            observations, idx = zip(*[shard[1:] for shard in self._window])
+            idx = np.concatenate(idx)
+            weights = torch.cat([self._get_weights(shard[0]) for shard in self._window])
+            self._window_data = concatenate_observations(observations), idx, weights
+
+        observation, idx, weights = self._window_data
+        i = torch.randint(len(idx), (batch_size,))
+        self._num_samples += batch_size
+        observation = self.apply_transformations(_index_observation(observation, i))
+        return observation, idx[i.numpy()], weights[i]
+
+    def batches(self, batch_size, drop_last=False):
+        """Iterate through an epoch of the dataset in batches.
+
+        The order of the shards is random and the transitions are shuffled across
+        the window. In the workers of a DataLoader, each worker iterates through a
+        different subset of the shards.
+
+        Parameters
+        ----------
+        batch_size: int
+            Number of transitions of each batch.
+        drop_last: bool, optional (default=False).
+            Flag that indicates whether to drop the last batch if it is incomplete.
+
+        Yields
+        ------
+        observation: Observation
+            Transformed transitions.
+        idx: np.ndarray
+            Indexes of the transitions in the dataset.
+        weights: torch.Tensor
+            Bootstrap weights of the transitions.
+        """
+        order = np.random.permutation(len(self.shards))
+        worker_info = get_worker_info()
+        if worker_info is not None:
+            order = order[worker_info.id :: worker_info.num_workers]
+
+        buffer = None
+        for index, observation, idx in self._load_shards(order):
+            shard = observation, idx, self._get_weights(index)
+            if buffer is not None:
+                shard = (
+                    concatenate_observations([buffer[0], shard[0]]),
+                    np.concatenate((buffer[1], shard[1])),
+                    torch.cat((buffer[2], shard[2])),
+                )
+            buffer = self._shuffle(shard)
+            num_ready = len(buffer[1]) - self.shuffle_window
+            num_ready = max(num_ready // batch_size, 0) * batch_size
+            yield from self._split_batches(buffer, num_ready, batch_size)
+            buffer = self._slice(buffer, num_ready, len(buffer[1]))
+
+        if buffer is not None:
+            num_ready = len(buffer[1])
+            if drop_last:
+                num_ready = num_ready // batch_size * batch_size
+            yield from self._split_batches(buffer, num_ready, batch_size)
+
+    def close(self):
+        """Stop prefetching the shards for `sample_batch'."""
+        stream = getattr(self, "_stream", None)
+        if stream is not None:
+            stream.close()
+        self._stream = None
+        self._window = deque()
+        self._window_length = 0
+        self._window_data = None
+        self._num_samples = 0
+
+    def _split_batches(self, data, num_transitions, batch_size):
+        """Yield the transformed batches of the first transitions of the data."""
+        for start in range(0, num_transitions, batch_size):
+            end = min(start + batch_size, num_transitions)
+            observation, idx, weights = self._slice(data, start, end)
+            yield self.apply_transformations(observation), idx, weights
+
+    @staticmethod
+    def _slice(data, start, end):
+        """Slice the observation, the indexes and the weights of a buffer."""
+        observation, idx, weights = data
+        observation = _index_observation(observation, slice(start, end))
+        return observation, idx[start:end], weights[start:end]
+
+    @staticmethod
+    def _shuffle(data):
+        """Shuffle the observation, the indexes and the weights of a buffer."""
+        observation, idx, weights = data
+        permutation = np.random.permutation(len(idx))
+        return (
+            _index_observation(observation, torch.as_tensor(permutation)),
+            idx[permutation],
+            weights[permutation],
+        )
+
+    def _shard_order(self):
+        """Iterate through the shards in a random order, repeating the epochs."""
+        while True:
+            yield from np.random.permutation(len(self.shards)).tolist()
+
+    def _fill_window(self):
+        """Load shards until the window has enough transitions."""
+        while self._window_length < self.shuffle_window or not self._window:
+            if len(self._window) == len(self.shards):
+                break
+            shard = next(self._stream)
+            self._window.append(shard)
+            self._window_length += len(shard[2])
+        self._window_data = None
+
+    def _load_shards(self, order):
+        """Load the shards in order, prefetching them if `num_prefetch' is positive.
+
+        Yields
+        ------
+        index: int
+            Index of the shard.
+        observation: Observation
+            Raw transitions of the shard.
+        idx: np.ndarray
+            Indexes of the transitions in the dataset.
+        """
+        # The loading thread does not hold a reference to the dataset.
+        load = partial(_load_rows, self.shards, self._rows, self.offsets)
+        if self.num_prefetch <= 0:
+            for index in order:
+                yield (index, *load(index))
+            return
+
+        prefetcher = _Prefetcher(load, order, self.num_prefetch)
+        try:
+            for index, (observation, idx) in prefetcher:
+                yield index, observation, idx
+        finally:
+            prefetcher.close()
+
+    def _get_rows(self, index):
+        """Get the rows of a shard that belong to the splits of the dataset."""
+        if not self.splits:
+            return None
+        rows = np.arange(shard_shape(self.shards[index])[0])
+        for seed, ratio, train in self.splits:
+            generator = np.random.default_rng((seed, index))
+            mask = generator.random(len(rows)) < ratio
+            rows = rows[mask if train else ~mask]
+        return rows
+
+    def _get_weights(self, index):
+        """Get the bootstrap weights of the transitions of a shard."""
+        length = int(self.offsets[index + 1] - self.offsets[index])
+        if not self.bootstrap:
+            return torch.ones(length, self.num_bootstraps)
+        generator = np.random.default_rng((self.seed, index))
+        weights = generator.poisson(1.0, size=(length, self.num_bootstraps))
+        return torch.as_tensor(weights, dtype=torch.get_default_dtype())
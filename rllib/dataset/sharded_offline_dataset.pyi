@@ -0,0 +1,120 @@
+import queue
+import threading
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import IterableDataset
+
+from .datatypes import Observation
+from .transforms import AbstractTransform, ComposedTransform
+
+FIELDS: List[str]
+_DEFAULTS: Observation
+
+Shard = Tuple[int, Observation, np.ndarray]
+Batch = Tuple[Observation, np.ndarray, torch.Tensor]
+
+def write_shards(
+    observation: Observation,
+    path: str,
+    shard_size: int = ...,
+    compress: bool = ...,
+) -> List[str]: ...
+def load_shard(path: str, rows: Optional[np.ndarray] = ...) -> Observation: ...
+def shard_shape(path: str) -> Tuple[int, ...]: ...
+def concatenate_observations(observations: Sequence[Observation]) -> Observation: ...
+def _index_observation(observation: Observation, idx: Any) -> Observation: ...
+def _load_rows(
+    shards: List[str],
+    rows: List[Optional[np.ndarray]],
+    offsets: np.ndarray,
+    index: int,
+) -> Tuple[Observation, np.ndarray]: ...
+
+class _Prefetcher(object):
+    _queue: queue.Queue
+    _stop: threading.Event
+    _thread: threading.Thread
+    def __init__(
+        self, load: Callable[[int], Any], order: Iterable[int], num_prefetch: int
+    ) -> None: ...
+    def _put(self, item: Any) -> bool: ...
+    def _run(self, load: Callable[[int], Any], order: Iterable[int]) -> None: ...
+    def __iter__(self) -> _Prefetcher: ...
+    def __next__(self) -> Tuple[int, Any]: ...
+    def close(self) -> None: ...
+
+class ShardedOfflineDataset(IterableDataset):
+    shards: List[str]
+    splits: Tuple[Tuple[int, float, bool], ...]
+    seed: int
+    bootstrap: bool
+    _num_bootstraps: int
+    shuffle_window: int
+    num_prefetch: int
+    _transform: ComposedTransform
+    _rows: List[Optional[np.ndarray]]
+    offsets: np.ndarray
+    _stream: Optional[Iterator[Shard]]
+    _window: Deque[Shard]
+    _window_length: int
+    _window_data: Optional[Batch]
+    _num_samples: int
+    def __init__(
+        self,
+        path: Union[str, List[str]],
+        transformations: Union[List[AbstractTransform], nn.ModuleList] = ...,
+        num_bootstraps: int = ...,
+        bootstrap: bool = ...,
+        shuffle_window: int = ...,
+        num_prefetch: int = ...,
+        seed: int = ...,
+        init_transformations: bool = ...,
+        splits: Sequence[Tuple[int, float, bool]] = ...,
+    ) -> None: ...
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[Observation]: ...
+    def __del__(self) -> None: ...
+    @property
+    def num_bootstraps(self) -> int: ...
+    @num_bootstraps.setter
+    def num_bootstraps(self, num_bootstraps: int) -> None: ...
+    @property
+    def transformations(self) -> nn.ModuleList: ...
+    @transformations.setter
+    def transformations(
+        self, value: Union[List[AbstractTransform], nn.ModuleList]
+    ) -> None: ...
+    def init_transformations(self) -> None: ...
+    def apply_transformations(self, observation: Observation) -> Observation: ...
+    def get_random_split(
+        self, ratio: float
+    ) -> Tuple[ShardedOfflineDataset, ShardedOfflineDataset]: ...
+    def sample_batch(self, batch_size: int) -> Batch: ...
+    def batches(self, batch_size: int, drop_last: bool = ...) -> Iterator[Batch]: ...
+    def close(self) -> None: ...
+    def _split_batches(
+        self, data: Batch, num_transitions: int, batch_size: int
+    ) -> Iterator[Batch]: ...
+    @staticmethod
+    def _slice(data: Batch, start: int, end: int) -> Batch: ...
+    @staticmethod
+    def _shuffle(data: Batch) -> Batch: ...
+    def _shard_order(self) -> Iterator[int]: ...
+    def _fill_window(self) -> None: ...
+    def _load_shards(self, order: Iterable[int]) -> Iterator[Shard]: ...
+    def _get_rows(self, index: int) -> Optional[np.ndarray]: ...
+    def _get_weights(self, index: int) -> torch.Tensor: ...
@@ -160,3 +160,64 @@ def test_initial_states(dataset):
 
     initial_states = dataset.initial_states
     assert initial_states.shape == (num_episodes, state_dim)
+
+
+def get_ragged_dataset(lengths):
+    dataset = TrajectoryDataset()
+    start = 0
+    for length in lengths:
+        state = torch.arange(start, start + length).float().unsqueeze(-1)
+        dataset.append(
+            Observation(
+                state=state,
+                action=torch.randn(length, 2),
+                reward=torch.randn(length),
+                next_state=state + 1,
+                done=torch.zeros(length),
+            )
+        )
+        start += length
+    return dataset
+
+
+def test_sample_batch():
+    lengths = [10, 3, 7, 25]
+    dataset = get_ragged_dataset(lengths)
+    dataset.sequence_length = 4
+    batch = dataset.sample_batch(64)
+    assert batch.state.shape == torch.Size([64, 4, 1])
+    assert batch.reward.shape == torch.Size([64, 4])
+    assert batch.log_prob_action.shape == torch.Size([64, 4])
+
+    # The windows are consecutive and do not cross the end of a trajectory.
+    ends = np.cumsum(lengths)
+    state = batch.state.squeeze(-1)
+    torch.testing.assert_allclose(state[:, 1:] - state[:, :-1], torch.ones(64, 3))
+    first, last = state[:, 0].numpy(), state[:, -1].numpy()
+    assert (np.searchsorted(ends, first, "right") == np.searchsorted(ends, last)).all()
+
+    assert dataset.sample_batch(8, sequence_length=10).state.shape[:2] == (8, 10)
+    with pytest.raises(ValueError):
+        TrajectoryDataset().sample_batch(8)
+
+
+def test_sequence_length_ragged():
+    lengths = [10, 3, 7, 25]
+    dataset = get_ragged_dataset(lengths)
+    for sequence_length in [1, 3, 4, 8]:
+        dataset.sequence_length = sequence_length
+        expected = []
+        for start, length in zip(np.cumsum([0] + lengths), lengths):
+            if length >= sequence_length:
+                sub_indexes = dataset._get_subindexes(length, sequence_length)
+                expected += [start + sub_index for sub_index in sub_indexes]
+        assert [dataset[i].state[0].item() for i in range(len(dataset))] == expected
+
+
+def test_all_data_view():
+    dataset = get_ragged_dataset([10, 3, 7])
+    all_data = dataset.all_data
+    assert all_data.state.shape == torch.Size([20, 1])
+    assert all_data.state.data_ptr() == dataset.all_data.state.data_ptr()
+    torch.testing.assert_allclose(all_data.state.squeeze(-1), torch.arange(20.0))
+    np.testing.assert_allclose(dataset.initial_states, [[0.0], [10.0], [13.0]])
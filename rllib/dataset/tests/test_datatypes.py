@@ -119,3 +119,30 @@ class TestObservation(object):
         for x, x1 in zip(o, o1):
             assert Observation._is_equal_nan(x, x1)
             assert x is not x1
+
+    def test_clone_defaults(self):
+        state, action, reward, next_state, done = self.init()
+        o = Observation(state, action, reward, next_state, done)
+        o1 = o.clone()
+        assert o1.state is not o.state
+        torch.testing.assert_allclose(o1.done, torch.tensor(0.0))
+        # The default fields share the same NaN tensor.
+        assert o1.next_action is o.next_action
+        assert o1.next_action is Observation(state).next_action
+        assert torch.isnan(o1.next_action)
+
+    def test_conversions(self):
+        state, action, reward, next_state, done = self.init()
+        o = Observation(state, action, reward, next_state, done).to_torch()
+        assert o.to_torch() is o
+        assert o.to("cpu") is o
+        o64 = o.to(torch.float64)
+        assert o64 is not o
+        assert o64.state.dtype is torch.float64
+
+    def test_shape(self):
+        state, action, reward, next_state, done = self.init()
+        assert Observation(state, action, reward, next_state, done).shape == ()
+        o = Observation(torch.randn(5, 3, 4), reward=torch.randn(5, 3, 1))
+        assert o.shape == (5, 3)
+        assert Observation(torch.randn(5, 3, 4)).shape == (5, 3)
@@ -0,0 +1,153 @@
+import os
+
+import numpy as np
+import pytest
+import torch
+
+from rllib.dataset import ShardedOfflineDataset, write_shards
+from rllib.dataset.datatypes import Observation
+from rllib.dataset.sharded_offline_dataset import load_shard, shard_shape
+from rllib.dataset.transforms import StateNormalizer
+from rllib.dataset.utilities import stack_list_of_tuples
+
+NUM_TRANSITIONS = 250
+SHARD_SIZE = 40
+
+
+@pytest.fixture(params=[0, 2])
+def num_prefetch(request):
+    return request.param
+
+
+@pytest.fixture
+def observation():
+    return stack_list_of_tuples(
+        [
+            Observation.random_example(dim_state=(3,), dim_action=(2,))
+            for _ in range(NUM_TRANSITIONS)
+        ]
+    )
+
+
+@pytest.fixture
+def directory(observation, tmp_path):
+    write_shards(observation, str(tmp_path), shard_size=SHARD_SIZE)
+    return str(tmp_path)
+
+
+def test_write_and_load(observation, directory):
+    shards = sorted(os.listdir(directory))
+    assert len(shards) == 7
+    shard = os.path.join(directory, shards[1])
+    assert shard_shape(shard) == (SHARD_SIZE, 3)
+
+    loaded = load_shard(shard, rows=np.array([0, 5]))
+    torch.testing.assert_allclose(loaded.state, observation.state[[40, 45]])
+    torch.testing.assert_allclose(loaded.reward, observation.reward[[40, 45]])
+    assert torch.isnan(loaded.next_action).all()
+
+
+def test_npy_shards(observation, tmp_path):
+    shard = os.path.join(str(tmp_path), "shard")
+    os.makedirs(shard)
+    for name in ["state", "action", "reward", "next_state", "done"]:
+        np.save(os.path.join(shard, f"{name}.npy"), getattr(observation, name).numpy())
+
+    dataset = ShardedOfflineDataset(str(tmp_path))
+    assert len(dataset) == NUM_TRANSITIONS
+    batch, idx, weights = dataset.sample_batch(16)
+    torch.testing.assert_allclose(batch.state, observation.state[idx])
+    dataset.close()
+
+
+def test_sample_batch(observation, directory, num_prefetch):
+    dataset = ShardedOfflineDataset(
+        directory, shuffle_window=100, num_prefetch=num_prefetch, num_bootstraps=4
+    )
+    assert len(dataset) == NUM_TRANSITIONS
+
+    sampled = set()
+    for _ in range(100):
+        batch, idx, weights = dataset.sample_batch(32)
+        assert batch.state.shape == torch.Size([32, 3])
+        assert weights.shape == torch.Size([32, 4])
+        assert dataset._window_length < 100 + SHARD_SIZE
+        torch.testing.assert_allclose(batch.state, observation.state[idx])
+        sampled.update(idx.tolist())
+
+    # The window goes through all the shards.
+    assert len(sampled) > 0.9 * NUM_TRANSITIONS
+    dataset.close()
+
+
+def test_batches(observation, directory, num_prefetch):
+    dataset = ShardedOfflineDataset(
+        directory, shuffle_window=100, num_prefetch=num_prefetch
+    )
+    idx = []
+    for batch, batch_idx, weights in dataset.batches(batch_size=32):
+        torch.testing.assert_allclose(batch.action, observation.action[batch_idx])
+        idx.append(batch_idx)
+    assert [len(i) for i in idx] == [32] * 7 + [26]
+    assert sorted(np.concatenate(idx).tolist()) == list(range(NUM_TRANSITIONS))
+    assert np.any(np.concatenate(idx) != np.arange(NUM_TRANSITIONS))
+
+    num_batches = len(list(dataset.batches(batch_size=32, drop_last=True)))
+    assert num_batches == NUM_TRANSITIONS // 32
+    assert len(list(dataset)) == NUM_TRANSITIONS
+
+
+def test_bootstrap_weights(directory):
+    dataset = ShardedOfflineDataset(directory, num_bootstraps=3, num_prefetch=0)
+    _, idx, weights = dataset.sample_batch(64)
+    _, other_idx, other_weights = dataset.sample_batch(64)
+
+    # The weights of a transition are the same every time that it is loaded.
+    for i, weight in zip(idx, weights):
+        if i in other_idx:
+            j = np.flatnonzero(other_idx == i)[0]
+            torch.testing.assert_allclose(weight, other_weights[j])
+
+    dataset.num_bootstraps = 5
+    assert dataset.sample_batch(64)[2].shape == torch.Size([64, 5])
+
+    dataset = ShardedOfflineDataset(directory, num_bootstraps=3, bootstrap=False)
+    _, _, weights = dataset.sample_batch(64)
+    torch.testing.assert_allclose(weights, torch.ones(64, 3))
+    dataset.close()
+
+
+def test_transformations(observation, directory):
+    dataset = ShardedOfflineDataset(
+        directory, transformations=[StateNormalizer(dim=(3,))]
+    )
+    normalizer = dataset.transformations[0]._normalizer
+    torch.testing.assert_allclose(normalizer.mean, observation.state.mean(0))
+    torch.testing.assert_allclose(normalizer.variance, observation.state.var(0))
+
+    batch, idx, _ = dataset.sample_batch(32)
+    torch.testing.assert_allclose(batch.state, normalizer(observation.state[idx]))
+    dataset.close()
+
+
+def test_random_split(directory):
+    dataset = ShardedOfflineDataset(directory)
+    train_set, validation_set = dataset.get_random_split(0.8)
+    assert len(train_set) + len(validation_set) == NUM_TRANSITIONS
+    assert 150 < len(train_set) < 240
+
+    states = [
+        torch.cat([batch.state for batch, _, _ in split.batches(batch_size=64)])
+        for split in (train_set, validation_set)
+    ]
+    assert len(states[0]) == len(train_set)
+    all_states = torch.cat(states)
+    assert len(torch.unique(all_states, dim=0)) == NUM_TRANSITIONS
+
+    train_train, train_validation = train_set.get_random_split(0.5)
+    assert len(train_train) + len(train_validation) == len(train_set)
+
+
+def test_empty_directory(tmp_path):
+    with pytest.raises(ValueError):
+        ShardedOfflineDataset(str(tmp_path))
@@ -1,6 +1,7 @@
 from .abstract_transform import AbstractTransform
 from .angle_wrapper import AngleWrapper
 from .clipper import ActionClipper, RewardClipper
+from .composed_transform import ComposedTransform
 from .mean_function import DeltaState, MeanFunction
 from .next_state_clamper import NextStateClamper
 from .normalizer import (
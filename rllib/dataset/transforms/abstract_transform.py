@@ -20,8 +20,27 @@ class AbstractTransform(nn.Module, metaclass=ABCMeta):
     update(observation):
         update the parameters of the transformer.
 
+    Properties
+    ----------
+    version: int
+        counter that changes whenever the parameters of the transformer change.
+        Transformers with statistics increment `_num_updates' when they update them,
+        so that the datasets can cache the transformed data. Transformers whose
+        output changes otherwise, e.g., with parameters that are trained, must also
+        increment it. The transformers with trainable parameters are never cached,
+        see `ComposedTransform.version'.
+
     """
 
+    def __init__(self):
+        super().__init__()
+        self._num_updates = 0
+
+    @property
+    def version(self):
+        """Return a counter that changes whenever the parameters change."""
+        return self._num_updates
+
     def forward(self, observation: Observation):
         """Apply transformation to observation tuple.
 
@@ -6,6 +6,10 @@ import torch.nn as nn
 from rllib.dataset.datatypes import Observation
 
 class AbstractTransform(nn.Module, metaclass=ABCMeta):
+    _num_updates: int
+    def __init__(self) -> None: ...
+    @property
+    def version(self) -> int: ...
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
     def update(self, observation: Observation) -> None: ...
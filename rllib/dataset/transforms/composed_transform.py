@@ -0,0 +1,75 @@
+"""Implementation of a Transformation that composes a sequence of transforms."""
+
+import torch.jit
+import torch.nn as nn
+
+from rllib.dataset.datatypes import Observation
+
+from .abstract_transform import AbstractTransform
+
+
+class ComposedTransform(AbstractTransform):
+    """Implementation of a transformer that applies a sequence of transformers.
+
+    The transformers are applied in order and inverted in reverse order, in a single
+    call on a batch of observations. They modify a shallow copy of the observation,
+    hence the observation of the caller is not modified.
+
+    The version of the composed transformer changes whenever one of the transformers
+    changes, which lets the datasets cache the transformed data. It is None if a
+    transformer has trainable parameters, which change without an update, and then
+    the transformed data is not cached.
+
+    Parameters
+    ----------
+    transformations: list of AbstractTransform, optional.
+        Transformers to compose. They are shared, not copied.
+
+    Examples
+    --------
+    >>> import torch
+    >>> from rllib.dataset.transforms import RewardClipper, RewardNormalizer
+    >>> transform = ComposedTransform([RewardClipper(), RewardNormalizer()])
+    >>> observation = Observation(state=torch.randn(32, 2), reward=torch.randn(32, 1))
+    >>> version = transform.version
+    >>> transform.update(observation)
+    >>> transform.version == version
+    False
+    >>> transform(observation) is observation
+    False
+    """
+
+    def __init__(self, transformations=()):
+        super().__init__()
+        self.transformations = nn.ModuleList(transformations)
+
+    @property
+    def version(self):
+        """Return a counter that changes whenever a transformer changes."""
+        if any(parameter.requires_grad for parameter in self.parameters()):
+            return None
+        return sum(transformation.version for transformation in self.transformations)
+
+    def forward(self, observation):
+        """See `AbstractTransform.__call__'."""
+        observation = Observation(*observation)
+        for transformation in self.transformations:
+            observation = transformation(observation)
+        return observation
+
+    @torch.jit.export
+    def inverse(self, observation):
+        """See `AbstractTransform.inverse'."""
+        observation = Observation(*observation)
+        for transformation in reversed(self.transformations):
+            observation = transformation.inverse(observation)
+        return observation
+
+    @torch.jit.export
+    def update(self, observation):
+        """Update each transformer with the output of the previous transformers."""
+        observation = Observation(*observation)
+        for i, transformation in enumerate(self.transformations):
+            transformation.update(observation)
+            if i + 1 < len(self.transformations):
+                observation = transformation(observation)
@@ -0,0 +1,16 @@
+from typing import Iterable, Optional
+
+import torch.nn as nn
+
+from rllib.dataset.datatypes import Observation
+
+from .abstract_transform import AbstractTransform
+
+class ComposedTransform(AbstractTransform):
+    transformations: nn.ModuleList
+    def __init__(self, transformations: Iterable[AbstractTransform] = ...) -> None: ...
+    @property
+    def version(self) -> Optional[int]: ...
+    def forward(self, observation: Observation) -> Observation: ...
+    def inverse(self, observation: Observation) -> Observation: ...
+    def update(self, observation: Observation) -> None: ...
@@ -4,13 +4,41 @@ import torch
 import torch.jit
 import torch.nn as nn
 
-from rllib.dataset.transforms.utilities import rescale, update_mean, update_var
+from rllib.dataset.transforms.utilities import rescale
 
 from .abstract_transform import AbstractTransform
 
 
 class Normalizer(nn.Module):
-    """Normalizer Class."""
+    """Normalizer with running statistics that are updated in place.
+
+    The statistics of a batch of data are merged with the running statistics with
+    the parallel algorithm of Chan et al., hence an update with a batch of data is
+    exact and the statistics of different workers or shards can be merged exactly.
+    A frozen normalizer does not update its statistics.
+
+    Parameters
+    ----------
+    dim: Tuple[int], optional (default=(1,)).
+        Shape of the normalized data.
+    preserve_origin: bool, optional (default=False)
+        preserve the origin when rescaling.
+
+    References
+    ----------
+    Chan, T. F., Golub, G. H., & LeVeque, R. J. (1979).
+    Updating formulae and a pairwise algorithm for computing sample variances.
+
+    Examples
+    --------
+    >>> data = torch.randn(100, 3)
+    >>> normalizer, shard = Normalizer(dim=(3,)), Normalizer(dim=(3,))
+    >>> normalizer.update(data[:60])
+    >>> shard.update(data[60:])
+    >>> normalizer.merge(shard)
+    >>> torch.allclose(normalizer.variance, data.var(0))
+    True
+    """
 
     preserve_orign: bool
 
@@ -18,52 +46,135 @@ class Normalizer(nn.Module):
         super().__init__()
         self.mean = nn.Parameter(torch.zeros(dim), requires_grad=False)
         self.variance = nn.Parameter(torch.ones(dim), requires_grad=False)
-        self.count = torch.tensor(0.0)
+        self.count = 0.0
         self.preserve_origin = preserve_origin
+        self.frozen = False
+        self.num_updates = 0
+
+    @property
+    def std(self):
+        """Return the standard deviation, replacing too small variances by one."""
+        variance = torch.where(
+            self.variance < 1e-6, torch.ones_like(self.variance), self.variance
+        )
+        return torch.sqrt(variance)
+
+    @property
+    def scale(self):
+        """Return the scale that divides the data."""
+        if self.preserve_origin:
+            return torch.sqrt(self.std ** 2 + self.mean ** 2)
+        return self.std
 
     def forward(self, array):
         """See `AbstractTransform.__call__'."""
         if self.preserve_origin:
-            scale = torch.sqrt(self.variance + self.mean ** 2)
-            return array / scale
+            return array / self.scale
         else:
-            return (array - self.mean) / torch.sqrt(self.variance)
+            return (array - self.mean) / self.scale
 
     @torch.jit.export
     def inverse(self, array):
         """See `AbstractTransform.inverse'."""
         if self.preserve_origin:
-            scale = torch.sqrt(self.variance + self.mean ** 2)
-            return array * scale
+            return array * self.scale
         else:
-            return self.mean + array * torch.sqrt(self.variance)
+            return self.mean + array * self.scale
 
     @torch.jit.export
     def update(self, array):
-        """See `AbstractTransform.update'."""
+        """Update the statistics with a batch of data, unless frozen.
+
+        A one-dimensional array is a single sample. The leading dimensions of the
+        other arrays are batch dimensions.
+        """
+        if self.frozen:
+            return
         while array.ndim <= 1:
             array = array.unsqueeze(0)
-        new_mean = torch.mean(array, 0)
-        new_var = torch.var(array, 0)
-        if torch.any(torch.isnan(new_var)):
-            new_var = torch.zeros_like(new_var)
-        new_count = torch.tensor(1.0) * torch.tensor(array.shape[0])
-        self.variance = nn.Parameter(
-            update_var(
-                self.mean, self.variance, self.count, new_mean, new_var, new_count
-            ),
-            requires_grad=False,
-        )
-        # If variance is too small, clamp the variance to 1.0
-        self.variance[self.variance < 1e-6] = 1.0
-        self.mean = nn.Parameter(
-            update_mean(self.mean, self.count, new_mean, new_count), requires_grad=False
-        )
+        array = array.reshape(-1, array.shape[-1])
+        if self.count == 0 and self.mean.shape != array.shape[1:]:
+            self.mean = nn.Parameter(torch.zeros_like(array[0]), requires_grad=False)
+            self.variance = nn.Parameter(torch.ones_like(array[0]), requires_grad=False)
+
+        variance, mean = torch.var_mean(array, 0, unbiased=False)
+        self._merge(array.shape[0], mean, variance * array.shape[0])
+
+    def merge(self, other):
+        """Merge the statistics of another normalizer, e.g., of another worker."""
+        if other.count > 1:
+            m2 = other.variance * (other.count - 1)
+        else:
+            m2 = torch.zeros_like(other.variance)
+        self._merge(other.count, other.mean, m2)
+
+    @torch.no_grad()
+    def _merge(self, count, mean, m2):
+        """Merge the count, mean and sum of squared deviations of other data."""
+        old_count, count = float(self.count), float(count)
+        if count == 0:
+            return
+        total = old_count + count
+        delta = mean - self.mean
+        m2 = torch.addcmul(m2, delta, delta, value=old_count * count / total)
+        if old_count > 1:
+            m2.add_(self.variance, alpha=old_count - 1)
+
+        self.mean.add_(delta, alpha=count / total)
+        if total > 1:
+            self.variance.copy_(m2.div_(total - 1))
+        self.count = total
+        self.num_updates += 1
+
+
+class NormalizerTransform(AbstractTransform):
+    """Transformer that normalizes an attribute with running statistics.
+
+    Parameters
+    ----------
+    dim: Tuple[int], optional (default=(1,)).
+        Shape of the attribute.
+    preserve_origin: bool, optional (default=False)
+        preserve the origin when rescaling.
+
+    Other Parameters
+    ----------------
+    attribute: str
+        Name of the normalized attribute of the observations.
+    """
+
+    attribute = ""
+
+    def __init__(self, dim=(1,), preserve_origin=False):
+        super().__init__()
+        self._normalizer = Normalizer(dim=dim, preserve_origin=preserve_origin)
+
+    @property
+    def version(self):
+        """Return the number of updates of the statistics."""
+        return self._normalizer.num_updates
+
+    @property
+    def frozen(self):
+        """Return whether the statistics are frozen."""
+        return self._normalizer.frozen
+
+    @frozen.setter
+    def frozen(self, value):
+        """Freeze or unfreeze the statistics."""
+        self._normalizer.frozen = value
 
-        self.count += new_count
+    @torch.jit.export
+    def update(self, observation):
+        """See `AbstractTransform.update'."""
+        self._normalizer.update(getattr(observation, self.attribute))
+
+    def merge(self, other):
+        """Merge the statistics of another transformer, e.g., of another worker."""
+        self._normalizer.merge(other._normalizer)
 
 
-class StateNormalizer(AbstractTransform):
+class StateNormalizer(NormalizerTransform):
     r"""Implementation of a transformer that normalizes the states.
 
     The state and next state of an observation are shifted by the mean and then are
@@ -79,13 +190,11 @@ class StateNormalizer(AbstractTransform):
 
     """
 
-    def __init__(self, dim=(1,), preserve_origin=False):
-        super().__init__()
-        self._normalizer = Normalizer(dim=dim, preserve_origin=preserve_origin)
+    attribute = "state"
 
     def forward(self, observation):
         """See `AbstractTransform.__call__'."""
-        scale = torch.diag_embed(1 / torch.sqrt(self._normalizer.variance))
+        scale = torch.diag_embed(1 / self._normalizer.std)
         observation.state = self._normalizer(observation.state)
         observation.state_scale_tril = rescale(observation.state_scale_tril, scale)
 
@@ -94,18 +203,13 @@ class StateNormalizer(AbstractTransform):
     @torch.jit.export
     def inverse(self, observation):
         """See `AbstractTransform.inverse'."""
-        inv_scale = torch.diag_embed(torch.sqrt(self._normalizer.variance))
+        inv_scale = torch.diag_embed(self._normalizer.std)
         observation.state = self._normalizer.inverse(observation.state)
         observation.state_scale_tril = rescale(observation.state_scale_tril, inv_scale)
         return observation
 
-    @torch.jit.export
-    def update(self, observation):
-        """See `AbstractTransform.update'."""
-        self._normalizer.update(observation.state)
-
 
-class NextStateNormalizer(AbstractTransform):
+class NextStateNormalizer(NormalizerTransform):
     r"""Implementation of a transformer that normalizes the next states.
 
     The next state of an observation is shifted by the mean and then re-scaled with the
@@ -121,13 +225,11 @@ class NextStateNormalizer(AbstractTransform):
 
     """
 
-    def __init__(self, dim=(1,), preserve_origin=False):
-        super().__init__()
-        self._normalizer = Normalizer(dim=dim, preserve_origin=preserve_origin)
+    attribute = "next_state"
 
     def forward(self, observation):
         """See `AbstractTransform.__call__'."""
-        scale = torch.diag_embed(1 / torch.sqrt(self._normalizer.variance))
+        scale = torch.diag_embed(1 / self._normalizer.std)
         observation.next_state = self._normalizer(observation.next_state)
         observation.next_state_scale_tril = rescale(
             observation.next_state_scale_tril, scale
@@ -137,29 +239,22 @@ class NextStateNormalizer(AbstractTransform):
     @torch.jit.export
     def inverse(self, observation):
         """See `AbstractTransform.inverse'."""
-        inv_scale = torch.diag_embed(torch.sqrt(self._normalizer.variance))
+        inv_scale = torch.diag_embed(self._normalizer.std)
         observation.next_state = self._normalizer.inverse(observation.next_state)
         observation.next_state_scale_tril = rescale(
             observation.next_state_scale_tril, inv_scale
         )
         return observation
 
-    @torch.jit.export
-    def update(self, observation):
-        """See `AbstractTransform.update'."""
-        self._normalizer.update(observation.next_state)
-
 
-class RewardNormalizer(AbstractTransform):
+class RewardNormalizer(NormalizerTransform):
     """Implementation of a transformer that normalizes the rewards."""
 
-    def __init__(self, dim=(1,), preserve_origin=False):
-        super().__init__()
-        self._normalizer = Normalizer(dim=dim, preserve_origin=preserve_origin)
+    attribute = "reward"
 
     def forward(self, observation):
         """See `AbstractTransform.__call__'."""
-        scale = torch.diag_embed(1 / torch.sqrt(self._normalizer.variance))
+        scale = torch.diag_embed(1 / self._normalizer.std)
         observation.reward = self._normalizer(observation.reward)
         observation.reward_scale_tril = rescale(observation.reward_scale_tril, scale)
         return observation
@@ -167,20 +262,15 @@ class RewardNormalizer(AbstractTransform):
     @torch.jit.export
     def inverse(self, observation):
         """See `AbstractTransform.inverse'."""
-        inv_scale = torch.diag_embed(torch.sqrt(self._normalizer.variance))
+        inv_scale = torch.diag_embed(self._normalizer.std)
         observation.reward = self._normalizer.inverse(observation.reward)
         observation.reward_scale_tril = rescale(
             observation.reward_scale_tril, inv_scale
         )
         return observation
 
-    @torch.jit.export
-    def update(self, observation):
-        """See `AbstractTransform.update'."""
-        self._normalizer.update(observation.reward)
-
 
-class ActionNormalizer(AbstractTransform):
+class ActionNormalizer(NormalizerTransform):
     """Implementation of a transformer that normalizes the action.
 
     The action of an observation is shifted by the mean and then re-scaled with the
@@ -196,9 +286,7 @@ class ActionNormalizer(AbstractTransform):
 
     """
 
-    def __init__(self, dim=(1,), preserve_origin=False):
-        super().__init__()
-        self._normalizer = Normalizer(dim=dim, preserve_origin=preserve_origin)
+    attribute = "action"
 
     def forward(self, observation):
         """See `AbstractTransform.__call__'."""
@@ -210,8 +298,3 @@ class ActionNormalizer(AbstractTransform):
         """See `AbstractTransform.inverse'."""
         observation.action = self._normalizer.inverse(observation.action)
         return observation
-
-    @torch.jit.export
-    def update(self, observation):
-        """See `AbstractTransform.update'."""
-        self._normalizer.update(observation.action)
@@ -1,4 +1,4 @@
-from typing import Any, Tuple
+from typing import Any, Tuple, Union
 
 import torch.nn as nn
 from torch import Tensor
@@ -10,37 +10,46 @@ from .abstract_transform import AbstractTransform
 class Normalizer(nn.Module):
     mean: Tensor
     variance: Tensor
-    count: Tensor
+    count: float
     preserve_origin: bool
-    def __init__(self, dim: Tuple, preserve_origin: bool = ...) -> None: ...
+    frozen: bool
+    num_updates: int
+    def __init__(self, dim: Tuple = ..., preserve_origin: bool = ...) -> None: ...
+    @property
+    def std(self) -> Tensor: ...
+    @property
+    def scale(self) -> Tensor: ...
     def forward(self, array: Tensor, **kwargs: Any) -> Tensor: ...
     def inverse(self, array: Tensor) -> Tensor: ...
     def update(self, array: Tensor) -> None: ...
+    def merge(self, other: Normalizer) -> None: ...
+    def _merge(self, count: Union[int, float], mean: Tensor, m2: Tensor) -> None: ...
 
-class StateNormalizer(AbstractTransform):
+class NormalizerTransform(AbstractTransform):
+    attribute: str
     _normalizer: Normalizer
-    def __init__(self, dim: Tuple, preserve_origin: bool = ...) -> None: ...
+    def __init__(self, dim: Tuple = ..., preserve_origin: bool = ...) -> None: ...
+    @property
+    def version(self) -> int: ...
+    @property
+    def frozen(self) -> bool: ...
+    @frozen.setter
+    def frozen(self, value: bool) -> None: ...
+    def update(self, observation: Observation) -> None: ...
+    def merge(self, other: NormalizerTransform) -> None: ...
+
+class StateNormalizer(NormalizerTransform):
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
-    def update(self, observation: Observation) -> None: ...
 
-class NextStateNormalizer(AbstractTransform):
-    _normalizer: Normalizer
-    def __init__(self, dim: Tuple, preserve_origin: bool = ...) -> None: ...
+class NextStateNormalizer(NormalizerTransform):
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
-    def update(self, observation: Observation) -> None: ...
 
-class ActionNormalizer(AbstractTransform):
-    _normalizer: Normalizer
-    def __init__(self, dim: Tuple, preserve_origin: bool = ...) -> None: ...
+class ActionNormalizer(NormalizerTransform):
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
-    def update(self, observation: Observation) -> None: ...
 
-class RewardNormalizer(AbstractTransform):
-    _normalizer: Normalizer
-    def __init__(self, dim: Tuple, preserve_origin: bool = ...) -> None: ...
+class RewardNormalizer(NormalizerTransform):
     def forward(self, observation: Observation, **kwargs: Any) -> Observation: ...
     def inverse(self, observation: Observation) -> Observation: ...
-    def update(self, observation: Observation) -> None: ...
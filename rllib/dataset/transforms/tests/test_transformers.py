@@ -7,9 +7,11 @@ from rllib.dataset.transforms import (
     ActionClipper,
     ActionNormalizer,
     ActionScaler,
+    ComposedTransform,
     DeltaState,
     MeanFunction,
     RewardClipper,
+    RewardNormalizer,
     RewardScaler,
     StateNormalizer,
 )
@@ -358,3 +360,70 @@ class TestStateNormalize(object):
         for x, y in zip(obs, inverse_observation):
             if x.shape == y.shape:
                 torch.testing.assert_allclose(x, y)
+
+
+class TestNormalizerTransform(object):
+    def test_merge(self, trajectory):
+        trajectory = stack_list_of_tuples(trajectory)
+        transformer, worker = StateNormalizer(dim=(4,)), StateNormalizer(dim=(4,))
+        transformer.update(trajectory)
+        version = transformer.version
+
+        worker.update(trajectory)
+        transformer.merge(worker)
+        assert transformer.version != version
+        states = torch.cat((trajectory.state, trajectory.state))
+        torch.testing.assert_allclose(transformer._normalizer.mean, states.mean(0))
+        torch.testing.assert_allclose(transformer._normalizer.variance, states.var(0))
+
+    def test_frozen(self, trajectory):
+        trajectory = stack_list_of_tuples(trajectory)
+        transformer = RewardNormalizer()
+        transformer.frozen = True
+        transformer.update(trajectory)
+        assert transformer.version == 0
+        assert transformer._normalizer.count == 0
+
+
+class TestComposedTransform(object):
+    @pytest.fixture
+    def transformations(self):
+        return [MeanFunction(DeltaState()), StateNormalizer(dim=(4,)), RewardClipper()]
+
+    def test_call(self, trajectory, transformations):
+        trajectory = stack_list_of_tuples(trajectory)
+        transformer = ComposedTransform(transformations)
+        transformer.update(trajectory)
+
+        obs = trajectory.clone()
+        transformed = transformer(trajectory)
+        expected = obs.clone()
+        for transformation in transformations:
+            expected = transformation(expected)
+        for x, y in zip(transformed, expected):
+            torch.testing.assert_allclose(x, y)
+
+        # The observation of the caller is not modified.
+        for x, y in zip(trajectory, obs):
+            torch.testing.assert_allclose(x, y)
+
+    def test_inverse(self, trajectory, transformations):
+        trajectory = stack_list_of_tuples(trajectory)
+        transformer = ComposedTransform(transformations[:2])
+        transformer.update(trajectory)
+
+        inverse_observation = transformer.inverse(transformer(trajectory))
+        for x, y in zip(trajectory, inverse_observation):
+            torch.testing.assert_allclose(x, y)
+
+    def test_version(self, trajectory, transformations):
+        trajectory = stack_list_of_tuples(trajectory)
+        transformer = ComposedTransform(transformations)
+        version = transformer.version
+        transformer(trajectory)
+        assert transformer.version == version
+
+        transformer.update(trajectory)
+        assert transformer.version != version
+        assert transformations[1].version == 1
+        assert transformations[2].version == 0
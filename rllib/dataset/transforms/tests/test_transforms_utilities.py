@@ -67,3 +67,60 @@ def test_sequential_update():
         array = torch.cat((array, new_array), dim=0)
         torch.testing.assert_allclose(transformer.mean, torch.mean(array, 0))
         torch.testing.assert_allclose(transformer.variance, torch.var(array, 0))
+
+
+def test_single_sample_update():
+    array = torch.randn(8, 4)
+    transformer = Normalizer(dim=(4,))
+    for sample in array:
+        transformer.update(sample)
+    torch.testing.assert_allclose(transformer.mean, torch.mean(array, 0))
+    torch.testing.assert_allclose(transformer.variance, torch.var(array, 0))
+
+
+def test_batch_dimensions():
+    array = torch.randn(8, 5, 4)
+    transformer = Normalizer(dim=(4,))
+    transformer.update(array)
+    torch.testing.assert_allclose(transformer.mean, array.reshape(-1, 4).mean(0))
+    torch.testing.assert_allclose(transformer.variance, array.reshape(-1, 4).var(0))
+
+
+def test_merge():
+    array = torch.randn(64, 4)
+    transformer = Normalizer(dim=(4,))
+    for shard in [array[:1], array[1:20], array[20:], array[:0]]:
+        worker = Normalizer(dim=(4,))
+        worker.update(shard)
+        transformer.merge(worker)
+
+    assert transformer.count == 64
+    torch.testing.assert_allclose(transformer.mean, torch.mean(array, 0))
+    torch.testing.assert_allclose(transformer.variance, torch.var(array, 0))
+
+
+def test_frozen():
+    transformer = Normalizer(dim=(4,))
+    transformer.update(torch.randn(32, 4))
+    mean, variance = transformer.mean.clone(), transformer.variance.clone()
+
+    transformer.frozen = True
+    transformer.update(torch.randn(32, 4))
+    torch.testing.assert_allclose(transformer.mean, mean)
+    torch.testing.assert_allclose(transformer.variance, variance)
+    assert transformer.num_updates == 1
+
+
+def test_constant_dimension():
+    array = torch.randn(32, 4)
+    array[:, 0] = 1.0
+    transformer = Normalizer(dim=(4,))
+    transformer.update(array)
+    assert transformer.variance[0] == 0
+    torch.testing.assert_allclose(transformer(array)[:, 0], torch.zeros(32))
+
+    # The statistics are exact after the constant dimension varies.
+    new_array = torch.randn(32, 4)
+    transformer.update(new_array)
+    array = torch.cat((array, new_array))
+    torch.testing.assert_allclose(transformer.variance, torch.var(array, 0))
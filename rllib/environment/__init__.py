@@ -1,4 +1,5 @@
 """Import environments."""
+import gym
 from gym.envs.registration import register
 
 import rllib.environment.mdps
@@ -12,6 +13,8 @@ from .mdp import *
 from .system_environment import *
 from .utilities import *
 
+gym.logger.set_level(gym.logger.ERROR)
+
 mini_atary_entry = "rllib.environment.miniatari_environment:MiniAtariEnv"
 register(
     id="MiniAsterix-v0", entry_point=mini_atary_entry, kwargs={"env_name": "asterix"}
@@ -9,6 +9,19 @@ from .abstract_environment import AbstractEnvironment
 from .utilities import parse_space
 
 
+def make_environment(env_name, **kwargs):
+    """Make a gym environment.
+
+    The toy-text environments, e.g. `NChain-v0', are registered by `gym_toytext',
+    which is slow to import. Hence, it is imported only for unregistered names.
+    """
+    try:
+        gym.spec(env_name)
+    except gym.error.Error:
+        import gym_toytext  # noqa: F401, register the toy-text environments.
+    return gym.make(env_name, **kwargs)
+
+
 class GymEnvironment(AbstractEnvironment):
     """Wrapper for OpenAI-Gym Environments.
 
@@ -22,7 +35,7 @@ class GymEnvironment(AbstractEnvironment):
     """
 
     def __init__(self, env_name, seed=None, **kwargs):
-        env = gym.make(env_name, **kwargs)
+        env = make_environment(env_name, **kwargs)
         if isinstance(env, gym.wrappers.TimeLimit) and not kwargs.get(
             "episodic", False
         ):
@@ -7,6 +7,8 @@ from rllib.dataset.datatypes import Action, State
 
 from .abstract_environment import AbstractEnvironment
 
+def make_environment(env_name: str, **kwargs: Any) -> gym.Env: ...
+
 class GymEnvironment(AbstractEnvironment):
     env: gym.envs.registration
     env_name: str
@@ -1,6 +1,7 @@
 """Implementation of CarPole System."""
 
 import numpy as np
+from scipy import integrate
 
 from rllib.environment.systems.ode_system import ODESystem
 from rllib.util.utilities import get_backend
@@ -15,11 +16,15 @@ class Cart1d(ODESystem):
     ..math :: dx/dt = [v, a]
     """
 
-    def __init__(self, step_size=0.01, max_action=1.0):
+    def __init__(self, step_size=0.01, max_action=1.0, integrator=integrate.RK45):
         """Initialize Cart 1d."""
         self.max_action = max_action
         super().__init__(
-            func=self._ode, step_size=step_size, dim_action=(1,), dim_state=(2,)
+            func=self._ode,
+            step_size=step_size,
+            dim_action=(1,),
+            dim_state=(2,),
+            integrator=integrator,
         )
 
     def _ode(self, t, state, action):
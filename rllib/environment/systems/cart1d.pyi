@@ -1,11 +1,19 @@
 """Implementation of CarPole System."""
+from typing import Type, Union
 
 import numpy as np
+from scipy.integrate import OdeSolver
 
 from rllib.dataset.datatypes import Action, State
+from rllib.environment.systems.integrators import FixedStepIntegrator
 from rllib.environment.systems.ode_system import ODESystem
 
 class Cart1d(ODESystem):
     max_action: float
-    def __init__(self, step_size: float = ..., max_action: float = ...) -> None: ...
+    def __init__(
+        self,
+        step_size: float = ...,
+        max_action: float = ...,
+        integrator: Union[Type[OdeSolver], FixedStepIntegrator] = ...,
+    ) -> None: ...
     def _ode(self, _: float, state: State, action: Action) -> State: ...
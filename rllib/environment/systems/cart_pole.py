@@ -1,6 +1,7 @@
 """Implementation of CarPole System."""
 
 import numpy as np
+from scipy import integrate
 
 from rllib.environment import SystemEnvironment
 from rllib.environment.systems.ode_system import ODESystem
@@ -18,6 +19,7 @@ class CartPole(ODESystem):
     rot_friction : float, optional
     gravity: float, optional
     step_size : float, optional
+    integrator : OdeSolver class or FixedStepIntegrator, optional
     """
 
     def __init__(
@@ -28,6 +30,7 @@ class CartPole(ODESystem):
         rot_friction=0.0,
         gravity=9.81,
         step_size=0.01,
+        integrator=integrate.RK45,
     ):
         """Initialize CartPole."""
         self.pendulum_mass = pendulum_mass
@@ -37,7 +40,11 @@ class CartPole(ODESystem):
         self.gravity = gravity
 
         super().__init__(
-            func=self._ode, step_size=step_size, dim_action=(1,), dim_state=(4,)
+            func=self._ode,
+            step_size=step_size,
+            dim_action=(1,),
+            dim_state=(4,),
+            integrator=integrator,
         )
 
     def _ode(self, _, state, action):
@@ -66,7 +73,8 @@ class CartPole(ODESystem):
 
         total_mass = pendulum_mass + cart_mass
 
-        x, theta, v, omega = state
+        theta, v, omega = state[..., 1], state[..., 2], state[..., 3]
+        action = action[..., 0]
 
         x_dot = v
         theta_dot = omega
@@ -89,7 +97,7 @@ class CartPole(ODESystem):
             + total_mass * g * bk.sin(theta)
         ) / det
 
-        return np.array((x_dot, theta_dot, v_dot, omega_dot))
+        return bk.stack((x_dot, theta_dot, v_dot, omega_dot), -1)
 
 
 class CartPoleEnv(SystemEnvironment):
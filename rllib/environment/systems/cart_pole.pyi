@@ -1,5 +1,10 @@
+from typing import Type, Union
+
+from scipy.integrate import OdeSolver
+
 from rllib.dataset.datatypes import Action, State
 
+from .integrators import FixedStepIntegrator
 from .ode_system import ODESystem
 
 class CartPole(ODESystem):
@@ -16,5 +21,6 @@ class CartPole(ODESystem):
         rot_friction: float = ...,
         gravity: float = ...,
         step_size: float = ...,
+        integrator: Union[Type[OdeSolver], FixedStepIntegrator] = ...,
     ) -> None: ...
     def _ode(self, _: float, state: State, action: Action) -> State: ...
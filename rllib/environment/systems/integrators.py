@@ -0,0 +1,91 @@
+"""Fixed-step integrators for ODE systems."""
+
+from abc import ABCMeta, abstractmethod
+
+import numpy as np
+import torch
+
+from rllib.util.utilities import get_backend
+
+
+class FixedStepIntegrator(object, metaclass=ABCMeta):
+    """Fixed-step integrator of an ode x' = f(t, x, u) with a constant action.
+
+    Contrary to scipy's adaptive solvers, fixed-step integrators only use arithmetic
+    operations on the state. Hence, they integrate batches of states of dimension
+    [*batch x dim_state] with batches of actions of dimension [*batch x dim_action],
+    either as numpy arrays or as torch tensors, and are differentiable in torch.
+
+    Parameters
+    ----------
+    num_substeps: int, optional (default=1).
+        Number of integration steps in which each call is divided.
+    """
+
+    def __init__(self, num_substeps=1):
+        self.num_substeps = num_substeps
+
+    def __call__(self, func, state, action, step_size, time=0.0):
+        """Integrate the ode for `step_size' seconds starting from `state'."""
+        dt = step_size / self.num_substeps
+        for i in range(self.num_substeps):
+            state = self.step(func, time + i * dt, state, action, dt)
+        return state
+
+    @abstractmethod
+    def step(self, func, time, state, action, dt):
+        """Do a single integration step of length dt."""
+        raise NotImplementedError
+
+
+class Euler(FixedStepIntegrator):
+    """Explicit (forward) Euler integrator."""
+
+    def step(self, func, time, state, action, dt):
+        """See `FixedStepIntegrator.step'."""
+        return state + dt * func(time, state, action)
+
+
+class SemiImplicitEuler(FixedStepIntegrator):
+    """Semi-implicit (symplectic) Euler integrator.
+
+    The velocities are first updated with the forward Euler rule and the positions
+    are then updated with the derivative evaluated at the new velocities.
+
+    Parameters
+    ----------
+    position_idx: Iterable[int].
+        Indexes of the state coordinates that are positions.
+    num_substeps: int, optional (default=1).
+        Number of integration steps in which each call is divided.
+    """
+
+    def __init__(self, position_idx, num_substeps=1):
+        super().__init__(num_substeps=num_substeps)
+        self.position_idx = list(position_idx)
+
+    def _position_mask(self, state):
+        """Get a mask that is one at the position coordinates."""
+        mask = np.zeros(state.shape[-1])
+        mask[self.position_idx] = 1.0
+        if get_backend(state) is torch:
+            return torch.tensor(mask, dtype=state.dtype, device=state.device)
+        return mask
+
+    def step(self, func, time, state, action, dt):
+        """See `FixedStepIntegrator.step'."""
+        mask = self._position_mask(state)
+        state = state + dt * (1 - mask) * func(time, state, action)
+        return state + dt * mask * func(time, state, action)
+
+
+class RK4(FixedStepIntegrator):
+    """Classic fourth-order Runge-Kutta integrator."""
+
+    def step(self, func, time, state, action, dt):
+        """See `FixedStepIntegrator.step'."""
+        k1 = func(time, state, action)
+        k2 = func(time + dt / 2, state + dt / 2 * k1, action)
+        k3 = func(time + dt / 2, state + dt / 2 * k2, action)
+        k4 = func(time + dt, state + dt * k3, action)
+        return state + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
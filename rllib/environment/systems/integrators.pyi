@@ -0,0 +1,38 @@
+from abc import ABCMeta, abstractmethod
+from typing import Callable, Iterable, List
+
+from rllib.dataset.datatypes import Action, Array, State
+
+class FixedStepIntegrator(object, metaclass=ABCMeta):
+    num_substeps: int
+    def __init__(self, num_substeps: int = ...) -> None: ...
+    def __call__(
+        self,
+        func: Callable,
+        state: State,
+        action: Action,
+        step_size: float,
+        time: float = ...,
+    ) -> State: ...
+    @abstractmethod
+    def step(
+        self, func: Callable, time: float, state: State, action: Action, dt: float
+    ) -> State: ...
+
+class Euler(FixedStepIntegrator):
+    def step(
+        self, func: Callable, time: float, state: State, action: Action, dt: float
+    ) -> State: ...
+
+class SemiImplicitEuler(FixedStepIntegrator):
+    position_idx: List[int]
+    def __init__(self, position_idx: Iterable[int], num_substeps: int = ...) -> None: ...
+    def _position_mask(self, state: State) -> Array: ...
+    def step(
+        self, func: Callable, time: float, state: State, action: Action, dt: float
+    ) -> State: ...
+
+class RK4(FixedStepIntegrator):
+    def step(
+        self, func: Callable, time: float, state: State, action: Action, dt: float
+    ) -> State: ...
@@ -4,6 +4,7 @@ import os
 
 import numpy as np
 from gym.spaces import Box
+from scipy import integrate
 
 from rllib.environment.systems.ode_system import ODESystem
 from rllib.util.utilities import get_backend
@@ -25,9 +26,19 @@ class InvertedPendulum(ODESystem):
     gravity: float, optional
     step_size : float, optional
         The duration of each time step.
+    integrator: OdeSolver class or FixedStepIntegrator, optional
+        Integrator used to simulate the ode, see `ODESystem'.
     """
 
-    def __init__(self, mass, length, friction, gravity=9.81, step_size=0.01):
+    def __init__(
+        self,
+        mass,
+        length,
+        friction,
+        gravity=9.81,
+        step_size=0.01,
+        integrator=integrate.RK45,
+    ):
         """Initialize InvertedPendulum."""
         self.mass = mass
         self.length = length
@@ -35,7 +46,11 @@ class InvertedPendulum(ODESystem):
         self.gravity = gravity
 
         super().__init__(
-            func=self._ode, step_size=step_size, dim_action=(1,), dim_state=(2,)
+            func=self._ode,
+            step_size=step_size,
+            dim_action=(1,),
+            dim_state=(2,),
+            integrator=integrator,
         )
         self.viewer = None
         self.last_action = None
@@ -98,7 +113,7 @@ class InvertedPendulum(ODESystem):
 
         self.last_action = action[0]
 
-        angle, angular_velocity = state
+        angle, angular_velocity = state[..., 0], state[..., 1]
 
         x_ddot = (
             gravity / length * bk.sin(angle)
@@ -106,7 +121,7 @@ class InvertedPendulum(ODESystem):
             - friction / inertia * angular_velocity
         )
 
-        return np.array((angular_velocity, x_ddot))
+        return bk.stack((angular_velocity, x_ddot), -1)
 
     @property
     def action_space(self):
@@ -1,10 +1,12 @@
-from typing import Union
+from typing import Type, Union
 
 import numpy as np
 from gym.envs.classic_control.rendering import Viewer
+from scipy.integrate import OdeSolver
 
 from rllib.dataset.datatypes import Action, State
 
+from .integrators import FixedStepIntegrator
 from .ode_system import ODESystem
 
 class InvertedPendulum(ODESystem):
@@ -22,6 +24,7 @@ class InvertedPendulum(ODESystem):
         friction: float,
         gravity: float = ...,
         step_size: float = ...,
+        integrator: Union[Type[OdeSolver], FixedStepIntegrator] = ...,
     ) -> None: ...
     @property
     def inertia(self) -> float: ...
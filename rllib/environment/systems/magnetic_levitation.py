@@ -1,9 +1,11 @@
 """Magnetic Levitation Implementation."""
 
 import numpy as np
+from scipy import integrate
 
 from rllib.environment import SystemEnvironment
 from rllib.environment.systems.ode_system import ODESystem
+from rllib.util.utilities import get_backend
 
 
 class MagneticLevitation(ODESystem):
@@ -27,6 +29,8 @@ class MagneticLevitation(ODESystem):
         Gravity acceleration.
     step_size: float, optional
         Integration step-time.
+    integrator: OdeSolver class or FixedStepIntegrator, optional
+        Integrator used to simulate the ode, see `ODESystem'.
 
     References
     ----------
@@ -44,6 +48,7 @@ class MagneticLevitation(ODESystem):
         max_action=60,
         gravity=9.81,
         step_size=0.01,
+        integrator=integrate.RK45,
     ):
         self.mass = mass
         self.resistance = resistance
@@ -54,7 +59,11 @@ class MagneticLevitation(ODESystem):
         self.gravity = gravity
 
         super().__init__(
-            func=self._ode, step_size=step_size, dim_action=(1,), dim_state=(3,)
+            func=self._ode,
+            step_size=step_size,
+            dim_action=(1,),
+            dim_state=(3,),
+            integrator=integrator,
         )
 
     def alpha(self, x1, x2, x3):
@@ -92,8 +101,9 @@ class MagneticLevitation(ODESystem):
             The state derivative according to the dynamics.
 
         """
+        bk = get_backend(state)
         # Physical dynamics
-        x1, x2, x3 = state
+        x1, x2, x3 = state[..., 0], state[..., 1], state[..., 2]
 
         alpha = self.alpha(x1, x2, x3)
         beta = self.beta(x1, x2, x3)
@@ -101,9 +111,9 @@ class MagneticLevitation(ODESystem):
 
         x1_dot = x2
         x2_dot = alpha
-        x3_dot = beta + gamma * action
+        x3_dot = beta + gamma * action[..., 0]
 
-        return np.array([x1_dot, x2_dot, x3_dot])
+        return bk.stack((x1_dot, x2_dot, x3_dot), -1)
 
 
 class MagneticLevitationEnv(SystemEnvironment):
@@ -1,5 +1,10 @@
+from typing import Type, Union
+
+from scipy.integrate import OdeSolver
+
 from rllib.dataset.datatypes import Action, State
 
+from .integrators import FixedStepIntegrator
 from .ode_system import ODESystem
 
 class MagneticLevitation(ODESystem):
@@ -20,6 +25,7 @@ class MagneticLevitation(ODESystem):
         max_action: float = ...,
         gravity: float = ...,
         step_size: float = ...,
+        integrator: Union[Type[OdeSolver], FixedStepIntegrator] = ...,
     ) -> None: ...
     def alpha(self, x1: float, x2: float, x3: float) -> float: ...
     def beta(self, x1: float, x2: float, x3: float) -> float: ...
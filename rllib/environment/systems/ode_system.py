@@ -2,9 +2,10 @@
 
 import numpy as np
 import torch
-from scipy import integrate, signal
+from scipy import integrate
 
 from .abstract_system import AbstractSystem
+from .integrators import FixedStepIntegrator
 from .linear_system import LinearSystem
 
 
@@ -19,6 +20,10 @@ class ODESystem(AbstractSystem):
     step_size : float
     dim_state: Tuple
     dim_action : Tuple
+    integrator: OdeSolver class or FixedStepIntegrator, optional.
+        Either a scipy adaptive solver class (default RK45) that integrates a single
+        numpy state, or a `FixedStepIntegrator' instance (e.g., RK4()) that
+        integrates batches of numpy or torch states and is differentiable in torch.
     """
 
     def __init__(
@@ -34,6 +39,11 @@ class ODESystem(AbstractSystem):
 
     def step(self, action):
         """See `AbstractSystem.step'."""
+        if isinstance(self.integrator, FixedStepIntegrator):
+            self.state = self.integrator(self.func, self.state, action, self.step_size)
+            self._time += self.step_size
+            return self.state
+
         integrator = self.integrator(
             lambda t, y: self.func(t, y, action), 0, self.state, t_bound=self.step_size
         )
@@ -71,34 +81,50 @@ class ODESystem(AbstractSystem):
         if action is None:
             action = np.zeros(self.dim_action)
 
-        if type(state) is not torch.Tensor:
-            state = torch.tensor(state)
-        if type(action) is not torch.Tensor:
-            action = torch.tensor(action)
-
-        state.requires_grad = True
-        action.requires_grad = True
-        f = self.func(None, state, action)
-
-        a = np.zeros((self.dim_state, self.dim_state))
-        b = np.zeros((self.dim_state, self.dim_action))
-        for i in range(self.dim_state):
-            aux = torch.autograd.grad(
-                f[i], state, allow_unused=True, retain_graph=True
-            )[0]
-            if aux is not None:
-                a[i] = aux.numpy()
-
-            aux = torch.autograd.grad(
-                f[i], action, allow_unused=True, retain_graph=True
-            )[0]
-            if aux is not None:
-                b[i] = aux.numpy()
-
-        ad, bd, _, _, _ = signal.cont2discrete(
-            (a, b, 0, 0), self.step_size, method="zoh"
+        state = torch.as_tensor(state, dtype=torch.get_default_dtype())
+        action = torch.as_tensor(action, dtype=torch.get_default_dtype())
+        ad, bd = self.linearize_batch(state.unsqueeze(0), action.unsqueeze(0))
+        return LinearSystem(ad[0].numpy(), bd[0].numpy())
+
+    def linearize_batch(self, state, action):
+        """Linearize and discretize the system at a batch of operating points.
+
+        The Jacobians of all operating points are computed with a single vectorized
+        call to torch autograd and discretized with a batched zero-order hold.
+
+        Parameters
+        ----------
+        state: Tensor.
+            Tensor of dimension [B x dim_state] with the operating states.
+        action: Tensor.
+            Tensor of dimension [B x dim_action] with the operating actions.
+
+        Returns
+        -------
+        a: Tensor.
+            Discrete state transition matrices of dimension [B x dim_state x dim_state].
+        b: Tensor.
+            Discrete input matrices of dimension [B x dim_state x dim_action].
+        """
+        dim_state, dim_action = state.shape[-1], action.shape[-1]
+
+        def _summed_func(state_, action_):
+            """Sum over the batch, the operating points are independent."""
+            return self.func(None, state_, action_).sum(0)
+
+        jac_state, jac_action = torch.autograd.functional.jacobian(
+            _summed_func, (state, action), vectorize=True
         )
-        return LinearSystem(ad, bd)
+
+        # Zero-order hold: expm([[A, B], [0, 0]] dt) = [[Ad, Bd], [0, I]].
+        dim = dim_state + dim_action
+        matrix = state.new_zeros(state.shape[0], dim, dim)
+        matrix[:, :dim_state, :dim_state] = jac_state.transpose(0, 1)
+        matrix[:, :dim_state, dim_state:] = jac_action.transpose(0, 1)
+        matrix_exp = torch.matrix_exp(matrix * self.step_size)
+        a = matrix_exp[:, :dim_state, :dim_state]
+        b = matrix_exp[:, :dim_state, dim_state:]
+        return a, b
 
     @property
     def state(self):
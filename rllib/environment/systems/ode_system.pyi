@@ -1,28 +1,31 @@
-from typing import Callable, Optional, Tuple, Type
+from typing import Callable, Optional, Tuple, Type, Union
 
 from scipy.integrate import OdeSolver
+from torch import Tensor
 
 from rllib.dataset.datatypes import Action, State
 
 from .abstract_system import AbstractSystem
+from .integrators import FixedStepIntegrator
 from .linear_system import LinearSystem
 
 class ODESystem(AbstractSystem):
     step_size: float
     func: Callable
-    integrator: Type[OdeSolver]
+    integrator: Union[Type[OdeSolver], FixedStepIntegrator]
     def __init__(
         self,
         func: Callable,
         step_size: float,
         dim_state: Tuple,
         dim_action: Tuple,
-        integrator: Type[OdeSolver] = ...,
+        integrator: Union[Type[OdeSolver], FixedStepIntegrator] = ...,
     ) -> None: ...
     def step(self, action: Action) -> State: ...
     def linearize(
         self, state: Optional[State] = ..., action: Optional[Action] = ...
     ) -> LinearSystem: ...
+    def linearize_batch(self, state: Tensor, action: Tensor) -> Tuple[Tensor, Tensor]: ...
     def reset(self, state: Optional[State] = ...) -> State: ...
     @property
     def state(self) -> State: ...
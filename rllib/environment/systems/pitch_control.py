@@ -1,8 +1,10 @@
 """Pitch Control Implementation."""
 
 import numpy as np
+from scipy import integrate
 
 from rllib.environment.systems.ode_system import ODESystem
+from rllib.util.utilities import get_backend
 
 
 class PitchControl(ODESystem):
@@ -19,6 +21,7 @@ class PitchControl(ODESystem):
     cm: float, optional.
     eta: float, optional
     step_size: float, optional
+    integrator: OdeSolver class or FixedStepIntegrator, optional
 
     References
     ----------
@@ -43,6 +46,7 @@ class PitchControl(ODESystem):
         cm=0.426,
         eta=0.0875,
         step_size=0.01,
+        integrator=integrate.RK45,
     ):
         self.omega = omega
         self.cld = cld
@@ -51,7 +55,11 @@ class PitchControl(ODESystem):
         self.cm = cm
         self.eta = eta
         super().__init__(
-            func=self._ode, step_size=step_size, dim_action=(1,), dim_state=(3,)
+            func=self._ode,
+            step_size=step_size,
+            dim_action=(1,),
+            dim_state=(3,),
+            integrator=integrator,
         )
 
     def _ode(self, _, state, action):
@@ -71,14 +79,15 @@ class PitchControl(ODESystem):
 
         """
         # Physical dynamics
-        alpha, q, theta = state
-        (u,) = action
+        bk = get_backend(state)
+        alpha, q = state[..., 0], state[..., 1]
+        u = action[..., 0]
 
         alpha_dot = -self.cld * alpha + self.omega * q + self.cw * u
         q_dot = -self.cmld * alpha - self.cm * q + self.eta * self.cw * u
         theta_dot = self.omega * q
 
-        return np.array([alpha_dot, q_dot, theta_dot])
+        return bk.stack((alpha_dot, q_dot, theta_dot), -1)
 
 
 if __name__ == "__main__":
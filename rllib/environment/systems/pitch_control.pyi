@@ -1,5 +1,10 @@
+from typing import Type, Union
+
+from scipy.integrate import OdeSolver
+
 from rllib.dataset.datatypes import Action, State
 
+from .integrators import FixedStepIntegrator
 from .ode_system import ODESystem
 
 class PitchControl(ODESystem):
@@ -18,5 +23,6 @@ class PitchControl(ODESystem):
         cm: float = ...,
         eta: float = ...,
         step_size: float = ...,
+        integrator: Union[Type[OdeSolver], FixedStepIntegrator] = ...,
     ) -> None: ...
     def _ode(self, _: float, state: State, action: Action) -> State: ...
@@ -1,6 +1,7 @@
 """Underwater Vehicle Implementation."""
 
 import numpy as np
+from scipy import integrate
 
 from rllib.environment.systems.ode_system import ODESystem
 from rllib.util.utilities import get_backend
@@ -12,6 +13,7 @@ class UnderwaterVehicle(ODESystem):
     Parameters
     ----------
     step_size : float, optional
+    integrator : OdeSolver class or FixedStepIntegrator, optional
 
     References
     ----------
@@ -19,9 +21,13 @@ class UnderwaterVehicle(ODESystem):
      Reinforcement learning in feedback control. Machine learning.
     """
 
-    def __init__(self, step_size=0.01):
+    def __init__(self, step_size=0.01, integrator=integrate.RK45):
         super().__init__(
-            func=self._ode, step_size=step_size, dim_action=(1,), dim_state=(1,)
+            func=self._ode,
+            step_size=step_size,
+            dim_action=(1,),
+            dim_state=(1,),
+            integrator=integrator,
         )
 
     def thrust(self, velocity, thrust):
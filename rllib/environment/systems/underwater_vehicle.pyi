@@ -1,9 +1,18 @@
+from typing import Type, Union
+
+from scipy.integrate import OdeSolver
+
 from rllib.dataset.datatypes import Action, State
 
+from .integrators import FixedStepIntegrator
 from .ode_system import ODESystem
 
 class UnderwaterVehicle(ODESystem):
-    def __init__(self, step_size: float = ...) -> None: ...
+    def __init__(
+        self,
+        step_size: float = ...,
+        integrator: Union[Type[OdeSolver], FixedStepIntegrator] = ...,
+    ) -> None: ...
     def drag_force(self, velocity: State) -> State: ...
     def thrust(self, velocity: State, thrust: Action) -> State: ...
     def _ode(self, _: float, state: State, action: Action) -> State: ...
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+import torch
+
+from rllib.environment.systems import CartPole, InvertedPendulum
+from rllib.environment.systems.integrators import RK4, Euler, SemiImplicitEuler
+
+
+@pytest.fixture(params=["Euler", "SemiImplicitEuler", "RK4"])
+def integrator(request):
+    return {
+        "Euler": Euler(num_substeps=10),
+        "SemiImplicitEuler": SemiImplicitEuler([0, 1], num_substeps=10),
+        "RK4": RK4(),
+    }[request.param]
+
+
+def simulate(system, state, action, num_steps=20):
+    system.reset(state)
+    for _ in range(num_steps):
+        system.step(action)
+    return system.state
+
+
+def test_rk45_equality(integrator):
+    state, action = np.array([0.1, 0.5, -0.2, 0.3]), np.array([0.4])
+    expected = simulate(CartPole(1.0, 1.0, 1.0), state, action)
+    out = simulate(CartPole(1.0, 1.0, 1.0, integrator=integrator), state, action)
+
+    rtol = 1e-4 if isinstance(integrator, RK4) else 1e-2
+    np.testing.assert_allclose(out, expected, rtol=rtol, atol=rtol)
+
+
+def test_batch(integrator):
+    system = CartPole(1.0, 1.0, 1.0, integrator=integrator)
+    state, action = 0.1 * np.random.randn(5, 4), np.random.randn(5, 1)
+    out = simulate(system, state, action)
+    assert out.shape == (5, 4)
+    for i in range(5):
+        np.testing.assert_allclose(out[i], simulate(system, state[i], action[i]))
+
+
+def test_torch_gradient(integrator):
+    system = CartPole(1.0, 1.0, 1.0, integrator=integrator)
+    state = torch.randn(3, 5, 4, dtype=torch.float64, requires_grad=True)
+    action = torch.randn(3, 5, 1, dtype=torch.float64, requires_grad=True)
+    out = simulate(system, state, action, num_steps=5)
+    assert out.shape == (3, 5, 4)
+
+    np.testing.assert_allclose(
+        out.detach().numpy(),
+        simulate(system, state.detach().numpy(), action.detach().numpy(), 5),
+    )
+    out.sum().backward()
+    assert state.grad.shape == state.shape
+    assert action.grad.shape == action.shape
+
+
+def test_time():
+    system = InvertedPendulum(1.0, 1.0, 0.1, step_size=0.05, integrator=RK4())
+    simulate(system, np.zeros(2), np.zeros(1), num_steps=4)
+    assert system.time == pytest.approx(0.2)
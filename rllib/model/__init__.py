@@ -10,7 +10,12 @@ The derived models provide such functionality.
 from .abstract_model import AbstractModel
 from .ensemble_model import EnsembleModel
 from .expected_model import ExpectedModel
-from .gp_model import ExactGPModel, RandomFeatureGPModel, SparseGPModel
+from .gp_model import (
+    ExactGPModel,
+    RandomFeatureGPModel,
+    SparseGPModel,
+    VariationalGPModel,
+)
 from .independent_ensemble_model import IndependentEnsembleModel
 from .linear_model import LinearModel
 from .nn_model import NNModel
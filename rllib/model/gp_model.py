@@ -6,6 +6,7 @@ import torch.nn
 
 from rllib.util.gaussian_processes.gps import ExactGP, RandomFeatureGP, SparseGP
 from rllib.util.gaussian_processes.utilities import add_data_to_gp, bkb, summarize_gp
+from rllib.util.gaussian_processes.variational_gp import ApproximateGPModel
 
 from .abstract_model import AbstractModel
 
@@ -309,3 +310,131 @@ class SparseGPModel(ExactGPModel):
             inducing_points = bkb(self.gp[i], arm_set, q_bar=self.q_bar)
             self.gp[i].set_inducing_points(inducing_points)
             add_data_to_gp(self.gp[i], new_x, new_y_i)
+
+
+class VariationalGPModel(AbstractModel):
+    """Sparse Variational GP Model trained on minibatches.
+
+    Each output coordinate is modelled with an independent stochastic variational GP
+    (SVGP) with `num_inducing_points' inducing points. Contrary to `ExactGPModel', the
+    model does not store the training data and the memory is O(m^2) in the number of
+    inducing points, hence it is trained with minibatches of the ELBO.
+
+    Parameters
+    ----------
+    num_inducing_points: int, optional (default=128).
+        Number of inducing points of each GP.
+    inducing_points: Tensor, optional.
+        Initial inducing points, of dimension [m x (d_x + d_u)].
+        By default they are sampled from a standard normal.
+    learn_inducing_loc: bool, optional (default=True).
+        Flag that indicates if the inducing point locations are optimized.
+    mean: Mean, optional.
+        Mean module, by default a constant mean.
+    kernel: Kernel, optional.
+        Kernel module, by default a scaled RBF kernel.
+    input_transform: nn.Module, optional (default=None).
+        Module with which to transform inputs.
+    num_data: int, optional (default=1).
+        Number of training points, used to scale the KL term of the ELBO.
+        `train_model' sets it to the size of the training set.
+
+    References
+    ----------
+    Hensman, J., Fusi, N., & Lawrence, N. D. (2013).
+    Gaussian processes for big data. UAI.
+    """
+
+    def __init__(
+        self,
+        num_inducing_points=128,
+        inducing_points=None,
+        learn_inducing_loc=True,
+        mean=None,
+        kernel=None,
+        input_transform=None,
+        num_data=1,
+        *args,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        if self.discrete_state or self.discrete_action:
+            raise NotImplementedError("Only continuous states and actions allowed.")
+        if self.model_kind == "dynamics":
+            out_dim = self.dim_state[0]
+        elif self.model_kind == "rewards":
+            out_dim = self.dim_reward[0]
+        else:
+            raise NotImplementedError(f"{self.model_kind} not implemented.")
+        self.input_transform = input_transform
+        self.num_data = num_data
+
+        in_dim = self.dim_state[0] + self.dim_action[0]
+        if input_transform is not None:
+            in_dim = in_dim + input_transform.extra_dim
+        if inducing_points is None:
+            inducing_points = torch.randn(num_inducing_points, in_dim)
+
+        self.likelihood = torch.nn.ModuleList(
+            [gpytorch.likelihoods.GaussianLikelihood() for _ in range(out_dim)]
+        )
+        self.gp = torch.nn.ModuleList(
+            [
+                ApproximateGPModel(
+                    inducing_points.clone(),
+                    learn_loc=learn_inducing_loc,
+                    mean=mean,
+                    kernel=kernel,
+                )
+                for _ in range(out_dim)
+            ]
+        )
+
+    @classmethod
+    def default(cls, environment, *args, **kwargs):
+        """See AbstractModel.default()."""
+        return super().default(environment, *args, **kwargs)
+
+    @property
+    def name(self):
+        """Get Model name."""
+        return "SVGP"
+
+    def forward(self, state, action, next_state=None):
+        """Get next state distribution."""
+        test_x = self.state_actions_to_input_data(state, action)
+        batch_shape = test_x.shape[:-1]
+        test_x = test_x.reshape(-1, test_x.shape[-1])
+
+        out = [
+            likelihood(gp(test_x)) for gp, likelihood in zip(self.gp, self.likelihood)
+        ]
+        mean = torch.stack(tuple(o.mean for o in out), dim=-1)
+        stddev = torch.stack(tuple(o.variance.sqrt() for o in out), dim=-1)
+
+        mean = mean.reshape(*batch_shape, -1)
+        scale_tril = torch.diag_embed(stddev.reshape(*batch_shape, -1))
+        if self.deterministic:
+            return mean, torch.zeros_like(scale_tril)
+        return mean, self.temperature * scale_tril
+
+    def state_actions_to_input_data(self, state, action):
+        """Convert state-action data to the gpytorch format."""
+        if self.input_transform is not None:
+            state = self.input_transform(state)
+        return torch.cat((state, action), dim=-1)
+
+    def state_actions_to_train_data(self, state, action, target):
+        """Convert transition data to flat gpytorch training data.
+
+        Returns
+        -------
+        train_x : torch.Tensor
+            [N x (d_x + d_u)]
+        train_y : torch.Tensor
+            [d_y x N], contiguous array
+        """
+        train_x = self.state_actions_to_input_data(state, action)
+        train_x = train_x.reshape(-1, train_x.shape[-1])
+        train_y = target.reshape(train_x.shape[0], -1).t().contiguous()
+        return train_x, train_y
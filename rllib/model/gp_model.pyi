@@ -64,3 +64,26 @@ class SparseGPModel(ExactGPModel):
         **kwargs: Any,
     ) -> None: ...
     def add_data(self, state: Tensor, action: Tensor, next_state: Tensor) -> None: ...
+
+class VariationalGPModel(AbstractModel):
+    input_transform: Optional[nn.Module]
+    num_data: int
+    likelihood: nn.ModuleList
+    gp: nn.ModuleList
+    def __init__(
+        self,
+        num_inducing_points: int = ...,
+        inducing_points: Optional[Tensor] = ...,
+        learn_inducing_loc: bool = ...,
+        mean: Optional[Mean] = ...,
+        kernel: Optional[Kernel] = ...,
+        input_transform: Optional[nn.Module] = ...,
+        num_data: int = ...,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None: ...
+    def forward(self, *args: Tensor, **kwargs: Any) -> TupleDistribution: ...
+    def state_actions_to_input_data(self, state: Tensor, action: Tensor) -> Tensor: ...
+    def state_actions_to_train_data(
+        self, state: Tensor, action: Tensor, target: Tensor
+    ) -> Tuple[Tensor, Tensor]: ...
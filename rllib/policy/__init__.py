@@ -8,6 +8,7 @@ distribution.
 """
 from .abstract_policy import AbstractPolicy
 from .derived_policy import DerivedPolicy
+from .inference_policy import InferencePolicy
 from .mpc_policy import MPCPolicy
 from .nn_policy import FelixPolicy, NNPolicy
 from .q_function_policy import AbstractQFunctionPolicy, EpsGreedy, MellowMax, SoftMax
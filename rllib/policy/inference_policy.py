@@ -0,0 +1,198 @@
+"""Low-latency inference with neural network policies."""
+
+import torch
+import torch.nn as nn
+
+from rllib.util.utilities import tensor_to_distribution
+
+from .nn_policy import NNPolicy
+
+
+class InferencePolicy(object):
+    """Fast path to compute the actions of a neural network policy.
+
+    The network of the policy is evaluated under `torch.inference_mode' and the
+    state, the noise and the action are written into preallocated buffers. Gaussian
+    actions are sampled as `mean + scale_tril @ noise', without building a
+    distribution. The actions follow the same distribution as the actions of
+    `AbstractAgent.act', except for the deterministic actions of tanh-squashed
+    policies, which are `tanh(mean)' instead of a Monte Carlo estimate of the mean.
+
+    Parameters
+    ----------
+    policy: NNPolicy.
+        Policy with which to act. The fast path reads its current parameters.
+    trace: bool, optional (default=False).
+        Flag that indicates whether to trace the network of the policy with
+        `torch.jit.trace'. The traced network shares the parameters of the policy.
+
+    Examples
+    --------
+    >>> policy = NNPolicy(dim_state=(3,), dim_action=(2,), action_scale=2.0)
+    >>> inference_policy = InferencePolicy(policy)
+    >>> action = inference_policy(torch.randn(3))
+    >>> action.shape
+    (2,)
+    >>> bool(abs(action).max() <= 2.0)
+    True
+    """
+
+    def __init__(self, policy, trace=False):
+        if not isinstance(policy, NNPolicy):
+            raise TypeError(f"{type(policy).__name__} is not a NNPolicy.")
+        self.policy = policy
+        self.network = policy.nn
+        self._output = None
+        self._resize(())
+        if trace:
+            with torch.no_grad():
+                self.network = torch.jit.trace(
+                    policy.nn, policy._preprocess_state(self._state), check_trace=False
+                )
+
+    def _resize(self, batch_shape):
+        """Allocate the buffers for a batch of states."""
+        device = self.policy.action_scale.device
+        if self.policy.discrete_state:
+            self._state = torch.zeros(batch_shape, dtype=torch.long, device=device)
+        else:
+            self._state = torch.zeros(
+                batch_shape + self.policy.dim_state, device=device
+            )
+        dim_action = batch_shape + self.policy.dim_action
+        self._noise = torch.zeros(dim_action, device=device)
+        self._scaled_noise = torch.zeros(dim_action + (1,), device=device)
+        self._action = torch.zeros(dim_action, device=device)
+        self._mean = torch.zeros(dim_action, device=device)
+
+    def __call__(self, state, sample=True):
+        """Compute the action of the policy at a state.
+
+        Parameters
+        ----------
+        state: Union[ndarray, Tensor].
+            State, or batch of states, at which to act.
+        sample: bool, optional (default=True).
+            Flag that indicates whether to sample the action or to return the mode
+            of the action distribution.
+
+        Returns
+        -------
+        action: ndarray.
+            Scaled action, in a new array.
+        """
+        state = torch.as_tensor(state)
+        if state.shape != self._state.shape:
+            num_state_dims = 0 if self.policy.discrete_state else 1
+            self._resize(state.shape[: state.dim() - num_state_dims])
+
+        with torch.inference_mode():
+            self._state.copy_(state)
+            self._output = self.network(self.policy._preprocess_state(self._state))
+            if self.policy.discrete_action:
+                action = self._discrete_action(self._output, sample)
+            else:
+                action = self._continuous_action(*self._output, sample)
+                action.clamp_(-1.0, 1.0).mul_(self.policy.action_scale)
+            return action.cpu().numpy().copy()
+
+    def _discrete_action(self, logits, sample):
+        """Sample the action from the logits, or take the most likely one."""
+        if not sample:
+            return torch.argmax(logits, dim=-1)
+        probabilities = torch.softmax(logits, dim=-1)
+        action = torch.multinomial(probabilities.reshape(-1, logits.shape[-1]), 1)
+        return action.reshape(logits.shape[:-1])
+
+    def _continuous_action(self, mean, scale_tril, sample):
+        """Sample the action from the mean and the scale, or take the mean."""
+        dist_params = self.policy.dist_params
+        action = self._action.copy_(mean)
+        if self.policy.deterministic:
+            if dist_params.get("add_noise", False):
+                noise_clip = dist_params.get("noise_clip", float("inf"))
+                policy_noise = dist_params.get("policy_noise", 1)
+                if callable(policy_noise):
+                    policy_noise = policy_noise()
+                torch.randn(self._noise.shape, out=self._noise)
+                action.add_(
+                    self._noise.mul_(policy_noise).clamp_(-noise_clip, noise_clip)
+                )
+            self._mean.copy_(action)  # The distribution is a Delta at the action.
+            return action
+
+        if sample:
+            torch.randn(self._noise.shape, out=self._noise)
+            torch.matmul(scale_tril, self._noise.unsqueeze(-1), out=self._scaled_noise)
+            action.add_(self._scaled_noise.squeeze(-1))
+        if dist_params.get("tanh", False):
+            action.tanh_()
+        return action
+
+    def distribution(self):
+        """Build the action distribution of the last call.
+
+        The outputs of the network are cloned, so the distribution remains valid
+        after the next call. The distribution of a deterministic policy is a Delta at
+        the unscaled action of the last call, including its exploration noise.
+        """
+        if self.policy.discrete_action:
+            return tensor_to_distribution(self._output.clone())
+        mean, scale_tril = (output.clone() for output in self._output)
+        if self.policy.deterministic:
+            return tensor_to_distribution(
+                (self._mean.clone(), torch.zeros_like(scale_tril))
+            )
+        return tensor_to_distribution((mean, scale_tril), **self.policy.dist_params)
+
+    def export(self, filename=None):
+        """Export the deterministic actions of the policy as a TorchScript module.
+
+        The module maps a batch of states to a batch of scaled actions, without
+        sampling, and can be loaded with `torch.jit.load' without rllib. It holds a
+        copy of the current parameters of the policy.
+
+        Parameters
+        ----------
+        filename: str, optional.
+            File where to save the module. By default, the module is not saved.
+
+        Returns
+        -------
+        module: torch.jit.ScriptModule.
+            Traced module.
+        """
+        if self.policy.input_transform is not None or self.policy.goal is not None:
+            raise NotImplementedError("Only policies of raw states can be exported.")
+        module = DeterministicAction(self.policy)
+        example = self._state.reshape(-1, *self._state.shape[-1:]).float()
+        with torch.no_grad():
+            module = torch.jit.trace(module, example, check_trace=False)
+        module = torch.jit.freeze(module.eval())  # parameters become constants.
+        if filename is not None:
+            module.save(filename)
+        return module
+
+
+class DeterministicAction(nn.Module):
+    """Deterministic scaled actions of the network of a policy."""
+
+    def __init__(self, policy):
+        super().__init__()
+        self.network = policy.nn
+        self.register_buffer("action_scale", policy.action_scale.clone())
+        self.num_states = policy.num_states
+        self.discrete_action = policy.discrete_action
+        self.tanh = policy.dist_params.get("tanh", False) and not policy.deterministic
+
+    def forward(self, state):
+        """Compute the actions at a batch of states."""
+        if self.num_states > 0:
+            state = nn.functional.one_hot(state.long(), self.num_states).float()
+        output = self.network(state)
+        if self.discrete_action:
+            return torch.argmax(output, dim=-1)
+        action = output[0]
+        if self.tanh:
+            action = torch.tanh(action)
+        return action.clamp(-1.0, 1.0) * self.action_scale
@@ -0,0 +1,38 @@
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import torch.nn as nn
+from torch import Tensor
+from torch.distributions import Distribution
+
+from .nn_policy import NNPolicy
+
+class InferencePolicy(object):
+    policy: NNPolicy
+    network: nn.Module
+    _output: Optional[Union[Tensor, Tuple[Tensor, Tensor]]]
+    _state: Tensor
+    _noise: Tensor
+    _scaled_noise: Tensor
+    _action: Tensor
+    _mean: Tensor
+    def __init__(self, policy: NNPolicy, trace: bool = ...) -> None: ...
+    def _resize(self, batch_shape: Tuple[int, ...]) -> None: ...
+    def __call__(
+        self, state: Union[np.ndarray, Tensor], sample: bool = ...
+    ) -> np.ndarray: ...
+    def _discrete_action(self, logits: Tensor, sample: bool) -> Tensor: ...
+    def _continuous_action(
+        self, mean: Tensor, scale_tril: Tensor, sample: bool
+    ) -> Tensor: ...
+    def distribution(self) -> Distribution: ...
+    def export(self, filename: Optional[str] = ...) -> nn.Module: ...
+
+class DeterministicAction(nn.Module):
+    network: nn.Module
+    action_scale: Tensor
+    num_states: int
+    discrete_action: bool
+    tanh: bool
+    def __init__(self, policy: NNPolicy) -> None: ...
+    def forward(self, state: Tensor) -> Tensor: ...
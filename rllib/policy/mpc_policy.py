@@ -1,8 +1,12 @@
 """Policy that Implements MPC."""
+import contextlib
+import threading
 
 import torch
 
+from rllib.algorithms.mpc.abstract_solver import MPCSolver
 from rllib.algorithms.mpc.cem_shooting import CEMShooting
+from rllib.util.neural_networks.utilities import repeat_along_dimension
 
 from .abstract_policy import AbstractPolicy
 
@@ -10,17 +14,46 @@ from .abstract_policy import AbstractPolicy
 class MPCPolicy(AbstractPolicy):
     """MPC Policy.
 
+    In asynchronous mode, the solver runs continuously in a background thread that
+    refines the solution for the last state passed to the policy, and warm starts
+    it by shifting the mean whenever a new state arrives. The policy then waits at
+    most `deadline' seconds for a plan of the current state that completed the
+    `num_iter' solver iterations. Otherwise, it uses the most recent plan shifted by
+    the number of steps elapsed since the plan state. When no plan of the last
+    `num_model_steps' states is available, e.g., at the first step of an episode
+    with a short deadline, the action is zero. With `deadline=None', the policy
+    instead blocks until the plan is ready.
+
+    The planner evaluates the dynamical model in eval mode. The model must not be
+    trained while the planner runs: `park' stops the planning at the end of an
+    episode, and `paused' keeps the planner from iterating, e.g., while learning.
+
     Parameters
     ----------
     mpc_solver: MPCSolver.
         Base solver for the MPC algorithm.
 
     solver_frequency: int
-        How often to call the MPC solver.
+        How often to call the MPC solver. Ignored in asynchronous mode.
+
+    asynchronous: bool, optional (default=False).
+        Flag that indicates whether to plan in a background thread.
+
+    deadline: float, optional (default=None).
+        Maximum time in seconds that the policy waits for a plan in asynchronous
+        mode. By default, it waits until the plan of the current state is ready.
 
     """
 
-    def __init__(self, mpc_solver, solver_frequency=1, *args, **kwargs):
+    def __init__(
+        self,
+        mpc_solver,
+        solver_frequency=1,
+        asynchronous=False,
+        deadline=None,
+        *args,
+        **kwargs,
+    ):
         super().__init__(
             dim_state=mpc_solver.dynamical_model.dim_state,
             dim_action=mpc_solver.dynamical_model.dim_action,
@@ -38,6 +71,28 @@ class MPCPolicy(AbstractPolicy):
                 {solver_frequency}."""
             )
 
+        self.asynchronous = asynchronous
+        self.deadline = deadline
+        if asynchronous and type(mpc_solver).forward is not MPCSolver.forward:
+            raise NotImplementedError(
+                f"{type(mpc_solver).__name__} does not support asynchronous planning."
+            )
+        self._condition = threading.Condition()
+        self._planner = None
+        self._request = 0
+        self._target = None  # (state, request) to plan for.
+        self._plan = None  # (action_sequence, request, iterations) of the last plan.
+        self._reset_solver = False
+        self._stop = False
+        self._paused = 0
+        self._iterating = False
+        self._num_iterations = 0
+        self._last_num_iterations = 0
+        self.deadline_miss = False
+        self.deadline_misses = 0
+        self.plan_age = 0
+        self.plan_iterations = 0
+
     @classmethod
     def default(cls, environment, *args, **kwargs):
         """See AbstractPolicy.default()."""
@@ -45,6 +100,11 @@ class MPCPolicy(AbstractPolicy):
 
     def forward(self, state, **kwargs):
         """Solve the MPC problem."""
+        if self.asynchronous:
+            action = self._forward_asynchronous(state)
+            self._steps += 1
+            return action, torch.zeros(self.dim_action[0], self.dim_action[0])
+
         if self._steps % self.solver_frequency == 0 or self.action_sequence is None:
             self.action_sequence = self.solver(state)
         else:
@@ -54,10 +114,134 @@ class MPCPolicy(AbstractPolicy):
         self._steps += 1
         return action, torch.zeros(self.dim_action[0], self.dim_action[0])
 
+    def _forward_asynchronous(self, state):
+        """Get the action of the best plan available before the deadline."""
+        if self._planner is None:
+            self._stop = False
+            self._planner = threading.Thread(target=self._plan_loop, daemon=True)
+            self._planner.start()
+
+        self._request += 1
+        request = self._request
+        with self._condition:
+            self._target = (state.detach().clone(), request)
+            self._condition.notify_all()
+            on_time = self._condition.wait_for(
+                lambda: self._plan is not None
+                and self._plan[1] == request
+                and self._plan[2] >= self.solver.num_iter,
+                timeout=self.deadline,
+            )
+            plan = self._plan
+            num_iterations = self._num_iterations
+
+        self.deadline_miss = not on_time
+        self.deadline_misses += int(self.deadline_miss)
+        self.plan_iterations = num_iterations - self._last_num_iterations
+        self._last_num_iterations = num_iterations
+
+        if plan is None or request - plan[1] >= self.solver.num_model_steps:
+            self.plan_age = self.solver.num_model_steps
+            return torch.zeros(*state.shape[:-1], self.dim_action[0])
+        self.plan_age = request - plan[1]
+        return plan[0][self.plan_age]
+
+    def _plan_loop(self):
+        """Refine the plan of the last state until the planner is stopped."""
+        state, solver_request, num_iter = None, None, 0
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stop
+                    or (self._target is not None and not self._paused)
+                )
+                if self._stop:
+                    return
+                if self._reset_solver:
+                    self.solver.reset()
+                    solver_request, self._reset_solver = None, False
+                target_state, request = self._target
+                self._iterating = True
+
+            try:
+                if request != solver_request:  # Warm start from the shifted plan.
+                    num_shifts = (
+                        1 if solver_request is None else request - solver_request
+                    )
+                    for _ in range(min(num_shifts, self.solver.num_model_steps)):
+                        self.solver.initialize_actions(target_state.shape[:-1])
+                    state = repeat_along_dimension(
+                        target_state, number=self.solver.num_particles, dim=-2
+                    )
+                    solver_request, num_iter = request, 0
+
+                self.solver.dynamical_model.eval()  # It may be trained meanwhile.
+                with torch.no_grad():
+                    self.solver.iterate(state)
+                num_iter += 1
+            finally:
+                with self._condition:
+                    self._iterating = False
+                    self._condition.notify_all()
+
+            with self._condition:
+                self._num_iterations += 1
+                if self._target is not None and self._target[1] == request:
+                    self._plan = (self.solver.action_sequence, request, num_iter)
+                    self._condition.notify_all()
+
+    def info(self):
+        """Get the statistics of the asynchronous planner at the last step."""
+        return {
+            "plan_age": self.plan_age,
+            "plan_iterations": self.plan_iterations,
+            "deadline_miss": float(self.deadline_miss),
+        }
+
+    def park(self):
+        """Stop planning for the last state and wait for the current iteration.
+
+        The planner resumes with the state of the next step.
+        """
+        with self._condition:
+            self._target = None
+            self._condition.wait_for(lambda: not self._iterating)
+
+    @contextlib.contextmanager
+    def paused(self):
+        """Keep the planner from iterating, e.g., while the models are trained.
+
+        The policy waits for a plan, up to the deadline, while the planner is paused.
+        """
+        with self._condition:
+            self._paused += 1
+            self._condition.wait_for(lambda: not self._iterating)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._paused -= 1
+                self._condition.notify_all()
+
+    def stop(self):
+        """Stop the asynchronous planner."""
+        if self._planner is not None:
+            with self._condition:
+                self._stop = True
+                self._condition.notify_all()
+            self._planner.join()
+            self._planner = None
+
     def reset(self):
         """Re-set last_action to None."""
         self._steps = 0
-        self.solver.reset()
+        if self._planner is None:
+            self.solver.reset()
+        else:  # The planner thread owns the solver.
+            with self._condition:
+                self._target, self._plan = None, None
+                self._reset_solver = True
+        self._last_num_iterations = self._num_iterations
 
     def set_goal(self, goal=None):
         """Set goal."""
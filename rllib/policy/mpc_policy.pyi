@@ -1,4 +1,5 @@
-from typing import Any, Optional
+import threading
+from typing import Any, ContextManager, Dict, Optional, Tuple
 
 from torch import Tensor
 
@@ -12,10 +13,35 @@ class MPCPolicy(AbstractPolicy):
     _steps: int
     solver_frequency: int
     action_sequence: Optional[Tensor]
+    asynchronous: bool
+    deadline: Optional[float]
+    _condition: threading.Condition
+    _planner: Optional[threading.Thread]
+    _request: int
+    _target: Optional[Tuple[Tensor, int]]
+    _plan: Optional[Tuple[Tensor, int, int]]
+    _reset_solver: bool
+    _stop: bool
+    _paused: int
+    _iterating: bool
+    _num_iterations: int
+    _last_num_iterations: int
+    deadline_miss: bool
+    deadline_misses: int
+    plan_age: int
+    plan_iterations: int
     def __init__(
         self,
         mpc_solver: MPCSolver,
         solver_frequency: int = ...,
+        asynchronous: bool = ...,
+        deadline: Optional[float] = ...,
         *args: Any,
         **kwargs: Any,
     ) -> None: ...
+    def _forward_asynchronous(self, state: Tensor) -> Tensor: ...
+    def _plan_loop(self) -> None: ...
+    def info(self) -> Dict[str, float]: ...
+    def park(self) -> None: ...
+    def paused(self) -> ContextManager[None]: ...
+    def stop(self) -> None: ...
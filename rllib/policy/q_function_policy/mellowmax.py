@@ -1,6 +1,5 @@
 """Mellow Policy."""
 
-import scipy.optimize
 import torch
 
 from rllib.util.utilities import mellow_max
@@ -30,6 +29,8 @@ class MellowMax(AbstractQFunctionPolicy):
 
     def forward(self, state):
         """See `AbstractQFunctionPolicy.forward'."""
+        import scipy.optimize  # Imported on first use, it is slow.
+
         q_value = self.multi_objective_reduction(self.q_function(state))
 
         mm = mellow_max(q_value, self.omega).unsqueeze(-1)
@@ -0,0 +1,137 @@
+import os
+
+import numpy as np
+import pytest
+import torch
+
+from rllib.agent import DPGAgent, PPOAgent, SACAgent
+from rllib.environment import GymEnvironment
+from rllib.policy import FelixPolicy, InferencePolicy, NNPolicy
+from rllib.util.rollout import rollout_agent
+from rllib.util.utilities import tensor_to_distribution
+
+
+@pytest.fixture(params=[True, False])
+def discrete_state(request):
+    return request.param
+
+
+@pytest.fixture(params=[True, False])
+def discrete_action(request):
+    return request.param
+
+
+@pytest.fixture(params=[True, False])
+def sample(request):
+    return request.param
+
+
+@pytest.fixture(params=[None, 4])
+def batch_size(request):
+    return request.param
+
+
+def get_policy(discrete_state, discrete_action, **kwargs):
+    return NNPolicy(
+        dim_state=() if discrete_state else (3,),
+        dim_action=() if discrete_action else (2,),
+        num_states=5 if discrete_state else -1,
+        num_actions=3 if discrete_action else -1,
+        initial_scale=0.1,
+        **kwargs,
+    )
+
+
+def get_state(discrete_state, batch_size):
+    batch_shape = () if batch_size is None else (batch_size,)
+    if discrete_state:
+        return torch.randint(5, batch_shape)
+    return torch.randn(batch_shape + (3,)) / 10
+
+
+def standard_action(policy, state, sample):
+    """Compute the action as `AbstractAgent.act'."""
+    pi = tensor_to_distribution(policy(state), **policy.dist_params)
+    if sample:
+        action = pi.sample()
+    elif pi.has_enumerate_support:
+        action = torch.argmax(pi.probs, dim=-1)
+    else:
+        action = pi.mean
+    if not policy.discrete_action:
+        action = action.clamp(-1.0, 1.0) * policy.action_scale
+    return action.detach().numpy()
+
+
+def test_action(discrete_state, discrete_action, sample, batch_size):
+    policy = get_policy(discrete_state, discrete_action, action_scale=2.0)
+    inference_policy = InferencePolicy(policy)
+    for _ in range(2):  # the second call reuses the buffers.
+        state = get_state(discrete_state, batch_size)
+        torch.manual_seed(0)
+        action = inference_policy(state.numpy(), sample=sample)
+        torch.manual_seed(0)
+        expected_action = standard_action(policy, state, sample)
+        assert action.shape == expected_action.shape
+        np.testing.assert_allclose(action, expected_action, rtol=1e-5, atol=1e-6)
+
+    pi = inference_policy.distribution()
+    assert pi.sample().shape == expected_action.shape
+
+
+def test_noisy_distribution():
+    policy = get_policy(False, False, deterministic=True)
+    policy.dist_params.update(add_noise=True, policy_noise=0.1)
+    inference_policy = InferencePolicy(policy)
+    action = inference_policy(get_state(False, 4))
+
+    # The distribution is a Delta at the noisy action that the policy returned.
+    pi = inference_policy.distribution()
+    np.testing.assert_allclose(pi.mean.clamp(-1.0, 1.0).numpy(), action, rtol=1e-6)
+    assert (pi.log_prob(pi.mean) == 0).all()
+
+
+@pytest.mark.parametrize("policy_class", [NNPolicy, FelixPolicy])
+def test_trace_and_export(policy_class, tmpdir):
+    policy = policy_class(dim_state=(3,), dim_action=(2,), action_scale=2.0)
+    inference_policy = InferencePolicy(policy, trace=True)
+    state = torch.randn(4, 3)
+    with torch.no_grad():
+        for param in policy.parameters():  # the traced network shares parameters.
+            param.add_(0.1)
+    expected_action = standard_action(policy, state, sample=False)
+    np.testing.assert_allclose(
+        inference_policy(state, sample=False), expected_action, rtol=1e-5
+    )
+
+    filename = os.path.join(tmpdir, "policy.pt")
+    inference_policy.export(filename)
+    exported_policy = torch.jit.load(filename)
+    np.testing.assert_allclose(
+        exported_policy(state).numpy(), expected_action, rtol=1e-5
+    )
+
+
+def test_not_nn_policy():
+    with pytest.raises(TypeError):
+        InferencePolicy(torch.nn.Linear(3, 2))
+
+
+@pytest.mark.parametrize(
+    "agent_class, environment",
+    [
+        (SACAgent, "VContinuous-CartPole-v0"),
+        (DPGAgent, "VContinuous-CartPole-v0"),
+        (PPOAgent, "CartPole-v0"),
+    ],
+)
+def test_agent_fast_inference(agent_class, environment):
+    environment = GymEnvironment(environment, seed=0)
+    agent = agent_class.default(
+        environment, fast_inference=True, num_iter=1, checkpoint_frequency=0
+    )
+    rollout_agent(environment, agent, num_episodes=2, max_steps=20)
+    assert list(agent.inference_policies.values())[0] is not None
+    assert np.all(np.isfinite(agent.logger.get("train_return-0")))
+    assert isinstance(agent.pi, torch.distributions.Distribution)
+    agent.logger.delete_directory()
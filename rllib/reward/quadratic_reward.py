@@ -26,4 +26,4 @@ class QuadraticReward(AbstractModel):
         """See `abstract_reward.forward'."""
         state_cost = torch_quadratic(state - self.goal, self.q)
         action_cost = torch_quadratic(action, self.r)
-        return -(state_cost + action_cost).squeeze(-1), torch.zeros(1)
+        return -(state_cost + action_cost), torch.zeros(1)
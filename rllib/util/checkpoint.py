@@ -0,0 +1,302 @@
+"""Implementation of an incremental and asynchronous checkpointer for agents."""
+import copy
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.optim.optimizer import Optimizer
+
+from rllib.dataset.experience_replay import ExperienceReplay
+from rllib.util.utilities import get_random_state, save_random_state
+
+
+class ComponentFile(object):
+    """Reference from a checkpoint manifest to a file with a single component.
+
+    Parameters
+    ----------
+    filename: str.
+        Name of the component file, relative to the checkpoint directory.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+
+class ReplaySegments(object):
+    """Reference from a checkpoint manifest to a segmented experience replay.
+
+    Parameters
+    ----------
+    header: str.
+        Name of the file with the experience replay without its memory.
+    segments: list of str.
+        Names of the files with consecutive slices of the memory.
+    """
+
+    def __init__(self, header, segments):
+        self.header = header
+        self.segments = segments
+
+
+def fingerprint(value):
+    """Compute a cheap fingerprint that changes when a state dict changes.
+
+    Tensors are identified through their storage and their version counter, which
+    torch increments at every in-place modification. If a leaf of the state dict is
+    neither a tensor nor a python scalar, it returns None and the value is considered
+    to always change.
+    """
+    try:
+        return _fingerprint(value)
+    except TypeError:
+        return None
+
+
+def _fingerprint(value):
+    """Compute the fingerprint or raise a TypeError if it is unknown."""
+    if isinstance(value, torch.Tensor):
+        return value.data_ptr(), value._version, tuple(value.shape), value.dtype
+    elif isinstance(value, dict):
+        return tuple((key, _fingerprint(val)) for key, val in value.items())
+    elif isinstance(value, (list, tuple)):
+        return tuple(_fingerprint(val) for val in value)
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Can't fingerprint {type(value)}.")
+
+
+def clone_state_dict(value):
+    """Copy the tensors of a state dict to cpu memory."""
+    if isinstance(value, torch.Tensor):
+        return value.detach().to("cpu", copy=True)
+    elif isinstance(value, dict):
+        return type(value)((key, clone_state_dict(val)) for key, val in value.items())
+    elif isinstance(value, (list, tuple)):
+        return type(value)(clone_state_dict(val) for val in value)
+    return copy.deepcopy(value)
+
+
+def atomic_save(obj, path):
+    """Save an object with torch.save by writing it to a temporary file first."""
+    tmp_path = f"{path}.tmp"
+    torch.save(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+class Checkpointer(object):
+    """Checkpointer that writes agent checkpoints incrementally and asynchronously.
+
+    The agent parameters are split in components. Modules and optimizers are stored
+    through their state dicts, experience replays through segments of their memory,
+    and every other attribute inline in a manifest with the name of the checkpoint.
+
+    At each checkpoint the calling thread only takes a snapshot of the components
+    that changed since the last checkpoint, i.e., it copies the tensors of the
+    changed state dicts and references the changed replay segments. Serialization
+    happens in a background thread that writes each file atomically, so an
+    interrupted write never corrupts the previous checkpoint. At most `max_pending'
+    checkpoints wait to be written, after which `save' blocks.
+
+    Parameters
+    ----------
+    directory: str.
+        Directory where to write the checkpoints.
+    frequency: int, optional (default=1).
+        Number of episodes between checkpoints. If zero, never checkpoint.
+    asynchronous: bool, optional (default=True).
+        Flag that indicates whether to serialize in a background thread.
+    segment_size: int, optional (default=10000).
+        Number of transitions in each experience replay segment.
+    max_pending: int, optional (default=2).
+        Maximum number of checkpoints waiting to be written.
+    """
+
+    def __init__(
+        self,
+        directory,
+        frequency=1,
+        asynchronous=True,
+        segment_size=10000,
+        max_pending=2,
+    ):
+        self.directory = directory
+        self.frequency = frequency
+        self.asynchronous = asynchronous
+        self.segment_size = segment_size
+        self.max_pending = max_pending
+
+        self._versions = {}
+        self._replays = {}
+        self._manifest_files = {}
+        self._counter = 0
+
+        self._executor = None
+        self._futures = deque()
+
+        self.save_time = 0.0
+        self.write_time = 0.0
+
+    @property
+    def component_dir(self):
+        """Return the directory with the component files."""
+        return f"{self.directory}/checkpoint"
+
+    def should_save(self, num_episodes):
+        """Check if a checkpoint is due after `num_episodes' episodes."""
+        return self.frequency > 0 and num_episodes % self.frequency == 0
+
+    def save(self, filename, params, random_state=False):
+        """Save a checkpoint.
+
+        Parameters
+        ----------
+        filename: str.
+            Name of the manifest of the checkpoint.
+        params: dict.
+            Dictionary with the agent components.
+        random_state: bool, optional (default=False).
+            Flag that indicates whether to save the random state too.
+
+        Returns
+        -------
+        path: str.
+            Path to the manifest of the checkpoint.
+        """
+        start = time.time()
+        manifest, files = {}, {}
+        for key, value in params.items():
+            if isinstance(value, ExperienceReplay):
+                manifest[key] = self._snapshot_replay(key, value, files)
+            elif isinstance(value, (nn.Module, Optimizer)):
+                manifest[key] = self._snapshot_state_dict(key, value, files)
+            else:
+                manifest[key] = copy.deepcopy(value)
+        rng_state = get_random_state() if random_state else None
+
+        if self.asynchronous:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            self.wait(self.max_pending - 1)
+            self._futures.append(
+                self._executor.submit(self._write, filename, manifest, files, rng_state)
+            )
+        else:
+            self._write(filename, manifest, files, rng_state)
+        self.save_time = time.time() - start
+        return f"{self.directory}/{filename}"
+
+    def wait(self, max_pending=0):
+        """Wait until at most `max_pending' checkpoints are waiting to be written.
+
+        It raises the exceptions that occurred while writing the checkpoints.
+        """
+        while len(self._futures) > max_pending:
+            self._futures.popleft().result()
+
+    def _new_filename(self, key):
+        """Get a new unique name for a component file."""
+        self._counter += 1
+        return f"{key}.{self._counter}.pt"
+
+    def _snapshot_state_dict(self, key, value, files):
+        """Snapshot the state dict of a module or optimizer if it changed."""
+        state_dict = value.state_dict()
+        version = fingerprint(state_dict)
+        old_version, filename = self._versions.get(key, (None, None))
+        if version is None or version != old_version:
+            filename = self._new_filename(key)
+            files[filename] = clone_state_dict(state_dict)
+            self._versions[key] = (version, filename)
+        return ComponentFile(filename)
+
+    def _snapshot_replay(self, key, replay, files):
+        """Snapshot the segments of the memory written since the last checkpoint.
+
+        Transitions are appended at `replay.ptr' and followed by `num_memory_steps'
+        padding transitions, so the memory written since the last checkpoint is
+        delimited by the change in `replay.data_count'.
+        """
+        num_segments = int(np.ceil(replay.max_len / self.segment_size))
+        memory_id, data_count, segments = self._replays.get(key, (None, 0, None))
+        num_written = replay.data_count - data_count + replay.num_memory_steps
+        if (
+            memory_id != id(replay.memory)
+            or replay.data_count < data_count
+            or num_written >= replay.max_len
+        ):
+            dirty = set(range(num_segments))
+            segments = [None] * num_segments
+        else:
+            indexes = np.arange(data_count, data_count + num_written) % replay.max_len
+            dirty = set(np.unique(indexes // self.segment_size).tolist())
+
+        segments = list(segments)
+        for i in dirty:
+            segments[i] = self._new_filename(f"{key}-segment{i}")
+            memory = replay.memory[i * self.segment_size : (i + 1) * self.segment_size]
+            files[segments[i]] = memory.copy()  # observations are never modified.
+
+        header = copy.copy(replay)
+        header.memory = None
+        header_file = self._new_filename(f"{key}-header")
+        files[header_file] = copy.deepcopy(header)
+
+        self._replays[key] = (id(replay.memory), replay.data_count, segments)
+        return ReplaySegments(header_file, segments)
+
+    def _write(self, filename, manifest, files, random_state):
+        """Serialize the snapshot and remove the component files no longer used."""
+        start = time.time()
+        os.makedirs(self.component_dir, exist_ok=True)
+        for component_file, value in files.items():
+            atomic_save(value, f"{self.component_dir}/{component_file}")
+        atomic_save(manifest, f"{self.directory}/{filename}")
+        if random_state is not None:
+            save_random_state(self.directory, random_state)
+
+        used_files = set()
+        for value in manifest.values():
+            if isinstance(value, ComponentFile):
+                used_files.add(value.filename)
+            elif isinstance(value, ReplaySegments):
+                used_files.update([value.header] + value.segments)
+        self._manifest_files[filename] = used_files
+        live_files = set().union(*self._manifest_files.values())
+        for component_file in os.listdir(self.component_dir):
+            if component_file not in live_files:
+                os.remove(f"{self.component_dir}/{component_file}")
+        self.write_time = time.time() - start
+
+
+def load_checkpoint(path):
+    """Load the parameters of a checkpoint.
+
+    Parameters
+    ----------
+    path: str.
+        Full path to a manifest written by a `Checkpointer' or to a file written with
+        `torch.save'.
+
+    Returns
+    -------
+    params: dict.
+        Dictionary with the agent parameters, with state dicts for the modules and
+        optimizers.
+    """
+    params = torch.load(path)
+    component_dir = f"{os.path.dirname(path) or '.'}/checkpoint"
+    for key, value in params.items():
+        if isinstance(value, ComponentFile):
+            params[key] = torch.load(f"{component_dir}/{value.filename}")
+        elif isinstance(value, ReplaySegments):
+            replay = torch.load(f"{component_dir}/{value.header}")
+            replay.memory = np.concatenate(
+                [torch.load(f"{component_dir}/{segment}") for segment in value.segments]
+            )
+            params[key] = replay
+    return params
@@ -0,0 +1,64 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from rllib.dataset.experience_replay import ExperienceReplay
+
+class ComponentFile(object):
+    filename: str
+    def __init__(self, filename: str) -> None: ...
+
+class ReplaySegments(object):
+    header: str
+    segments: List[str]
+    def __init__(self, header: str, segments: List[str]) -> None: ...
+
+def fingerprint(value: Any) -> Optional[Tuple]: ...
+def _fingerprint(value: Any) -> Any: ...
+def clone_state_dict(value: Any) -> Any: ...
+def atomic_save(obj: Any, path: str) -> None: ...
+
+class Checkpointer(object):
+    directory: str
+    frequency: int
+    asynchronous: bool
+    segment_size: int
+    max_pending: int
+    _versions: Dict[str, Tuple[Optional[Tuple], str]]
+    _replays: Dict[str, Tuple[int, int, List[str]]]
+    _manifest_files: Dict[str, Set[str]]
+    _counter: int
+    _executor: Optional[ThreadPoolExecutor]
+    _futures: Deque[Future]
+    save_time: float
+    write_time: float
+    def __init__(
+        self,
+        directory: str,
+        frequency: int = ...,
+        asynchronous: bool = ...,
+        segment_size: int = ...,
+        max_pending: int = ...,
+    ) -> None: ...
+    @property
+    def component_dir(self) -> str: ...
+    def should_save(self, num_episodes: int) -> bool: ...
+    def save(
+        self, filename: str, params: Dict[str, Any], random_state: bool = ...
+    ) -> str: ...
+    def wait(self, max_pending: int = ...) -> None: ...
+    def _new_filename(self, key: str) -> str: ...
+    def _snapshot_state_dict(
+        self, key: str, value: Any, files: Dict[str, Any]
+    ) -> ComponentFile: ...
+    def _snapshot_replay(
+        self, key: str, replay: ExperienceReplay, files: Dict[str, Any]
+    ) -> ReplaySegments: ...
+    def _write(
+        self,
+        filename: str,
+        manifest: Dict[str, Any],
+        files: Dict[str, Any],
+        random_state: Optional[Dict[str, Any]],
+    ) -> None: ...
+
+def load_checkpoint(path: str) -> Dict[str, Any]: ...
@@ -2,9 +2,8 @@
 import gpytorch
 import numpy as np
 import torch
-from gpytorch.lazy import MatmulLazyTensor, delazify, lazify
+from gpytorch.lazy import MatmulLazyTensor, lazify
 from gpytorch.models.exact_prediction_strategies import DefaultPredictionStrategy
-from scipy.stats.distributions import chi
 
 from .prediction_strategies import SparsePredictionStrategy
 
@@ -103,6 +102,10 @@ class SparseGP(ExactGP):
     ..math:: \mu = K(x, u) A K(u, x_t) D^{-1} y
     ..math:: \Sigma = K(x, x) + K(x, u) A K(u, x) - Q(x, x)
 
+    The m x m factors and the weight vector A K(u, x_t) D^{-1} y are cached in a
+    `SparsePredictionStrategy', so that predictions cost O(batch m^2). Adding data
+    or changing the inducing points updates the cache incrementally.
+
     Parameters
     ----------
     train_x: Tensor
@@ -146,70 +149,47 @@ class SparseGP(ExactGP):
         return f"{self.approximation} {self.__class__.__name__}"
 
     def set_inducing_points(self, inducing_points):
-        """Set Inducing Points. Reset caches."""
+        """Set Inducing Points.
+
+        The prediction caches are updated incrementally on the next call.
+        """
         self.xu = inducing_points
-        self.prediction_strategy = None
+
+    def set_train_data(self, inputs=None, targets=None, strict=True):
+        """Set training data, keeping the prediction caches for an incremental update.
+
+        Hyper-parameter changes go through `train()', which still resets the caches.
+        """
+        prediction_strategy = self.prediction_strategy
+        super().set_train_data(inputs=inputs, targets=targets, strict=strict)
+        self.prediction_strategy = prediction_strategy
 
     def __call__(self, x):
         """Return GP posterior at location `x'."""
         train_inputs = self.xu
-        m = train_inputs.shape[0]
         if x.dim() == 1:
             x = x.unsqueeze(-1)
         inputs = x
 
         if self.prediction_strategy is None:
-            x_uf = torch.cat((train_inputs, self.train_inputs[0]), dim=0)
-            output = self.forward(x_uf)
-            mu_uf, kernel = output.mean, output.lazy_covariance_matrix
-
-            mu_u, mu_f = mu_uf[:m], mu_uf[m:]
-            k_uu, k_ff, k_uf = kernel[:m, :m], kernel[m:, m:], kernel[:m, m:]
-
-            if self.approximation == "FITC":
-                k_uu_root_inv = k_uu.root_inv_decomposition().root
-                z = k_uf.transpose(-2, -1) @ k_uu_root_inv
-                q_ff = z @ z.transpose(-2, -1)
-
-                diag = delazify(k_ff - q_ff).diag() + self.likelihood.noise
-                diag = lazify(torch.diag(1 / diag))
-
-            elif self.approximation == "SOR" or self.approximation == "DTC":
-                diag = lazify(torch.eye(len(self.train_targets))).mul(
-                    1.0 / self.likelihood.noise
-                )
-            else:
-                raise NotImplementedError(f"{self.approximation} Not implemented.")
-
-            cov = k_uu + (k_uf @ diag) @ k_uf.transpose(-2, -1)
-
-            prior_dist = gpytorch.distributions.MultivariateNormal(
-                mu_u, cov.add_jitter(1e-3)
-            )
-
-            # Create the prediction strategy for
             self.prediction_strategy = SparsePredictionStrategy(
-                train_inputs=train_inputs,
-                train_prior_dist=prior_dist,
-                train_labels=(k_uf @ diag) @ (self.train_targets - mu_f),
+                mean_module=self.mean_module,
+                covar_module=self.covar_module,
                 likelihood=self.likelihood,
-                k_uu=k_uu.add_jitter(),
+                approximation=self.approximation,
             )
+        self.prediction_strategy.update(
+            train_inputs, self.train_inputs[0], self.train_targets
+        )
 
-        # Concatenate the input to the training input
-        batch_shape = inputs.shape[:-2]
         # Make sure the batch shapes agree for training/test data
+        batch_shape = inputs.shape[:-2]
         if batch_shape != train_inputs.shape[:-2]:
             train_inputs = train_inputs.expand(*batch_shape, *train_inputs.shape[-2:])
-        full_inputs = torch.cat([train_inputs, inputs], dim=-2)
-
-        # Get the joint distribution for training/test data
-        joint_output = self.forward(full_inputs)
-        joint_mean, joint_covar = joint_output.loc, joint_output.lazy_covariance_matrix
 
-        # Separate components.
-        mu_s = joint_mean[..., m:]
-        k_su, k_ss = joint_covar[..., m:, :m], joint_covar[..., m:, m:]
+        mu_s = self.mean_module(inputs)
+        k_su = self.covar_module(inputs, train_inputs).evaluate()
+        k_ss = self.covar_module(inputs)
 
         pred_mean = mu_s + k_su @ self.prediction_strategy.mean_cache
 
@@ -228,7 +208,7 @@ class SparseGP(ExactGP):
         else:
             raise NotImplementedError(f"{self.approximation} Not implemented.")
 
-        return joint_output.__class__(pred_mean, pred_cov)
+        return gpytorch.distributions.MultivariateNormal(pred_mean, pred_cov)
 
 
 class RandomFeatureGP(ExactGP):
@@ -321,6 +301,8 @@ class RandomFeatureGP(ExactGP):
             scale = torch.tensor(1.0 / self.num_features)
 
         elif self.approximation == "OFF":
+            from scipy.stats.distributions import chi  # Imported on first use.
+
             q, _ = torch.qr(torch.randn(self.num_features, self.dim))
             diag = torch.diag(
                 torch.tensor(
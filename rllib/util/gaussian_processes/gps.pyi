@@ -45,6 +45,12 @@ class SparseGP(ExactGP):
         kernel: Optional[Kernel] = None,
     ) -> None: ...
     def set_inducing_points(self, inducing_points: Tensor) -> None: ...
+    def set_train_data(
+        self,
+        inputs: Optional[Tensor] = ...,
+        targets: Optional[Tensor] = ...,
+        strict: bool = ...,
+    ) -> None: ...
     def forward(self, x: Tensor) -> MultivariateNormal: ...
     def __call__(self, *args: Tensor, **kwargs: Any) -> MultivariateNormal: ...
 
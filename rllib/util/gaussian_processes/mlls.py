@@ -1,5 +1,6 @@
 """Implementation of MLL loss for multi-output GPs."""
 
+import gpytorch
 import torch.nn as nn
 
 
@@ -27,3 +28,26 @@ def exact_mll(predicted_distribution, target, gp):
             loss += prior.log_prob(closure()).sum()
 
     return loss / data_size
+
+
+def variational_elbo(train_x, train_y, gp, likelihood, num_data):
+    """Calculate negative ELBO of independent variational GPs on a minibatch.
+
+    Parameters
+    ----------
+    train_x: Tensor
+        Tensor of dimension batch x dim_x.
+    train_y: Tensor
+        Tensor of dimension dim_y x batch.
+    gp: nn.ModuleList
+        List with one variational GP per output coordinate.
+    likelihood: nn.ModuleList
+        List with one likelihood per output coordinate.
+    num_data: int
+        Total number of data points, used to scale the KL term of the minibatch.
+    """
+    loss = 0
+    for gp_, likelihood_, train_y_ in zip(gp, likelihood, train_y):
+        elbo = gpytorch.mlls.VariationalELBO(likelihood_, gp_, num_data=num_data)
+        loss -= elbo(gp_(train_x), train_y_)
+    return loss
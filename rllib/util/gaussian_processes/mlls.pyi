@@ -12,3 +12,10 @@ def exact_mll(
     target: Tensor,
     gp: Union[nn.ModuleList, ExactGP],
 ) -> Tensor: ...
+def variational_elbo(
+    train_x: Tensor,
+    train_y: Tensor,
+    gp: nn.ModuleList,
+    likelihood: nn.ModuleList,
+    num_data: int,
+) -> Tensor: ...
@@ -1,64 +1,203 @@
 """Implementation of cached prediction strategies for Sparse GPs."""
-import functools
+import contextlib
 
+import torch
 from gpytorch import settings
-from gpytorch.lazy import delazify
-from gpytorch.models.exact_prediction_strategies import (
-    DefaultPredictionStrategy,
-    clear_cache_hook,
-)
-from gpytorch.utils.memoize import cached
+from gpytorch.utils.cholesky import psd_safe_cholesky
 
 
-class SparsePredictionStrategy(DefaultPredictionStrategy):
-    """Prediction strategy for Sparse GPs."""
+class SparsePredictionStrategy(object):
+    r"""Prediction strategy for Sparse GPs.
+
+    The strategy caches the sufficient statistics of the sparse approximation
+    ..math:: \Phi = K(u, x_t) D^{-1} K(x_t, u),
+    ..math:: r = K(u, x_t) D^{-1} (y_t - m(x_t)),
+    together with the m x m factors of K(u, u) and A^{-1} = K(u, u) + \Phi and the
+    weight vector A r. Predictions only evaluate K(x, u) and cost O(batch m^2).
+
+    When data is appended to the training set, or when the inducing points are
+    replaced by a set that shares points with the current one (as `bkb' does), the
+    statistics are updated incrementally instead of recomputed from scratch.
+
+    Parameters
+    ----------
+    mean_module: Mean
+        GP mean module.
+    covar_module: Kernel
+        GP kernel module.
+    likelihood: Likelihood
+        GP Gaussian likelihood.
+    approximation: str
+        Sparse approximation, one of "SOR", "DTC" or "FITC".
+    jitter: float
+        Jitter added to the m x m matrices before factorizing them.
+    """
 
     def __init__(
-        self,
-        train_inputs,
-        train_prior_dist,
-        train_labels,
-        likelihood,
-        k_uu,
-        root=None,
-        inv_root=None,
+        self, mean_module, covar_module, likelihood, approximation, jitter=1e-3
     ):
-        super().__init__(
-            train_inputs,
-            train_prior_dist,
-            train_labels,
-            likelihood,
-            root=root,
-            inv_root=inv_root,
-        )
-        self.k_uu = k_uu
-        self.lik_train_train_covar = train_prior_dist.lazy_covariance_matrix
-
-    @property  # type: ignore
-    @cached(name="k_uu_inv_root")
-    def k_uu_inv_root(self):
-        """Get K_uu^-1/2."""
-        train_train_covar = self.k_uu
-        train_train_covar_inv_root = delazify(
-            train_train_covar.root_inv_decomposition().root
+        if approximation not in ["SOR", "DTC", "FITC"]:
+            raise NotImplementedError(f"{approximation} Not implemented.")
+        self.mean_module = mean_module
+        self.covar_module = covar_module
+        self.likelihood = likelihood
+        self.approximation = approximation
+        self.jitter = jitter
+
+        self.inducing_points = None
+        self.train_inputs = None
+        self.train_targets = None
+
+        self.k_uu = None
+        self.k_uf = None
+        self.residual = None
+        self.d_inv = None
+        self.phi = None
+        self.r = None
+
+        self.k_uu_inv_root = None
+        self.covar_cache = None
+        self.mean_cache = None
+
+    def update(self, inducing_points, train_inputs, train_targets):
+        """Bring the caches up to date with the inducing points and training data.
+
+        Tensors are compared by identity first, so this is free when nothing changed.
+        """
+        if (
+            inducing_points is self.inducing_points
+            and train_inputs is self.train_inputs
+            and train_targets is self.train_targets
+        ):
+            return
+
+        with self._grad_context():
+            if not self._extends_train_data(train_inputs, train_targets):
+                self._rebuild(inducing_points, train_inputs, train_targets)
+                return
+
+            num_old = self.train_inputs.shape[-2]
+            if inducing_points is not self.inducing_points:
+                self._set_inducing_points(inducing_points)
+            if train_inputs.shape[-2] > num_old:
+                self._add_data(train_inputs[num_old:], train_targets[num_old:])
+            self.train_inputs, self.train_targets = train_inputs, train_targets
+            self._factorize()
+
+    def _extends_train_data(self, train_inputs, train_targets):
+        """Check if the training data extends the cached training data."""
+        if self.train_inputs is None:
+            return False
+        if train_inputs is self.train_inputs:
+            return train_targets is self.train_targets
+        num_old = self.train_inputs.shape[-2]
+        return (
+            train_inputs.shape[-2] >= num_old
+            and train_inputs.shape[-1] == self.train_inputs.shape[-1]
+            and torch.equal(train_inputs[:num_old], self.train_inputs)
+            and torch.equal(train_targets[:num_old], self.train_targets)
         )
-        return train_train_covar_inv_root
 
-    @property  # type: ignore
-    @cached(name="mean_cache")
-    def mean_cache(self):
-        r"""Get mean cache, namely \sigma^-1 k_uf y_f."""
-        sigma = self.lik_train_train_covar
-        sigma_inv_root = delazify(sigma.root_inv_decomposition().root)
-        sigma_inv = sigma_inv_root @ sigma_inv_root.transpose(-2, -1)
-        mean_cache = (sigma_inv @ self.train_labels.unsqueeze(-1)).squeeze(-1)
+    def _rebuild(self, inducing_points, train_inputs, train_targets):
+        """Compute all caches from scratch."""
+        self.inducing_points = inducing_points
+        self.train_inputs = train_inputs
+        self.train_targets = train_targets
+
+        self.k_uu = self.covar_module(inducing_points).evaluate()
+        self.k_uf = self.covar_module(inducing_points, train_inputs).evaluate()
+        self.residual = train_targets - self.mean_module(train_inputs)
+        self._factorize_k_uu()
+        self.d_inv = self._precision(train_inputs, self.k_uf)
+        self.phi = (self.k_uf * self.d_inv) @ self.k_uf.transpose(-2, -1)
+        self.r = self.k_uf @ (self.d_inv * self.residual)
+        self._factorize()
+
+    def _add_data(self, new_inputs, new_targets):
+        """Add new data with a rank-n_new update of the statistics."""
+        k_un = self.covar_module(self.inducing_points, new_inputs).evaluate()
+        residual = new_targets - self.mean_module(new_inputs)
+        d_inv = self._precision(new_inputs, k_un)
+
+        self.phi = self.phi + (k_un * d_inv) @ k_un.transpose(-2, -1)
+        self.r = self.r + k_un @ (d_inv * residual)
+        self.k_uf = torch.cat((self.k_uf, k_un), dim=-1)
+        self.residual = torch.cat((self.residual, residual), dim=-1)
+        self.d_inv = torch.cat((self.d_inv, d_inv), dim=-1)
+
+    def _set_inducing_points(self, inducing_points):
+        """Change inducing points, reusing the kernel rows of the retained points."""
+        old_points = self.inducing_points
+        equal = (inducing_points.unsqueeze(-2) == old_points.unsqueeze(-3)).all(-1)
+        kept = equal.any(-1)
+        old_idx = equal.int().argmax(-1)[kept]
+        kept_idx, new_idx = torch.where(kept)[0], torch.where(~kept)[0]
+
+        # Assemble K(u, u) and K(u, x_t) from old rows and new kernel evaluations.
+        num_points = inducing_points.shape[-2]
+        k_uu = self.k_uu.new_zeros(num_points, num_points)
+        kept_rows, old_rows = kept_idx.unsqueeze(-1), old_idx.unsqueeze(-1)
+        k_uu[kept_rows, kept_idx] = self.k_uu[old_rows, old_idx]
+        k_uf = self.k_uf.new_zeros(num_points, self.k_uf.shape[-1])
+        k_uf[kept_idx] = self.k_uf[old_idx]
+        if len(new_idx):
+            new_points = inducing_points[new_idx]
+            k_nu = self.covar_module(new_points, inducing_points).evaluate()
+            k_uu[new_idx] = k_nu
+            k_uu[:, new_idx] = k_nu.transpose(-2, -1)
+            k_uf[new_idx] = self.covar_module(new_points, self.train_inputs).evaluate()
 
+        self.inducing_points, self.k_uu, self.k_uf = inducing_points, k_uu, k_uf
+        self._factorize_k_uu()
+
+        if self.approximation == "FITC":  # D depends on every inducing point.
+            self.d_inv = self._precision(self.train_inputs, k_uf)
+            self.phi = (k_uf * self.d_inv) @ k_uf.transpose(-2, -1)
+            self.r = k_uf @ (self.d_inv * self.residual)
+        else:
+            phi = self.phi.new_zeros(num_points, num_points)
+            phi[kept_rows, kept_idx] = self.phi[old_rows, old_idx]
+            r = self.r.new_zeros(num_points)
+            r[kept_idx] = self.r[old_idx]
+            if len(new_idx):
+                phi_new = (k_uf[new_idx] * self.d_inv) @ k_uf.transpose(-2, -1)
+                phi[new_idx] = phi_new
+                phi[:, new_idx] = phi_new.transpose(-2, -1)
+                r[new_idx] = k_uf[new_idx] @ (self.d_inv * self.residual)
+            self.phi, self.r = phi, r
+
+    def _precision(self, inputs, k_ui):
+        """Compute the diagonal of D^{-1} at the inputs."""
+        noise = self.likelihood.noise
+        if self.approximation == "FITC":
+            k_ii = self.covar_module(inputs, diag=True)
+            z = k_ui.transpose(-2, -1) @ self.k_uu_inv_root
+            q_ii = (z ** 2).sum(-1)
+            return 1.0 / (k_ii - q_ii + noise)
+        else:
+            return (1.0 / noise).expand(inputs.shape[-2])
+
+    @staticmethod
+    def _grad_context():
+        """Get the context in which the caches are computed."""
         if settings.detach_test_caches.on():
-            mean_cache = mean_cache.detach()
+            return torch.no_grad()
+        return contextlib.nullcontext()
 
-        if mean_cache.grad_fn is not None:
-            wrapper = functools.partial(clear_cache_hook, self)
-            functools.update_wrapper(wrapper, clear_cache_hook)
-            mean_cache.grad_fn.register_hook(wrapper)
+    def _factorize_k_uu(self):
+        """Compute K(u, u)^{-1/2}."""
+        self.k_uu_inv_root = self._inv_root(self.k_uu)
+
+    def _factorize(self):
+        """Compute A^{1/2} and the weight vector A r."""
+        sigma = self.k_uu + self.phi
+        self.covar_cache = self._inv_root(sigma)
+        self.mean_cache = self.covar_cache @ (
+            self.covar_cache.transpose(-2, -1) @ self.r
+        )
 
-        return mean_cache
+    def _inv_root(self, matrix):
+        """Compute L^{-T} such that L^{-T} L^{-1} = matrix^{-1}."""
+        eye = torch.eye(matrix.shape[-1], dtype=matrix.dtype, device=matrix.device)
+        chol = psd_safe_cholesky(matrix + self.jitter * eye)
+        return torch.linalg.solve_triangular(chol, eye, upper=False).transpose(-2, -1)
@@ -1,27 +1,50 @@
-from typing import Optional
+from typing import ContextManager, Optional
 
-from gpytorch.distributions import Distribution
+from gpytorch.kernels import Kernel
 from gpytorch.likelihoods import Likelihood
-from gpytorch.models.exact_prediction_strategies import DefaultPredictionStrategy
-from gpytorch.utils.memoize import cached
+from gpytorch.means import Mean
 from torch import Tensor
 
-class SparsePredictionStrategy(DefaultPredictionStrategy):
+class SparsePredictionStrategy(object):
     """Prediction strategy for Sparse GPs."""
 
+    mean_module: Mean
+    covar_module: Kernel
+    likelihood: Likelihood
+    approximation: str
+    jitter: float
+    inducing_points: Optional[Tensor]
+    train_inputs: Optional[Tensor]
+    train_targets: Optional[Tensor]
+    k_uu: Optional[Tensor]
+    k_uf: Optional[Tensor]
+    residual: Optional[Tensor]
+    d_inv: Optional[Tensor]
+    phi: Optional[Tensor]
+    r: Optional[Tensor]
+    k_uu_inv_root: Optional[Tensor]
+    covar_cache: Optional[Tensor]
+    mean_cache: Optional[Tensor]
     def __init__(
         self,
-        train_inputs: Tensor,
-        train_prior_dist: Distribution,
-        train_labels: Tensor,
+        mean_module: Mean,
+        covar_module: Kernel,
         likelihood: Likelihood,
-        k_uu: Tensor,
-        root: Optional[Tensor] = ...,
-        inv_root: Optional[Tensor] = ...,
+        approximation: str,
+        jitter: float = ...,
     ) -> None: ...
-    @property  # type: ignore
-    @cached(name="k_uu_inv_root")
-    def k_uu_inv_root(self) -> Tensor: ...
-    @property  # type: ignore
-    @cached(name="mean_cache")
-    def mean_cache(self) -> Tensor: ...
+    def update(
+        self, inducing_points: Tensor, train_inputs: Tensor, train_targets: Tensor
+    ) -> None: ...
+    def _extends_train_data(self, train_inputs: Tensor, train_targets: Tensor) -> bool: ...
+    def _rebuild(
+        self, inducing_points: Tensor, train_inputs: Tensor, train_targets: Tensor
+    ) -> None: ...
+    def _add_data(self, new_inputs: Tensor, new_targets: Tensor) -> None: ...
+    def _set_inducing_points(self, inducing_points: Tensor) -> None: ...
+    def _precision(self, inputs: Tensor, k_ui: Tensor) -> Tensor: ...
+    @staticmethod
+    def _grad_context() -> ContextManager: ...
+    def _factorize_k_uu(self) -> None: ...
+    def _factorize(self) -> None: ...
+    def _inv_root(self, matrix: Tensor) -> Tensor: ...
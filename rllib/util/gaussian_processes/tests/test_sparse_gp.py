@@ -0,0 +1,60 @@
+import gpytorch
+import pytest
+import torch
+import torch.testing
+
+from rllib.util.gaussian_processes import SparseGP
+from rllib.util.gaussian_processes.utilities import add_data_to_gp
+
+
+@pytest.fixture(params=["DTC", "SOR", "FITC"])
+def approximation(request):
+    return request.param
+
+
+def get_gp(train_x, train_y, inducing_points, approximation):
+    likelihood = gpytorch.likelihoods.GaussianLikelihood()
+    likelihood.noise = 0.1
+    gp = SparseGP(train_x, train_y, likelihood, inducing_points, approximation)
+    gp.eval()
+    return gp
+
+
+def test_cache(approximation):
+    torch.manual_seed(0)
+    x, test_x = torch.randn(32, 2), torch.randn(8, 2)
+    gp = get_gp(x, torch.sin(x).sum(-1), x[:8], approximation)
+
+    with torch.no_grad():
+        pred = gp(test_x)
+        cache = gp.prediction_strategy.mean_cache
+        assert cache.shape == (8,)
+        pred_ = gp(test_x)
+        assert gp.prediction_strategy.mean_cache is cache
+
+    torch.testing.assert_allclose(pred.mean, pred_.mean)
+    torch.testing.assert_allclose(pred.covariance_matrix, pred_.covariance_matrix)
+
+
+def test_incremental_update(approximation):
+    torch.manual_seed(0)
+    x, new_x, test_x = torch.randn(32, 2), torch.randn(4, 2), torch.randn(8, 2)
+    y, new_y = torch.sin(x).sum(-1), torch.sin(new_x).sum(-1)
+    gp = get_gp(x, y, x[:8], approximation)
+
+    with torch.no_grad():
+        gp(test_x)
+        add_data_to_gp(gp, new_x, new_y)
+        inducing_points = torch.cat((x[2:8], new_x[:2]), dim=0)
+        gp.set_inducing_points(inducing_points)
+        pred = gp(test_x)
+
+        other = get_gp(
+            torch.cat((x, new_x)), torch.cat((y, new_y)), inducing_points, approximation
+        )
+        expected = other(test_x)
+
+    torch.testing.assert_allclose(pred.mean, expected.mean, rtol=1e-4, atol=1e-4)
+    torch.testing.assert_allclose(
+        pred.covariance_matrix, expected.covariance_matrix, rtol=1e-4, atol=1e-4
+    )
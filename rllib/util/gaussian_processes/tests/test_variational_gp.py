@@ -1,28 +1,69 @@
-# from rllib.util.gaussian_processes import VariationalGP
-# import torch
-# import pytest
-#
-#
-# @pytest.fixture(params=[(100, 4)])
-# def gp(request):
-#     num_inducing_points = request.param[0]
-#     in_dim = request.param[1]
-#     inducing_points = torch.randn((num_inducing_points, in_dim))
-#     gp_ = VariationalGP(inducing_points)
-#     return gp_, in_dim
-#
-#
-# def test_init(gp):
-#     pass
-#
-#
-# def test_forward(gp):
-#     gp, in_dim = gp
-#     batch_size = 32
-#
-#     tensor = torch.rand((batch_size, in_dim))
-#     distribution = gp.forward(tensor)
-#
-#     assert distribution.mean.shape == (batch_size, )
-#     assert distribution.has_rsample
-#     assert not distribution.has_enumerate_support
+import pytest
+import torch
+
+from rllib.dataset.datatypes import Observation
+from rllib.dataset.experience_replay import ExperienceReplay
+from rllib.model import VariationalGPModel
+from rllib.util.gaussian_processes.variational_gp import ApproximateGPModel
+from rllib.util.logger import Logger
+from rllib.util.training.model_learning import train_model
+
+
+@pytest.fixture(params=[(16, 4)])
+def gp(request):
+    num_inducing_points, in_dim = request.param
+    inducing_points = torch.randn((num_inducing_points, in_dim))
+    return ApproximateGPModel(inducing_points), num_inducing_points, in_dim
+
+
+def test_init(gp):
+    gp, num_inducing_points, in_dim = gp
+    distribution = gp.variational_strategy.variational_distribution
+    assert distribution.mean.shape == (num_inducing_points,)
+
+
+def test_forward(gp):
+    gp, _, in_dim = gp
+    batch_size = 32
+    distribution = gp(torch.rand((batch_size, in_dim)))
+    assert distribution.mean.shape == (batch_size,)
+
+
+@pytest.fixture(params=["dynamics", "rewards"])
+def model_kind(request):
+    return request.param
+
+
+def test_variational_gp_model(model_kind):
+    torch.manual_seed(0)
+    dim_state, dim_action, num_data = 2, 1, 256
+    model = VariationalGPModel(
+        num_inducing_points=16,
+        dim_state=(dim_state,),
+        dim_action=(dim_action,),
+        model_kind=model_kind,
+    )
+    out_dim = dim_state if model_kind == "dynamics" else 1
+    mean, scale_tril = model(torch.randn(4, 8, dim_state), torch.randn(4, 8, 1))
+    assert mean.shape == (4, 8, out_dim)
+    assert scale_tril.shape == (4, 8, out_dim, out_dim)
+
+    memory = ExperienceReplay(max_len=num_data)
+    for _ in range(num_data):
+        state, action = torch.randn(dim_state), torch.randn(dim_action)
+        next_state = torch.sin(state) + action
+        memory.append(
+            Observation(
+                state=state,
+                action=action,
+                reward=next_state.sum(-1, keepdim=True),
+                next_state=next_state,
+                done=torch.tensor(0.0),
+            ).to_torch()
+        )
+
+    optimizer = torch.optim.Adam(model.parameters(), lr=0.05)
+    logger = Logger("svgp_training")
+    train_model(model, memory, optimizer, batch_size=32, max_iter=20, logger=logger)
+    assert model.num_data == num_data
+    logger.delete_directory()
@@ -8,7 +8,7 @@ class ApproximateGPModel(gpytorch.models.ApproximateGP):
 
     def __init__(self, inducing_points, learn_loc=True, mean=None, kernel=None):
         variational_distribution = gpytorch.variational.CholeskyVariationalDistribution(
-            inducing_points.size(-1)
+            inducing_points.size(-2)
         )
         variational_strategy = gpytorch.variational.VariationalStrategy(
             self,
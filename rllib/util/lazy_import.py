@@ -0,0 +1,48 @@
+"""Lazy attributes of packages, which are imported on first use (PEP 562).
+
+A package that re-exports many modules, some of which import slow dependencies,
+replaces the imports of its `__init__' by a table from the names of the attributes
+to the modules that define them. Hence, importing the package is fast and each
+attribute costs its import only when it is first accessed.
+
+Examples
+--------
+>>> import rllib.agent
+>>> "SACAgent" in dir(rllib.agent)
+True
+>>> rllib.agent.SACAgent.__name__
+'SACAgent'
+"""
+import sys
+from importlib import import_module
+
+
+def lazy_attributes(package, attributes):
+    """Get the `__getattr__' and `__dir__' functions of a package with lazy attributes.
+
+    Parameters
+    ----------
+    package: str
+        Name of the package, i.e., `__name__' in its `__init__'.
+    attributes: Dict[str, str]
+        Module that defines each attribute, relative to the package.
+
+    Returns
+    -------
+    __getattr__: Callable[[str], Any]
+        Function that imports an attribute and caches it in the package.
+    __dir__: Callable[[], List[str]]
+        Function that lists the attributes, including the ones not imported yet.
+    """
+
+    def __getattr__(name):
+        if name not in attributes:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(attributes[name], package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__
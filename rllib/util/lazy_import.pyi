@@ -0,0 +1,5 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+def lazy_attributes(
+    package: str, attributes: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]: ...
@@ -1,13 +1,57 @@
 """Implementation of a Logger class."""
+import functools
 import json
+import math
 import os
 import shutil
-from collections import defaultdict
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import numpy as np
 import torch
-from tensorboardX import SummaryWriter
+
+
+def _summary_writer(log_dir):
+    """Get a tensorboard writer, importing tensorboardX on first use."""
+    from tensorboardX import SummaryWriter
+
+    return SummaryWriter(log_dir=log_dir)
+
+
+def is_tensor(value):
+    """Check if a value is a tensor."""
+    return isinstance(value, torch.Tensor)
+
+
+def synchronized(method):
+    """Call a method of the logger holding its lock, so that threads can share it."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def to_floats(values):
+    """Convert a list of scalars and scalar tensors to floats with one copy per device.
+
+    Tensors are stacked on their device and copied to the host at once, which
+    synchronizes each device a single time.
+    """
+    floats = list(values)
+    indexes = defaultdict(list)
+    for i, value in enumerate(values):
+        if is_tensor(value):
+            indexes[value.device].append(i)
+    for device_indexes in indexes.values():
+        stacked = torch.stack([values[i].reshape(()).double() for i in device_indexes])
+        for i, value in zip(device_indexes, stacked.tolist()):
+            floats[i] = value
+    return floats
 
 
 def safe_make_dir(dir_name):
@@ -23,6 +67,16 @@ def safe_make_dir(dir_name):
 class Logger(object):
     """Class that implements a logger of statistics.
 
+    Updates are buffered. Tensor values that are not in cpu memory stay on their
+    device, and the running means of the episode are computed with tensor
+    operations, so `update' does not synchronize with the device. Every
+    `flush_frequency' updates, and at the end of each episode, the buffered values
+    are converted to floats in a single batch and the tensorboard writes are issued
+    from a background thread.
+
+    The raw values of each key are kept in `all', with a stride of `downsample' and
+    at most `max_len' values, which bounds its memory in long runs.
+
     Parameters
     ----------
     name: str
@@ -32,19 +86,48 @@ class Logger(object):
         The folder is runs/`name'/`comment_date'.
     tensorboard: bool, optional.
         Flag that indicates whether or not to save the results in the tensorboard.
+    max_len: int, optional.
+        Maximum number of raw values kept per key. By default, keep all of them.
+    downsample: int, optional (default=1).
+        Keep one every `downsample' raw values of each key.
+    flush_frequency: int, optional (default=1000).
+        Number of updates between flushes of the buffered values.
+    asynchronous: bool, optional (default=True).
+        Flag that indicates whether to write to tensorboard and to disk in a
+        background thread.
     """
 
-    def __init__(self, name, comment="", tensorboard=False):
+    def __init__(
+        self,
+        name,
+        comment="",
+        tensorboard=False,
+        max_len=None,
+        downsample=1,
+        flush_frequency=1000,
+        asynchronous=True,
+    ):
         self.statistics = list()
         self.current = dict()
-        self.all = defaultdict(list)
+        self.max_len = max_len
+        self.downsample = downsample
+        self.flush_frequency = flush_frequency
+        self.asynchronous = asynchronous
+        self.all = defaultdict(self._new_values)
+        self._num_values = defaultdict(int)
+        # Tuples (key, value, None, None) of raw values and (None, value, tag, step)
+        # of tensorboard scalars.
+        self._buffer = []
+        self._executor = None
+        self._futures = deque()
+        self._lock = threading.RLock()
 
         now = datetime.now()
         current_time = now.strftime("%b%d_%H-%M-%S")
         comment = comment + "_" + current_time if len(comment) else current_time
         log_dir = f"runs/{name}/{comment}"
         if tensorboard:
-            self.writer = SummaryWriter(log_dir=log_dir)
+            self.writer = _summary_writer(log_dir)
             self.log_dir = self.writer.logdir
         else:
             self.writer = None
@@ -52,6 +135,10 @@ class Logger(object):
         self.episode = 0
         self.keys = set()
 
+    def _new_values(self):
+        """Get an empty container of raw values."""
+        return deque(maxlen=self.max_len) if self.max_len else list()
+
     def __len__(self):
         """Return the number of episodes."""
         return len(self.statistics)
@@ -69,6 +156,8 @@ class Logger(object):
         str_ = ""
         for key in sorted(self.keys):
             values = self.get(key)
+            if not len(values):  # updated only after the end of the last episode.
+                continue
             str_ += " ".join(key.split("_")).title().ljust(17)
             str_ += f"Last: {values[-1]:.2g}".ljust(15)
             str_ += f"Avg: {np.mean(values):.2g}".ljust(15)
@@ -85,26 +174,33 @@ class Logger(object):
         """
         return [statistic[key] for statistic in self.statistics if key in statistic]
 
+    @synchronized
     def update(self, **kwargs):
         """Update the statistics for the current episode.
 
         Parameters
         ----------
         kwargs: dict
-            Any kwargs passed to update is converted to numpy and averaged
+            Any kwargs passed to update is converted to a scalar and averaged
             over the course of an episode.
         """
         for key, value in kwargs.items():
             self.keys.add(key)
             if isinstance(value, torch.Tensor):
-                value = value.detach().numpy()
-            value = np.nan_to_num(value)
-            if isinstance(value, np.ndarray):
-                value = float(np.mean(value))
-            if isinstance(value, np.float32):
-                value = float(value)
-            if isinstance(value, np.int64):
-                value = int(value)
+                value = torch.nan_to_num(value.detach().double()).mean()
+                if value.device.type == "cpu":  # Reading it does not synchronize.
+                    value = value.item()
+            if isinstance(value, float) or isinstance(value, int):
+                if not math.isfinite(value):
+                    value = float(np.nan_to_num(value))
+            elif not isinstance(value, torch.Tensor):
+                value = np.nan_to_num(value)
+                if isinstance(value, np.ndarray):
+                    value = float(np.mean(value))
+                if isinstance(value, np.float32) or isinstance(value, np.float64):
+                    value = float(value)
+                if isinstance(value, np.int64):
+                    value = int(value)
 
             if key not in self.current:
                 self.current[key] = (1, value)
@@ -114,15 +210,62 @@ class Logger(object):
                 new_value = old_value + (value - old_value) * (1 / new_count)
                 self.current[key] = (new_count, new_value)
 
-            self.all[key].append(value)
-
+            self._buffer.append((key, value, None, None))
             if self.writer is not None:
-                self.writer.add_scalar(
-                    f"episode_{self.episode}/{key}",
-                    self.current[key][1],
-                    global_step=self.current[key][0],
+                count, mean = self.current[key]
+                self._buffer.append(
+                    (None, mean, f"episode_{self.episode}/{key}", count)
                 )
 
+        if len(self._buffer) >= self.flush_frequency:
+            self.flush()
+
+    @synchronized
+    def flush(self):
+        """Convert the buffered values to floats and write them."""
+        if not self._buffer:
+            return
+        buffer, self._buffer = self._buffer, []
+        values = to_floats([value for _, value, _, _ in buffer])
+
+        scalars = []
+        for (key, _, tag, step), value in zip(buffer, values):
+            if key is None:
+                scalars.append((tag, value, step))
+            else:
+                if self._num_values[key] % self.downsample == 0:
+                    self.all[key].append(value)
+                self._num_values[key] += 1
+        if scalars:
+            self._submit(self._write_scalars, scalars)
+
+    def _write_scalars(self, scalars):
+        """Write scalars to tensorboard."""
+        for tag, value, step in scalars:
+            self.writer.add_scalar(tag, value, global_step=step)
+
+    def _submit(self, function, *args):
+        """Call a function in the background thread if the logger is asynchronous."""
+        if self.asynchronous:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            self._futures.append(self._executor.submit(function, *args))
+            while self._futures and self._futures[0].done():
+                self._futures.popleft().result()
+        else:
+            function(*args)
+
+    @synchronized
+    def wait(self):
+        """Flush the buffered values and wait until all writes finish.
+
+        It raises the exceptions that occurred while writing.
+        """
+        self.flush()
+        while self._futures:
+            self._futures.popleft().result()
+
+    @synchronized
     def end_episode(self, **kwargs):
         """Finalize collected data and add final fixed values.
 
@@ -133,18 +276,25 @@ class Logger(object):
             This can be used to store fixed values that are tracked per episode
             and do not need to be averaged.
         """
+        self.flush()
         data = {key: value[1] for key, value in self.current.items()}
         kwargs = {key: value for key, value in kwargs.items()}
         data.update(kwargs)
+        tensor_keys = [key for key, value in data.items() if is_tensor(value)]
+        for key, value in zip(
+            tensor_keys, to_floats([data[key] for key in tensor_keys])
+        ):
+            data[key] = value
 
+        scalars = []
         for key, value in data.items():
             self.keys.add(key)
             if isinstance(value, float) or isinstance(value, int):
                 self.all[key].append(value)
                 if self.writer is not None:
-                    self.writer.add_scalar(
-                        f"average/{key}", value, global_step=self.episode
-                    )
+                    scalars.append((f"average/{key}", value, self.episode))
+        if scalars:
+            self._submit(self._write_scalars, scalars)
 
         self.statistics.append(data)
         self.current = dict()
@@ -157,10 +307,11 @@ class Logger(object):
 
     def export_to_json(self):
         """Save the statistics to a json file."""
+        self.wait()
         with open(f"{self.log_dir}/statistics.json", "w") as f:
             json.dump(self.statistics, f)
         with open(f"{self.log_dir}/all.json", "w") as f:
-            json.dump(self.all, f)
+            json.dump({key: list(values) for key, values in self.all.items()}, f)
 
     def load_from_json(self, log_dir=None):
         """Load the statistics from a json file."""
@@ -169,10 +320,69 @@ class Logger(object):
         with open(f"{log_dir}/statistics.json", "r") as f:
             self.statistics = json.load(f)
         with open(f"{log_dir}/all.json", "r") as f:
-            self.all = json.load(f)
+            self._set_all(json.load(f))
+        for key in self.all.keys():
+            self.keys.add(key)
+
+    @synchronized
+    def export(self):
+        """Save the statistics in columnar format, in the background if asynchronous.
+
+        The statistics are saved to `statistics.npz', with one array per key that has
+        one entry per episode (nan if the key is missing in an episode), and the raw
+        values to `all.npz', with one array per key.
+        """
+        self.flush()
+        keys = sorted(set().union(*self.statistics)) if self.statistics else []
+        statistics = {}
+        for key in keys:
+            try:
+                statistics[key] = np.array(
+                    [statistic.get(key, np.nan) for statistic in self.statistics],
+                    dtype=np.float64,
+                )
+            except (TypeError, ValueError):  # Only numeric statistics are exported.
+                pass
+        all_ = {
+            key: np.array(values, dtype=np.float64) for key, values in self.all.items()
+        }
+        self._submit(self._write_columns, self.log_dir, statistics, all_)
+
+    @staticmethod
+    def _write_columns(log_dir, statistics, all_):
+        """Write the columns of the statistics and the raw values atomically."""
+        for filename, columns in [("statistics", statistics), ("all", all_)]:
+            path = f"{log_dir}/{filename}.npz"
+            with open(f"{path}.tmp", "wb") as f:
+                np.savez(f, **columns)
+            os.replace(f"{path}.tmp", path)
+
+    def load(self, log_dir=None):
+        """Load the statistics saved with `export'."""
+        log_dir = log_dir if log_dir is not None else self.log_dir
+
+        with np.load(f"{log_dir}/statistics.npz") as columns:
+            columns = {key: columns[key].tolist() for key in columns.files}
+        num_episodes = max(map(len, columns.values()), default=0)
+        self.statistics = [
+            {
+                key: values[i]
+                for key, values in columns.items()
+                if not np.isnan(values[i])
+            }
+            for i in range(num_episodes)
+        ]
+        with np.load(f"{log_dir}/all.npz") as columns:
+            self._set_all({key: columns[key].tolist() for key in columns.files})
         for key in self.all.keys():
             self.keys.add(key)
 
+    def _set_all(self, all_):
+        """Set the raw values from a dictionary of lists."""
+        self.all = defaultdict(self._new_values)
+        for key, values in all_.items():
+            self.all[key].extend(values)
+
     def log_hparams(self, hparams, metrics=None):
         """Log hyper parameters together with a metric dictionary."""
         if self.writer is None:  # Do not save.
@@ -191,6 +401,7 @@ class Logger(object):
         -----
         Use with caution. This will erase the directory, not the object.
         """
+        self.wait()
         shutil.rmtree(self.log_dir)
 
     def change_log_dir(self, new_log_dir):
@@ -201,13 +412,16 @@ class Logger(object):
         except FileNotFoundError:
             pass
         if self.writer is not None:
-            self.writer = SummaryWriter(log_dir=log_dir)
+            self.writer = _summary_writer(log_dir)
             self.log_dir = self.writer.logdir
         else:
             self.writer = None
             self.log_dir = safe_make_dir(log_dir)
 
         try:
-            self.load_from_json()  # If json files in log_dir, then load them.
+            self.load()  # If statistics in log_dir, then load them.
         except FileNotFoundError:
-            pass
+            try:
+                self.load_from_json()
+            except FileNotFoundError:
+                pass
@@ -1,33 +1,70 @@
 """Implementation of a Logger class."""
 
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import tensorboardX
+from torch import Tensor
 
+def _summary_writer(log_dir: str) -> tensorboardX.SummaryWriter: ...
+def is_tensor(value: Any) -> bool: ...
+def synchronized(method: Callable) -> Callable: ...
+def to_floats(values: List[Union[float, int, Tensor]]) -> List[Union[float, int]]: ...
 def safe_make_dir(dir_name: str) -> str: ...
 
 class Logger(object):
     statistics: List[Dict[str, float]]  # statistic[i_episode] = Summary(i_episode)
-    current: Dict[str, Tuple[int, float]]  # Dict[key, (count, value)]
-    all: Dict[str, List[float]]
+    current: Dict[str, Tuple[int, Union[float, Tensor]]]  # Dict[key, (count, value)]
+    all: Dict[str, Union[List[float], Deque[float]]]
+    max_len: Optional[int]
+    downsample: int
+    flush_frequency: int
+    asynchronous: bool
+    _num_values: Dict[str, int]
+    _buffer: List[Tuple[Optional[str], Any, Optional[str], Optional[int]]]
+    _executor: Optional[ThreadPoolExecutor]
+    _futures: Deque[Future]
+    _lock: threading.RLock
     writer: Optional[tensorboardX.SummaryWriter]
     episode: int
     keys: set
     log_dir: str
     def __init__(
-        self, name: str, comment: str = ..., tensorboard: bool = ...
+        self,
+        name: str,
+        comment: str = ...,
+        tensorboard: bool = ...,
+        max_len: Optional[int] = ...,
+        downsample: int = ...,
+        flush_frequency: int = ...,
+        asynchronous: bool = ...,
     ) -> None: ...
+    def _new_values(self) -> Union[List[float], Deque[float]]: ...
     def __len__(self) -> int: ...
     def __iter__(self) -> Iterator[Dict[str, float]]: ...
     def __getitem__(self, item: int) -> Dict[str, float]: ...
     def __str__(self) -> str: ...
     def get(self, key: str) -> List[float]: ...
     def update(self, **kwargs: Any) -> None: ...
+    def flush(self) -> None: ...
+    def _write_scalars(self, scalars: List[Tuple[str, float, int]]) -> None: ...
+    def _submit(self, function: Callable[..., None], *args: Any) -> None: ...
+    def wait(self) -> None: ...
     def end_episode(self, **kwargs: Any) -> None: ...
     def save_hparams(self, hparams: Dict) -> None: ...
     def export_to_json(self) -> None: ...
     def load_from_json(self, log_dir: Optional[str] = ...) -> None: ...
+    def export(self) -> None: ...
+    @staticmethod
+    def _write_columns(
+        log_dir: str,
+        statistics: Dict[str, np.ndarray],
+        all_: Dict[str, np.ndarray],
+    ) -> None: ...
+    def load(self, log_dir: Optional[str] = ...) -> None: ...
+    def _set_all(self, all_: Dict[str, List[float]]) -> None: ...
     def log_hparams(self, hparams: Dict, metrics: Optional[Dict] = ...) -> None: ...
     def delete_directory(self) -> None: ...
     def change_log_dir(self, new_log_dir: str) -> None: ...
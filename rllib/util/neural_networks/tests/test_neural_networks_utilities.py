@@ -13,6 +13,7 @@ from rllib.util.neural_networks.neural_networks import (
     HomoGaussianNN,
 )
 from rllib.util.neural_networks.utilities import (
+    SparseTileCode,
     TileCode,
     get_batch_size,
     init_head_bias,
@@ -219,6 +220,50 @@ class TestTileCode(object):
         )
 
 
+class TestSparseTileCode(object):
+    @pytest.fixture(params=[None, 512], scope="class")
+    def table_size(self, request):
+        return request.param
+
+    def test_indexes(self, table_size):
+        encoding = SparseTileCode(
+            [-1.0, -2.0], [1.0, 2.0], bins=10, num_tilings=4, table_size=table_size
+        )
+        encoding = torch.jit.script(encoding)
+        index = encoding(torch.rand(32, 5, 2))
+        assert index.shape == torch.Size([32, 5, 4])
+        assert index.dtype is torch.long
+        assert (0 <= index).all() and (index < encoding.num_outputs).all()
+        if table_size is None:
+            assert encoding.num_outputs == 4 * 11 * 11
+            tiling = torch.arange(4) * 11 * 11
+            assert ((tiling <= index) & (index < tiling + 11 * 11)).all()
+        else:
+            assert encoding.num_outputs == table_size
+
+    def test_tilings(self):
+        encoding = SparseTileCode([-1.0], [1.0], bins=10, num_tilings=4)
+        index = encoding(torch.tensor([[0.0], [0.08], [0.2]]))
+
+        # The first tiling is aligned with TileCode.
+        torch.testing.assert_allclose(index[:, 0], torch.tensor([5, 5, 6]))
+        # Close states share most of the tiles, far states share none.
+        assert (index[0] == index[1]).sum() == 3
+        assert (index[0] == index[2]).sum() == 0
+
+    def test_out_of_bounds(self):
+        encoding = SparseTileCode([-1.0, -1.0], [1.0, 1.0], bins=4, num_tilings=2)
+        index = encoding(torch.tensor([[-10.0, -10.0], [10.0, 10.0]]))
+        torch.testing.assert_allclose(index[0], torch.tensor([0, 25]))
+        torch.testing.assert_allclose(index[1], torch.tensor([24, 49]))
+
+    def test_too_many_tiles(self):
+        with pytest.raises(ValueError):
+            SparseTileCode([-1.0] * 20, [1.0] * 20, bins=10)
+        encoding = SparseTileCode([-1.0] * 20, [1.0] * 20, bins=10, table_size=4096)
+        assert encoding(torch.zeros(20)).shape == torch.Size([8])
+
+
 class TestOneHotEncode(object):
     @pytest.fixture(params=[None, 1, 16], scope="class")
     def batch_size(self, request):
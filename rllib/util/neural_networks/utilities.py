@@ -155,17 +155,15 @@ def update_parameters(target_module, new_module, tau=0.0):
             if target_state_dict[name] is new_state_dict[name]:
                 continue
             else:
-                if target_state_dict[name].data.ndim == 0:
-                    target_state_dict[name].data = new_state_dict[name].data
+                # In-place copies modify the tensors of the module and increment their
+                # version counter, which tracks changes, see `util.checkpoint'.
+                if target_state_dict[name].ndim == 0:
+                    target_state_dict[name].copy_(new_state_dict[name])
                 else:
-                    target_state_dict[name].data[:] = (
-                        tau * target_state_dict[name].data
-                        + (1 - tau) * new_state_dict[name].data
+                    target_state_dict[name].copy_(
+                        tau * target_state_dict[name] + (1 - tau) * new_state_dict[name]
                     )
 
-        # It is not necessary to load the dict again as it modifies the pointer.
-        # target_module.load_state_dict(target_state_dict)
-
 
 def count_vars(module):
     """Count the number of variables in a module."""
@@ -370,6 +368,83 @@ class TileCode(nn.Module):
         return code
 
 
+class SparseTileCode(nn.Module):
+    """Sparse tile coding with multiple offset tilings and optional hashing.
+
+    Each tiling partitions the box [low, high] into `bins' tiles per dimension, plus
+    one tile per dimension that covers the offset of the tiling. The tilings are
+    offset by fractions of a tile width along the asymmetric displacement vector
+    (1, 3, 5, ...). Instead of a one-hot vector of size (bins + 1) ** dim, it returns
+    the indexes of the `num_tilings' active tiles, which evaluate a linear function of
+    the features with `nn.EmbeddingBag' in O(num_tilings).
+
+    Parameters
+    ----------
+    low: array_like
+        Array of lower value of bins (per dimension).
+    high: array_like
+        Array of higher value of bins (per dimension).
+    bins: int
+        Number of bins per dimension.
+    num_tilings: int, optional (default=8).
+        Number of offset tilings.
+    table_size: int, optional.
+        If given, hash the tiles into a table of this size. Otherwise, each tile has
+        its own index, which needs num_tilings * (bins + 1) ** dim indexes.
+
+    Notes
+    -----
+    Values outside of [low, high] are assigned to the border tiles.
+
+    References
+    ----------
+    Sutton, R. S., & Barto, A. G. (2018).
+    Reinforcement learning: An introduction. Section 9.5.4.
+    """
+
+    def __init__(self, low, high, bins, num_tilings=8, table_size=None):
+        super().__init__()
+        low = torch.tensor(low, dtype=torch.get_default_dtype())
+        high = torch.tensor(high, dtype=torch.get_default_dtype())
+        dim = len(low)
+        assert dim == len(high)
+
+        width = (high - low) / bins
+        displacement = 2 * torch.arange(dim) + 1
+        offsets = (torch.arange(num_tilings).unsqueeze(-1) * displacement) % num_tilings
+        self.register_buffer("origin", low - offsets / num_tilings * width)
+        self.register_buffer("width", width)
+        self.bins = bins
+        self.num_tilings = num_tilings
+
+        num_tiles = (bins + 1) ** dim
+        self.hashed = table_size is not None
+        if self.hashed:
+            self.num_outputs = table_size
+            generator = torch.Generator().manual_seed(0)
+            weights = torch.randint(
+                2 ** 30, (num_tilings, dim + 1), generator=generator
+            )
+            self.register_buffer("weights", 2 * weights + 1)  # odd weights.
+        else:
+            if num_tilings * num_tiles >= 2 ** 62:
+                raise ValueError("Too many tiles, set a table_size to hash them.")
+            self.num_outputs = num_tilings * num_tiles
+            weights = torch.zeros(num_tilings, dim + 1, dtype=torch.long)
+            weights[:, :-1] = (bins + 1) ** torch.arange(dim)  # strides.
+            weights[:, -1] = torch.arange(num_tilings) * num_tiles  # tiling offset.
+            self.register_buffer("weights", weights)
+
+    def forward(self, x):
+        """Return the indexes of the active tiles, of shape [..., num_tilings]."""
+        coordinates = torch.floor((x.unsqueeze(-2) - self.origin) / self.width)
+        coordinates = coordinates.long().clamp(0, self.bins)
+        index = (coordinates * self.weights[:, :-1]).sum(-1) + self.weights[:, -1]
+        if self.hashed:
+            index = torch.remainder(index, self.num_outputs)
+        return index
+
+
 def digitize(tensor, bin_boundaries):
     """Implement numpy digitize using torch."""
     result = torch.zeros(tensor.shape).long()
@@ -47,6 +47,24 @@ class TileCode(nn.Module):
     def _tuple_to_int(self, tuple_: Union[Tensor, Tuple[Tensor]]) -> Tensor: ...
     def forward(self, *args: Tensor, **kwargs: Any) -> Tensor: ...
 
+class SparseTileCode(nn.Module):
+    origin: Tensor
+    width: Tensor
+    weights: Tensor
+    bins: int
+    num_tilings: int
+    num_outputs: int
+    hashed: bool
+    def __init__(
+        self,
+        low: Sequence[float],
+        high: Sequence[float],
+        bins: int,
+        num_tilings: int = ...,
+        table_size: Optional[int] = ...,
+    ) -> None: ...
+    def forward(self, x: Tensor) -> Tensor: ...
+
 def digitize(tensor: Tensor, bin_boundaries: Tensor) -> Tensor: ...
 
 class OneHotEncode(nn.Module):
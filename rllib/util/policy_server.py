@@ -0,0 +1,321 @@
+"""Policy server that batches the actions requested by concurrent clients.
+
+The server runs an asyncio event loop in a background thread. Clients request
+actions from other threads with `PolicyServer.act', from coroutines of the loop with
+`PolicyServer.act_async', or from other processes through a local socket with
+`PolicyClient'. The server gathers the pending requests into micro-batches, computes
+the actions of each batch with a single forward pass and sends each action back to
+its client.
+"""
+import asyncio
+import io
+import socket
+import struct
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import torch
+
+from rllib.util.utilities import tensor_to_distribution
+
+HEADER = struct.Struct("!I")  # Length of a message.
+
+
+def policy_actions(policy, states, sample=True, random=False):
+    """Compute the scaled actions of a policy at a batch of states.
+
+    With `random', the actions follow the random distribution of the policy, with
+    which the agents explore.
+    """
+    with torch.no_grad():
+        states = torch.as_tensor(states, dtype=torch.get_default_dtype())
+        if policy.discrete_state:
+            states = states.long()
+        if random:
+            out = policy.random(batch_size=(states.shape[0],))
+        else:
+            out = policy(states)
+        pi = tensor_to_distribution(out, **policy.dist_params)
+        if sample:
+            actions = pi.sample()
+        elif pi.has_enumerate_support:
+            actions = torch.argmax(pi.probs, dim=-1)
+        else:
+            try:
+                actions = pi.mean
+            except NotImplementedError:
+                actions = pi.sample((100,)).mean(dim=0)
+        if not policy.discrete_action:
+            actions = actions.clamp(-1.0, 1.0) * policy.action_scale
+    return actions.numpy()
+
+
+def agent_actions(agent, states):
+    """Compute the actions of an agent at a batch of states.
+
+    As `AbstractAgent.act', it acts randomly during the exploration steps and
+    episodes and samples the actions in training mode, with its acting policy.
+    """
+    exploring = agent.total_steps < agent.exploration_steps or (
+        agent.total_episodes < agent.exploration_episodes
+    )
+    with agent._acting_policy() as policy:
+        return policy_actions(policy, states, sample=agent.training, random=exploring)
+
+
+def encode(array):
+    """Encode an array as a message, without pickle."""
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(array), allow_pickle=False)
+    data = buffer.getvalue()
+    return HEADER.pack(len(data)) + data
+
+
+def decode(data):
+    """Decode the array of a message."""
+    return np.load(io.BytesIO(data), allow_pickle=False)
+
+
+class PolicyServer(object):
+    """Server that computes the actions of concurrent clients in micro-batches.
+
+    Parameters
+    ----------
+    policy: Union[AbstractAgent, AbstractPolicy].
+        Agent or policy that computes the actions. An agent computes them with its
+        acting policy, like `agent.act' but on the batch of states.
+    max_batch_size: int, optional (default=32).
+        Maximum number of states per batch.
+    max_wait_time: float, optional (default=0.001).
+        Maximum time, in seconds, that the first request of a batch waits for more
+        requests.
+    sample: bool, optional (default=True).
+        Flag that indicates whether to sample the actions of a policy or to return the
+        mode of the action distribution. Agents sample in training mode.
+
+    Examples
+    --------
+    >>> from rllib.policy import NNPolicy
+    >>> policy = NNPolicy(dim_state=(3,), dim_action=(2,))
+    >>> with PolicyServer(policy, max_batch_size=8) as server:
+    ...     action = server.act(np.zeros(3))
+    >>> action.shape
+    (2,)
+    >>> server.statistics()["num_requests"]
+    1
+    """
+
+    def __init__(self, policy, max_batch_size=32, max_wait_time=1e-3, sample=True):
+        self.policy = policy
+        self.max_batch_size = max_batch_size
+        self.max_wait_time = max_wait_time
+        self.sample = sample
+        self.batch_sizes = Counter()
+        self.queue_times = []
+        self.forward_times = []
+        self.loop = None
+        self._thread = None
+        self._requests = None
+        self._servers = []
+
+    def __enter__(self):
+        """Start the server."""
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        """Stop the server."""
+        self.stop()
+
+    def start(self):
+        """Start the event loop and the batching task in a background thread."""
+        if self._thread is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self._requests = asyncio.Queue()
+            self.loop.create_task(self._batch_requests())
+            self.loop.call_soon(started.set)
+            self.loop.run_forever()
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop(self):
+        """Close the sockets and stop the event loop."""
+        if self._thread is None:
+            return
+        for server in self._servers:
+            self.loop.call_soon_threadsafe(server.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self._thread, self._servers = None, []
+
+    def act(self, state):
+        """Request the action at a state from another thread and wait for it."""
+        if self._thread is None:
+            raise RuntimeError("The server is not running.")
+        future = asyncio.run_coroutine_threadsafe(self.act_async(state), self.loop)
+        return future.result()
+
+    async def act_async(self, state):
+        """Request the action at a state from a coroutine of the event loop."""
+        future = self.loop.create_future()
+        await self._requests.put((np.asarray(state), future, time.perf_counter()))
+        return await future
+
+    async def _batch_requests(self):
+        """Gather the requests into batches and compute their actions."""
+        while True:
+            batch = [await self._requests.get()]
+            deadline = time.perf_counter() + self.max_wait_time
+            while len(batch) < self.max_batch_size:
+                if not self._requests.empty():
+                    batch.append(self._requests.get_nowait())
+                    continue
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._requests.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._compute_actions(batch)
+
+    def _compute_actions(self, batch):
+        """Compute the actions of a batch of requests with a single forward pass."""
+        states, futures, request_times = zip(*batch)
+        start = time.perf_counter()
+        self.batch_sizes[len(batch)] += 1
+        self.queue_times.extend(start - request_time for request_time in request_times)
+        try:
+            if hasattr(self.policy, "act"):  # an agent.
+                actions = agent_actions(self.policy, np.stack(states))
+            else:
+                actions = policy_actions(self.policy, np.stack(states), self.sample)
+            if len(actions) != len(batch):
+                raise ValueError(f"{len(actions)} actions for {len(batch)} states.")
+        except Exception as exception:
+            for future in futures:
+                if not future.cancelled():
+                    future.set_exception(exception)
+            return
+        self.forward_times.append(time.perf_counter() - start)
+        for future, action in zip(futures, actions):
+            if not future.cancelled():
+                future.set_result(action)
+
+    def serve(self, host="127.0.0.1", port=0):
+        """Accept clients of other processes through a local socket.
+
+        Parameters
+        ----------
+        host: str, optional (default="127.0.0.1").
+            Address of the socket. Use a local address, the server has no
+            authentication.
+        port: int, optional (default=0).
+            Port of the socket. By default, use a free port.
+
+        Returns
+        -------
+        address: Tuple[str, int].
+            Address to which the clients connect.
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._handle_client, host, port), self.loop
+        )
+        server = future.result()
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[:2]
+
+    async def _handle_client(self, reader, writer):
+        """Answer the requests of a client until it disconnects."""
+        try:
+            while True:
+                (length,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+                state = decode(await reader.readexactly(length))
+                action = await self.act_async(state)
+                writer.write(encode(action))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def statistics(self):
+        """Return the statistics of the batches and the latencies, in seconds.
+
+        Returns
+        -------
+        statistics: dict.
+            Number of requests and batches, the mean batch size, the number of
+            batches of each size, and the mean, p50 and p99 time that the requests
+            waited in the queue, and the mean time of the forward passes.
+        """
+        num_requests = sum(size * count for size, count in self.batch_sizes.items())
+        num_batches = sum(self.batch_sizes.values())
+        queue_times = np.array(self.queue_times) if self.queue_times else np.zeros(1)
+        return {
+            "num_requests": num_requests,
+            "num_batches": num_batches,
+            "mean_batch_size": num_requests / max(num_batches, 1),
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "queue_time": queue_times.mean(),
+            "queue_time_p50": np.percentile(queue_times, 50),
+            "queue_time_p99": np.percentile(queue_times, 99),
+            "forward_time": np.mean(self.forward_times) if self.forward_times else 0,
+        }
+
+
+class PolicyClient(object):
+    """Client of a policy server, for environments in other processes.
+
+    Parameters
+    ----------
+    address: Tuple[str, int].
+        Address returned by `PolicyServer.serve'.
+    """
+
+    def __init__(self, address):
+        self.socket = socket.create_connection(address)
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _receive(self, size):
+        """Receive exactly `size' bytes."""
+        data = b""
+        while len(data) < size:
+            chunk = self.socket.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("The policy server closed the connection.")
+            data += chunk
+        return data
+
+    def act(self, state):
+        """Request the action at a state and wait for it."""
+        self.socket.sendall(encode(state))
+        (length,) = HEADER.unpack(self._receive(HEADER.size))
+        return decode(self._receive(length))
+
+    def close(self):
+        """Close the connection."""
+        self.socket.close()
+
+    def __enter__(self):
+        """Return the client."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the connection."""
+        self.close()
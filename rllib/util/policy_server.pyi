@@ -0,0 +1,67 @@
+import asyncio
+import socket
+import struct
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from rllib.agent import AbstractAgent
+from rllib.policy import AbstractPolicy
+
+HEADER: struct.Struct
+
+def policy_actions(
+    policy: AbstractPolicy,
+    states: np.ndarray,
+    sample: bool = ...,
+    random: bool = ...,
+) -> np.ndarray: ...
+def agent_actions(agent: AbstractAgent, states: np.ndarray) -> np.ndarray: ...
+def encode(array: np.ndarray) -> bytes: ...
+def decode(data: bytes) -> np.ndarray: ...
+
+class PolicyServer(object):
+    policy: Union[AbstractAgent, AbstractPolicy]
+    max_batch_size: int
+    max_wait_time: float
+    sample: bool
+    batch_sizes: Counter
+    queue_times: List[float]
+    forward_times: List[float]
+    loop: Optional[asyncio.AbstractEventLoop]
+    _thread: Optional[threading.Thread]
+    _requests: Optional[asyncio.Queue]
+    _servers: List[asyncio.AbstractServer]
+    def __init__(
+        self,
+        policy: Union[AbstractAgent, AbstractPolicy],
+        max_batch_size: int = ...,
+        max_wait_time: float = ...,
+        sample: bool = ...,
+    ) -> None: ...
+    def __enter__(self) -> PolicyServer: ...
+    def __exit__(self, *args: Any) -> None: ...
+    def start(self) -> None: ...
+    def stop(self) -> None: ...
+    def act(self, state: np.ndarray) -> np.ndarray: ...
+    async def act_async(self, state: np.ndarray) -> np.ndarray: ...
+    async def _batch_requests(self) -> None: ...
+    def _compute_actions(
+        self, batch: List[Tuple[np.ndarray, asyncio.Future, float]]
+    ) -> None: ...
+    def serve(self, host: str = ..., port: int = ...) -> Tuple[str, int]: ...
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None: ...
+    def statistics(self) -> Dict[str, Any]: ...
+
+class PolicyClient(object):
+    socket: socket.socket
+    def __init__(self, address: Tuple[str, int]) -> None: ...
+    def _receive(self, size: int) -> bytes: ...
+    def act(self, state: np.ndarray) -> np.ndarray: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> PolicyClient: ...
+    def __exit__(self, *args: Any) -> None: ...
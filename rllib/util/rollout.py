@@ -1,21 +1,53 @@
 """Helper functions to conduct a rollout with policies or agents."""
 
 import torch
-from gym.wrappers.monitoring.video_recorder import VideoRecorder
 from tqdm import tqdm
 
 from rllib.dataset.datatypes import Observation
 from rllib.util.neural_networks.utilities import broadcast_to_tensor, to_torch
+from rllib.util.tracing import count, traced
 from rllib.util.training.utilities import Evaluate
 from rllib.util.utilities import (
     get_entropy_and_log_p,
+    pack_distribution_params,
     sample_model,
     tensor_to_distribution,
 )
 
 
-def step_env(environment, state, action, action_scale, pi=None, render=False):
-    """Perform a single step in an environment."""
+def get_behavior_statistics(pi, action, action_scale, defer_statistics=False):
+    """Get the fields of an observation with the statistics of the behavior policy.
+
+    Without a policy, the entropy is zero and the log-probability is one.
+    """
+    if pi is None:
+        return dict(entropy=0.0, log_prob_action=1.0)
+    try:
+        if defer_statistics:
+            return dict(behavior_params=pack_distribution_params(pi).detach())
+        entropy, log_prob_action = get_entropy_and_log_p(pi, action, action_scale)
+    except RuntimeError:
+        return dict(entropy=0.0, log_prob_action=1.0)
+    return dict(entropy=entropy, log_prob_action=log_prob_action)
+
+
+@traced("step_env")
+def step_env(
+    environment,
+    state,
+    action,
+    action_scale,
+    pi=None,
+    render=False,
+    defer_statistics=False,
+):
+    """Perform a single step in an environment.
+
+    With `defer_statistics', the observation stores the packed parameters of `pi'
+    instead of the entropy and log-probability of the action, which
+    `fill_behavior_statistics' computes later for a whole batch.
+    """
+    count("env_steps")
     try:
         next_state, reward, done, info = environment.step(action)
     except TypeError:
@@ -23,26 +55,18 @@ def step_env(environment, state, action, action_scale, pi=None, render=False):
 
     action = to_torch(action)
 
-    if pi is not None:
-        try:
-            with torch.no_grad():
-                entropy, log_prob_action = get_entropy_and_log_p(
-                    pi, action, action_scale
-                )
-        except RuntimeError:
-            entropy, log_prob_action = 0.0, 1.0
-    else:
-        entropy, log_prob_action = 0.0, 1.0
+    with torch.no_grad():
+        statistics = get_behavior_statistics(pi, action, action_scale, defer_statistics)
 
+    # Convert each field once, instead of building the observation twice.
     observation = Observation(
-        state=state,
+        state=to_torch(state),
         action=action,
-        reward=reward,
-        next_state=next_state,
-        done=done,
-        entropy=entropy,
-        log_prob_action=log_prob_action,
-    ).to_torch()
+        reward=to_torch(reward),
+        next_state=to_torch(next_state),
+        done=to_torch(done),
+        **statistics,
+    )
     state = next_state
     if render:
         environment.render()
@@ -58,8 +82,9 @@ def step_model(
     done=None,
     action_scale=1.0,
     pi=None,
+    defer_statistics=False,
 ):
-    """Perform a single step in an dynamical model."""
+    """Perform a single step in an dynamical model. See `step_env'."""
     # Sample a next state
     next_state = sample_model(dynamical_model, state, action)
 
@@ -76,13 +101,7 @@ def step_model(
         done_ = sample_model(termination_model, state, action, next_state).bool()
         done = done + done_  # "+" is a boolean "or".
 
-    if pi is not None:
-        try:
-            entropy, log_prob_action = get_entropy_and_log_p(pi, action, action_scale)
-        except RuntimeError:
-            entropy, log_prob_action = 0.0, 1.0
-    else:
-        entropy, log_prob_action = 0.0, 1.0
+    statistics = get_behavior_statistics(pi, action, action_scale, defer_statistics)
 
     observation = Observation(
         state=state,
@@ -90,8 +109,7 @@ def step_model(
         reward=reward,
         next_state=next_state,
         done=done.float(),
-        entropy=entropy,
-        log_prob_action=log_prob_action,
+        **statistics,
     ).to_torch()
 
     return observation, next_state, done
@@ -99,6 +117,8 @@ def step_model(
 
 def record(environment, agent, path, num_episodes=1, max_steps=1000):
     """Record an episode."""
+    from gym.wrappers.monitoring.video_recorder import VideoRecorder
+
     recorder = VideoRecorder(environment, path=path)
     for _ in range(num_episodes):
         state = environment.reset()
@@ -138,6 +158,7 @@ def rollout_episode(
             action_scale=agent.policy.action_scale,
             pi=agent.pi,
             render=render,
+            defer_statistics=agent.defer_statistics,
         )
         agent.observe(obs)
         # Log info.
@@ -222,7 +243,13 @@ def rollout_agent(
 
 
 def rollout_policy(
-    environment, policy, num_episodes=1, max_steps=1000, render=False, memory=None
+    environment,
+    policy,
+    num_episodes=1,
+    max_steps=1000,
+    render=False,
+    memory=None,
+    defer_statistics=False,
 ):
     """Conduct a rollout of a policy in an environment.
 
@@ -240,6 +267,9 @@ def rollout_policy(
         Flag that indicates whether to render the environment or not.
     memory: ExperienceReplay, optional.
         Memory where to store the simulated transitions.
+    defer_statistics: bool, optional (default=False).
+        Flag that indicates whether to defer the statistics of the policy.
+        See `step_env'.
 
     Returns
     -------
@@ -265,6 +295,7 @@ def rollout_policy(
                 action_scale=policy.action_scale,
                 pi=pi,
                 render=render,
+                defer_statistics=defer_statistics,
             )
             trajectory.append(obs)
             if memory is not None:
@@ -287,6 +318,7 @@ def rollout_model(
     termination_model=None,
     max_steps=1000,
     memory=None,
+    defer_statistics=False,
 ):
     """Conduct a rollout of a policy interacting with a model.
 
@@ -308,6 +340,9 @@ def rollout_model(
         Maximum number of steps per episode.
     memory: ExperienceReplay, optional.
         Memory where to store the simulated transitions.
+    defer_statistics: bool, optional (default=False).
+        Flag that indicates whether to defer the statistics of the policy.
+        See `step_env'.
 
     Returns
     -------
@@ -353,6 +388,7 @@ def rollout_model(
             action_scale=action_scale,
             done=done,
             pi=pi,
+            defer_statistics=defer_statistics,
         )
         trajectory.append(observation)
         if memory is not None:
@@ -1,4 +1,4 @@
-from typing import Callable, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from numpy import ndarray
 from torch import Tensor
@@ -11,6 +11,12 @@ from rllib.environment import AbstractEnvironment
 from rllib.model import AbstractModel
 from rllib.policy import AbstractPolicy
 
+def get_behavior_statistics(
+    pi: Optional[Distribution],
+    action: Tensor,
+    action_scale: Action,
+    defer_statistics: bool = ...,
+) -> Dict[str, Union[float, Tensor]]: ...
 def step_env(
     environment: AbstractEnvironment,
     state: Union[int, ndarray],
@@ -18,6 +24,7 @@ def step_env(
     action_scale: Action,
     pi: Optional[Distribution] = ...,
     render: bool = ...,
+    defer_statistics: bool = ...,
 ) -> Tuple[Observation, Union[int, ndarray], bool, dict]: ...
 def step_model(
     dynamical_model: AbstractModel,
@@ -28,6 +35,7 @@ def step_model(
     done: Optional[Tensor] = ...,
     action_scale: Action = 1.0,
     pi: Optional[Distribution] = ...,
+    defer_statistics: bool = ...,
 ) -> Tuple[Observation, Tensor, Tensor]: ...
 def record(
     environment: AbstractEnvironment,
@@ -67,6 +75,7 @@ def rollout_policy(
     max_steps: int = ...,
     render: bool = ...,
     memory: Optional[ExperienceReplay] = ...,
+    defer_statistics: bool = ...,
 ) -> List[Trajectory]: ...
 def rollout_model(
     dynamical_model: AbstractModel,
@@ -77,6 +86,7 @@ def rollout_model(
     termination_model: Optional[AbstractModel] = ...,
     max_steps: int = ...,
     memory: Optional[ExperienceReplay] = ...,
+    defer_statistics: bool = ...,
 ) -> Trajectory: ...
 def rollout_actions(
     dynamical_model: AbstractModel,
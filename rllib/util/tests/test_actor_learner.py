@@ -0,0 +1,54 @@
+import pytest
+
+from rllib.agent import DPGAgent, DQNAgent, MPOAgent, SACAgent, TD3Agent
+from rllib.dataset.experience_replay import ExperienceReplay
+from rllib.environment import GymEnvironment
+from rllib.util.training.actor_learner import train_agent_actor_learner
+
+NUM_ENV_STEPS = 200
+
+
+@pytest.fixture(params=[SACAgent, TD3Agent, DPGAgent, DQNAgent, MPOAgent])
+def agent_class(request):
+    return request.param
+
+
+def get_agent(agent_class, **kwargs):
+    if agent_class is DQNAgent:
+        environment = GymEnvironment("CartPole-v0", 0)
+    else:
+        environment = GymEnvironment("VContinuous-CartPole-v0", 0)
+    agent = agent_class.default(environment, num_iter=1, batch_size=32, **kwargs)
+    return agent, environment
+
+
+def test_actor_learner(agent_class):
+    agent, environment = get_agent(agent_class)
+    train_agent_actor_learner(
+        agent, environment, num_env_steps=NUM_ENV_STEPS, max_steps=50
+    )
+    assert agent.total_steps == len(agent.memory) >= NUM_ENV_STEPS
+    assert 0 < agent.train_steps <= agent.total_steps
+    assert agent.total_episodes == len(agent.logger.get("train_return-0")) > 0
+    assert len(agent.logger.get("env_steps_per_sec")) > 0
+    assert len(agent.logger.get("updates_per_sec")) > 0
+
+
+@pytest.mark.parametrize("num_memory_steps", [0, 2])
+def test_data_lag(num_memory_steps):
+    memory = ExperienceReplay(max_len=1000, num_memory_steps=num_memory_steps)
+    agent, environment = get_agent(DQNAgent, memory=memory)
+    train_agent_actor_learner(
+        agent,
+        environment,
+        num_env_steps=NUM_ENV_STEPS,
+        update_to_data_ratio=0.5,
+        max_data_lag=16,
+        max_steps=50,
+    )
+    assert agent.total_steps >= NUM_ENV_STEPS
+    assert 0.5 * (agent.total_steps - 32 - 16 - 50) <= agent.train_steps
+    assert agent.train_steps <= 0.5 * agent.total_steps + 1
+
+    observation, _, _ = agent.memory.sample_batch(8)
+    assert observation.state.shape[1] == max(1, num_memory_steps)
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+import torch
+
+from rllib.agent import DQNAgent, DynaAgent, SACAgent, TD3Agent
+from rllib.environment import GymEnvironment
+from rllib.policy import NNPolicy
+from rllib.util.rollout import rollout_episode
+from rllib.util.training.agent_training import train_agent
+from rllib.util.training.background_learner import BackgroundLearner
+from rllib.util.utilities import set_random_seed
+
+NUM_EPISODES = 3
+MAX_STEPS = 40
+
+
+@pytest.fixture(params=[SACAgent, DQNAgent, DynaAgent])
+def agent_class(request):
+    return request.param
+
+
+def train(agent_class, **kwargs):
+    set_random_seed(0)
+    if agent_class is DQNAgent:
+        environment = GymEnvironment("CartPole-v0", 0)
+    else:
+        environment = GymEnvironment("VContinuous-CartPole-v0", 0)
+    if agent_class is DynaAgent:
+        kwargs.update(train_frequency=10, num_epochs=1, model_learn_num_rollouts=1)
+    agent = agent_class.default(
+        environment, num_iter=2, batch_size=16, checkpoint_frequency=0, **kwargs
+    )
+    train_agent(agent, environment, num_episodes=NUM_EPISODES, max_steps=MAX_STEPS)
+    agent.logger.delete_directory()
+    return agent
+
+
+def test_background_learner():
+    policy = NNPolicy(dim_state=(2,), dim_action=(1,))
+    learner = BackgroundLearner(policy, max_pending_updates=2)
+    calls = []
+
+    def learn():
+        calls.append("learn")
+        for param in policy.parameters():
+            param.data.add_(1.0)
+
+    learner.run(calls.append, "append")
+    learner.update(learn)
+    learner.wait()
+    assert calls == ["append", "learn"]
+    assert learner.version == 1
+    with learner.acting_policy() as acting_policy:
+        for param, acting_param in zip(policy.parameters(), acting_policy.parameters()):
+            assert acting_param is not param
+            torch.testing.assert_allclose(acting_param, param)
+
+    learner.update(lambda: 1 / 0)
+    learner.run(calls.append, "skipped")
+    with pytest.raises(ZeroDivisionError):
+        learner.wait()
+    assert calls == ["append", "learn"]
+    learner.close()
+
+
+def test_deterministic_learning(agent_class):
+    agent = train(agent_class)
+    background_agent = train(
+        agent_class, background_learning=True, deterministic_learning=True
+    )
+    assert background_agent.background_learner is None  # closed after training.
+    assert background_agent.train_steps == agent.train_steps > 0
+    np.testing.assert_allclose(
+        background_agent.logger.get("train_return-0"),
+        agent.logger.get("train_return-0"),
+    )
+    for param, background_param in zip(
+        agent.policy.parameters(), background_agent.policy.parameters()
+    ):
+        torch.testing.assert_allclose(background_param, param)
+
+
+def test_background_learning(agent_class):
+    agent = train(agent_class, background_learning=True, max_pending_updates=2)
+    assert agent.total_steps == len(agent.memory)
+    assert agent.train_steps > 0
+    assert len(agent.logger.get("train_return-0")) == NUM_EPISODES
+
+
+def test_evaluation_without_noise():
+    set_random_seed(0)
+    environment = GymEnvironment("VContinuous-CartPole-v0", 0)
+    agent = TD3Agent.default(
+        environment, num_iter=2, batch_size=16, background_learning=True
+    )
+    for _ in range(2):
+        rollout_episode(environment, agent, MAX_STEPS, False, 0, [])
+    assert agent.background_learner is not None
+
+    # The acting copies of the policy follow the distribution parameters.
+    agent.eval()
+    state = environment.reset()
+    np.testing.assert_allclose(agent.act(state), agent.act(state))
+    agent.train()
+    assert not np.allclose(agent.act(state), agent.act(state))
+    for policy in agent.background_learner.policies:
+        assert policy.dist_params["policy_noise"] is agent.policy.dist_params[
+            "policy_noise"
+        ]
+
+    agent.end_interaction()
+    agent.logger.delete_directory()
@@ -0,0 +1,160 @@
+import os
+import tempfile
+
+import pytest
+import torch
+
+from rllib.agent import DQNAgent
+from rllib.dataset.datatypes import Observation
+from rllib.dataset.experience_replay import ExperienceReplay
+from rllib.environment import GymEnvironment
+from rllib.util.checkpoint import Checkpointer, fingerprint, load_checkpoint
+from rllib.util.neural_networks.utilities import update_parameters
+from rllib.util.rollout import rollout_agent
+from rllib.util.training.agent_training import train_agent
+
+
+@pytest.fixture(params=[True, False])
+def asynchronous(request):
+    return request.param
+
+
+def get_observation():
+    return Observation(
+        state=torch.randn(4),
+        action=torch.randn(2),
+        reward=torch.randn(1),
+        next_state=torch.randn(4),
+        done=torch.tensor(0.0),
+    )
+
+
+def get_params():
+    module = torch.nn.Linear(4, 2)
+    optimizer = torch.optim.Adam(module.parameters(), lr=0.1)
+    memory = ExperienceReplay(max_len=50)
+    for _ in range(30):
+        memory.append(get_observation())
+    return {"module": module, "optimizer": optimizer, "memory": memory, "gamma": 0.9}
+
+
+def optimizer_step(params):
+    params["optimizer"].zero_grad()
+    params["module"](torch.randn(8, 4)).sum().backward()
+    params["optimizer"].step()
+
+
+def check_loaded(params, loaded):
+    for key, value in params["module"].state_dict().items():
+        torch.testing.assert_close(loaded["module"][key], value)
+    assert loaded["optimizer"]["state"].keys() == (
+        params["optimizer"].state_dict()["state"].keys()
+    )
+    assert loaded["gamma"] == params["gamma"]
+    assert loaded["memory"].data_count == params["memory"].data_count
+    for new, old in zip(loaded["memory"].all_raw, params["memory"].all_raw):
+        torch.testing.assert_close(new, old, equal_nan=True)
+
+
+def test_save_load(asynchronous):
+    params = get_params()
+    with tempfile.TemporaryDirectory() as directory:
+        checkpointer = Checkpointer(
+            directory, asynchronous=asynchronous, segment_size=10
+        )
+        for _ in range(3):
+            optimizer_step(params)
+            for _ in range(7):
+                params["memory"].append(get_observation())
+            path = checkpointer.save("last.pkl", params, random_state=True)
+        checkpointer.wait()
+
+        check_loaded(params, load_checkpoint(path))
+        assert os.path.exists(f"{directory}/random_state.pkl")
+        # Only the files of the last checkpoint remain.
+        assert len(os.listdir(checkpointer.component_dir)) == 3 + 5
+
+
+def test_interrupted_random_state(monkeypatch):
+    with tempfile.TemporaryDirectory() as directory:
+        checkpointer = Checkpointer(directory, asynchronous=False)
+        checkpointer.save("last.pkl", get_params(), random_state=True)
+        with open(f"{directory}/random_state.pkl", "rb") as f:
+            random_state = f.read()
+
+        def interrupted_dump(obj, f):
+            f.write(b"partial")
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr("rllib.util.utilities.pickle.dump", interrupted_dump)
+        with pytest.raises(KeyboardInterrupt):
+            checkpointer.save("last.pkl", get_params(), random_state=True)
+        with open(f"{directory}/random_state.pkl", "rb") as f:
+            assert f.read() == random_state
+
+
+def test_frequency():
+    checkpointer = Checkpointer("runs", frequency=3)
+    assert [checkpointer.should_save(i) for i in range(1, 7)] == [0, 0, 1, 0, 0, 1]
+    assert not Checkpointer("runs", frequency=0).should_save(3)
+
+
+def test_incremental():
+    params = get_params()
+    with tempfile.TemporaryDirectory() as directory:
+        checkpointer = Checkpointer(directory, asynchronous=False, segment_size=10)
+        first = torch.load(checkpointer.save("last.pkl", params))
+
+        second = torch.load(checkpointer.save("last.pkl", params))
+        assert second["module"].filename == first["module"].filename
+        assert second["optimizer"].filename == first["optimizer"].filename
+        assert second["memory"].segments == first["memory"].segments
+
+        optimizer_step(params)
+        params["memory"].append(get_observation())
+        third = torch.load(checkpointer.save("last.pkl", params))
+        assert third["module"].filename != first["module"].filename
+        assert third["optimizer"].filename != first["optimizer"].filename
+        changed = [
+            new != old
+            for new, old in zip(third["memory"].segments, first["memory"].segments)
+        ]
+        assert changed == [False, False, False, True, False]
+        check_loaded(params, load_checkpoint(f"{directory}/last.pkl"))
+
+
+def test_agent_checkpoint():
+    environment = GymEnvironment("CartPole-v0", seed=0)
+    agent = DQNAgent.default(environment)
+    rollout_agent(environment, agent, num_episodes=3, max_steps=20)
+    agent.checkpointer.wait()
+
+    assert "checkpoint_time" in agent.logger[-1]
+    assert os.path.exists(f"{agent.logger.log_dir}/last.pkl")
+
+    new_agent = DQNAgent.default(environment)
+    new_agent.load(f"{agent.logger.log_dir}/last.pkl")
+    assert new_agent.total_episodes == 3
+    assert len(new_agent.memory) == len(agent.memory)
+    for key, value in agent.policy.state_dict().items():
+        torch.testing.assert_close(new_agent.policy.state_dict()[key], value)
+
+    agent.logger.delete_directory()
+    new_agent.logger.delete_directory()
+
+
+def test_train_agent_print():
+    environment = GymEnvironment("CartPole-v0", seed=0)
+    agent = DQNAgent.default(environment)
+    # The checkpoint times of the last episode have no episode statistics.
+    train_agent(agent, environment, num_episodes=1, max_steps=20, plot_flag=False)
+    assert "checkpoint_time" in agent.logger.keys
+    assert "Checkpoint Time" not in str(agent)
+    agent.logger.delete_directory()
+
+
+def test_fingerprint_soft_update():
+    target, module = torch.nn.Linear(4, 2), torch.nn.Linear(4, 2)
+    old_fingerprint = fingerprint(target.state_dict())
+    update_parameters(target, module, tau=0.9)
+    assert fingerprint(target.state_dict()) != old_fingerprint
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+import pytest
+
+import rllib.agent
+from rllib.agent import AGENTS
+
+
+def test_lazy_agents():
+    assert "SACAgent" in dir(rllib.agent)
+    assert rllib.agent.SACAgent.__name__ == "SACAgent"
+    assert "SACAgent" in vars(rllib.agent)
+    for name in AGENTS:
+        assert getattr(rllib.agent, f"{name}Agent").__name__ == f"{name}Agent"
+    with pytest.raises(AttributeError):
+        rllib.agent.NotAnAgent
+
+
+def test_star_import():
+    namespace = {}
+    exec("from rllib.agent import *", namespace)
+    assert "PPOAgent" in namespace and "MODEL_FREE" in namespace
+
+
+def test_import_is_lazy():
+    statement = (
+        "import sys, rllib.agent, rllib.dataset; "
+        "print(' '.join(m for m in ['gym', 'gym_toytext', 'matplotlib', 'scipy', "
+        "'rllib.agent.off_policy'] if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", statement],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stdout
+    assert output.split() == []
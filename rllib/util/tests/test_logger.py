@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+import torch
+
+from rllib.util.logger import Logger
+
+
+@pytest.fixture(params=[True, False])
+def asynchronous(request):
+    return request.param
+
+
+@pytest.fixture(params=[True, False])
+def tensorboard(request):
+    return request.param
+
+
+def test_update(asynchronous, tensorboard):
+    logger = Logger(
+        "logger_test",
+        tensorboard=tensorboard,
+        asynchronous=asynchronous,
+        flush_frequency=7,
+    )
+    for episode in range(3):
+        for i in range(10):
+            logger.update(loss=torch.tensor([i, i + 2.0]), reward=float(i), steps=i)
+        logger.end_episode(episode=episode)
+    logger.update(loss=torch.tensor(float("nan")))
+    logger.update(partial=torch.tensor([1.0, float("nan"), 3.0]))
+    logger.wait()
+
+    assert logger.get("loss") == [5.5, 5.5, 5.5]
+    assert logger.get("reward") == [4.5, 4.5, 4.5]
+    assert logger.get("episode") == [0, 1, 2]
+    assert logger.current["loss"][1] == 0.0
+    assert logger.current["partial"][1] == pytest.approx(4.0 / 3)  # NaNs are zeros.
+    assert len(logger.all["loss"]) == 3 * 10 + 3 + 1
+    logger.delete_directory()
+
+
+def test_bounded_memory():
+    logger = Logger("logger_test", max_len=5, downsample=3, flush_frequency=4)
+    for i in range(30):
+        logger.update(loss=torch.tensor(float(i)))
+    logger.flush()
+    assert list(logger.all["loss"]) == [15.0, 18.0, 21.0, 24.0, 27.0]
+    logger.delete_directory()
+
+
+def test_export_and_load(asynchronous):
+    logger = Logger("logger_test", asynchronous=asynchronous)
+    for episode in range(4):
+        logger.update(loss=torch.randn(()))
+        if episode % 2 == 0:
+            logger.end_episode(train_return=float(episode))
+        else:
+            logger.end_episode(eval_return=float(episode))
+    logger.export()
+    logger.wait()
+
+    new_logger = Logger("logger_test")
+    new_logger.load(logger.log_dir)
+    assert new_logger.statistics == logger.statistics
+    assert new_logger.keys == logger.keys
+    for key, values in logger.all.items():
+        np.testing.assert_allclose(new_logger.all[key], values)
+    logger.delete_directory()
+    new_logger.delete_directory()
@@ -0,0 +1,141 @@
+import multiprocessing
+import threading
+
+import numpy as np
+import pytest
+import torch
+
+from rllib.agent import DQNAgent, SACAgent
+from rllib.environment import GymEnvironment
+from rllib.policy import NNPolicy
+from rllib.util.policy_server import PolicyClient, PolicyServer, policy_actions
+
+NUM_CLIENTS = 4
+NUM_STEPS = 20
+
+
+def get_policy():
+    torch.manual_seed(0)
+    return NNPolicy(dim_state=(4,), dim_action=(1,), action_scale=2.0)
+
+
+def run_client(act, actions, seed):
+    """Interact with an environment, requesting the actions to the server."""
+    environment = GymEnvironment("VContinuous-CartPole-v0", seed=seed)
+    state = environment.reset()
+    for _ in range(NUM_STEPS):
+        action = act(state)
+        actions.append((state, action))
+        state, _, done, _ = environment.step(action)
+        if done:
+            state = environment.reset()
+
+
+def run_process_client(address, queue, seed):
+    with PolicyClient(address) as client:
+        actions = []
+        run_client(client.act, actions, seed)
+    queue.put(actions)
+
+
+def check_actions(policy, actions):
+    for state, action in actions:
+        expected_action = policy_actions(policy, state[np.newaxis], sample=False)[0]
+        np.testing.assert_allclose(action, expected_action, rtol=1e-5, atol=1e-6)
+
+
+def test_thread_clients():
+    policy = get_policy()
+    server = PolicyServer(policy, max_batch_size=3, max_wait_time=0.02, sample=False)
+    actions = [[] for _ in range(NUM_CLIENTS)]
+    with server:
+        clients = [
+            threading.Thread(target=run_client, args=(server.act, actions[i], i))
+            for i in range(NUM_CLIENTS)
+        ]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+
+    for client_actions in actions:
+        assert len(client_actions) == NUM_STEPS
+        check_actions(policy, client_actions)
+
+    statistics = server.statistics()
+    assert statistics["num_requests"] == NUM_CLIENTS * NUM_STEPS
+    assert max(statistics["batch_sizes"]) <= 3
+    assert statistics["mean_batch_size"] > 1
+    assert 0 <= statistics["queue_time_p50"] <= statistics["queue_time_p99"]
+
+
+def test_process_clients():
+    policy = get_policy()
+    with PolicyServer(policy, max_wait_time=0.01, sample=False) as server:
+        address = server.serve()
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        clients = [
+            context.Process(target=run_process_client, args=(address, queue, i))
+            for i in range(NUM_CLIENTS)
+        ]
+        for client in clients:
+            client.start()
+        actions = [queue.get(timeout=60) for _ in clients]
+        for client in clients:
+            client.join()
+
+    for client_actions in actions:
+        assert len(client_actions) == NUM_STEPS
+        check_actions(policy, client_actions)
+    assert server.statistics()["num_requests"] == NUM_CLIENTS * NUM_STEPS
+
+
+@pytest.mark.parametrize("agent_class", [SACAgent, DQNAgent])
+@pytest.mark.parametrize("training", [True, False])
+@pytest.mark.parametrize("exploration_steps", [0, 100])
+def test_agent(agent_class, training, exploration_steps):
+    if agent_class is DQNAgent:
+        environment = GymEnvironment("CartPole-v0", seed=0)
+    else:
+        environment = GymEnvironment("VContinuous-CartPole-v0", seed=0)
+    agent = agent_class.default(
+        environment, checkpoint_frequency=0, exploration_steps=exploration_steps
+    )
+    agent.logger.delete_directory()
+    agent.train(training)
+
+    state = environment.reset()
+    results = []
+    with PolicyServer(agent, max_wait_time=0.05) as server:
+        threads = [
+            threading.Thread(target=lambda: results.append(server.act(state)))
+            for _ in range(NUM_CLIENTS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(results) == NUM_CLIENTS
+    assert max(server.batch_sizes) > 1
+    for action in results:
+        assert action.shape == environment.action_space.shape
+        assert environment.action_space.contains(
+            action.astype(environment.action_space.dtype)
+        )
+    if agent_class is DQNAgent and not training and exploration_steps == 0:
+        # The greedy actions at the same state are equal.
+        for action in results:
+            np.testing.assert_allclose(action, results[0])
+
+
+def test_error():
+    def policy(state):
+        raise ValueError("invalid state")
+
+    policy.discrete_state = False
+    with PolicyServer(policy) as server:
+        with pytest.raises(ValueError, match="invalid state"):
+            server.act(np.zeros(4))
+    with pytest.raises(RuntimeError):
+        server.act(np.zeros(4))
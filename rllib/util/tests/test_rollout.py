@@ -1,10 +1,15 @@
 import pytest
+import torch
+import torch.testing
 
-from rllib.agent import RandomAgent
+from rllib.agent import A2CAgent, RandomAgent
+from rllib.dataset.experience_replay import ExperienceReplay
+from rllib.dataset.utilities import stack_list_of_tuples
 from rllib.environment import GymEnvironment
 from rllib.environment.mdps import EasyGridWorld
-from rllib.policy import RandomPolicy
+from rllib.policy import NNPolicy, RandomPolicy
 from rllib.util.rollout import rollout_agent, rollout_policy
+from rllib.util.utilities import fill_behavior_statistics
 
 
 @pytest.fixture(
@@ -37,3 +42,61 @@ def test_rollout_easy_grid_world():
 
     policy = agent.policy
     rollout_policy(environment, policy)
+
+
+@pytest.mark.parametrize(
+    "name, deterministic",
+    [("CartPole-v0", False), ("Pendulum-v1", False), ("Pendulum-v1", True)],
+)
+def test_defer_statistics(name, deterministic):
+    environment = GymEnvironment(name, seed=0)
+    policy = NNPolicy.default(environment, deterministic=deterministic)
+    trajectories = {}
+    for defer_statistics in [False, True]:
+        torch.manual_seed(0)
+        environment = GymEnvironment(name, seed=0)
+        trajectory = rollout_policy(
+            environment, policy, max_steps=20, defer_statistics=defer_statistics
+        )[0]
+        trajectories[defer_statistics] = stack_list_of_tuples(trajectory)
+
+    trajectory, deferred = trajectories[False], trajectories[True]
+    assert torch.isnan(deferred.log_prob_action).all()
+    deferred = fill_behavior_statistics(deferred, policy)
+    torch.testing.assert_allclose(deferred.action, trajectory.action)
+    torch.testing.assert_allclose(deferred.log_prob_action, trajectory.log_prob_action)
+    torch.testing.assert_allclose(deferred.entropy, trajectory.entropy)
+    assert fill_behavior_statistics(trajectory, policy) is trajectory
+
+
+def test_defer_statistics_memory():
+    environment = GymEnvironment("Pendulum-v1", seed=0)
+    policy = NNPolicy.default(environment)
+    memory = ExperienceReplay(max_len=100, num_memory_steps=3)
+    rollout_policy(
+        environment, policy, max_steps=20, memory=memory, defer_statistics=True
+    )
+    memory.end_episode()
+
+    observation, *_ = memory.sample_batch(32)
+    assert observation.behavior_params.shape == (32, 3, 1 + 1)
+    observation = fill_behavior_statistics(observation, policy)
+    assert torch.isfinite(observation.log_prob_action).all()
+    assert torch.isfinite(observation.entropy).all()
+
+
+def test_defer_statistics_agent():
+    parameters = {}
+    for defer_statistics in [False, True]:
+        torch.manual_seed(0)
+        environment = GymEnvironment("Pendulum-v1", seed=0)
+        agent = A2CAgent.default(
+            environment, defer_statistics=defer_statistics, checkpoint_frequency=0
+        )
+        agent.logger.delete_directory()
+        rollout_agent(environment, agent, num_episodes=2, max_steps=50)
+        parameters[defer_statistics] = torch.cat(
+            [parameter.flatten() for parameter in agent.policy.parameters()]
+        )
+        assert len(agent.logger.get("entropy")) == 2
+    torch.testing.assert_allclose(parameters[True], parameters[False])
@@ -0,0 +1,96 @@
+import json
+import os
+import time
+
+import pytest
+
+from rllib.agent import DQNAgent
+from rllib.environment import GymEnvironment
+from rllib.util.rollout import rollout_agent
+from rllib.util.tracing import _NULL_SPAN, TRACER, Tracer, count, span, traced
+
+
+@pytest.fixture
+def tracer():
+    TRACER.reset()
+    TRACER.enable(record_events=True)
+    yield TRACER
+    TRACER.disable()
+    TRACER.reset()
+
+
+@traced()
+def traced_function(x):
+    return 2 * x
+
+
+def test_disabled():
+    tracer = Tracer()
+    assert tracer.span("span") is _NULL_SPAN
+    with tracer.span("span"):
+        tracer.count("counter")
+    assert span("span") is _NULL_SPAN
+    assert traced_function(3) == 6
+    assert len(tracer.statistics) == 0
+    assert len(tracer.counters) == 0
+    assert tracer.breakdown() == {}
+
+
+def test_nested_spans(tracer):
+    for _ in range(2):
+        with span("outer"):
+            time.sleep(0.01)
+            with span("inner"):
+                time.sleep(0.01)
+                count("items", 2)
+    assert traced_function(3) == 6
+
+    calls, total_time, self_time = tracer.statistics["outer"]
+    assert calls == 2
+    assert total_time >= 0.04
+    assert 0.02 <= self_time < total_time
+    assert tracer.statistics["outer/inner"][0] == 2
+    assert tracer.statistics["traced_function"][0] == 1
+
+    breakdown = tracer.breakdown()
+    assert breakdown["calls/outer"] == 2
+    assert breakdown["calls/outer/inner"] == 2
+    assert breakdown["time/outer"] >= 40
+    assert breakdown["count/items"] == 4
+    assert "outer/inner" in tracer.summary()
+
+    with span("outer"):
+        pass
+    assert tracer.breakdown() == {
+        "calls/outer": 1,
+        "time/outer": pytest.approx(0, abs=1),
+    }
+
+
+def test_chrome_trace(tracer, tmp_path):
+    with span("outer"):
+        with span("inner"):
+            count("items")
+    filename = os.path.join(tmp_path, "trace.json")
+    tracer.export_chrome_trace(filename)
+    with open(filename, "r") as file:
+        events = json.load(file)["traceEvents"]
+
+    assert [event["ph"] for event in events] == ["C", "X", "X"]
+    inner, outer = events[1], events[2]
+    assert (inner["name"], outer["name"]) == ("inner", "outer")
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert events[0]["args"] == {"items": 1}
+
+
+def test_agent_breakdown(tracer):
+    environment = GymEnvironment("CartPole-v0", 0)
+    agent = DQNAgent.default(environment, num_iter=2, batch_size=4)
+    rollout_agent(environment, agent, num_episodes=2, max_steps=10)
+
+    for key in ["act", "observe", "step_env", "learn/sample_batch", "learn/forward"]:
+        assert len(agent.logger.get(f"calls/{key}")) == 2
+    assert agent.logger.get("count/env_steps") == [10, 10]
+    assert os.path.exists(f"{agent.logger.log_dir}/trace.json")
+    agent.logger.delete_directory()
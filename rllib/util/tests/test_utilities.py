@@ -9,8 +9,10 @@ from rllib.util.utilities import (
     get_backend,
     integrate,
     mellow_max,
+    pack_distribution_params,
     separated_kl,
     tensor_to_distribution,
+    unpack_distribution_params,
 )
 
 
@@ -142,6 +144,34 @@ class TestTensor2Dist(object):
         assert d.sample().shape == mu.shape
 
 
+class TestPackDistributionParams(object):
+    @pytest.fixture(params=[(), (1,), (4, 3)], scope="class")
+    def batch_shape(self, request):
+        return request.param
+
+    @pytest.fixture(params=[1, 2], scope="class")
+    def dim(self, request):
+        return request.param
+
+    def test_categorical(self, batch_shape, dim):
+        d = tensor_to_distribution(torch.randn(batch_shape + (dim,)))
+        params = pack_distribution_params(d)
+        assert params.shape == batch_shape + (dim,)
+        d_ = tensor_to_distribution(unpack_distribution_params(params, True))
+        torch.testing.assert_allclose(d_.logits, d.logits)
+
+    @pytest.mark.parametrize("scale", [0.0, 0.1])
+    def test_normal(self, batch_shape, dim, scale):
+        mean = torch.randn(batch_shape + (dim,))
+        scale_tril = scale * torch.eye(dim).expand(batch_shape + (dim, dim))
+        d = tensor_to_distribution((mean, scale_tril), tanh=True)
+        params = pack_distribution_params(d)
+        assert params.shape == batch_shape + (dim + dim ** 2,)
+        mean_, scale_tril_ = unpack_distribution_params(params, False)
+        torch.testing.assert_allclose(mean_, mean)
+        torch.testing.assert_allclose(scale_tril_, scale_tril)
+
+
 class TestSeparatedKL(object):
     @pytest.fixture(params=[1, 10], scope="class")
     def dim(self, request):
@@ -0,0 +1,322 @@
+"""Low-overhead tracing of named, nested spans and counters.
+
+The hot paths of the library (acting, observing, sampling from the memory, computing
+the losses, stepping the environment and solving MPC problems) are instrumented with
+spans of the global tracer `TRACER'. The tracer is disabled by default, and then a
+span or a traced function only costs a flag check.
+
+Once enabled, the tracer aggregates the number of calls and the total and self time
+of each span, keyed by its path of nested span names (e.g., `learn/forward'), and the
+values of the counters. Agents log the breakdown of each episode and, if the tracer
+records the events, write a Chrome trace to their log directory at the end of the
+interaction. The trace opens in `chrome://tracing' or https://ui.perfetto.dev.
+
+Setting the environment variable `RLLIB_TRACE' to `1' enables the tracer at import
+and setting it to `events' also records the events.
+
+Examples
+--------
+>>> from rllib.util.tracing import TRACER, count, span
+>>> TRACER.enable()
+>>> with span("outer"):
+...     with span("inner"):
+...         count("items", 3)
+>>> breakdown = TRACER.breakdown()
+>>> breakdown["calls/outer/inner"], breakdown["count/items"]
+(1, 3)
+>>> TRACER.disable()
+>>> TRACER.reset()
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import torch
+
+
+class _NullSpan(object):
+    """Span that does nothing, returned while the tracer is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span(object):
+    """Timed span of a tracer.
+
+    Parameters
+    ----------
+    tracer: Tracer.
+        Tracer that records the span.
+    name: str.
+        Name of the span.
+    """
+
+    __slots__ = ("tracer", "name", "path", "start", "child_time")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+        self.path = name
+        self.start = 0
+        self.child_time = 0
+
+    def __enter__(self):
+        """Open the span as a child of the innermost open span of the thread."""
+        stack = self.tracer.stack
+        if stack:
+            self.path = f"{stack[-1].path}/{self.name}"
+        stack.append(self)
+        if self.tracer.synchronize:
+            torch.cuda.synchronize()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *args):
+        """Close the span and record its duration."""
+        if self.tracer.synchronize:
+            torch.cuda.synchronize()
+        end = time.perf_counter_ns()
+        duration = end - self.start
+        stack = self.tracer.stack
+        stack.pop()
+        if stack:
+            stack[-1].child_time += duration
+        self.tracer.record(self, duration)
+        return False
+
+
+class Tracer(object):
+    """Tracer of named, nested spans and counters.
+
+    Parameters
+    ----------
+    max_events: int, optional (default=1000000).
+        Maximum number of events kept for the Chrome trace. Older events are dropped.
+
+    Attributes
+    ----------
+    enabled: bool.
+        Flag that indicates whether spans and counters are recorded.
+    record_events: bool.
+        Flag that indicates whether each span is kept as an event of the trace.
+    synchronize: bool.
+        Flag that indicates whether to synchronize cuda at the span boundaries, so
+        that the spans include the asynchronous kernels that they launch.
+    statistics: dict.
+        Number of calls, total time and self time in seconds of each span path.
+    counters: dict.
+        Accumulated value of each counter.
+    """
+
+    def __init__(self, max_events=1000000):
+        self.enabled = False
+        self.record_events = False
+        self.synchronize = False
+        self.statistics = defaultdict(lambda: [0, 0.0, 0.0])
+        self.counters = defaultdict(int)
+        self.events = deque(maxlen=max_events)
+        self._last_statistics = {}
+        self._last_counters = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    @property
+    def stack(self):
+        """Get the open spans of the calling thread."""
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def enable(self, record_events=False, synchronize=False):
+        """Enable the tracer.
+
+        Parameters
+        ----------
+        record_events: bool, optional (default=False).
+            Flag that indicates whether to keep the events for the Chrome trace.
+        synchronize: bool, optional (default=False).
+            Flag that indicates whether to synchronize cuda at the span boundaries.
+            It is ignored if cuda is not available.
+        """
+        self.enabled = True
+        self.record_events = record_events
+        self.synchronize = synchronize and torch.cuda.is_available()
+
+    def disable(self):
+        """Disable the tracer. The recorded statistics and events are kept."""
+        self.enabled = False
+        self.record_events = False
+        self.synchronize = False
+
+    def reset(self):
+        """Remove the recorded statistics, counters and events."""
+        with self._lock:
+            self.statistics.clear()
+            self.counters.clear()
+            self.events.clear()
+            self._last_statistics = {}
+            self._last_counters = {}
+
+    def span(self, name):
+        """Get a context manager that times a span with a given name."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name)
+
+    def count(self, name, value=1):
+        """Add a value to a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] += value
+            if self.record_events:
+                self.events.append(
+                    ("C", name, time.perf_counter_ns(), self.counters[name], 0)
+                )
+
+    def record(self, span, duration):
+        """Record the duration in nanoseconds of a closed span."""
+        with self._lock:
+            statistics = self.statistics[span.path]
+            statistics[0] += 1
+            statistics[1] += duration * 1e-9
+            statistics[2] += (duration - span.child_time) * 1e-9
+            if self.record_events:
+                self.events.append(
+                    ("X", span.name, span.start, duration, threading.get_ident())
+                )
+
+    def breakdown(self):
+        """Get the calls, time and counters since the last breakdown.
+
+        Returns
+        -------
+        breakdown: dict.
+            Dictionary with the number of calls (`calls/<path>'), the total time in
+            milliseconds (`time/<path>') of each span path and the value of each
+            counter (`count/<name>') since the previous call.
+        """
+        breakdown = {}
+        with self._lock:
+            for path, (calls, total_time, _) in self.statistics.items():
+                last_calls, last_time, _ = self._last_statistics.get(path, (0, 0, 0))
+                if calls > last_calls:
+                    breakdown[f"calls/{path}"] = calls - last_calls
+                    breakdown[f"time/{path}"] = 1000 * (total_time - last_time)
+            for name, value in self.counters.items():
+                last_value = self._last_counters.get(name, 0)
+                if value != last_value:
+                    breakdown[f"count/{name}"] = value - last_value
+            self._last_statistics = {
+                path: tuple(value) for path, value in self.statistics.items()
+            }
+            self._last_counters = dict(self.counters)
+        return breakdown
+
+    def summary(self):
+        """Get a table with the statistics of each span path, sorted by total time."""
+        rows = sorted(self.statistics.items(), key=lambda item: -item[1][1])
+        width = max([len(path) for path, _ in rows] + [4]) + 2
+        lines = [
+            "span".ljust(width)
+            + "calls".rjust(10)
+            + "total [s]".rjust(12)
+            + "self [s]".rjust(12)
+            + "mean [ms]".rjust(12)
+        ]
+        for path, (calls, total_time, self_time) in rows:
+            lines.append(
+                path.ljust(width)
+                + f"{calls}".rjust(10)
+                + f"{total_time:.3f}".rjust(12)
+                + f"{self_time:.3f}".rjust(12)
+                + f"{1000 * total_time / calls:.3f}".rjust(12)
+            )
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name}: {value:g}")
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, filename):
+        """Write the recorded events in the Chrome trace event format.
+
+        Parameters
+        ----------
+        filename: str.
+            Name of the json file.
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+        trace_events = []
+        for phase, name, start, value, tid in events:
+            event = {
+                "name": name,
+                "ph": phase,
+                "ts": (start - self._origin) / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            if phase == "X":
+                event["dur"] = value / 1000
+            else:
+                event["args"] = {name: value}
+            trace_events.append(event)
+        with open(filename, "w") as file:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, file)
+
+
+TRACER = Tracer()
+if os.environ.get("RLLIB_TRACE", "0") not in ("", "0"):
+    TRACER.enable(record_events=os.environ["RLLIB_TRACE"] == "events")
+
+
+def span(name):
+    """Get a context manager that times a span of the global tracer."""
+    if not TRACER.enabled:
+        return _NULL_SPAN
+    return Span(TRACER, name)
+
+
+def count(name, value=1):
+    """Add a value to a counter of the global tracer."""
+    if TRACER.enabled:
+        TRACER.count(name, value)
+
+
+def traced(name=None):
+    """Decorate a function so that each call is a span of the global tracer.
+
+    Parameters
+    ----------
+    name: str, optional.
+        Name of the span. By default, the qualified name of the function.
+    """
+
+    def decorator(function):
+        span_name = function.__qualname__ if name is None else name
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return function(*args, **kwargs)
+            with Span(TRACER, span_name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
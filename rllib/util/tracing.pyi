@@ -0,0 +1,53 @@
+"""Low-overhead tracing of named, nested spans and counters."""
+
+import threading
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T", bound=Callable)
+
+class _NullSpan(object):
+    def __enter__(self) -> _NullSpan: ...
+    def __exit__(self, *args: Any) -> bool: ...
+
+_NULL_SPAN: _NullSpan
+
+class Span(object):
+    tracer: Tracer
+    name: str
+    path: str
+    start: int
+    child_time: int
+    def __init__(self, tracer: Tracer, name: str) -> None: ...
+    def __enter__(self) -> Span: ...
+    def __exit__(self, *args: Any) -> bool: ...
+
+class Tracer(object):
+    enabled: bool
+    record_events: bool
+    synchronize: bool
+    statistics: Dict[str, List[Union[int, float]]]
+    counters: Dict[str, Union[int, float]]
+    events: Deque[Tuple[str, str, int, Union[int, float], int]]
+    _last_statistics: Dict[str, Tuple[Union[int, float], ...]]
+    _last_counters: Dict[str, Union[int, float]]
+    _local: threading.local
+    _lock: threading.Lock
+    _origin: int
+    def __init__(self, max_events: int = ...) -> None: ...
+    @property
+    def stack(self) -> List[Span]: ...
+    def enable(self, record_events: bool = ..., synchronize: bool = ...) -> None: ...
+    def disable(self) -> None: ...
+    def reset(self) -> None: ...
+    def span(self, name: str) -> Union[Span, _NullSpan]: ...
+    def count(self, name: str, value: Union[int, float] = ...) -> None: ...
+    def record(self, span: Span, duration: int) -> None: ...
+    def breakdown(self) -> Dict[str, Union[int, float]]: ...
+    def summary(self) -> str: ...
+    def export_chrome_trace(self, filename: str) -> None: ...
+
+TRACER: Tracer
+
+def span(name: str) -> Union[Span, _NullSpan]: ...
+def count(name: str, value: Union[int, float] = ...) -> None: ...
+def traced(name: Optional[str] = ...) -> Callable[[T], T]: ...
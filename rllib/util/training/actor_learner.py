@@ -0,0 +1,312 @@
+"""Decoupled actor-learner training of off-policy agents.
+
+Actor processes interact with copies of the environment using the policy of the
+agent and send the transitions to the learner. The learner, the calling process,
+appends them to the memory of the agent and learns continuously from it. Policy
+weights are shared with the actors through shared memory.
+"""
+import copy
+import queue
+import time
+from collections import defaultdict
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from rllib.dataset.datatypes import Observation
+from rllib.dataset.utilities import stack_list_of_tuples
+from rllib.util.rollout import step_env
+from rllib.util.tracing import TRACER
+
+
+class SharedState(object):
+    """State shared between the learner and the actors.
+
+    Parameters
+    ----------
+    agent: AbstractAgent.
+        Agent whose policy is shared.
+    context: multiprocessing context.
+        Context that creates the shared objects.
+    """
+
+    def __init__(self, agent, context):
+        self.policy = copy.deepcopy(agent.policy).share_memory()
+        self.version = context.Value("l", agent.train_steps, lock=False)
+        self.lock = context.Lock()
+        self.total_steps = context.Value("l", agent.total_steps)
+        self.total_episodes = context.Value("l", agent.total_episodes)
+        self.stop = context.Event()
+        self.transitions = context.Queue()
+
+    def publish(self, policy, version):
+        """Publish the weights of the learner policy."""
+        with self.lock:
+            self.policy.load_state_dict(policy.state_dict())
+            self.version.value = version
+
+    def sync(self, policy):
+        """Copy the shared weights into an actor policy and return their version."""
+        with self.lock:
+            policy.load_state_dict(self.policy.state_dict())
+            return self.version.value
+
+
+def pack_observations(observations):
+    """Stack a list of observations into numpy arrays that are cheap to send."""
+    observation = stack_list_of_tuples(observations)
+    return {key: value.numpy() for key, value in observation.__dict__.items()}
+
+
+def unpack_observations(arrays):
+    """Unstack the arrays sent by an actor into a list of observations."""
+    num_observations = len(arrays["state"])
+    return [
+        Observation(**{key: value[i] for key, value in arrays.items()}).to_torch()
+        for i in range(num_observations)
+    ]
+
+
+def run_actor(
+    rank,
+    agent,
+    environment,
+    shared,
+    max_env_steps,
+    max_policy_lag,
+    max_data_lag,
+    update_to_data_ratio,
+    send_frequency,
+    max_steps,
+    seed,
+):
+    """Interact with the environment and send the transitions to the learner.
+
+    The actor re-synchronizes its policy when the learner made more than
+    `max_policy_lag' updates since the last synchronization. If `max_data_lag' is
+    not None, it waits while its steps exceed the steps that the learner consumed at
+    the update-to-data ratio by more than `max_data_lag'. With multi-step memories,
+    it only waits between episodes, as the learner appends whole episodes.
+
+    Each message carries the rank of the actor, the packed transitions, the return
+    of the episode if it ended and the average policy lag of the transitions.
+    """
+    torch.set_num_threads(1)
+    torch.manual_seed(seed + rank)
+    np.random.seed(seed + rank)
+    policy = agent.policy
+    policy_version = shared.sync(policy)
+    start_steps, start_updates = shared.total_steps.value, policy_version
+    multi_step = agent.memory.num_memory_steps > 0
+
+    def learner_is_behind():
+        consumed_steps = (shared.version.value - start_updates) / update_to_data_ratio
+        allowed_steps = max(agent.batch_size, consumed_steps) + max_data_lag
+        return shared.total_steps.value - start_steps >= allowed_steps
+
+    def send(episode_return=None):
+        message = (rank, pack_observations(observations), episode_return, lag)
+        shared.transitions.put(message)
+        observations.clear()
+
+    observations, lag = [], 0.0
+    while not shared.stop.is_set():
+        state = environment.reset()
+        policy.reset()
+        episode_return = 0.0
+        for step in range(max_steps):
+            if max_data_lag is not None and (step == 0 or not multi_step):
+                while learner_is_behind() and not shared.stop.is_set():
+                    if len(observations):
+                        send()
+                    time.sleep(1e-3)
+            if shared.version.value - policy_version > max_policy_lag:
+                policy_version = shared.sync(policy)
+            agent.counters["total_steps"] = shared.total_steps.value
+            agent.counters["total_episodes"] = shared.total_episodes.value
+
+            action = agent.act(state)
+            observation, state, done, _ = step_env(
+                environment,
+                state,
+                action,
+                policy.action_scale,
+                pi=agent.pi,
+                defer_statistics=agent.defer_statistics,
+            )
+            policy.update()  # update policy parameters (eps-greedy.)
+            episode_return = episode_return + torch.atleast_1d(observation.reward)
+            observations.append(observation)
+            step_lag = shared.version.value - policy_version
+            lag = step_lag if len(observations) == 1 else lag
+            lag += (step_lag - lag) / len(observations)
+            with shared.total_steps.get_lock():
+                shared.total_steps.value += 1
+
+            if shared.total_steps.value >= max_env_steps:
+                shared.stop.set()
+            if done or step == max_steps - 1:
+                send(episode_return.tolist())
+                with shared.total_episodes.get_lock():
+                    shared.total_episodes.value += 1
+                break
+            elif shared.stop.is_set() or len(observations) >= send_frequency:
+                send()
+                if shared.stop.is_set():
+                    break
+    shared.transitions.put(None)
+
+
+def train_agent_actor_learner(
+    agent,
+    environment,
+    num_env_steps,
+    num_actors=2,
+    update_to_data_ratio=1.0,
+    max_policy_lag=0,
+    max_data_lag=None,
+    send_frequency=32,
+    max_steps=1000,
+    seed=0,
+):
+    """Train an off-policy agent with parallel actors and a continuous learner.
+
+    The learner appends the transitions to `agent.memory' as they arrive and calls
+    `agent.learn()' as long as the number of gradient steps is below
+    `update_to_data_ratio' times the number of received transitions. After each
+    call, it publishes the policy weights to the actors.
+
+    Parameters
+    ----------
+    agent: OffPolicyAgent
+        Agent to train. It learns in the calling process.
+    environment: AbstractEnvironment
+        Environment with which the agent interacts. Each actor forks a copy.
+    num_env_steps: int
+        Total number of environment steps of all the actors.
+    num_actors: int, optional (default=2).
+        Number of actor processes.
+    update_to_data_ratio: float, optional (default=1.0).
+        Maximum number of gradient steps per environment step.
+    max_policy_lag: int, optional (default=0).
+        Maximum number of gradient steps of the learner that the policy of an actor
+        can lag behind before it is synchronized.
+    max_data_lag: int, optional (default=None).
+        Maximum number of environment steps that the actors can be ahead of the
+        learner at the update-to-data ratio. If None, the actors never wait and the
+        learner makes as many gradient steps as it can, up to the ratio.
+    send_frequency: int, optional (default=32).
+        Number of transitions that an actor gathers before sending them.
+    max_steps: int, optional (default=1000).
+        Maximum number of steps per episode.
+    seed: int, optional (default=0).
+        Seed of the actors. Actor `i' is seeded with `seed + i'.
+
+    Notes
+    -----
+    At the end of each episode, the logger of the agent records the return, the
+    environment steps per second (`env_steps_per_sec'), the gradient steps per
+    second (`updates_per_sec') and the average policy lag (`policy_lag').
+
+    If the memory returns multi-step observations, the learner appends the
+    transitions of an actor once its episode ends, so that they are contiguous.
+    """
+    agent.train()
+    context = mp.get_context("fork")
+    shared = SharedState(agent, context)
+    actors = [
+        context.Process(
+            target=run_actor,
+            args=(
+                rank,
+                agent,
+                environment,
+                shared,
+                agent.total_steps + num_env_steps,
+                max_policy_lag,
+                max_data_lag,
+                update_to_data_ratio,
+                send_frequency,
+                max_steps,
+                seed,
+            ),
+        )
+        for rank in range(num_actors)
+    ]
+    for actor in actors:
+        actor.start()
+
+    start_time, start_updates = time.time(), agent.train_steps
+    env_steps, num_running = 0, num_actors
+    pending = defaultdict(list)  # Transitions of unfinished multi-step episodes.
+
+    def can_learn():
+        num_updates = agent.train_steps - start_updates
+        return len(agent.memory) >= agent.batch_size and (
+            num_updates < update_to_data_ratio * env_steps
+        )
+
+    try:
+        while num_running > 0:
+            try:
+                message = shared.transitions.get(block=not can_learn(), timeout=1.0)
+            except queue.Empty:
+                message = False
+                if not any(actor.is_alive() for actor in actors):
+                    raise RuntimeError("Actor processes ended without finishing.")
+
+            if message is None:
+                num_running -= 1
+            elif message:
+                rank, packed_observations, episode_return, policy_lag = message
+                observations = unpack_observations(packed_observations)
+                env_steps += len(observations)
+                agent.logger.update(policy_lag=policy_lag)
+                if agent.memory.num_memory_steps > 0:
+                    pending[rank] += observations
+                    observations = [] if episode_return is None else pending.pop(rank)
+                for observation in observations:
+                    agent.memory.append(observation)
+                    agent.counters["total_steps"] += 1
+
+                if episode_return is not None:
+                    elapsed_time = time.time() - start_time
+                    end_episode(
+                        agent,
+                        episode_return,
+                        env_steps_per_sec=env_steps / elapsed_time,
+                        updates_per_sec=(agent.train_steps - start_updates)
+                        / elapsed_time,
+                    )
+
+            if can_learn():
+                agent.learn()
+                shared.publish(agent.policy, agent.train_steps)
+
+        for observations in pending.values():  # Episodes cut by the end of training.
+            for observation in observations:
+                agent.memory.append(observation)
+                agent.counters["total_steps"] += 1
+            agent.memory.end_episode()
+    finally:
+        shared.stop.set()
+        for actor in actors:
+            actor.join(timeout=10)
+            if actor.is_alive():
+                actor.terminate()
+    agent.end_interaction()
+
+
+def end_episode(agent, episode_return, **kwargs):
+    """Finish an episode of an actor in the learner and log its statistics."""
+    if len(agent.memory) > 0:
+        agent.memory.end_episode()
+    agent.counters["total_episodes"] += 1
+    agent.counters["train_episodes"] += 1
+    if TRACER.enabled:
+        kwargs.update(TRACER.breakdown())
+    agent.logger.end_episode(
+        **{f"train_return-{i}": value for i, value in enumerate(episode_return)},
+        **kwargs,
+    )
@@ -0,0 +1,54 @@
+from multiprocessing.context import BaseContext
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from torch import multiprocessing as mp
+
+from rllib.agent import AbstractAgent
+from rllib.agent.off_policy.off_policy_agent import OffPolicyAgent
+from rllib.dataset.datatypes import Observation
+from rllib.environment import AbstractEnvironment
+from rllib.policy import AbstractPolicy
+
+class SharedState(object):
+    policy: AbstractPolicy
+    version: Any
+    lock: Any
+    total_steps: Any
+    total_episodes: Any
+    stop: Any
+    transitions: mp.Queue
+    def __init__(self, agent: AbstractAgent, context: BaseContext) -> None: ...
+    def publish(self, policy: AbstractPolicy, version: int) -> None: ...
+    def sync(self, policy: AbstractPolicy) -> int: ...
+
+def pack_observations(observations: List[Observation]) -> Dict[str, np.ndarray]: ...
+def unpack_observations(arrays: Dict[str, np.ndarray]) -> List[Observation]: ...
+def run_actor(
+    rank: int,
+    agent: AbstractAgent,
+    environment: AbstractEnvironment,
+    shared: SharedState,
+    max_env_steps: int,
+    max_policy_lag: int,
+    max_data_lag: Optional[int],
+    update_to_data_ratio: float,
+    send_frequency: int,
+    max_steps: int,
+    seed: int,
+) -> None: ...
+def train_agent_actor_learner(
+    agent: OffPolicyAgent,
+    environment: AbstractEnvironment,
+    num_env_steps: int,
+    num_actors: int = ...,
+    update_to_data_ratio: float = ...,
+    max_policy_lag: int = ...,
+    max_data_lag: Optional[int] = ...,
+    send_frequency: int = ...,
+    max_steps: int = ...,
+    seed: int = ...,
+) -> None: ...
+def end_episode(
+    agent: AbstractAgent, episode_return: List[float], **kwargs: Any
+) -> None: ...
@@ -1,8 +1,4 @@
 """Python Script Template."""
-try:
-    import matplotlib.pyplot as plt
-except ImportError:
-    pass  # If there is an import error it should not be used.
 import numpy as np
 
 from rllib.util.rollout import rollout_agent
@@ -27,6 +23,8 @@ def train_agent(agent, environment, plot_flag=True, *args, **kwargs):
     rollout_agent(environment, agent, *args, **kwargs)
 
     if plot_flag:
+        import matplotlib.pyplot as plt  # Imported on first use, it is slow.
+
         for key in agent.logger.keys:
             plt.plot(agent.logger.get(key))
             plt.xlabel("Episode")
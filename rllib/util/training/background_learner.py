@@ -0,0 +1,136 @@
+"""Background learner that overlaps learning with the interaction of an agent.
+
+The learner thread executes, in order, the tasks that the agent submits: memory
+appends, model learning and policy learning. As the memory is only modified by the
+learner thread, every batch is sampled from a consistent view of the memory while
+the agent keeps interacting with the environment.
+
+The agent acts with one of two copies of the policy. After each learning task, the
+learner loads its parameters and its distribution parameters into the back copy and
+swaps it with the front copy, so that the agent never acts with partially updated
+parameters.
+"""
+import contextlib
+import copy
+import queue
+import threading
+
+
+class BackgroundLearner(object):
+    """Thread that executes the learning tasks of an agent.
+
+    Parameters
+    ----------
+    policy: AbstractPolicy.
+        Policy that is learned. The agent acts with copies of it.
+    max_pending_updates: int, optional (default=1).
+        Maximum number of learning tasks submitted and not finished. Submitting
+        another learning task blocks, which bounds the staleness of the acting policy.
+    deterministic: bool, optional (default=False).
+        Flag that indicates whether to wait for each learning task to finish. The
+        agent then acts with the same parameters and draws the same random numbers as
+        when learning sequentially, but learning does not overlap with acting.
+
+    Methods
+    -------
+    run(function, *args):
+        Execute a function in the learner thread after the previous tasks.
+    update(function, *args):
+        Execute a learning function and publish the parameters of the policy.
+    acting_policy():
+        Context manager that yields the policy with which to act.
+    wait():
+        Wait until all the submitted tasks finish.
+    close():
+        Wait for the submitted tasks and stop the learner thread.
+    """
+
+    def __init__(self, policy, max_pending_updates=1, deterministic=False):
+        self.policy = policy
+        self.max_pending_updates = max_pending_updates
+        self.deterministic = deterministic
+        self.policies = [copy.deepcopy(policy), copy.deepcopy(policy)]
+        self.version = 0
+        self._front = 0
+        self._lock = threading.Lock()
+        self._pending_updates = threading.BoundedSemaphore(max_pending_updates)
+        self._tasks = queue.Queue()
+        self._exception = None
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def _work(self):
+        """Execute the submitted tasks until receiving None."""
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                self._tasks.task_done()
+                break
+            function, args, is_update = task
+            try:
+                if self._exception is None:  # Skip the tasks after an error.
+                    function(*args)
+                    if is_update:
+                        self.publish()
+            except Exception as exception:
+                self._exception = exception
+            finally:
+                if is_update:
+                    self._pending_updates.release()
+                self._tasks.task_done()
+
+    def _raise(self):
+        """Raise the exception of a failed task in the calling thread."""
+        if self._exception is not None:
+            exception, self._exception = self._exception, None
+            raise exception
+
+    def run(self, function, *args):
+        """Execute a function in the learner thread after the previous tasks."""
+        self._raise()
+        self._tasks.put((function, args, False))
+
+    def update(self, function, *args):
+        """Execute a learning function and publish the parameters of the policy."""
+        self._raise()
+        self._pending_updates.acquire()
+        self._tasks.put((function, args, True))
+        if self.deterministic:
+            self.wait()
+
+    def publish(self):
+        """Load the parameters of the policy into the back copy and swap the copies.
+
+        The distribution parameters, e.g., the exploration noise, are not tensors of
+        the state dict. The copies share their values with the policy, so that a decay
+        of the noise in the learner also applies to them. The back copy is only
+        modified by the learner thread.
+        """
+        back = 1 - self._front
+        self.policies[back].load_state_dict(self.policy.state_dict())
+        self.policies[back].dist_params = dict(self.policy.dist_params)
+        self.policies[back].deterministic = self.policy.deterministic
+        with self._lock:
+            self._front = back
+            self.version += 1
+
+    @contextlib.contextmanager
+    def acting_policy(self):
+        """Yield the front copy of the policy, which is not swapped meanwhile."""
+        with self._lock:
+            yield self.policies[self._front]
+
+    def wait(self):
+        """Wait until all the submitted tasks finish.
+
+        It raises the exception of a failed task.
+        """
+        self._tasks.join()
+        self._raise()
+
+    def close(self):
+        """Wait for the submitted tasks and stop the learner thread."""
+        if self._thread.is_alive():
+            self._tasks.put(None)
+            self._thread.join()
+        self._raise()
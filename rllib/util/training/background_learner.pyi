@@ -0,0 +1,32 @@
+import threading
+from queue import Queue
+from typing import Any, Callable, ContextManager, List, Optional
+
+from rllib.policy import AbstractPolicy
+
+class BackgroundLearner(object):
+    policy: AbstractPolicy
+    max_pending_updates: int
+    deterministic: bool
+    policies: List[AbstractPolicy]
+    version: int
+    _front: int
+    _lock: threading.Lock
+    _pending_updates: threading.BoundedSemaphore
+    _tasks: Queue
+    _exception: Optional[Exception]
+    _thread: threading.Thread
+    def __init__(
+        self,
+        policy: AbstractPolicy,
+        max_pending_updates: int = ...,
+        deterministic: bool = ...,
+    ) -> None: ...
+    def _work(self) -> None: ...
+    def _raise(self) -> None: ...
+    def run(self, function: Callable, *args: Any) -> None: ...
+    def update(self, function: Callable, *args: Any) -> None: ...
+    def publish(self) -> None: ...
+    def acting_policy(self) -> ContextManager[AbstractPolicy]: ...
+    def wait(self) -> None: ...
+    def close(self) -> None: ...
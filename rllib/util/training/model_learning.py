@@ -5,17 +5,18 @@ import torch
 from tqdm import tqdm
 
 from rllib.dataset.datatypes import Observation
-from rllib.model import EnsembleModel, ExactGPModel, NNModel
+from rllib.model import EnsembleModel, ExactGPModel, NNModel, VariationalGPModel
 from rllib.model.independent_ensemble_model import IndependentEnsembleModel
 from rllib.model.utilities import PredictionStrategy
 from rllib.util.early_stopping import EarlyStopping
-from rllib.util.gaussian_processes.mlls import exact_mll
+from rllib.util.gaussian_processes.mlls import exact_mll, variational_elbo
 from rllib.util.logger import Logger
 from rllib.util.utilities import tensor_to_distribution
 
 from .utilities import (
     calibration_score,
     get_model_validation_score,
+    get_target,
     model_loss,
     sharpness,
 )
@@ -69,6 +70,20 @@ def train_exact_gp_type2mll_step(model, observation, optimizer):
     return loss
 
 
+def train_variational_gp_step(model, observation, optimizer):
+    """Train a variational GP using the minibatch ELBO."""
+    optimizer.zero_grad()
+    train_x, train_y = model.state_actions_to_train_data(
+        observation.state, observation.action, get_target(model, observation)
+    )
+    loss = variational_elbo(
+        train_x, train_y, model.gp, model.likelihood, num_data=model.num_data
+    )
+    loss.backward()
+    optimizer.step()
+    return loss
+
+
 def _train_model_step(
     model, observation, optimizer, mask, logger, dynamical_model=None
 ):
@@ -85,6 +100,8 @@ def _train_model_step(
         )
     elif isinstance(model, ExactGPModel):
         loss = train_exact_gp_type2mll_step(model, observation, optimizer)
+    elif isinstance(model, VariationalGPModel):
+        loss = train_variational_gp_step(model, observation, optimizer)
     else:
         raise TypeError("Only Implemented for Ensembles and GP Models.")
     logger.update(**{f"{model.model_kind[:3]}-loss": loss.item()})
@@ -164,6 +181,9 @@ def train_model(
         max_iter = data_size * num_epochs
         min_iter = data_size * min_iter
 
+    if isinstance(model, VariationalGPModel):
+        model.num_data = len(train_set)
+
     model.train()
     early_stopping = EarlyStopping(epsilon, non_decrease_iter=non_decrease_iter)
 
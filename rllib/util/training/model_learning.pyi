@@ -9,7 +9,7 @@ from rllib.dataset.datatypes import Observation
 from rllib.dataset.experience_replay import ExperienceReplay
 from rllib.model.abstract_model import AbstractModel
 from rllib.model.ensemble_model import EnsembleModel
-from rllib.model.gp_model import ExactGPModel
+from rllib.model.gp_model import ExactGPModel, VariationalGPModel
 from rllib.model.independent_ensemble_model import IndependentEnsembleModel
 from rllib.model.nn_model import NNModel
 from rllib.util.logger import Logger
@@ -31,6 +31,9 @@ def train_ensemble_step(
 def train_exact_gp_type2mll_step(
     model: ExactGPModel, observation: Observation, optimizer: Optimizer
 ) -> Tensor: ...
+def train_variational_gp_step(
+    model: VariationalGPModel, observation: Observation, optimizer: Optimizer
+) -> Tensor: ...
 def train_model(
     model: AbstractModel,
     train_set: ExperienceReplay,
@@ -1,7 +1,9 @@
 """Utilities for the rllib library."""
+import os
 import pickle
 import time
 import warnings
+from dataclasses import replace
 
 import numpy as np
 import torch
@@ -29,10 +31,23 @@ def set_random_seed(seed):
     torch.manual_seed(seed)
 
 
-def save_random_state(directory):
-    """Save the simulation random state in a directory."""
-    with open(f"{directory}/random_state.pkl", "wb") as f:
-        pickle.dump({"numpy": np.random.get_state(), "torch": torch.get_rng_state()}, f)
+def get_random_state():
+    """Get the simulation random state."""
+    return {"numpy": np.random.get_state(), "torch": torch.get_rng_state()}
+
+
+def save_random_state(directory, random_state=None):
+    """Save the simulation random state in a directory.
+
+    If random_state is None, it saves the current random state. The state is written
+    to a temporary file first, so an interrupted save keeps the previous one.
+    """
+    if random_state is None:
+        random_state = get_random_state()
+    path = f"{directory}/random_state.pkl"
+    with open(f"{path}.tmp", "wb") as f:
+        pickle.dump(random_state, f)
+    os.replace(f"{path}.tmp", path)
 
 
 def load_random_state(directory):
@@ -251,6 +266,103 @@ def get_entropy_and_log_p(pi, action, action_scale):
     return entropy, log_p
 
 
+def pack_distribution_params(pi):
+    """Pack the parameters of a distribution in a tensor.
+
+    A Categorical distribution is packed as its logits. A MultivariateNormal or a
+    Delta distribution is packed as its mean followed by its flattened scale_tril
+    matrix, which is zero for a Delta. The tanh transform is not packed.
+
+    Parameters
+    ----------
+    pi: Distribution.
+        Distribution returned by `tensor_to_distribution'.
+
+    Returns
+    -------
+    params: Tensor.
+        Tensor of shape [batch x num_actions] or [batch x (dim_action + dim_action^2)].
+    """
+    if isinstance(pi, TransformedDistribution):
+        pi = pi.base_dist
+    if isinstance(pi, Categorical):
+        return pi.logits
+    mean = pi.mean
+    if isinstance(pi, Delta):
+        scale_tril = torch.zeros(mean.shape + mean.shape[-1:])
+    else:
+        scale_tril = pi.scale_tril
+    return torch.cat((mean, scale_tril.flatten(-2)), dim=-1)
+
+
+def unpack_distribution_params(params, discrete_action):
+    """Unpack the parameters of `pack_distribution_params' for tensor_to_distribution.
+
+    Parameters
+    ----------
+    params: Tensor.
+        Packed parameters of a distribution.
+    discrete_action: bool.
+        Flag that indicates whether the parameters are the logits of a Categorical.
+
+    Returns
+    -------
+    params: Union[Tensor, Tuple[Tensor, Tensor]].
+        Logits or mean and scale_tril matrix.
+    """
+    if discrete_action:
+        return params
+    dim_action = round((np.sqrt(1 + 4 * params.shape[-1]) - 1) / 2)
+    mean = params[..., :dim_action]
+    scale_tril = params[..., dim_action:].reshape(
+        params.shape[:-1] + (dim_action, dim_action)
+    )
+    return mean, scale_tril
+
+
+def fill_behavior_statistics(observation, policy):
+    """Compute the deferred entropy and log-probability of the behavior policy.
+
+    Rollouts with `defer_statistics' store the packed parameters of the behavior
+    policy in `observation.behavior_params' instead of evaluating its entropy and
+    log-probability at each step. This function evaluates them for a batch of
+    observations with a single call. Entries without parameters, e.g., the padding of
+    an n-step memory, keep their values.
+
+    Parameters
+    ----------
+    observation: Observation.
+        Batch of observations.
+    policy: AbstractPolicy.
+        Policy with the action space and the distribution of the behavior policy.
+
+    Returns
+    -------
+    observation: Observation.
+        Batch of observations with the entropy and the log-probability of the action.
+    """
+    params = observation.behavior_params
+    if params.dim() == 0:  # The statistics are not deferred.
+        return observation
+    valid = ~torch.isnan(params).any(-1)
+    if not valid.any():
+        return observation
+    params = torch.where(valid.unsqueeze(-1), params, params[valid][0])
+    pi = tensor_to_distribution(
+        unpack_distribution_params(params, policy.discrete_action),
+        tanh=policy.dist_params.get("tanh", False),
+    )
+    with torch.no_grad():
+        entropy, log_p = get_entropy_and_log_p(
+            pi, observation.action, policy.action_scale
+        )
+    return replace(
+        observation,
+        entropy=torch.where(valid, entropy, observation.entropy),
+        log_prob_action=torch.where(valid, log_p, observation.log_prob_action),
+    )
+
+
 def sample_mean_and_cov(sample, diag=False):
     """Compute mean and covariance of a sample of vectors.
 
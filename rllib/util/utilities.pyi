@@ -1,17 +1,20 @@
-from typing import Any, Callable, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 import types
 import numpy as np
 import torch.__spec__ as torch_mod
 from torch import Tensor
 from torch.distributions import Distribution
 
-from rllib.dataset.datatypes import Array, Reward, TupleDistribution
+from rllib.dataset.datatypes import Array, Observation, Reward, TupleDistribution
 from rllib.model import AbstractModel
 from rllib.policy import AbstractPolicy
 
 def get_backend(array: Array) -> types.ModuleType: ...
 def set_random_seed(seed: int) -> None: ...
-def save_random_state(directory: str) -> None: ...
+def get_random_state() -> Dict[str, Any]: ...
+def save_random_state(
+    directory: str, random_state: Optional[Dict[str, Any]] = ...
+) -> None: ...
 def load_random_state(directory: str) -> None: ...
 def mellow_max(values: Array, omega: Union[Tensor, float] = ...) -> Array: ...
 def integrate(
@@ -30,6 +33,13 @@ def off_policy_weight(
 def get_entropy_and_log_p(
     pi: Distribution, action: Tensor, action_scale: Union[float, Tensor]
 ) -> Tuple[Tensor, Tensor]: ...
+def pack_distribution_params(pi: Distribution) -> Tensor: ...
+def unpack_distribution_params(
+    params: Tensor, discrete_action: bool
+) -> TupleDistribution: ...
+def fill_behavior_statistics(
+    observation: Observation, policy: AbstractPolicy
+) -> Observation: ...
 def sample_mean_and_cov(sample: Tensor, diag: bool = ...) -> Tuple[Tensor, Tensor]: ...
 def safe_cholesky(covariance_matrix: Tensor, jitter: float = ...) -> Tensor: ...
 def sample_model(
@@ -2,8 +2,6 @@
 from collections import namedtuple
 
 import numpy as np
-import scipy
-import scipy.signal
 import torch
 
 from rllib.dataset.utilities import stack_list_of_tuples
@@ -63,6 +61,8 @@ def discount_cumsum(rewards, gamma=1.0, reward_transformer=RewardTransformer()):
     if bk is torch and not rewards.requires_grad:
         rewards = rewards.numpy()
     if type(rewards) is np.ndarray:
+        import scipy.signal  # Imported on first use, it is slow.
+
         returns = scipy.signal.lfilter(
             [1], [1, -gamma], rewards[..., ::-1, :], axis=-2
         )[..., ::-1, :]
@@ -3,3 +3,4 @@ from .integrate_q_value_function import IntegrateQValueFunction
 from .nn_ensemble_value_function import NNEnsembleQFunction, NNEnsembleValueFunction
 from .nn_value_function import DuelingQFunction, NNQFunction, NNValueFunction
 from .tabular_value_function import TabularQFunction, TabularValueFunction
+from .tile_coding_value_function import TileCodingQFunction, TileCodingValueFunction
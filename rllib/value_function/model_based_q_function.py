@@ -27,6 +27,11 @@ class ModelBasedQFunction(AbstractQFunction):
         Entropy regularization for rewards.
     reward_transformer: RewardTransformer, optional.
         Reward transformer module.
+    checkpoint_steps: int, optional.
+        Number of steps of the simulation segments that are recomputed in the
+        backward pass instead of stored.
+    truncation_steps: int, optional.
+        Number of steps of the windows through which gradients are propagated.
     """
 
     def __init__(
@@ -42,6 +47,8 @@ class ModelBasedQFunction(AbstractQFunction):
         td_lambda=1.0,
         reward_transformer=RewardTransformer(),
         entropy_regularization=0.0,
+        checkpoint_steps=None,
+        truncation_steps=None,
         *args,
         **kwargs,
     ):
@@ -57,6 +64,8 @@ class ModelBasedQFunction(AbstractQFunction):
             num_model_steps=num_model_steps,
             num_particles=num_particles,
             termination_model=termination_model,
+            checkpoint_steps=checkpoint_steps,
+            truncation_steps=truncation_steps,
         )
         assert num_model_steps > 0, "At least one-step ahead simulation."
         if policy is None:
@@ -27,6 +27,8 @@ class ModelBasedQFunction(AbstractQFunction):
         td_lambda: float = ...,
         reward_transformer: RewardTransformer = ...,
         entropy_regularization: float = ...,
+        checkpoint_steps: Optional[int] = ...,
+        truncation_steps: Optional[int] = ...,
         *args: Any,
         **kwargs: Any,
     ) -> None: ...
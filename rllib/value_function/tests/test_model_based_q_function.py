@@ -0,0 +1,85 @@
+import pytest
+import torch
+import torch.testing
+
+from rllib.environment.mujoco.locomotion import LargeStateTermination
+from rllib.model import LinearModel
+from rllib.policy import NNPolicy
+from rllib.reward.quadratic_reward import QuadraticReward
+from rllib.value_function import NNValueFunction
+from rllib.value_function.model_based_q_function import ModelBasedQFunction
+
+NUM_MODEL_STEPS = 10
+
+
+@pytest.fixture(params=[False, True])
+def termination(request):
+    return request.param
+
+
+def get_q_function(termination, **kwargs):
+    torch.manual_seed(0)
+    a = 1.2 * torch.eye(3) + 0.1 * torch.randn(3, 3)
+    b = torch.randn(3, 2)
+    if termination:
+        termination_model = LargeStateTermination(healthy_state_range=(-3.0, 3.0))
+    else:
+        termination_model = None
+    return ModelBasedQFunction(
+        dynamical_model=LinearModel(a, b),
+        reward_model=QuadraticReward(torch.eye(3), 0.1 * torch.eye(2)),
+        termination_model=termination_model,
+        num_model_steps=NUM_MODEL_STEPS,
+        num_particles=4,
+        policy=NNPolicy(dim_state=(3,), dim_action=(2,), layers=[32, 32]),
+        value_function=NNValueFunction(dim_state=(3,), layers=[32, 32]),
+        gamma=0.99,
+        **kwargs,
+    )
+
+
+def get_value_and_gradient(q_function, state, action):
+    torch.manual_seed(1)
+    value = q_function(state, action)
+    value.sum().backward()
+    return value, [p.grad for p in q_function.policy.parameters()]
+
+
+def test_checkpoint(termination):
+    state, action = torch.randn(5, 1, 3), torch.randn(5, 1, 2)
+    q_function = get_q_function(termination)
+    value, gradient = get_value_and_gradient(q_function, state, action)
+    for checkpoint_steps in [1, 3]:
+        q_function = get_q_function(termination, checkpoint_steps=checkpoint_steps)
+        checkpoint_value, checkpoint_gradient = get_value_and_gradient(
+            q_function, state, action
+        )
+        torch.testing.assert_close(value, checkpoint_value)
+        torch.testing.assert_close(gradient, checkpoint_gradient)
+
+        info = q_function.simulator.info
+        assert info["sim_throughput"] > 0
+        assert info["sim_saved_memory"] > 0
+
+
+def test_truncation(termination):
+    state, action = torch.randn(5, 1, 3), torch.randn(5, 1, 2)
+    q_function = get_q_function(termination)
+    value, gradient = get_value_and_gradient(q_function, state, action)
+    q_function = get_q_function(termination, checkpoint_steps=3, truncation_steps=4)
+    assert q_function.simulator.get_segments() == [
+        (0, 3),
+        (3, 4),
+        (4, 6),
+        (6, 8),
+        (8, 9),
+        (9, 10),
+    ]
+    truncated_value, truncated_gradient = get_value_and_gradient(
+        q_function, state, action
+    )
+    torch.testing.assert_close(value, truncated_value)
+    assert any(
+        not torch.allclose(g, truncated_g)
+        for g, truncated_g in zip(gradient, truncated_gradient)
+    )
@@ -0,0 +1,161 @@
+import pytest
+import torch
+import torch.testing
+
+from rllib.environment import GymEnvironment
+from rllib.util.neural_networks.utilities import one_hot_encode, random_tensor
+from rllib.value_function import TileCodingQFunction, TileCodingValueFunction
+
+LOW, HIGH = [-1.0, -1.0, -1.0], [1.0, 1.0, 1.0]
+
+
+@pytest.fixture(params=[None, 4096])
+def table_size(request):
+    return request.param
+
+
+@pytest.fixture(params=[4, 1])
+def dim_reward(request):
+    return request.param
+
+
+@pytest.fixture(params=[None, 1, 16])
+def batch_size(request):
+    return request.param
+
+
+def batch_shape(batch_size):
+    return (batch_size,) if batch_size else ()
+
+
+class RemoveFirst(torch.nn.Module):
+    def forward(self, state):
+        return state[..., 1:]
+
+
+class TestTileCodingValueFunction(object):
+    def test_forward(self, table_size, dim_reward, batch_size):
+        value_function = TileCodingValueFunction(
+            LOW, HIGH, dim_state=(3,), dim_reward=(dim_reward,), table_size=table_size
+        )
+        state = random_tensor(False, 3, batch_size)
+        value = value_function(state)
+        assert value.shape == torch.Size(batch_shape(batch_size) + (dim_reward,))
+        torch.testing.assert_allclose(value, torch.zeros_like(value))
+
+    def test_fit(self, table_size):
+        torch.manual_seed(0)
+        value_function = TileCodingValueFunction(
+            LOW, HIGH, bins=4, dim_state=(3,), table_size=table_size
+        )
+        optimizer = torch.optim.Adam(value_function.parameters(), lr=0.05)
+        state, test_state = 2 * torch.rand(2, 1000, 3) - 1
+        target = torch.sin(3 * state).sum(-1, keepdim=True)
+        for _ in range(200):
+            optimizer.zero_grad()
+            loss = ((value_function(state) - target) ** 2).mean()
+            loss.backward()
+            optimizer.step()
+
+        # The tilings generalize to states that are not in the training set.
+        test_target = torch.sin(3 * test_state).sum(-1, keepdim=True)
+        test_loss = ((value_function(test_state) - test_target) ** 2).mean()
+        assert test_loss.item() < 0.1 * test_target.var().item()
+
+    def test_default(self):
+        environment = GymEnvironment("VPendulum-v0")
+        value_function = TileCodingValueFunction.default(environment)
+        state = torch.zeros(4, environment.dim_state[0])
+        assert value_function(state).shape == torch.Size([4, 1])
+
+    def test_discrete_state(self):
+        with pytest.raises(NotImplementedError):
+            TileCodingValueFunction(LOW, HIGH, dim_state=(), num_states=4)
+
+    def test_input_transform(self):
+        value_function = TileCodingValueFunction(
+            [-1.0, -1.0], [1.0, 1.0], dim_state=(3,), input_transform=RemoveFirst()
+        )
+        torch.nn.init.normal_(value_function.embedding.weight)
+        state = torch.rand(8, 3)
+        other_state = state.clone()
+        other_state[..., 0] = 0.0
+        torch.testing.assert_close(value_function(state), value_function(other_state))
+
+    def test_infinite_bounds(self):
+        environment = GymEnvironment("CartPole-v0")
+        with pytest.raises(ValueError):
+            TileCodingValueFunction.default(environment)
+        value_function = TileCodingValueFunction.default(
+            environment, low=[-1.0] * 4, high=[1.0] * 4
+        )
+        assert value_function(torch.zeros(4)).shape == torch.Size([1])
+
+
+class TestTileCodingQFunction(object):
+    def test_discrete_action(self, table_size, dim_reward, batch_size):
+        q_function = TileCodingQFunction(
+            LOW,
+            HIGH,
+            dim_state=(3,),
+            dim_action=(),
+            num_actions=2,
+            dim_reward=(dim_reward,),
+            table_size=table_size,
+        )
+        torch.nn.init.normal_(q_function.embedding.weight)
+        state = random_tensor(False, 3, batch_size)
+        action = random_tensor(True, 2, batch_size)
+
+        action_value = q_function(state)
+        assert action_value.shape == torch.Size(
+            batch_shape(batch_size) + (2, dim_reward)
+        )
+        value = q_function(state, action)
+        assert value.shape == torch.Size(batch_shape(batch_size) + (dim_reward,))
+        mask = one_hot_encode(action, num_classes=2).unsqueeze(-1)
+        torch.testing.assert_allclose(value, (mask * action_value).sum(-2))
+
+    def test_continuous_action(self, table_size, batch_size):
+        q_function = TileCodingQFunction(
+            LOW + [-2.0],
+            HIGH + [2.0],
+            dim_state=(3,),
+            dim_action=(1,),
+            table_size=table_size,
+        )
+        state = random_tensor(False, 3, batch_size)
+        action = random_tensor(False, 1, batch_size)
+        value = q_function(state, action)
+        assert value.shape == torch.Size(batch_shape(batch_size) + (1,))
+        with pytest.raises(NotImplementedError):
+            q_function(state)
+
+    def test_input_transform(self):
+        q_function = TileCodingQFunction(
+            [-1.0, -1.0, -2.0],
+            [1.0, 1.0, 2.0],
+            dim_state=(3,),
+            dim_action=(1,),
+            input_transform=RemoveFirst(),
+        )
+        torch.nn.init.normal_(q_function.embedding.weight)
+        state, action = torch.rand(8, 3), torch.rand(8, 1)
+        other_state = state.clone()
+        other_state[..., 0] = 0.0
+        torch.testing.assert_close(
+            q_function(state, action), q_function(other_state, action)
+        )
+
+    def test_infinite_bounds(self):
+        environment = GymEnvironment("CartPole-v0")
+        with pytest.raises(ValueError):
+            TileCodingQFunction.default(environment)
+
+    def test_default(self):
+        environment = GymEnvironment("VPendulum-v0")
+        q_function = TileCodingQFunction.default(environment, table_size=4096)
+        state = torch.zeros(4, environment.dim_state[0])
+        action = torch.zeros(4, environment.dim_action[0])
+        assert q_function(state, action).shape == torch.Size([4, 1])
+        assert q_function.tile_code.origin.shape == torch.Size([8, 4])
@@ -0,0 +1,209 @@
+"""Value and Q-Functions linear in sparse tile-coding features."""
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from rllib.util.neural_networks.utilities import SparseTileCode, gather_along_index
+
+from .abstract_value_function import AbstractQFunction, AbstractValueFunction
+
+
+def _tile_bag(tile_code, embedding, x):
+    """Sum the weights of the active tiles of each input, with shape [..., dim]."""
+    index = tile_code(x)
+    value = embedding(index.reshape(-1, tile_code.num_tilings))
+    return value.reshape(index.shape[:-1] + (-1,))
+
+
+def _check_bounds(low, high):
+    """Raise an error if the bounds of the tile coding are not finite.
+
+    The unbounded dimensions of the gym spaces have the largest float32 as bounds.
+    """
+    bounds = np.abs(np.concatenate((np.asarray(low), np.asarray(high)), axis=None))
+    if not (bounds < np.finfo(np.float32).max).all():
+        raise ValueError(
+            f"The tile coding needs finite bounds, but got low={low} and high={high}. "
+            "Pass finite `low' and `high', e.g., when the observation space is not "
+            "bounded."
+        )
+
+
+class TileCodingValueFunction(AbstractValueFunction):
+    """Value function that is linear in sparse tile-coding features.
+
+    The value of a state is the sum of the weights of the `num_tilings' active tiles,
+    which `nn.EmbeddingBag' evaluates without building the one-hot features. Its cost
+    does not grow with the number of tiles, which allows fine tilings of
+    high-dimensional states when the tiles are hashed with `table_size'.
+
+    Parameters
+    ----------
+    low: array_like
+        Lower bound of the state space, or of the transformed states.
+    high: array_like
+        Upper bound of the state space, or of the transformed states.
+    bins: int, optional (default=10).
+        Number of bins per dimension.
+    num_tilings: int, optional (default=8).
+        Number of offset tilings.
+    table_size: int, optional.
+        Size of the hash table. By default, the tiles are not hashed.
+    input_transform: nn.Module, optional (default=None).
+        Module with which to transform the states before the tile coding.
+
+    Notes
+    -----
+    The weights are initialized to zero. As num_tilings weights are active in each
+    state, divide the learning rate by num_tilings for a step size independent of it.
+
+    Other Parameters
+    ----------------
+    See AbstractValueFunction.
+
+    Examples
+    --------
+    >>> value_function = TileCodingValueFunction(
+    ...     low=[-1.0, -1.0], high=[1.0, 1.0], dim_state=(2,), table_size=1024
+    ... )
+    >>> value_function(torch.zeros(32, 2)).shape
+    torch.Size([32, 1])
+    """
+
+    def __init__(
+        self,
+        low,
+        high,
+        bins=10,
+        num_tilings=8,
+        table_size=None,
+        input_transform=None,
+        *args,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        if self.discrete_state:
+            raise NotImplementedError("Use a TabularValueFunction for discrete states.")
+        _check_bounds(low, high)
+        self.input_transform = input_transform
+        self.tile_code = SparseTileCode(low, high, bins, num_tilings, table_size)
+        self.embedding = nn.EmbeddingBag(
+            self.tile_code.num_outputs, self.dim_reward[0], mode="sum"
+        )
+        nn.init.zeros_(self.embedding.weight)
+
+    @classmethod
+    def default(cls, environment, *args, **kwargs):
+        """Get a tile-coding value function on the observation space bounds.
+
+        The bounds must be finite, otherwise pass `low' and `high'.
+        """
+        kwargs.setdefault("low", environment.observation_space.low)
+        kwargs.setdefault("high", environment.observation_space.high)
+        return super().default(environment, *args, **kwargs)
+
+    def forward(self, state, action=torch.tensor(float("nan"))):
+        """Get value of the value-function at a given state."""
+        if self.input_transform is not None:
+            state = self.input_transform(state)
+        return _tile_bag(self.tile_code, self.embedding, state)
+
+
+class TileCodingQFunction(AbstractQFunction):
+    """Q-function that is linear in sparse tile-coding features.
+
+    With discrete actions, the state is tile coded and each tile holds the weights
+    of all the actions. With continuous actions, the concatenated state and action
+    are tile coded.
+
+    Parameters
+    ----------
+    low: array_like
+        Lower bound of the state space, or of the transformed states, followed by
+        the lower bound of the action space for continuous actions.
+    high: array_like
+        Upper bound of the state space, or of the transformed states, followed by
+        the upper bound of the action space for continuous actions.
+    bins: int, optional (default=10).
+        Number of bins per dimension.
+    num_tilings: int, optional (default=8).
+        Number of offset tilings.
+    table_size: int, optional.
+        Size of the hash table. By default, the tiles are not hashed.
+    input_transform: nn.Module, optional (default=None).
+        Module with which to transform the states before the tile coding.
+
+    Other Parameters
+    ----------------
+    See AbstractQFunction.
+    """
+
+    def __init__(
+        self,
+        low,
+        high,
+        bins=10,
+        num_tilings=8,
+        table_size=None,
+        input_transform=None,
+        *args,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        if self.discrete_state:
+            raise NotImplementedError("Use a TabularQFunction for discrete states.")
+        _check_bounds(low, high)
+        self.input_transform = input_transform
+        self.tile_code = SparseTileCode(low, high, bins, num_tilings, table_size)
+        if self.discrete_action:
+            embedding_dim = self.num_actions * self.dim_reward[0]
+        else:
+            embedding_dim = self.dim_reward[0]
+        self.embedding = nn.EmbeddingBag(
+            self.tile_code.num_outputs, embedding_dim, mode="sum"
+        )
+        nn.init.zeros_(self.embedding.weight)
+
+    @classmethod
+    def default(cls, environment, *args, **kwargs):
+        """Get a tile-coding q-function on the observation and action space bounds.
+
+        The bounds must be finite, otherwise pass `low' and `high'.
+        """
+        space = environment.observation_space
+        low, high = space.low, space.high
+        if environment.num_actions < 0:
+            low = np.concatenate((low, environment.action_space.low))
+            high = np.concatenate((high, environment.action_space.high))
+        kwargs.setdefault("low", low)
+        kwargs.setdefault("high", high)
+        return super().default(environment, *args, **kwargs)
+
+    def forward(self, state, action=torch.tensor(float("nan"))):
+        """Get value of the q-function at a given state-action pair.
+
+        Parameters
+        ----------
+        state: torch.Tensor
+        action: torch.Tensor
+
+        Returns
+        -------
+        value: torch.Tensor
+        """
+        if self.input_transform is not None:
+            state = self.input_transform(state)
+        if not self.discrete_action:
+            if torch.isnan(action).all():
+                raise NotImplementedError
+            state_action = torch.cat((state, action), dim=-1)
+            return _tile_bag(self.tile_code, self.embedding, state_action)
+
+        action_value = _tile_bag(self.tile_code, self.embedding, state)
+        action_value = action_value.reshape(
+            action_value.shape[:-1] + (self.num_actions, self.dim_reward[0])
+        )
+        if torch.isnan(action).all():
+            return action_value
+        return gather_along_index(action_value, index=action.long(), dim=-2)
@@ -0,0 +1,58 @@
+from typing import Any, Optional, Sequence, Type, TypeVar
+
+import torch.nn as nn
+from torch import Tensor
+
+from rllib.environment import AbstractEnvironment
+from rllib.util.neural_networks.utilities import SparseTileCode
+
+from .abstract_value_function import AbstractQFunction, AbstractValueFunction
+
+T = TypeVar("T", bound="AbstractQFunction")
+
+def _tile_bag(
+    tile_code: SparseTileCode, embedding: nn.EmbeddingBag, x: Tensor
+) -> Tensor: ...
+def _check_bounds(low: Sequence[float], high: Sequence[float]) -> None: ...
+
+class TileCodingValueFunction(AbstractValueFunction):
+    tile_code: SparseTileCode
+    embedding: nn.EmbeddingBag
+    input_transform: Optional[nn.Module]
+    def __init__(
+        self,
+        low: Sequence[float],
+        high: Sequence[float],
+        bins: int = ...,
+        num_tilings: int = ...,
+        table_size: Optional[int] = ...,
+        input_transform: Optional[nn.Module] = ...,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None: ...
+    @classmethod
+    def default(
+        cls: Type[T], environment: AbstractEnvironment, *args: Any, **kwargs: Any
+    ) -> T: ...
+    def forward(self, *args: Tensor, **kwargs: Any) -> Tensor: ...
+
+class TileCodingQFunction(AbstractQFunction):
+    tile_code: SparseTileCode
+    embedding: nn.EmbeddingBag
+    input_transform: Optional[nn.Module]
+    def __init__(
+        self,
+        low: Sequence[float],
+        high: Sequence[float],
+        bins: int = ...,
+        num_tilings: int = ...,
+        table_size: Optional[int] = ...,
+        input_transform: Optional[nn.Module] = ...,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None: ...
+    @classmethod
+    def default(
+        cls: Type[T], environment: AbstractEnvironment, *args: Any, **kwargs: Any
+    ) -> T: ...
+    def forward(self, *args: Tensor, **kwargs: Any) -> Tensor: ...
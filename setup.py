@@ -33,7 +33,7 @@ setup(
     author_email="sebascuri@gmail.com",
     license="MIT",
     python_requires=">=3.7.0",
-    packages=find_packages(exclude=["docs"]),
+    packages=find_packages(exclude=["docs", "benchmarks", "benchmarks.*"]),
     package_data={"rllib": ["environment/mujoco/assets/*.xml"]},
     install_requires=[
         "numpy>=1.14,<2",